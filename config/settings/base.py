@@ -185,6 +185,26 @@ MEDIA_URL = "/media/"
 # Solution PDF export (LaTeX + vendored evan.sty; requires TeX Live with KOMA-Script on the host).
 SOLUTION_PDF_LATEX_TIMEOUT = env.int("SOLUTION_PDF_LATEX_TIMEOUT", default=120)
 SOLUTION_PDF_LATEX_BINARY = env("SOLUTION_PDF_LATEX_BINARY", default="latexmk")
+# Compiled PDFs are cached under MEDIA_ROOT/pdf_cache; least recently used ones are evicted past this size.
+SOLUTION_PDF_CACHE_MAX_BYTES = env.int("SOLUTION_PDF_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+# Cache misses compile on a bounded per-process pool; a download waits up to
+# SOLUTION_PDF_COMPILE_INLINE_WAIT seconds before falling back to a polling page.
+SOLUTION_PDF_COMPILE_WORKERS = env.int("SOLUTION_PDF_COMPILE_WORKERS", default=2)
+SOLUTION_PDF_COMPILE_QUEUE_DEPTH = env.int("SOLUTION_PDF_COMPILE_QUEUE_DEPTH", default=32)
+SOLUTION_PDF_COMPILE_MAX_PER_USER = env.int("SOLUTION_PDF_COMPILE_MAX_PER_USER", default=3)
+SOLUTION_PDF_COMPILE_INLINE_WAIT = env.float("SOLUTION_PDF_COMPILE_INLINE_WAIT", default=3.0)
+# latexmk compiles load a precompiled format of the shared evan.sty preamble
+# (built with mylatexformat under MEDIA_ROOT/pdf_cache/formats) when TeX can build one.
+SOLUTION_PDF_LATEX_FORMAT = env.bool("SOLUTION_PDF_LATEX_FORMAT", default=True)
+# Publishing or editing a published solution / public problem list pre-renders its PDF
+# SOLUTION_PDF_PRERENDER_DELAY seconds after the last change.
+SOLUTION_PDF_PRERENDER = env.bool("SOLUTION_PDF_PRERENDER", default=True)
+SOLUTION_PDF_PRERENDER_DELAY = env.float("SOLUTION_PDF_PRERENDER_DELAY", default=10.0)
+
+# Asymptote diagrams in statements: cache misses render on a shared per-process pool,
+# and a page waits at most ASYMPTOTE_STATEMENT_RENDER_BUDGET seconds for them.
+ASYMPTOTE_RENDER_WORKERS = env.int("ASYMPTOTE_RENDER_WORKERS", default=4)
+ASYMPTOTE_STATEMENT_RENDER_BUDGET = env.float("ASYMPTOTE_STATEMENT_RENDER_BUDGET", default=20.0)
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
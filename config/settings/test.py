@@ -34,5 +34,10 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver/"
+
+# PDF
+# ------------------------------------------------------------------------------
+# Background pre-render timers would compile outside the test transaction.
+SOLUTION_PDF_PRERENDER = False
 # Your stuff...
 # ------------------------------------------------------------------------------
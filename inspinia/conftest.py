@@ -1,5 +1,7 @@
 import pytest
+from django.core.cache import cache
 
+from inspinia.pages.asymptote_render import clear_asymptote_render_cache
 from inspinia.users.models import User
 from inspinia.users.tests.factories import UserFactory
 
@@ -9,6 +11,16 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _render_caches():
+    # Rendered statement fragments live in the Django cache; keep tests from sharing them.
+    clear_asymptote_render_cache()
+    cache.clear()
+    yield
+    clear_asymptote_render_cache()
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -0,0 +1,231 @@
+"""Vectorized contest x year and contest x MOHS pivots for analytics dashboards.
+
+The dashboards hand over plain dict rows; these helpers load them into a
+DataFrame once and aggregate with pandas so the per-cell work stays out of
+Python loops. Payloads are kept key-for-key identical to the loop-based
+builders they replace, so the chart JSON does not change.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+CONTEST_NAME = "contest_name"
+CONTEST_YEAR = "contest_year"
+CONTEST_YEAR_KEY = [CONTEST_NAME, CONTEST_YEAR]
+
+
+def analytics_frame(rows: Iterable[dict[str, Any]] | pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """Return ``rows`` as a DataFrame limited to ``columns`` (missing keys become NaN)."""
+    if isinstance(rows, pd.DataFrame):
+        return rows.reindex(columns=list(columns))
+    return pd.DataFrame.from_records(list(rows), columns=list(columns))
+
+
+def contest_year_heatmap_payload(
+    rows: Iterable[dict[str, Any]] | pd.DataFrame,
+    *,
+    value_key: str,
+    config: dict[str, object] | None = None,
+) -> dict[str, object]:
+    """Build the ApexCharts contest x year heatmap payload.
+
+    Duplicate contest/year rows keep the last value for the cell but all count
+    towards the contest total, and a cell URL is only emitted for non-zero
+    values, matching the original per-row loop.
+    """
+    payload_config = config or {}
+    url_key = str(payload_config.get("url_key") or "") or None
+    metric_label = str(payload_config.get("metric_label") or "")
+    mode = str(payload_config.get("mode") or "")
+    ordered_contests = payload_config.get("ordered_contests")
+    is_limited = bool(payload_config.get("is_limited", False))
+
+    columns = [CONTEST_NAME, CONTEST_YEAR, value_key]
+    if url_key and url_key not in columns:
+        columns.append(url_key)
+    frame = analytics_frame(rows, columns)
+    if frame.empty:
+        return {
+            "is_limited": is_limited,
+            "max_value": 0,
+            "metric_label": metric_label,
+            "mode": mode,
+            "series": [],
+            "years": [],
+        }
+
+    cells = pd.DataFrame(
+        {
+            CONTEST_NAME: frame[CONTEST_NAME].astype(str),
+            CONTEST_YEAR: frame[CONTEST_YEAR].astype(int),
+            "value": pd.to_numeric(frame[value_key]).fillna(0).astype(int),
+        },
+    )
+    years = sorted(cells[CONTEST_YEAR].unique().tolist())
+    value_matrix = cells.pivot_table(
+        index=CONTEST_NAME,
+        columns=CONTEST_YEAR,
+        values="value",
+        aggfunc="last",
+        fill_value=0,
+    ).reindex(columns=years, fill_value=0)
+    contest_totals = cells.groupby(CONTEST_NAME, sort=False)["value"].sum()
+
+    url_matrix = None
+    if url_key:
+        cells["url"] = frame[url_key].where(frame[url_key].notna(), "").astype(str)
+        url_cells = cells[(cells["url"] != "") & (cells["value"] != 0)]
+        if not url_cells.empty:
+            url_matrix = url_cells.pivot_table(
+                index=CONTEST_NAME,
+                columns=CONTEST_YEAR,
+                values="url",
+                aggfunc="last",
+            )
+
+    totals_by_contest = {str(name): int(total) for name, total in contest_totals.items()}
+    if not isinstance(ordered_contests, list):
+        ordered_contests = sorted(
+            totals_by_contest,
+            key=lambda contest_name: (-totals_by_contest[contest_name], contest_name),
+        )
+    else:
+        ordered_contests = [contest_name for contest_name in ordered_contests if contest_name in totals_by_contest]
+
+    value_rows = value_matrix.reindex(index=ordered_contests).to_numpy().tolist()
+    url_rows: list[list[object]] = [[None] * len(years) for _contest_name in ordered_contests]
+    if url_matrix is not None:
+        url_rows = (
+            url_matrix.reindex(index=ordered_contests, columns=years)
+            .astype(object)
+            .where(lambda matrix: matrix.notna(), None)
+            .to_numpy()
+            .tolist()
+        )
+
+    year_labels = [str(year) for year in years]
+    return {
+        "is_limited": is_limited,
+        "max_value": int(cells["value"].max()),
+        "metric_label": metric_label,
+        "mode": mode,
+        "series": [
+            {
+                "data": [
+                    ({"x": year_label, "y": value, "url": url} if url is not None else {"x": year_label, "y": value})
+                    for year_label, value, url in zip(year_labels, values, urls, strict=True)
+                ],
+                "name": contest_name,
+            }
+            for contest_name, values, urls in zip(ordered_contests, value_rows, url_rows, strict=True)
+        ],
+        "years": year_labels,
+    }
+
+
+def contest_year_mohs_pivot_payload(
+    rows: Iterable[dict[str, Any]] | pd.DataFrame,
+    *,
+    hide_empty: bool,
+) -> dict[str, object]:
+    """Count statements per contest year and MOHS for the analytics pivot table.
+
+    Rows are ordered by contest name (case-insensitive) then newest year first;
+    contest years without any MOHS value are reported as empty rows and dropped
+    when ``hide_empty`` is set.
+    """
+    frame = analytics_frame(rows, [CONTEST_NAME, CONTEST_YEAR, "contest_year_label", "mohs"])
+    if frame.empty:
+        return {
+            "contest_names": [],
+            "mohs_values": [],
+            "table_rows": [],
+            "year_values": [],
+            "column_totals": {},
+            "grand_total": 0,
+            "grand_total_label": "0",
+            "max_cell_count": 0,
+            "hidden_empty_rows": 0,
+            "empty_rows_available": 0,
+            "hide_empty": hide_empty,
+        }
+
+    last_seen = frame.drop_duplicates(CONTEST_YEAR_KEY, keep="last")
+    contest_year_labels = dict(
+        zip(
+            zip(last_seen[CONTEST_NAME].tolist(), last_seen[CONTEST_YEAR].astype(int).tolist(), strict=True),
+            last_seen["contest_year_label"].tolist(),
+            strict=True,
+        ),
+    )
+    first_seen = frame.drop_duplicates(CONTEST_YEAR_KEY)
+    first_seen_keys = list(
+        zip(first_seen[CONTEST_NAME].astype(str).tolist(), first_seen[CONTEST_YEAR].astype(int).tolist(), strict=True),
+    )
+    ordered_keys = sorted(first_seen_keys, key=lambda key: (key[0].casefold(), -key[1]))
+
+    mohs_frame = frame[frame["mohs"].notna()]
+    mohs_values = sorted(int(mohs) for mohs in mohs_frame["mohs"].unique())
+    count_matrix = np.zeros((len(ordered_keys), len(mohs_values)), dtype=np.int64)
+    if mohs_values:
+        count_matrix = (
+            mohs_frame.assign(mohs=mohs_frame["mohs"].astype(int), statement_count=1)
+            .pivot_table(
+                index=CONTEST_YEAR_KEY,
+                columns="mohs",
+                values="statement_count",
+                aggfunc="sum",
+                fill_value=0,
+            )
+            .reindex(index=pd.MultiIndex.from_tuples(ordered_keys), columns=mohs_values, fill_value=0)
+            .to_numpy()
+        )
+
+    row_totals = count_matrix.sum(axis=1)
+    is_empty = row_totals == 0
+    kept = ~is_empty if hide_empty else np.ones(len(ordered_keys), dtype=bool)
+    kept_counts = count_matrix[kept]
+    kept_totals = row_totals[kept].tolist()
+    kept_keys = [key for key, is_kept in zip(ordered_keys, kept.tolist(), strict=True) if is_kept]
+    mohs_labels = [str(mohs) for mohs in mohs_values]
+    empty_rows_available = int(is_empty.sum())
+
+    table_rows = [
+        {
+            "contest_name": contest_name,
+            "contest_year": contest_year,
+            "contest_year_label": contest_year_labels[(contest_name, contest_year)],
+            "row_total": row_total,
+            "has_mohs": row_total > 0,
+            "mohs_counts": dict(zip(mohs_labels, counts, strict=True)),
+        }
+        for (contest_name, contest_year), row_total, counts in zip(
+            kept_keys,
+            kept_totals,
+            kept_counts.tolist(),
+            strict=True,
+        )
+    ]
+    grand_total = sum(kept_totals)
+    return {
+        "contest_names": sorted({contest_name for contest_name, _contest_year in kept_keys}, key=str.casefold),
+        "mohs_values": mohs_labels,
+        "table_rows": table_rows,
+        "year_values": [str(year) for year in sorted({key[1] for key in kept_keys}, reverse=True)],
+        "column_totals": dict(zip(mohs_labels, kept_counts.sum(axis=0).tolist(), strict=True)),
+        "grand_total": grand_total,
+        "grand_total_label": f"{grand_total:,}",
+        "max_cell_count": int(kept_counts.max()) if kept_counts.size else 0,
+        "hidden_empty_rows": empty_rows_available if hide_empty else 0,
+        "empty_rows_available": empty_rows_available,
+        "hide_empty": hide_empty,
+    }
@@ -1,18 +1,57 @@
+"""Render `[asy]` blocks in statements to sanitized inline SVG.
+
+Renders go through two cache tiers: a per-process LRU in front of the shared
+`AsymptoteRender` table, keyed by `asymptote_render_key` (renderer version plus
+code). Only a block missing from both spawns `asy` or calls the remote
+renderer; `prerender_asymptote` fills the table for the whole archive so
+statement pages never do.
+
+Within one statement, cache misses render concurrently on a small shared thread
+pool (`ASYMPTOTE_RENDER_WORKERS`). The page waits at most
+`ASYMPTOTE_STATEMENT_RENDER_BUDGET` seconds; blocks still rendering get an
+error marker, and their result is picked up by the next request once it lands.
+Worker threads never touch the database: lookups and store writes stay on the
+request thread.
+"""
+
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import transaction
+
+from inspinia.pages.models import AsymptoteRender
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
 
+# Bump when the renderer or the SVG sanitizer changes output; stored renders are keyed on it.
+ASYMPTOTE_RENDERER_VERSION = "v1"
+ASYMPTOTE_PROCESS_CACHE_SIZE = 512
+ASYMPTOTE_STORE_LOOKUP_BATCH_SIZE = 500
 ASY_BLOCK_RE = re.compile(r"\[asy\](?P<code>.*?)\[/asy\]", flags=re.DOTALL | re.IGNORECASE)
 SVG_TAG_RE = re.compile(r"(<svg\b[\s\S]*?</svg>)", flags=re.IGNORECASE)
 ASY_REMOTE_BASE_URL = "https://asymptote.ualberta.ca"
@@ -30,6 +69,15 @@ UNSAFE_ATTR_VALUES = ("javascript:",)
 ET.register_namespace("", SVG_NAMESPACE)
 ET.register_namespace("xlink", XLINK_NAMESPACE)
 
+_MSG_EMPTY_BLOCK = "Empty Asymptote block."
+_MSG_RENDER_BUDGET = "Diagram is still rendering. Reload the page to see it."
+
+_process_cache: OrderedDict[str, AsymptoteRenderResult] = OrderedDict()
+_finished_in_background: dict[str, AsymptoteRenderResult] = {}
+_in_flight: dict[str, Future] = {}
+_cache_lock = threading.Lock()
+_render_executor: ThreadPoolExecutor | None = None
+
 
 @dataclass(frozen=True)
 class AsymptoteRenderResult:
@@ -47,16 +95,15 @@ def build_statement_render_segments(statement_latex: str) -> list[dict]:
     segments: list[dict] = []
     cursor = 0
 
-    for match in ASY_BLOCK_RE.finditer(statement_text):
+    matches = list(ASY_BLOCK_RE.finditer(statement_text))
+    render_results = render_asymptote_blocks(match.group("code").strip() for match in matches)
+    for match in matches:
         prefix = statement_text[cursor : match.start()]
         if prefix:
             segments.append({"kind": "text", "content": prefix})
 
         asy_code = match.group("code").strip()
-        render_result = render_asymptote_svg(asy_code) if asy_code else AsymptoteRenderResult(
-            svg_markup="",
-            error="Empty Asymptote block.",
-        )
+        render_result = render_results.get(asy_code) or AsymptoteRenderResult(svg_markup="", error=_MSG_EMPTY_BLOCK)
         segments.append(
             {
                 "backend_label": (
@@ -81,12 +128,193 @@ def build_statement_render_segments(statement_latex: str) -> list[dict]:
     return segments
 
 
-@lru_cache(maxsize=128)
+def render_asymptote_blocks(
+    codes: Iterable[str],
+    *,
+    time_budget: float | None = None,
+) -> dict[str, AsymptoteRenderResult]:
+    """Render the distinct non-empty ``codes``, fanning cache misses out over the render pool.
+
+    Blocks that have not finished after ``time_budget`` seconds (default
+    ``ASYMPTOTE_STATEMENT_RENDER_BUDGET``) come back as error results; they keep
+    rendering and are cached when done.
+    """
+    results: dict[str, AsymptoteRenderResult] = {}
+    misses = []
+    for code in dict.fromkeys(code for code in codes if code):
+        cached = cached_asymptote_render(code)
+        if cached is None:
+            misses.append(code)
+        else:
+            results[code] = cached
+    if not misses:
+        return results
+
+    futures = {code: _submit_render(code) for code in misses}
+    budget = settings.ASYMPTOTE_STATEMENT_RENDER_BUDGET if time_budget is None else time_budget
+    wait(futures.values(), timeout=budget)
+    for code, future in futures.items():
+        if future.done():
+            results[code] = _remember_render(code, future.result())
+        else:
+            logger.warning("asymptote_render_over_budget code_hash=%s", asymptote_render_key(code))
+            future.add_done_callback(partial(_finish_in_background, code))
+            results[code] = AsymptoteRenderResult(svg_markup="", error=_MSG_RENDER_BUDGET)
+    return results
+
+
+def asymptote_blocks(statement_latex: str) -> list[str]:
+    """Stripped, non-empty Asymptote code of every `[asy]` block in ``statement_latex``."""
+    return [
+        code for match in ASY_BLOCK_RE.finditer(statement_latex or "") if (code := match.group("code").strip())
+    ]
+
+
+def asymptote_render_key(asy_code: str) -> str:
+    digest = hashlib.sha256(ASYMPTOTE_RENDERER_VERSION.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(asy_code.strip().encode("utf-8"))
+    return digest.hexdigest()
+
+
 def render_asymptote_svg(asy_code: str) -> AsymptoteRenderResult:
     code = (asy_code or "").strip()
     if not code:
-        return AsymptoteRenderResult(svg_markup="", error="Empty Asymptote block.")
+        return AsymptoteRenderResult(svg_markup="", error=_MSG_EMPTY_BLOCK)
+
+    cached = cached_asymptote_render(code)
+    if cached is not None:
+        return cached
+    return _remember_render(code, render_asymptote_svg_uncached(code))
+
+
+def cached_asymptote_render(code: str) -> AsymptoteRenderResult | None:
+    """The render of ``code`` from the process LRU or the shared store, or ``None``."""
+    with _cache_lock:
+        background_result = _finished_in_background.pop(code, None)
+        cached = _process_cache.get(code)
+        if cached is not None:
+            _process_cache.move_to_end(code)
+    if background_result is not None:
+        return _remember_render(code, background_result)
+    if cached is not None:
+        return cached
+
+    stored = stored_asymptote_render(asymptote_render_key(code))
+    if stored is not None:
+        _remember_in_process(code, stored)
+    return stored
+
+
+def clear_asymptote_render_cache() -> None:
+    """Drop the per-process tier; the shared store is left alone."""
+    with _cache_lock:
+        _process_cache.clear()
+        _finished_in_background.clear()
+
+
+def _remember_render(code: str, render_result: AsymptoteRenderResult) -> AsymptoteRenderResult:
+    if render_result.svg_markup:
+        store_asymptote_render(asymptote_render_key(code), render_result)
+    _remember_in_process(code, render_result)
+    return render_result
+
+
+def _remember_in_process(code: str, render_result: AsymptoteRenderResult) -> None:
+    with _cache_lock:
+        _process_cache[code] = render_result
+        _process_cache.move_to_end(code)
+        while len(_process_cache) > ASYMPTOTE_PROCESS_CACHE_SIZE:
+            _process_cache.popitem(last=False)
+
+
+def _finish_in_background(code: str, future) -> None:
+    # Runs on the render thread: park the result for the next request to store.
+    if future.cancelled() or future.exception() is not None:
+        return
+    with _cache_lock:
+        _finished_in_background[code] = future.result()
+
+
+def _submit_render(code: str) -> Future:
+    # Concurrent requests for the same block share one render.
+    global _render_executor  # noqa: PLW0603
+    with _cache_lock:
+        future = _in_flight.get(code)
+        if future is not None:
+            return future
+        if _render_executor is None:
+            _render_executor = ThreadPoolExecutor(
+                max_workers=max(settings.ASYMPTOTE_RENDER_WORKERS, 1),
+                thread_name_prefix="asy-render",
+            )
+        future = _render_executor.submit(render_asymptote_svg_uncached, code)
+        _in_flight[code] = future
+    future.add_done_callback(lambda _finished: _forget_in_flight(code))
+    return future
+
+
+def _forget_in_flight(code: str) -> None:
+    with _cache_lock:
+        _in_flight.pop(code, None)
+
 
+def stored_asymptote_render(code_hash: str) -> AsymptoteRenderResult | None:
+    try:
+        # Savepoint: a failed lookup must not break the surrounding request transaction.
+        with transaction.atomic():
+            row = AsymptoteRender.objects.filter(code_hash=code_hash).only("svg_markup", "backend").first()
+    except DatabaseError:
+        logger.warning("asymptote_render_store_unavailable", exc_info=True)
+        return None
+    if row is None:
+        return None
+    return AsymptoteRenderResult(svg_markup=row.svg_markup, backend=row.backend)
+
+
+def store_asymptote_render(code_hash: str, render_result: AsymptoteRenderResult) -> None:
+    try:
+        AsymptoteRender.objects.update_or_create(
+            code_hash=code_hash,
+            defaults={"svg_markup": render_result.svg_markup, "backend": render_result.backend},
+        )
+    except DatabaseError:
+        logger.warning("asymptote_render_store_failed code_hash=%s", code_hash, exc_info=True)
+
+
+def prerender_asymptote_blocks(codes: Iterable[str], *, workers: int, force: bool = False) -> dict[str, int]:
+    """Render every block in ``codes`` missing from the shared store, ``workers`` at a time."""
+    code_by_hash = {asymptote_render_key(code): code.strip() for code in codes if code.strip()}
+    stored_hashes: set[str] = set()
+    if not force:
+        hashes = list(code_by_hash)
+        for start in range(0, len(hashes), ASYMPTOTE_STORE_LOOKUP_BATCH_SIZE):
+            stored_hashes.update(
+                AsymptoteRender.objects.filter(
+                    code_hash__in=hashes[start : start + ASYMPTOTE_STORE_LOOKUP_BATCH_SIZE],
+                ).values_list("code_hash", flat=True),
+            )
+    pending = {code_hash: code for code_hash, code in code_by_hash.items() if code_hash not in stored_hashes}
+
+    summary = {"blocks": len(code_by_hash), "cached": len(stored_hashes), "rendered": 0, "failed": 0}
+    # Renders are subprocess or network bound; the store writes stay on this thread.
+    with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="asy-prerender") as executor:
+        for code_hash, render_result in zip(
+            pending,
+            executor.map(render_asymptote_svg_uncached, pending.values()),
+            strict=True,
+        ):
+            if render_result.svg_markup:
+                store_asymptote_render(code_hash, render_result)
+                summary["rendered"] += 1
+            else:
+                logger.warning("asymptote_prerender_failed code_hash=%s error=%s", code_hash, render_result.error)
+                summary["failed"] += 1
+    return summary
+
+
+def render_asymptote_svg_uncached(code: str) -> AsymptoteRenderResult:
+    """Render ``code`` with local `asy` when available, else the remote renderer."""
     asy_executable = shutil.which("asy")
     if asy_executable:
         local_result = _render_asymptote_svg_local(code, asy_executable)
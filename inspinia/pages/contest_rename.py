@@ -13,6 +13,7 @@ from inspinia.pages.models import ContestProblemStatement
 from inspinia.pages.models import ProblemSolveRecord
 from inspinia.pages.models import StatementTopicTechnique
 from inspinia.pages.models import UserProblemCompletion
+from inspinia.pages.search_index import refresh_search_documents
 
 
 class ContestRenameValidationError(ValueError):
@@ -273,6 +274,7 @@ def _update_problem_rows(problem_rows: list[ProblemSolveRecord], target_contest:
             ["contest", "contest_year_problem"],
             batch_size=200,
         )
+        refresh_search_documents(problem_ids=[record.id for record in problem_rows])
 
 
 def _update_statement_rows(
@@ -290,6 +292,7 @@ def _update_statement_rows(
             ["contest_name", "contest_year_problem", "updated_at"],
             batch_size=200,
         )
+        refresh_search_documents(statement_ids=[statement.id for statement in statement_plan.rename_rows])
 
     source_statement_ids_to_delete = [
         _merge_statement_row_into_target(
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from inspinia.pages.analytics_pivots import contest_year_heatmap_payload
+from inspinia.pages.analytics_pivots import contest_year_mohs_pivot_payload
+
+DEFAULT_STATEMENT_TOTAL = 50_000
+DEFAULT_CONTEST_TOTAL = 400
+DEFAULT_REPEAT = 5
+BENCHMARK_YEAR_MIN = 1959
+BENCHMARK_YEAR_MAX = 2026
+BENCHMARK_MOHS_VALUES = (None, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50)
+BENCHMARK_LINK_RATE = 0.7
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the vectorized contest/year heatmap and contest/MOHS pivot builders "
+        "on a synthetic statement archive. No database rows are read or written."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--statements",
+            type=int,
+            default=DEFAULT_STATEMENT_TOTAL,
+            help=f"Synthetic statement rows to generate (default {DEFAULT_STATEMENT_TOTAL}).",
+        )
+        parser.add_argument(
+            "--contests",
+            type=int,
+            default=DEFAULT_CONTEST_TOTAL,
+            help=f"Distinct contest names to spread statements over (default {DEFAULT_CONTEST_TOTAL}).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=DEFAULT_REPEAT,
+            help=f"Timed runs per payload; the best run is reported (default {DEFAULT_REPEAT}).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic archive.")
+
+    def handle(self, *args, **options) -> None:
+        statement_total = options["statements"]
+        contest_total = options["contests"]
+        repeat = options["repeat"]
+        if statement_total < 1 or contest_total < 1 or repeat < 1:
+            msg = "--statements, --contests and --repeat must be positive integers."
+            raise CommandError(msg)
+
+        statement_rows = _synthetic_statement_rows(statement_total, contest_total, seed=options["seed"])
+        set_rows = _synthetic_statement_set_rows(statement_rows)
+        self.stdout.write(
+            f"Synthetic archive: {len(statement_rows):,} statement(s), {len(set_rows):,} contest year set(s).",
+        )
+
+        timings = {
+            "contest x year heatmap (statement sets)": _best_of(
+                repeat,
+                lambda: contest_year_heatmap_payload(
+                    set_rows,
+                    value_key="statement_count",
+                    config={"metric_label": "Statement rows", "url_key": "contest_year_url"},
+                ),
+            ),
+            "contest x MOHS pivot (statements)": _best_of(
+                repeat,
+                lambda: contest_year_mohs_pivot_payload(statement_rows, hide_empty=True),
+            ),
+        }
+        for label, seconds in timings.items():
+            self.stdout.write(f"{label}: {seconds * 1000:.1f} ms (best of {repeat})")
+        self.stdout.write(self.style.SUCCESS("Analytics pivot benchmark complete."))
+
+
+def _best_of(repeat: int, build) -> float:
+    best = float("inf")
+    for _run in range(repeat):
+        started = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _synthetic_statement_rows(statement_total: int, contest_total: int, *, seed: int) -> list[dict[str, object]]:
+    rng = random.Random(seed)  # noqa: S311
+    contest_names = [f"Benchmark Olympiad {index:04d}" for index in range(contest_total)]
+    rows = []
+    for _index in range(statement_total):
+        contest_name = rng.choice(contest_names)
+        contest_year = rng.randint(BENCHMARK_YEAR_MIN, BENCHMARK_YEAR_MAX)
+        rows.append(
+            {
+                "contest_name": contest_name,
+                "contest_year": contest_year,
+                "contest_year_label": f"{contest_name} {contest_year}",
+                "mohs": rng.choice(BENCHMARK_MOHS_VALUES),
+                "is_linked": rng.random() < BENCHMARK_LINK_RATE,
+            },
+        )
+    return rows
+
+
+def _synthetic_statement_set_rows(statement_rows: list[dict[str, object]]) -> list[dict[str, object]]:
+    counts: dict[tuple[object, object], list[int]] = defaultdict(lambda: [0, 0])
+    for row in statement_rows:
+        totals = counts[(row["contest_name"], row["contest_year"])]
+        totals[0] += 1
+        totals[1] += 0 if row["is_linked"] else 1
+    return [
+        {
+            "contest_name": contest_name,
+            "contest_year": contest_year,
+            "contest_year_url": f"/statements/{contest_name}/{contest_year}/",
+            "statement_count": statement_count,
+            "unlinked_count": unlinked_count,
+        }
+        for (contest_name, contest_year), (statement_count, unlinked_count) in counts.items()
+    ]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from inspinia.pages.asymptote_render import asymptote_blocks
+from inspinia.pages.asymptote_render import prerender_asymptote_blocks
+from inspinia.pages.models import ContestProblemStatement
+
+DEFAULT_WORKERS = 4
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every [asy] block in the statement archive into the shared Asymptote SVG store, "
+        "so statement pages serve stored diagrams instead of running asy."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f"Parallel renders (default {DEFAULT_WORKERS}).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render blocks that are already stored.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        workers = options["workers"]
+        if workers < 1:
+            msg = "--workers must be a positive integer."
+            raise CommandError(msg)
+
+        codes = []
+        statement_texts = ContestProblemStatement.objects.filter(statement_latex__icontains="[asy]").values_list(
+            "statement_latex",
+            flat=True,
+        )
+        for statement_latex in statement_texts.iterator(chunk_size=500):
+            codes.extend(asymptote_blocks(statement_latex))
+
+        summary = prerender_asymptote_blocks(codes, workers=workers, force=options["force"])
+        message = (
+            f"Asymptote blocks: {summary['blocks']} distinct, {summary['cached']} already stored, "
+            f"{summary['rendered']} rendered, {summary['failed']} failed."
+        )
+        if summary["failed"]:
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from inspinia.pages.search_index import SEARCH_DOCUMENT_BATCH_SIZE
+from inspinia.pages.search_index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search documents for every problem and statement. "
+        "Migrations build the documents and saves keep them current; run this after raw SQL or bulk update edits."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SEARCH_DOCUMENT_BATCH_SIZE,
+            help=f"Rows refreshed per transaction (default {SEARCH_DOCUMENT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            msg = "--batch-size must be a positive integer."
+            raise CommandError(msg)
+
+        summary = rebuild_search_index(batch_size=batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt search index: "
+                f"{summary['problems']} problem(s), {summary['statements']} statement(s), "
+                f"removed {summary['stale_deleted']} stale document(s).",
+            ),
+        )
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.9 on 2026-10-19 14:20
+
+from django.db import migrations
+from django.db import models
+
+
+def _stripped(value) -> str:
+    return str(value or "").strip()
+
+
+def forwards_backfill_effective_analytics(apps, schema_editor) -> None:
+    # Same rules as inspinia.pages.statement_analytics.effective_topic/effective_mohs.
+    ContestProblemStatement = apps.get_model("pages", "ContestProblemStatement")
+
+    statements = (
+        ContestProblemStatement.objects.select_related("linked_problem")
+        .only("topic", "mohs", "linked_problem", "linked_problem__topic", "linked_problem__mohs")
+        .order_by("pk")
+    )
+    batch = []
+    for statement in statements.iterator(chunk_size=500):
+        linked = statement.linked_problem
+        statement.effective_topic = _stripped(statement.topic) or (_stripped(linked.topic) if linked else "")
+        statement.effective_mohs = statement.mohs if statement.mohs is not None else (linked.mohs if linked else None)
+        batch.append(statement)
+        if len(batch) >= 500:
+            ContestProblemStatement.objects.bulk_update(batch, ["effective_topic", "effective_mohs"])
+            batch = []
+    if batch:
+        ContestProblemStatement.objects.bulk_update(batch, ["effective_topic", "effective_mohs"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0034_userproblemcompletion_user_updated_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contestproblemstatement",
+            name="effective_mohs",
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="contestproblemstatement",
+            name="effective_topic",
+            field=models.CharField(blank=True, default="", editable=False, max_length=32),
+        ),
+        migrations.RunPython(forwards_backfill_effective_analytics, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="contestproblemstatement",
+            index=models.Index(
+                fields=["is_active", "effective_topic", "effective_mohs"],
+                name="pages_cps_eff_topic_mohs_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contestproblemstatement",
+            index=models.Index(fields=["is_active", "effective_mohs"], name="pages_cps_eff_mohs_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contestproblemstatement",
+            index=models.Index(fields=["contest_name", "effective_topic"], name="pages_cps_contest_topic_idx"),
+        ),
+    ]
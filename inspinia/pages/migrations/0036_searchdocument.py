@@ -0,0 +1,73 @@
+# Generated by Django 5.1.9 on 2026-10-19 16:05
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db import models
+
+POSTGRES_SEARCH_INDEXES = (
+    (
+        "pages_searchdoc_document_trgm",
+        "CREATE INDEX IF NOT EXISTS pages_searchdoc_document_trgm "
+        "ON pages_searchdocument USING gin (document gin_trgm_ops)",
+    ),
+    (
+        "pages_searchdoc_vector_gin",
+        "CREATE INDEX IF NOT EXISTS pages_searchdoc_vector_gin ON pages_searchdocument USING gin (search_vector)",
+    ),
+)
+
+
+def create_postgres_search_indexes(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _name, statement in POSTGRES_SEARCH_INDEXES:
+        schema_editor.execute(statement)
+
+
+def drop_postgres_search_indexes(apps, schema_editor) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _statement in POSTGRES_SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0035_contestproblemstatement_effective_analytics"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("problem", "Problem"), ("statement", "Statement")],
+                        max_length=16,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("label", models.CharField(blank=True, max_length=255)),
+                ("document", models.TextField(blank=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"),
+                        name="pages_searchdocument_unique_kind_object",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(create_postgres_search_indexes, drop_postgres_search_indexes),
+    ]
@@ -0,0 +1,144 @@
+import re
+from collections import defaultdict
+
+from django.db import migrations
+
+# Frozen copies of the document builders in inspinia.pages.search_index as of
+# this migration, so later changes to that module cannot alter the backfill.
+BATCH_SIZE = 500
+SEARCH_VECTOR_CONFIG = "simple"
+LABEL_MAX_LENGTH = 255
+WHITESPACE_RE = re.compile(r"\s+")
+PROBLEM_DOCUMENT_FIELDS = (
+    "contest",
+    "problem",
+    "contest_year_problem",
+    "topic",
+    "topic_tags",
+    "core_ideas",
+    "core_ideas_value",
+    "rationale",
+    "rationale_value",
+    "pitfalls",
+    "pitfalls_value",
+)
+STATEMENT_NOTE_FIELDS = (
+    "core_ideas",
+    "core_ideas_value",
+    "rationale",
+    "rationale_value",
+    "pitfalls",
+    "pitfalls_value",
+)
+STATEMENT_DOCUMENT_FIELDS = (
+    "contest_name",
+    "contest_year",
+    "contest_year_problem",
+    "day_label",
+    "problem_number",
+    "problem_code",
+    "statement_uuid",
+    "effective_topic",
+    "topic_tags",
+    "core_ideas_value",
+    "statement_latex",
+)
+
+
+def _normalize(value) -> str:
+    if value is None:
+        return ""
+    return WHITESPACE_RE.sub(" ", str(value)).strip().casefold()
+
+
+def _join(values) -> str:
+    return " ".join(normalized for value in values if (normalized := _normalize(value)))
+
+
+def _problem_documents(ContestProblemStatement, SearchDocument, problems):
+    statements_by_problem_id = defaultdict(list)
+    for statement in ContestProblemStatement.objects.filter(
+        is_active=True,
+        linked_problem_id__in=[problem.id for problem in problems],
+    ).order_by("id"):
+        statements_by_problem_id[statement.linked_problem_id].append(statement)
+
+    documents = []
+    for problem in problems:
+        values = [getattr(problem, field_name) for field_name in PROBLEM_DOCUMENT_FIELDS]
+        values.extend(row.technique for row in problem.topic_techniques.all())
+        for statement in statements_by_problem_id.get(problem.id, ()):
+            values.extend(getattr(statement, field_name) for field_name in STATEMENT_NOTE_FIELDS)
+            values.append(statement.statement_latex)
+        label = problem.contest_year_problem or f"{problem.contest} {problem.year} {problem.problem}"
+        documents.append(
+            SearchDocument(
+                kind="problem",
+                object_id=problem.id,
+                label=_normalize(label)[:LABEL_MAX_LENGTH],
+                document=_join(values),
+            ),
+        )
+    return documents
+
+
+def _statement_documents(SearchDocument, statements):
+    documents = []
+    for statement in statements:
+        values = [getattr(statement, field_name) for field_name in STATEMENT_DOCUMENT_FIELDS]
+        values.extend(row.technique for row in statement.statement_topic_techniques.all())
+        documents.append(
+            SearchDocument(
+                kind="statement",
+                object_id=statement.id,
+                label=_normalize(statement.contest_year_problem)[:LABEL_MAX_LENGTH],
+                document=_join(values),
+            ),
+        )
+    return documents
+
+
+def _in_batches(queryset):
+    batch = []
+    for row in queryset.iterator(chunk_size=BATCH_SIZE):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def forwards_backfill_search_documents(apps, schema_editor) -> None:
+    ContestProblemStatement = apps.get_model("pages", "ContestProblemStatement")
+    ProblemSolveRecord = apps.get_model("pages", "ProblemSolveRecord")
+    SearchDocument = apps.get_model("pages", "SearchDocument")
+
+    SearchDocument.objects.all().delete()
+    problems = ProblemSolveRecord.objects.order_by("id").prefetch_related("topic_techniques")
+    for batch in _in_batches(problems):
+        SearchDocument.objects.bulk_create(_problem_documents(ContestProblemStatement, SearchDocument, batch))
+    statements = ContestProblemStatement.objects.order_by("id").prefetch_related("statement_topic_techniques")
+    for batch in _in_batches(statements):
+        SearchDocument.objects.bulk_create(_statement_documents(SearchDocument, batch))
+
+    if schema_editor.connection.vendor == "postgresql":
+        from django.contrib.postgres.search import SearchVector
+
+        SearchDocument.objects.update(
+            search_vector=(
+                SearchVector("label", weight="A", config=SEARCH_VECTOR_CONFIG)
+                + SearchVector("document", weight="B", config=SEARCH_VECTOR_CONFIG)
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0036_searchdocument"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.9 on 2026-10-19 15:56
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pages", "0037_backfill_search_documents"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AsymptoteRender",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("code_hash", models.CharField(max_length=64, unique=True)),
+                ("svg_markup", models.TextField()),
+                ("backend", models.CharField(blank=True, max_length=16)),
+                ("rendered_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -2,6 +2,7 @@ import uuid
 from decimal import Decimal
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -14,6 +15,8 @@ from inspinia.pages.analytics_field_parse import parse_rationale_value
 from inspinia.pages.contest_names import PROJECT_CONTEST_NAME_MAX_LENGTH
 from inspinia.pages.contest_names import normalize_contest_name
 from inspinia.pages.contest_names import normalize_text_list
+from inspinia.pages.statement_analytics import EFFECTIVE_ANALYTICS_FIELDS
+from inspinia.pages.statement_analytics import effective_analytics_field_values
 from inspinia.pages.topic_tags_parse import clean_token
 from inspinia.pages.topic_tags_parse import domains_dedup_preserve_order
 from inspinia.pages.topic_tags_parse import normalize_topic_tag
@@ -124,6 +127,9 @@ class ProblemSolveRecord(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Statements linked to this record, kept by ``pages.signals`` from pre_delete to post_delete.
+    _linked_statement_ids: list[int]
+
     class Meta:
         ordering = ["-year", "contest", "problem"]
 
@@ -223,6 +229,10 @@ class ContestProblemStatement(models.Model):
     rationale_value = models.TextField(null=True, blank=True)
     pitfalls = models.TextField(null=True, blank=True)
     pitfalls_value = models.TextField(null=True, blank=True)
+    # Stored statement-first / linked-problem fallback values so topic and MOHS
+    # filters can use indexes; refreshed on save and from linked record saves.
+    effective_topic = models.CharField(max_length=32, blank=True, default="", editable=False)
+    effective_mohs = models.IntegerField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -234,6 +244,14 @@ class ContestProblemStatement(models.Model):
                 name="pages_contestproblemstatement_unique_contest_day_problem_code",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["is_active", "effective_topic", "effective_mohs"],
+                name="pages_cps_eff_topic_mohs_idx",
+            ),
+            models.Index(fields=["is_active", "effective_mohs"], name="pages_cps_eff_mohs_idx"),
+            models.Index(fields=["contest_name", "effective_topic"], name="pages_cps_contest_topic_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.contest_year_problem
@@ -252,6 +270,10 @@ class ContestProblemStatement(models.Model):
         self.pitfalls_value = parse_pitfalls_value(self.pitfalls)
 
         update_fields = kwargs.get("update_fields")
+        refresh_effective = self._effective_analytics_need_refresh(update_fields)
+        if refresh_effective:
+            for field_name, value in effective_analytics_field_values(self).items():
+                setattr(self, field_name, value)
         if update_fields is not None:
             kwargs["update_fields"] = set(update_fields) | {
                 "contest_year_problem",
@@ -261,9 +283,40 @@ class ContestProblemStatement(models.Model):
                 "core_ideas_value",
                 "rationale_value",
                 "pitfalls_value",
+                *(EFFECTIVE_ANALYTICS_FIELDS if refresh_effective else ()),
             }
 
         super().save(*args, **kwargs)
+        self._effective_analytics_inputs = self._current_effective_analytics_inputs()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._effective_analytics_inputs = instance._current_effective_analytics_inputs()  # noqa: SLF001
+        return instance
+
+    @property
+    def loaded_linked_problem_id(self) -> int | None:
+        """``linked_problem_id`` as last loaded from or saved to the database.
+
+        Still the previous value inside post_save handlers of the save that changes it.
+        """
+        loaded_inputs = getattr(self, "_effective_analytics_inputs", None)
+        return loaded_inputs[-1] if loaded_inputs is not None else None
+
+    def _current_effective_analytics_inputs(self) -> tuple:
+        # Read __dict__ so deferred fields are not loaded just to compare them.
+        return tuple(self.__dict__.get(field_name) for field_name in ("topic", "mohs", "linked_problem_id"))
+
+    def _effective_analytics_need_refresh(self, update_fields) -> bool:
+        """Whether save() must recompute the stored effective columns.
+
+        Linked record edits refresh them through signals, so a save that leaves
+        the statement topic, MOHS and link untouched keeps the stored values.
+        """
+        if self._state.adding or set(update_fields or ()) & set(EFFECTIVE_ANALYTICS_FIELDS):
+            return True
+        return self._current_effective_analytics_inputs() != getattr(self, "_effective_analytics_inputs", None)
 
 
 class StatementTopicTechnique(models.Model):
@@ -302,6 +355,58 @@ class StatementTopicTechnique(models.Model):
         super().save(*args, **kwargs)
 
 
+class SearchDocument(models.Model):
+    """
+    Denormalized search text for one problem or statement row.
+
+    `document` holds casefolded, whitespace-collapsed text from every searchable
+    field so a search token is one substring test instead of a join per field.
+    On Postgres the migration adds a trigram GIN index on `document` and a GIN
+    index on `search_vector`; other backends scan `document` with LIKE.
+    """
+
+    class Kind(models.TextChoices):
+        PROBLEM = "problem", "Problem"
+        STATEMENT = "statement", "Statement"
+
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    label = models.CharField(max_length=255, blank=True)
+    document = models.TextField(blank=True)
+    # Weighted tsvector (label A, document B); only populated on Postgres.
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"],
+                name="pages_searchdocument_unique_kind_object",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.object_id}"
+
+
+class AsymptoteRender(models.Model):
+    """
+    Sanitized SVG for one `[asy]` block, shared by every process.
+
+    `code_hash` is a SHA-256 of the renderer version and the stripped Asymptote
+    code, so bumping the version in `asymptote_render` re-renders everything.
+    Only successful renders are stored.
+    """
+
+    code_hash = models.CharField(max_length=64, unique=True)
+    svg_markup = models.TextField()
+    backend = models.CharField(max_length=16, blank=True)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.code_hash
+
+
 class ContestMetadata(models.Model):
     contest_uuid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, db_index=True)
     contest = models.CharField(max_length=PROJECT_CONTEST_NAME_MAX_LENGTH)
@@ -9,6 +9,7 @@ from typing import Any
 
 from django.utils import timezone
 
+from inspinia.pages.analytics_pivots import contest_year_mohs_pivot_payload
 from inspinia.pages.models import ProblemSolveRecord
 from inspinia.pages.models import StatementTopicTechnique
 from inspinia.pages.topic_labels import display_topic_label
@@ -62,7 +63,7 @@ def build_problem_analytics_context(query_params, base_queryset) -> dict[str, ob
     all_rows = _dashboard_statement_rows(base_queryset)
     filters = _filters_from_query(query_params)
     filtered_rows = _filter_rows(all_rows, filters)
-    pivot_payload = _contest_year_mohs_pivot_payload(filtered_rows, hide_empty=filters["hide_empty"])
+    pivot_payload = contest_year_mohs_pivot_payload(filtered_rows, hide_empty=bool(filters["hide_empty"]))
     summary = _summary_payload(all_rows, filtered_rows, pivot_payload)
     quality = _quality_payload(all_rows, filtered_rows, pivot_payload)
     charts_payload = {
@@ -426,67 +427,6 @@ def _ranked_items(counts: Counter[str], limit: int) -> tuple[list[str], list[int
     return [label for label, _count in ranked], [count for _label, count in ranked]
 
 
-def _contest_year_mohs_pivot_payload(rows: list[dict[str, Any]], *, hide_empty: bool) -> dict[str, object]:
-    mohs_values = sorted({row["mohs"] for row in rows if row["mohs"] is not None})
-    counts_by_contest_year: dict[tuple[str, int], Counter[int]] = defaultdict(Counter)
-    contest_year_names: dict[tuple[str, int], str] = {}
-    for row in rows:
-        key = (row["contest_name"], row["contest_year"])
-        contest_year_names[key] = row["contest_year_label"]
-        if row["mohs"] is not None:
-            counts_by_contest_year[key][row["mohs"]] += 1
-
-    ordered_keys = sorted(
-        contest_year_names,
-        key=lambda key: (key[0].casefold(), -key[1]),
-    )
-    table_rows = []
-    hidden_empty_rows = 0
-    empty_rows_available = 0
-    max_cell_count = 0
-    for contest_name, contest_year in ordered_keys:
-        mohs_counts = {
-            str(mohs): counts_by_contest_year[(contest_name, contest_year)].get(mohs, 0)
-            for mohs in mohs_values
-        }
-        row_total = sum(mohs_counts.values())
-        if row_total == 0:
-            empty_rows_available += 1
-            if hide_empty:
-                hidden_empty_rows += 1
-                continue
-        max_cell_count = max(max_cell_count, *(mohs_counts.values() or [0]))
-        table_rows.append(
-            {
-                "contest_name": contest_name,
-                "contest_year": contest_year,
-                "contest_year_label": contest_year_names[(contest_name, contest_year)],
-                "row_total": row_total,
-                "has_mohs": row_total > 0,
-                "mohs_counts": mohs_counts,
-            },
-        )
-
-    column_totals = {
-        str(mohs): sum(row["mohs_counts"].get(str(mohs), 0) for row in table_rows)
-        for mohs in mohs_values
-    }
-    grand_total = sum(row["row_total"] for row in table_rows)
-    return {
-        "contest_names": sorted({row["contest_name"] for row in table_rows}, key=str.casefold),
-        "mohs_values": [str(mohs) for mohs in mohs_values],
-        "table_rows": table_rows,
-        "year_values": [str(year) for year in sorted({row["contest_year"] for row in table_rows}, reverse=True)],
-        "column_totals": column_totals,
-        "grand_total": grand_total,
-        "grand_total_label": _format_int(grand_total),
-        "max_cell_count": max_cell_count,
-        "hidden_empty_rows": hidden_empty_rows,
-        "empty_rows_available": empty_rows_available,
-        "hide_empty": hide_empty,
-    }
-
-
 def _suspected_duplicate_contest_groups(rows: list[dict[str, Any]]) -> list[dict[str, object]]:
     names_by_fingerprint: dict[str, Counter[str]] = defaultdict(Counter)
     for row in rows:
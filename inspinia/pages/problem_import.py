@@ -24,6 +24,9 @@ from inspinia.pages.models import ProblemTopicTechnique
 from inspinia.pages.models import normalize_topic_tag_list
 from inspinia.pages.statement_analytics_sync import sync_statement_analytics_from_linked_problem
 from inspinia.pages.subtopic_cleanup import classified_topic_tag_entries
+from inspinia.pages.tabular_reader import TABULAR_FORMAT_CSV
+from inspinia.pages.tabular_reader import read_tabular_dataframe
+from inspinia.pages.tabular_reader import sniff_tabular_format
 from inspinia.pages.topic_tags_parse import domains_dedup_preserve_order
 from inspinia.pages.topic_tags_parse import merge_domain_lists
 from inspinia.pages.topic_tags_parse import parse_contest_problem_string
@@ -425,13 +428,19 @@ def build_problem_statement_export_workbook_bytes(
 
 def dataframe_from_excel(source: Path | str | BinaryIO | bytes) -> pd.DataFrame:
     """Load workbook; normalize column headers (strip)."""
-    if isinstance(source, bytes):
-        source = io.BytesIO(source)
+    msg = "Could not read Excel file. Is it a valid .xlsx?"
     try:
-        dataframe = pd.read_excel(source)
+        tabular_format = sniff_tabular_format(source)
+        # Problem workbooks are Excel-only; a CSV upload is rejected without parsing it.
+        dataframe = (
+            None
+            if tabular_format == TABULAR_FORMAT_CSV
+            else read_tabular_dataframe(source, tabular_format=tabular_format)
+        )
     except Exception as exc:
-        msg = "Could not read Excel file. Is it a valid .xlsx?"
         raise ProblemImportValidationError(msg) from exc
+    if dataframe is None:
+        raise ProblemImportValidationError(msg)
 
     dataframe.columns = [str(column).strip() for column in dataframe.columns]
     missing = REQUIRED_COLUMNS - set(dataframe.columns)
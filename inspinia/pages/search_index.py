@@ -0,0 +1,360 @@
+"""Full-text search documents for problems and statements.
+
+Every searchable field of a problem or statement row is folded into one
+``SearchDocument`` row (casefolded, whitespace collapsed), so a search token
+becomes a single substring test against an indexed column instead of an
+``icontains`` OR across joined tables. On Postgres the document column carries a
+trigram GIN index and a weighted ``tsvector`` used for ranking; other backends
+fall back to LIKE scans over the same text and a label-match rank.
+
+Model signals queue refreshes with ``queue_search_document_refresh``: ids are
+collected per transaction and refreshed once, after commit, so a bulk import
+rebuilds each touched document once instead of once per saved row.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+from django.db import connection
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import FloatField
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.utils import timezone
+
+from inspinia.pages.models import ContestProblemStatement
+from inspinia.pages.models import ProblemSolveRecord
+from inspinia.pages.models import SearchDocument
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+SEARCH_DOCUMENT_BATCH_SIZE = 500
+SEARCH_VECTOR_CONFIG = "simple"
+SEARCH_INDEX_MARKER_KEY = "search-index-changed-at:v1"
+SEARCH_INDEX_MARKER_TIMEOUT_SECONDS = 24 * 60 * 60
+_WHITESPACE_RE = re.compile(r"\s+")
+_TSQUERY_WORD_RE = re.compile(r"\w+")
+_PROBLEM_DOCUMENT_FIELDS = (
+    "contest",
+    "problem",
+    "contest_year_problem",
+    "topic",
+    "topic_tags",
+    "core_ideas",
+    "core_ideas_value",
+    "rationale",
+    "rationale_value",
+    "pitfalls",
+    "pitfalls_value",
+)
+_STATEMENT_NOTE_FIELDS = (
+    "core_ideas",
+    "core_ideas_value",
+    "rationale",
+    "rationale_value",
+    "pitfalls",
+    "pitfalls_value",
+)
+_STATEMENT_DOCUMENT_FIELDS = (
+    "contest_name",
+    "contest_year",
+    "contest_year_problem",
+    "day_label",
+    "problem_number",
+    "problem_code",
+    "statement_uuid",
+    "effective_topic",
+    "topic_tags",
+    "core_ideas_value",
+    "statement_latex",
+)
+
+
+def normalize_search_text(value: object) -> str:
+    """Casefold ``value`` and collapse whitespace the way documents are stored."""
+    if value is None:
+        return ""
+    return _WHITESPACE_RE.sub(" ", str(value)).strip().casefold()
+
+
+def search_tokens(search_text: str | None) -> list[str]:
+    return [token for token in normalize_search_text(search_text).split(" ") if token]
+
+
+def search_index_marker() -> str:
+    """Opaque marker that changes whenever search documents are refreshed.
+
+    Caches derived from search results (facet counts, label indexes) put it in
+    their keys so edits show up without waiting for the cache timeout.
+    """
+    return str(cache.get(SEARCH_INDEX_MARKER_KEY) or "")
+
+
+def mark_search_index_changed() -> None:
+    cache.set(
+        SEARCH_INDEX_MARKER_KEY,
+        timezone.now().isoformat(),
+        timeout=SEARCH_INDEX_MARKER_TIMEOUT_SECONDS,
+    )
+
+
+def problem_search_document(
+    problem: ProblemSolveRecord,
+    *,
+    techniques: Iterable[str] = (),
+    statements: Iterable[ContestProblemStatement] = (),
+) -> str:
+    """Searchable text for a problem: archive fields, tags and active statement notes."""
+    values: list[object] = [getattr(problem, field_name) for field_name in _PROBLEM_DOCUMENT_FIELDS]
+    values.extend(techniques)
+    for statement in statements:
+        values.extend(getattr(statement, field_name) for field_name in _STATEMENT_NOTE_FIELDS)
+        values.append(statement.statement_latex)
+    return _join_document_values(values)
+
+
+def statement_search_document(
+    statement: ContestProblemStatement,
+    *,
+    techniques: Iterable[str] = (),
+) -> str:
+    """Searchable text for a statement: contest labels, tags, core ideas and LaTeX."""
+    values: list[object] = [getattr(statement, field_name) for field_name in _STATEMENT_DOCUMENT_FIELDS]
+    values.extend(techniques)
+    return _join_document_values(values)
+
+
+def refresh_search_documents(
+    *,
+    problem_ids: Iterable[int] | None = None,
+    statement_ids: Iterable[int] | None = None,
+) -> int:
+    """Rebuild the search documents for the given rows; missing rows lose their document."""
+    requested_problem_ids = _clean_id_set(problem_ids)
+    requested_statement_ids = _clean_id_set(statement_ids)
+    if not requested_problem_ids and not requested_statement_ids:
+        return 0
+
+    documents = [
+        *_problem_documents(requested_problem_ids),
+        *_statement_documents(requested_statement_ids),
+    ]
+    with transaction.atomic():
+        if requested_problem_ids:
+            SearchDocument.objects.filter(
+                kind=SearchDocument.Kind.PROBLEM,
+                object_id__in=requested_problem_ids,
+            ).delete()
+        if requested_statement_ids:
+            SearchDocument.objects.filter(
+                kind=SearchDocument.Kind.STATEMENT,
+                object_id__in=requested_statement_ids,
+            ).delete()
+        created = SearchDocument.objects.bulk_create(documents, batch_size=SEARCH_DOCUMENT_BATCH_SIZE)
+        _refresh_search_vectors([document.pk for document in created if document.pk is not None])
+    mark_search_index_changed()
+    return len(documents)
+
+
+def queue_search_document_refresh(
+    *,
+    problem_ids: Iterable[int | None] | None = None,
+    statement_ids: Iterable[int | None] | None = None,
+) -> None:
+    """Refresh these documents once the current transaction commits (right away outside one).
+
+    Ids queued within one transaction are merged: the first of its commit
+    callbacks refreshes them all and the rest find nothing left to do. Ids
+    queued in a transaction that rolls back wait for the next commit, which only
+    rebuilds their documents from the current rows.
+    """
+    requested_problem_ids = _clean_id_set(problem_ids)
+    requested_statement_ids = _clean_id_set(statement_ids)
+    if not requested_problem_ids and not requested_statement_ids:
+        return
+
+    pending = _pending_refresh_ids()
+    pending["problem_ids"] |= requested_problem_ids
+    pending["statement_ids"] |= requested_statement_ids
+    transaction.on_commit(_refresh_pending_search_documents)
+
+
+def _refresh_pending_search_documents() -> None:
+    pending = _pending_refresh_ids()
+    problem_ids, statement_ids = pending["problem_ids"], pending["statement_ids"]
+    if not problem_ids and not statement_ids:
+        return
+    pending["problem_ids"], pending["statement_ids"] = set(), set()
+    refresh_search_documents(problem_ids=problem_ids, statement_ids=statement_ids)
+
+
+def _pending_refresh_ids() -> dict[str, set[int]]:
+    # One pending set per thread, matching Django's per-thread connections.
+    if not hasattr(_pending_refreshes, "ids"):
+        _pending_refreshes.ids = {"problem_ids": set(), "statement_ids": set()}
+    return _pending_refreshes.ids
+
+
+_pending_refreshes = threading.local()
+
+
+def rebuild_search_index(*, batch_size: int = SEARCH_DOCUMENT_BATCH_SIZE) -> dict[str, int]:
+    """Refresh every search document in batches and drop documents for deleted rows."""
+    problem_ids = list(ProblemSolveRecord.objects.order_by("id").values_list("id", flat=True))
+    statement_ids = list(ContestProblemStatement.objects.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(problem_ids), batch_size):
+        refresh_search_documents(problem_ids=problem_ids[start : start + batch_size])
+    for start in range(0, len(statement_ids), batch_size):
+        refresh_search_documents(statement_ids=statement_ids[start : start + batch_size])
+
+    stale_deleted, _details = SearchDocument.objects.filter(
+        Q(kind=SearchDocument.Kind.PROBLEM) & ~Q(object_id__in=ProblemSolveRecord.objects.values("id"))
+        | Q(kind=SearchDocument.Kind.STATEMENT) & ~Q(object_id__in=ContestProblemStatement.objects.values("id")),
+    ).delete()
+    mark_search_index_changed()
+    return {
+        "problems": len(problem_ids),
+        "statements": len(statement_ids),
+        "stale_deleted": stale_deleted,
+    }
+
+
+def search_document_ids(kind: str, search_text: str, *, match_any: bool = False):
+    """Object ids (as a subquery) whose document contains every token of ``search_text``.
+
+    With ``match_any`` a single matching token is enough. An empty search matches
+    nothing so callers can always combine the result with ``id__in``.
+    """
+    return _matching_documents(kind, search_tokens(search_text), match_any=match_any).values("object_id")
+
+
+def ranked_search_documents(kind: str, search_text: str):
+    """Matching documents ordered best first, annotated with ``search_rank``.
+
+    Postgres ranks with ``ts_rank`` over the weighted vector (label hits weigh
+    more than body text); other backends rank label matches above body matches.
+    """
+    tokens = search_tokens(search_text)
+    return (
+        _matching_documents(kind, tokens)
+        .annotate(search_rank=_search_rank_expression(tokens))
+        .order_by("-search_rank", "label", "object_id")
+    )
+
+
+def _matching_documents(kind: str, tokens: list[str], *, match_any: bool = False):
+    documents = SearchDocument.objects.filter(kind=kind)
+    if not tokens:
+        return documents.none()
+    if match_any:
+        token_query = Q()
+        for token in tokens:
+            token_query |= Q(document__contains=token)
+        return documents.filter(token_query)
+    for token in tokens:
+        documents = documents.filter(document__contains=token)
+    return documents
+
+
+def _search_rank_expression(tokens: list[str]):
+    words = [word for token in tokens for word in _TSQUERY_WORD_RE.findall(token)]
+    if connection.vendor == "postgresql" and words:
+        from django.contrib.postgres.search import SearchQuery
+        from django.contrib.postgres.search import SearchRank
+
+        return SearchRank(
+            "search_vector",
+            SearchQuery(
+                " & ".join(f"{word}:*" for word in words),
+                config=SEARCH_VECTOR_CONFIG,
+                search_type="raw",
+            ),
+        )
+
+    label_query = Q()
+    for token in tokens:
+        label_query &= Q(label__contains=token)
+    return Case(
+        When(label_query, then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def _refresh_search_vectors(document_ids: list[int]) -> None:
+    if connection.vendor != "postgresql" or not document_ids:
+        return
+    from django.contrib.postgres.search import SearchVector
+
+    SearchDocument.objects.filter(pk__in=document_ids).update(
+        search_vector=(
+            SearchVector("label", weight="A", config=SEARCH_VECTOR_CONFIG)
+            + SearchVector("document", weight="B", config=SEARCH_VECTOR_CONFIG)
+        ),
+    )
+
+
+def _problem_documents(problem_ids: set[int]) -> list[SearchDocument]:
+    if not problem_ids:
+        return []
+    statements_by_problem_id: dict[int | None, list[ContestProblemStatement]] = defaultdict(list)
+    for statement in ContestProblemStatement.objects.filter(
+        is_active=True,
+        linked_problem_id__in=problem_ids,
+    ).order_by("id"):
+        statements_by_problem_id[statement.linked_problem_id].append(statement)
+
+    return [
+        SearchDocument(
+            kind=SearchDocument.Kind.PROBLEM,
+            object_id=problem.id,
+            label=_document_label(
+                problem.contest_year_problem or f"{problem.contest} {problem.year} {problem.problem}",
+            ),
+            document=problem_search_document(
+                problem,
+                techniques=[row.technique for row in problem.topic_techniques.all()],
+                statements=statements_by_problem_id.get(problem.id, ()),
+            ),
+        )
+        for problem in ProblemSolveRecord.objects.filter(id__in=problem_ids).prefetch_related("topic_techniques")
+    ]
+
+
+def _statement_documents(statement_ids: set[int]) -> list[SearchDocument]:
+    if not statement_ids:
+        return []
+    return [
+        SearchDocument(
+            kind=SearchDocument.Kind.STATEMENT,
+            object_id=statement.id,
+            label=_document_label(statement.contest_year_problem),
+            document=statement_search_document(
+                statement,
+                techniques=[row.technique for row in statement.statement_topic_techniques.all()],
+            ),
+        )
+        for statement in ContestProblemStatement.objects.filter(id__in=statement_ids).prefetch_related(
+            "statement_topic_techniques",
+        )
+    ]
+
+
+def _document_label(value: str | None) -> str:
+    return normalize_search_text(value)[: SearchDocument._meta.get_field("label").max_length]  # noqa: SLF001
+
+
+def _join_document_values(values: Iterable[object]) -> str:
+    return " ".join(normalized for value in values if (normalized := normalize_search_text(value)))
+
+
+def _clean_id_set(values: Iterable[int | None] | None) -> set[int]:
+    return {int(value) for value in values or () if value is not None}
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 from django.db.models.signals import post_delete
 from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
 from django.dispatch import receiver
 
 from inspinia.pages.models import ContestProblemStatement
+from inspinia.pages.models import ProblemSolveRecord
 from inspinia.pages.models import ProblemTopicTechnique
 from inspinia.pages.models import StatementTopicTechnique
+from inspinia.pages.search_index import queue_search_document_refresh
+from inspinia.pages.statement_analytics_sync import refresh_effective_statement_analytics
 from inspinia.pages.technique_progress import mark_technique_progress_user_options_stale
 from inspinia.pages.technique_progress_catalog import queue_technique_progress_catalog_refresh
 from inspinia.users.models import User
@@ -18,6 +22,25 @@ def queue_statement_catalog_refresh(sender, instance: ContestProblemStatement, *
     queue_technique_progress_catalog_refresh(statement_ids=[instance.id])
 
 
+@receiver(post_save, sender=ProblemSolveRecord)
+def refresh_linked_statement_effective_analytics(sender, instance: ProblemSolveRecord, **kwargs) -> None:
+    refresh_effective_statement_analytics(ContestProblemStatement.objects.filter(linked_problem_id=instance.pk))
+
+
+@receiver(pre_delete, sender=ProblemSolveRecord)
+def remember_linked_statement_ids(sender, instance: ProblemSolveRecord, **kwargs) -> None:
+    instance._linked_statement_ids = list(  # noqa: SLF001
+        ContestProblemStatement.objects.filter(linked_problem_id=instance.pk).values_list("id", flat=True),
+    )
+
+
+@receiver(post_delete, sender=ProblemSolveRecord)
+def refresh_unlinked_statement_effective_analytics(sender, instance: ProblemSolveRecord, **kwargs) -> None:
+    statement_ids = getattr(instance, "_linked_statement_ids", None)
+    if statement_ids:
+        refresh_effective_statement_analytics(ContestProblemStatement.objects.filter(id__in=statement_ids))
+
+
 @receiver(post_save, sender=StatementTopicTechnique)
 @receiver(post_delete, sender=StatementTopicTechnique)
 def queue_statement_tag_catalog_refresh(sender, instance: StatementTopicTechnique, **kwargs) -> None:
@@ -30,6 +53,42 @@ def queue_problem_tag_catalog_refresh(sender, instance: ProblemTopicTechnique, *
     queue_technique_progress_catalog_refresh(problem_ids=[instance.record_id])
 
 
+@receiver(post_save, sender=ContestProblemStatement)
+@receiver(post_delete, sender=ContestProblemStatement)
+def refresh_statement_search_documents(sender, instance: ContestProblemStatement, **kwargs) -> None:
+    # A relinked statement leaves its old problem's document too.
+    queue_search_document_refresh(
+        statement_ids=[instance.pk],
+        problem_ids=[instance.linked_problem_id, instance.loaded_linked_problem_id],
+    )
+
+
+@receiver(post_save, sender=ProblemSolveRecord)
+def refresh_problem_search_documents(sender, instance: ProblemSolveRecord, **kwargs) -> None:
+    statement_ids = ContestProblemStatement.objects.filter(linked_problem_id=instance.pk).values_list("id", flat=True)
+    queue_search_document_refresh(problem_ids=[instance.pk], statement_ids=statement_ids)
+
+
+@receiver(post_delete, sender=ProblemSolveRecord)
+def drop_problem_search_document(sender, instance: ProblemSolveRecord, **kwargs) -> None:
+    queue_search_document_refresh(
+        problem_ids=[instance.pk],
+        statement_ids=getattr(instance, "_linked_statement_ids", None),
+    )
+
+
+@receiver(post_save, sender=StatementTopicTechnique)
+@receiver(post_delete, sender=StatementTopicTechnique)
+def refresh_statement_tag_search_document(sender, instance: StatementTopicTechnique, **kwargs) -> None:
+    queue_search_document_refresh(statement_ids=[instance.statement_id])
+
+
+@receiver(post_save, sender=ProblemTopicTechnique)
+@receiver(post_delete, sender=ProblemTopicTechnique)
+def refresh_problem_tag_search_document(sender, instance: ProblemTopicTechnique, **kwargs) -> None:
+    queue_search_document_refresh(problem_ids=[instance.record_id])
+
+
 @receiver(post_save, sender=User)
 @receiver(post_delete, sender=User)
 def expire_technique_progress_user_options(sender, instance: User, **kwargs) -> None:
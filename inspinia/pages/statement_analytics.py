@@ -4,9 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from django.db.models import CharField
 from django.db.models import F
-from django.db.models import IntegerField
 from django.db.models import TextField
 from django.db.models import Value
 from django.db.models.functions import Coalesce
@@ -15,21 +13,19 @@ from django.db.models.functions import NullIf
 if TYPE_CHECKING:
     from inspinia.pages.models import ContestProblemStatement
 
+# Effective values stored on ContestProblemStatement (see effective_analytics_field_values).
+EFFECTIVE_ANALYTICS_FIELDS = ("effective_topic", "effective_mohs")
+
 
 def annotate_effective_statement_analytics(queryset):
-    """SQL coalesce of CPS columns over linked_problem for dashboard aggregates."""
+    """SQL coalesce of CPS columns over linked_problem for dashboard aggregates.
+
+    Topic and MOHS read the stored ``effective_*`` columns so filters and
+    groupings on them can use the statement indexes.
+    """
     return queryset.annotate(
-        _eff_topic=Coalesce(
-            NullIf(F("topic"), Value("")),
-            NullIf(F("linked_problem__topic"), Value("")),
-            Value(""),
-            output_field=CharField(max_length=32),
-        ),
-        _eff_mohs=Coalesce(
-            F("mohs"),
-            F("linked_problem__mohs"),
-            output_field=IntegerField(null=True),
-        ),
+        _eff_topic=F("effective_topic"),
+        _eff_mohs=F("effective_mohs"),
         _eff_confidence=Coalesce(
             NullIf(F("confidence"), Value("")),
             NullIf(F("linked_problem__confidence"), Value("")),
@@ -63,6 +59,14 @@ def annotate_effective_statement_analytics(queryset):
     )
 
 
+def effective_analytics_field_values(statement: ContestProblemStatement) -> dict[str, object]:
+    """Values for the stored ``EFFECTIVE_ANALYTICS_FIELDS`` of ``statement``."""
+    return {
+        "effective_topic": effective_topic(statement),
+        "effective_mohs": effective_mohs(statement),
+    }
+
+
 def effective_topic(statement: ContestProblemStatement) -> str:
     if (statement.topic or "").strip():
         return str(statement.topic).strip()
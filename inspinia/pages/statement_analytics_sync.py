@@ -7,6 +7,8 @@ from django.db import transaction
 from inspinia.pages.models import ContestProblemStatement
 from inspinia.pages.models import ProblemTopicTechnique
 from inspinia.pages.models import StatementTopicTechnique
+from inspinia.pages.statement_analytics import EFFECTIVE_ANALYTICS_FIELDS
+from inspinia.pages.statement_analytics import effective_analytics_field_values
 
 TEXT_ANALYTICS_FIELD_PAIRS = (
     ("topic", "topic"),
@@ -19,6 +21,7 @@ TEXT_ANALYTICS_FIELD_PAIRS = (
     ("rationale", "rationale"),
     ("pitfalls", "pitfalls"),
 )
+EFFECTIVE_ANALYTICS_REFRESH_BATCH_SIZE = 500
 
 
 def _is_blank_str(value: str | None) -> bool:
@@ -54,11 +57,60 @@ def _fill_statement_analytics_gaps(statement: ContestProblemStatement, record) -
     return _copy_workbook_label_if_missing(statement, record) or changed
 
 
+def _stale_effective_analytics_fields(statement: ContestProblemStatement) -> list[str]:
+    return [
+        field_name
+        for field_name, value in effective_analytics_field_values(statement).items()
+        if getattr(statement, field_name) != value
+    ]
+
+
+def refresh_effective_statement_analytics(queryset=None) -> int:
+    """
+    Recompute stored effective topic/MOHS for ``queryset`` (default: every
+    statement) and return how many rows changed. Used after linked
+    ProblemSolveRecord writes, which bypass ContestProblemStatement.save().
+
+    Values come from effective_analytics_field_values(), the same code save()
+    uses, so both paths agree on what counts as a blank topic.
+    """
+    if queryset is None:
+        queryset = ContestProblemStatement.objects.all()
+    statements = (
+        queryset.select_related("linked_problem")
+        .only(
+            "topic",
+            "mohs",
+            *EFFECTIVE_ANALYTICS_FIELDS,
+            "linked_problem",
+            "linked_problem__topic",
+            "linked_problem__mohs",
+        )
+        .order_by("pk")
+    )
+    stale: list[ContestProblemStatement] = []
+    changed_total = 0
+    for statement in statements.iterator(chunk_size=EFFECTIVE_ANALYTICS_REFRESH_BATCH_SIZE):
+        values = effective_analytics_field_values(statement)
+        if all(getattr(statement, field_name) == value for field_name, value in values.items()):
+            continue
+        for field_name, value in values.items():
+            setattr(statement, field_name, value)
+        stale.append(statement)
+        if len(stale) >= EFFECTIVE_ANALYTICS_REFRESH_BATCH_SIZE:
+            changed_total += ContestProblemStatement.objects.bulk_update(stale, EFFECTIVE_ANALYTICS_FIELDS)
+            stale = []
+    if stale:
+        changed_total += ContestProblemStatement.objects.bulk_update(stale, EFFECTIVE_ANALYTICS_FIELDS)
+    return changed_total
+
+
 @transaction.atomic
 def sync_statement_analytics_from_linked_problem(statement: ContestProblemStatement) -> bool:
     """
     Fill empty statement analytics from linked ProblemSolveRecord and copy techniques
     when the statement has none. Safe to call multiple times (idempotent gaps only).
+    Stored effective topic/MOHS are refreshed even when no gap needed filling.
     """
     if statement.linked_problem_id is None:
         return False
@@ -67,8 +119,16 @@ def sync_statement_analytics_from_linked_problem(statement: ContestProblemStatem
         return False
 
     changed = _fill_statement_analytics_gaps(statement, record)
+    stale_fields = _stale_effective_analytics_fields(statement)
+    if stale_fields:
+        # save() only recomputes these when the statement's own inputs changed.
+        for field_name, value in effective_analytics_field_values(statement).items():
+            setattr(statement, field_name, value)
     if changed:
         statement.save()
+    elif stale_fields:
+        statement.save(update_fields=stale_fields)
+        changed = True
 
     techniques_changed = False
     if not StatementTopicTechnique.objects.filter(statement_id=statement.pk).exists():
@@ -0,0 +1,113 @@
+"""Cached render fragments for contest problem statements.
+
+List and detail pages used to re-run the same passes over ``statement_latex``
+for every row of every request: whitespace collapsing for previews, and the
+`[asy]` split plus SVG lookup for the rendered statement. Both results are now
+kept in the Django cache under a hash of the statement text, so an edited
+statement gets fresh fragments on its next view and an unchanged one is served
+from the cache. Batch helpers fetch a whole page of rows with one ``get_many``.
+
+Render payloads containing a failed or still-rendering Asymptote block are not
+cached, so the next view retries them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+
+from inspinia.pages.asymptote_render import ASYMPTOTE_RENDERER_VERSION
+from inspinia.pages.asymptote_render import build_statement_render_segments
+from inspinia.pages.asymptote_render import has_asymptote_blocks
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+STATEMENT_RENDER_CACHE_TIMEOUT_SECONDS = 7 * 24 * 60 * 60
+STATEMENT_RENDER_CACHE_VERSION = "v1"
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_content_hash(statement_latex: str) -> str:
+    return hashlib.sha256((statement_latex or "").encode("utf-8")).hexdigest()
+
+
+def collapse_statement_whitespace(statement_latex: str) -> str:
+    return _WHITESPACE_RE.sub(" ", (statement_latex or "").strip())
+
+
+def build_statement_render_payload(statement_latex: str) -> dict:
+    """Uncached render payload, for text that is not a saved statement (import and live previews)."""
+    return {
+        "statement_has_asymptote": has_asymptote_blocks(statement_latex),
+        "statement_render_segments": build_statement_render_segments(statement_latex),
+    }
+
+
+def statement_preview_text(statement_latex: str) -> str:
+    return statement_preview_texts([statement_latex])[statement_latex or ""]
+
+
+def statement_preview_texts(statement_latexes: Iterable[str]) -> dict[str, str]:
+    """Whitespace-collapsed text of each statement, keyed by the original ``statement_latex``."""
+    return _cached_fragments(
+        statement_latexes,
+        kind="preview",
+        build=collapse_statement_whitespace,
+        is_cacheable=lambda _preview: True,
+    )
+
+
+def statement_render_payload(statement_latex: str) -> dict:
+    return statement_render_payloads([statement_latex])[statement_latex or ""]
+
+
+def statement_render_payloads(statement_latexes: Iterable[str]) -> dict[str, dict]:
+    """Render payload (``statement_has_asymptote``, ``statement_render_segments``) of each statement.
+
+    Callers must not mutate the returned segments; they may be shared with the cache.
+    """
+    return _cached_fragments(
+        statement_latexes,
+        kind="render",
+        build=build_statement_render_payload,
+        is_cacheable=_render_payload_is_cacheable,
+    )
+
+
+def _cached_fragments(statement_latexes: Iterable[str], *, kind: str, build, is_cacheable) -> dict:
+    key_by_latex = {
+        latex: _statement_fragment_cache_key(kind, latex)
+        for latex in dict.fromkeys(latex or "" for latex in statement_latexes)
+    }
+    if not key_by_latex:
+        return {}
+    cached = cache.get_many(list(key_by_latex.values()))
+
+    fragments = {}
+    fresh = {}
+    for latex, cache_key in key_by_latex.items():
+        fragment = cached.get(cache_key)
+        if fragment is None:
+            fragment = build(latex)
+            if is_cacheable(fragment):
+                fresh[cache_key] = fragment
+        fragments[latex] = fragment
+    if fresh:
+        cache.set_many(fresh, STATEMENT_RENDER_CACHE_TIMEOUT_SECONDS)
+    return fragments
+
+
+def _statement_fragment_cache_key(kind: str, statement_latex: str) -> str:
+    # The renderer version keeps cached segments in step with the stored SVGs they embed.
+    return (
+        f"statement-{kind}:{STATEMENT_RENDER_CACHE_VERSION}:{ASYMPTOTE_RENDERER_VERSION}:"
+        f"{statement_content_hash(statement_latex)}"
+    )
+
+
+def _render_payload_is_cacheable(payload: dict) -> bool:
+    return not any(segment.get("error") for segment in payload["statement_render_segments"])
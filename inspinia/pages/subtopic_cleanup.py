@@ -23,6 +23,7 @@ from inspinia.pages.models import ProblemSolveRecord
 from inspinia.pages.models import ProblemTopicTechnique
 from inspinia.pages.models import StatementTopicTechnique
 from inspinia.pages.models import normalize_topic_tag_list
+from inspinia.pages.search_index import refresh_search_documents
 from inspinia.pages.subtopic_taxonomy import CANONICAL_SUBTOPIC_TAXONOMY
 from inspinia.pages.topic_tag_layer_taxonomy import LAYERED_TOPIC_TAG_MAPPINGS
 from inspinia.pages.topic_tag_layer_taxonomy import LayeredTopicTagMapping
@@ -7229,6 +7230,10 @@ def _apply_tag_cleanup(
         parent_field_name=parent_field_name,
         timestamp_field_name=timestamp_field_name,
     )
+    if parent_model is ProblemSolveRecord:
+        refresh_search_documents(problem_ids=touched_parent_ids)
+    else:
+        refresh_search_documents(statement_ids=touched_parent_ids)
     return SubtopicCleanupApplyResult(
         created_count=len(created_rows),
         deleted_count=len(duplicate_ids),
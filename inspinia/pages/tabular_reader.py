@@ -0,0 +1,198 @@
+"""Chunked CSV/XLSX reader shared by the ranking and problem uploads.
+
+Uploads used to be loaded whole with ``pd.read_excel``/``pd.read_csv`` after
+guessing the format from the file name, and the ranking import retried with the
+other parser when the first one failed, parsing a bad upload twice.
+``sniff_tabular_format`` decides the format once from the leading magic bytes;
+``iter_tabular_chunks`` then streams the rows as dataframes of at most
+``TABULAR_CHUNK_SIZE`` rows: XLSX through an openpyxl ``read_only`` worksheet
+iterator and CSV through ``pd.read_csv(chunksize=...)``.
+
+XLSX chunks are built through pandas' ``TextParser`` from the cell values the
+way ``pd.read_excel`` does, so column naming (``Unnamed: N``, ``name.1``) and
+blank-row handling match a whole-sheet read. Every column is read as
+``object``: pandas would infer types per chunk, so one column could come back
+as text in one chunk and as numbers in the next, turning ``00123`` into ``123``.
+XLSX cells keep their native values and CSV cells stay strings; callers coerce
+the cells they need after normalizing the column labels.
+"""
+
+from __future__ import annotations
+
+import io
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import BinaryIO
+
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+TABULAR_FORMAT_CSV = "csv"
+TABULAR_FORMAT_XLSX = "xlsx"
+TABULAR_FORMAT_XLS = "xls"
+
+TABULAR_CHUNK_SIZE = 1000
+
+# Zip container (XLSX) and OLE2 compound document (legacy XLS) signatures.
+XLSX_MAGIC = b"PK\x03\x04"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+TabularSource = Path | str | BinaryIO | bytes
+
+
+def sniff_tabular_format(source: TabularSource) -> str:
+    """Return ``"xlsx"``, ``"xls"`` or ``"csv"`` from the first bytes of ``source``.
+
+    File-like sources are rewound to where they started.
+    """
+    with _open_binary(source) as stream:
+        start = stream.tell()
+        head = stream.read(len(XLS_MAGIC))
+        stream.seek(start)
+    if head.startswith(XLSX_MAGIC):
+        return TABULAR_FORMAT_XLSX
+    if head.startswith(XLS_MAGIC):
+        return TABULAR_FORMAT_XLS
+    return TABULAR_FORMAT_CSV
+
+
+def iter_tabular_chunks(
+    source: TabularSource,
+    *,
+    chunk_size: int = TABULAR_CHUNK_SIZE,
+    tabular_format: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the rows of the first sheet (or the CSV) as dataframes of ``chunk_size`` rows.
+
+    The first chunk always carries the header, even when the sheet has no data
+    rows. ``tabular_format`` skips sniffing when the caller already knows it.
+    """
+    if tabular_format is None:
+        tabular_format = sniff_tabular_format(source)
+    with _open_binary(source) as stream:
+        if tabular_format == TABULAR_FORMAT_XLSX:
+            yield from _iter_xlsx_chunks(stream, chunk_size=chunk_size)
+        elif tabular_format == TABULAR_FORMAT_XLS:
+            # openpyxl cannot stream the legacy binary format; pandas reads it whole.
+            yield pd.read_excel(stream, dtype=object)
+        else:
+            with pd.read_csv(stream, chunksize=chunk_size, dtype=object) as reader:
+                yield from reader
+
+
+def read_tabular_dataframe(
+    source: TabularSource,
+    *,
+    tabular_format: str | None = None,
+) -> pd.DataFrame:
+    """Read the whole source into one dataframe, for callers that need random access."""
+    return concat_tabular_chunks(iter_tabular_chunks(source, tabular_format=tabular_format))
+
+
+def concat_tabular_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    chunk_list = list(chunks)
+    if not chunk_list:
+        return pd.DataFrame()
+    if len(chunk_list) == 1:
+        return chunk_list[0]
+    return pd.concat(chunk_list, ignore_index=True)
+
+
+def dataframe_chunks(data: pd.DataFrame | Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Iterate ``data`` as chunks whether it is one dataframe or already chunked."""
+    if isinstance(data, pd.DataFrame):
+        yield data
+    else:
+        yield from data
+
+
+@contextmanager
+def _open_binary(source: TabularSource) -> Iterator[BinaryIO]:
+    if isinstance(source, bytes):
+        yield io.BytesIO(source)
+    elif isinstance(source, (str, Path)):
+        with Path(source).open("rb") as handle:
+            yield handle
+    else:
+        yield source
+
+
+def _iter_xlsx_chunks(
+    stream: BinaryIO,
+    *,
+    chunk_size: int,
+) -> Iterator[pd.DataFrame]:
+    workbook = load_workbook(stream, read_only=True, data_only=True, keep_links=False)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _trim_trailing_blanks(next(rows, ()))
+        columns = _column_names(header)
+        pending: list[list[Any]] = []
+        # Blank rows are held back so trailing ones are dropped, as pd.read_excel does.
+        blank_run: list[list[Any]] = []
+        yielded = False
+        for values in rows:
+            cells = [_convert_cell(value) for value in _trim_trailing_blanks(values)]
+            if not cells:
+                blank_run.append([])
+                continue
+            pending.extend(blank_run)
+            blank_run.clear()
+            if len(cells) > len(columns):
+                columns = _column_names(header, width=len(cells))
+            pending.append(cells)
+            if len(pending) >= chunk_size:
+                yield _parse_rows(pending, columns=columns)
+                pending = []
+                yielded = True
+        if pending or not yielded:
+            yield _parse_rows(pending, columns=columns)
+    finally:
+        workbook.close()
+
+
+def _parse_rows(rows: list[list[Any]], *, columns: list[str]) -> pd.DataFrame:
+    width = len(columns)
+    padded = [row + [""] * (width - len(row)) for row in rows]
+    if not padded:
+        return pd.DataFrame(columns=columns)
+    parser = TextParser(padded, names=columns, header=None, dtype=object)
+    try:
+        return parser.read()
+    finally:
+        parser.close()
+
+
+def _column_names(header: tuple | list, *, width: int | None = None) -> list[str]:
+    names: list[Any] = []
+    seen: dict[Any, int] = {}
+    for index in range(max(width or 0, len(header))):
+        value = header[index] if index < len(header) else None
+        name = f"Unnamed: {index}" if value is None or value == "" else _convert_cell(value)
+        # Repeated headers get ``.1``, ``.2`` suffixes like pandas' own de-duplication.
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(f"{name}.{count}" if count else name)
+    return names
+
+
+def _trim_trailing_blanks(values: tuple | list) -> list[Any]:
+    trimmed = list(values)
+    while trimmed and (trimmed[-1] is None or trimmed[-1] == ""):
+        trimmed.pop()
+    return trimmed
+
+
+def _convert_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
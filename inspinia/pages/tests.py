@@ -1,6 +1,8 @@
 import csv
 import json
 import re
+import threading
+import time
 import uuid
 from datetime import date
 from datetime import datetime
@@ -31,9 +33,15 @@ from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from inspinia.pages.analytics_pivots import contest_year_heatmap_payload
+from inspinia.pages.analytics_pivots import contest_year_mohs_pivot_payload
 from inspinia.pages.asymptote_render import AsymptoteRenderResult
 from inspinia.pages.asymptote_render import _extract_svg_markup
+from inspinia.pages.asymptote_render import asymptote_render_key
 from inspinia.pages.asymptote_render import build_statement_render_segments
+from inspinia.pages.asymptote_render import cached_asymptote_render
+from inspinia.pages.asymptote_render import clear_asymptote_render_cache
+from inspinia.pages.asymptote_render import render_asymptote_svg
 from inspinia.pages.completion_progress import CompletionProgressFilters
 from inspinia.pages.completion_progress import completion_progress_contest_heatmap_payload
 from inspinia.pages.completion_progress import completion_progress_contest_options
@@ -48,11 +56,13 @@ from inspinia.pages.contest_links import contest_dashboard_listing_url
 from inspinia.pages.contest_links import problem_statement_contest_year_master_url
 from inspinia.pages.handle_summary_parser import build_handle_summary_preview_payload
 from inspinia.pages.handle_summary_parser import parse_handle_summary_text
+from inspinia.pages.models import AsymptoteRender
 from inspinia.pages.models import ContestMetadata
 from inspinia.pages.models import ContestProblemStatement
 from inspinia.pages.models import PageViewEvent
 from inspinia.pages.models import ProblemSolveRecord
 from inspinia.pages.models import ProblemTopicTechnique
+from inspinia.pages.models import SearchDocument
 from inspinia.pages.models import StatementTopicTechnique
 from inspinia.pages.models import TechniqueBenchmark
 from inspinia.pages.models import TechniqueBenchmarkAlias
@@ -64,7 +74,11 @@ from inspinia.pages.models import UserProblemDifficultyRating
 from inspinia.pages.problem_import import ProblemImportValidationError
 from inspinia.pages.problem_import import dataframe_from_excel
 from inspinia.pages.problem_import import import_problem_dataframe
+from inspinia.pages.search_index import ranked_search_documents
+from inspinia.pages.search_index import search_document_ids
+from inspinia.pages.statement_analytics import annotate_effective_statement_analytics
 from inspinia.pages.statement_analytics import effective_topic
+from inspinia.pages.statement_analytics_sync import refresh_effective_statement_analytics
 from inspinia.pages.statement_analytics_sync import sync_statement_analytics_from_linked_problem
 from inspinia.pages.statement_import import LATEX_STATEMENT_SAMPLE
 from inspinia.pages.statement_import import URL_FETCH_TIMEOUT_SECONDS
@@ -77,10 +91,19 @@ from inspinia.pages.statement_import import parse_contest_problem_statements
 from inspinia.pages.statement_metadata_backfill import StatementMetadataBackfillValidationError
 from inspinia.pages.statement_metadata_backfill import import_statement_metadata_dataframe
 from inspinia.pages.statement_metadata_backfill import statement_metadata_dataframe_from_rows
+from inspinia.pages.statement_render import statement_preview_texts
+from inspinia.pages.statement_render import statement_render_payload
+from inspinia.pages.statement_render import statement_render_payloads
 from inspinia.pages.subtopic_cleanup import apply_subtopic_cleanup
 from inspinia.pages.subtopic_cleanup import classified_topic_tag_entries
 from inspinia.pages.subtopic_cleanup import taxonomy_entries_for_technique
 from inspinia.pages.subtopic_cleanup import taxonomy_entry_for_technique
+from inspinia.pages.tabular_reader import TABULAR_CHUNK_SIZE
+from inspinia.pages.tabular_reader import TABULAR_FORMAT_CSV
+from inspinia.pages.tabular_reader import TABULAR_FORMAT_XLSX
+from inspinia.pages.tabular_reader import iter_tabular_chunks
+from inspinia.pages.tabular_reader import read_tabular_dataframe
+from inspinia.pages.tabular_reader import sniff_tabular_format
 from inspinia.pages.topic_tags_parse import parse_topic_tags_cell
 from inspinia.pages.views import ADMIN_TABLE_LATEST_LIMIT
 from inspinia.pages.views import COMPLETION_QUICK_UPDATE_SEARCH_LIMIT
@@ -93,9 +116,13 @@ from inspinia.users.tests.factories import UserFactory
 pytestmark = pytest.mark.django_db
 
 EXPECTED_RECORD_COUNT = 1
+EXPECTED_ASYMPTOTE_PARALLEL_STORED_TOTAL = 2
 EXPECTED_ONE_TECHNIQUE = 1
 EXPECTED_TWO_TECHNIQUES = 2
 EXPECTED_MULTI_CONTEST_RENAME_TOTAL = 2
+EXPECTED_PIVOT_GRAND_TOTAL = 3
+EXPECTED_MIXED_CODE_CHUNK_TOTAL = 2
+EXPECTED_HEATMAP_MAX_VALUE = 6
 UPDATED_MOHS = 5
 EXPECTED_PROGRESS_HALF_PERCENT = 50
 EXPECTED_PROGRESS_TAGGED_STATEMENT_TOTAL = 2
@@ -1019,6 +1046,57 @@ def test_dataframe_from_excel_strips_headers_and_requires_columns():
         dataframe_from_excel(missing_column_bytes)
 
 
+def test_dataframe_from_excel_rejects_csv_without_parsing():
+    with pytest.raises(ProblemImportValidationError, match="valid .xlsx"):
+        dataframe_from_excel(b"YEAR,TOPIC\n2026,NT\n")
+
+
+def test_tabular_reader_sniffs_format_and_streams_xlsx_like_read_excel():
+    workbook_bytes = _workbook_bytes(
+        *({"CODE": f"{index:05d}", "SCORE": index if index % 2 else None} for index in range(5)),
+    )
+
+    assert sniff_tabular_format(workbook_bytes) == TABULAR_FORMAT_XLSX
+    assert sniff_tabular_format(b"CODE,SCORE\n1,2\n") == TABULAR_FORMAT_CSV
+    chunks = list(iter_tabular_chunks(workbook_bytes, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(
+        read_tabular_dataframe(workbook_bytes),
+        pd.read_excel(BytesIO(workbook_bytes), dtype=object),
+    )
+    assert list(read_tabular_dataframe(workbook_bytes)["CODE"]) == [
+        "00000",
+        "00001",
+        "00002",
+        "00003",
+        "00004",
+    ]
+
+
+def test_tabular_reader_keeps_cell_types_stable_across_chunks():
+    # The first chunk holds only numeric-looking codes and the second only
+    # alphanumeric ones; per-chunk inference would turn "00001" into 1.
+    codes = [f"{index:05d}" for index in range(1, TABULAR_CHUNK_SIZE + 1)]
+    codes += [f"A{index:04d}" for index in range(TABULAR_CHUNK_SIZE // 2)]
+    rows: list[dict[str, object]] = [{"CODE": None, "SCORE": None}]
+    rows += [{"CODE": code, "SCORE": index} for index, code in enumerate(codes)]
+    workbook_bytes = _workbook_bytes(*rows)
+    csv_bytes = pd.DataFrame(rows).to_csv(index=False).encode()
+
+    xlsx_chunks = list(iter_tabular_chunks(workbook_bytes))
+    csv_chunks = list(iter_tabular_chunks(csv_bytes))
+
+    assert len(xlsx_chunks) == len(csv_chunks) == EXPECTED_MIXED_CODE_CHUNK_TOTAL
+    xlsx_dataframe = read_tabular_dataframe(workbook_bytes)
+    csv_dataframe = read_tabular_dataframe(csv_bytes)
+    assert pd.isna(xlsx_dataframe["CODE"].iloc[0])
+    assert pd.isna(csv_dataframe["CODE"].iloc[0])
+    assert list(xlsx_dataframe["CODE"].iloc[1:]) == codes
+    assert list(csv_dataframe["CODE"].iloc[1:]) == codes
+    assert list(xlsx_dataframe["SCORE"].iloc[1:]) == list(range(len(codes)))
+    pd.testing.assert_frame_equal(xlsx_dataframe, pd.read_excel(BytesIO(workbook_bytes), dtype=object))
+
+
 def test_import_problem_dataframe_creates_records_and_normalized_fields():
     dataframe = _analytics_rows(
         {
@@ -4324,7 +4402,7 @@ def test_build_statement_render_segments_preserves_text_around_asymptote_blocks(
             backend="remote",
         )
 
-    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg", fake_render)
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_render)
 
     segments = build_statement_render_segments(
         "Before $x$.\n[asy]\nsize(100);\ndraw((0,0)--(1,1));\n[/asy]\nAfter $y$.",
@@ -4338,6 +4416,154 @@ def test_build_statement_render_segments_preserves_text_around_asymptote_blocks(
     assert segments[2]["content"] == "\nAfter $y$."
 
 
+def test_render_asymptote_svg_reads_and_fills_the_shared_store(monkeypatch):
+    rendered_codes = []
+
+    def fake_uncached(code: str) -> AsymptoteRenderResult:
+        rendered_codes.append(code)
+        if "broken" in code:
+            return AsymptoteRenderResult(svg_markup="", error="Local Asymptote render failed.")
+        return AsymptoteRenderResult(svg_markup=FAKE_ASYMPTOTE_SVG, backend="local")
+
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_uncached)
+    AsymptoteRender.objects.create(
+        code_hash=asymptote_render_key("draw(unitcircle);"),
+        svg_markup=FAKE_ASYMPTOTE_SVG,
+        backend="remote",
+    )
+    stored = render_asymptote_svg("  draw(unitcircle);  ")
+    fresh = render_asymptote_svg("draw((0,0)--(1,1));")
+    failed = render_asymptote_svg("broken(")
+
+    assert stored.backend == "remote"
+    assert fresh.svg_markup == FAKE_ASYMPTOTE_SVG
+    assert failed.error
+    assert rendered_codes == ["draw((0,0)--(1,1));", "broken("]
+    assert AsymptoteRender.objects.filter(code_hash=asymptote_render_key("draw((0,0)--(1,1));")).exists()
+    assert not AsymptoteRender.objects.filter(code_hash=asymptote_render_key("broken(")).exists()
+
+
+def test_build_statement_render_segments_renders_cache_misses_in_parallel(monkeypatch, settings):
+    settings.ASYMPTOTE_RENDER_WORKERS = 2
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fake_uncached(code: str) -> AsymptoteRenderResult:
+        # Only returns if the two distinct blocks render at the same time.
+        both_started.wait()
+        return AsymptoteRenderResult(svg_markup=FAKE_ASYMPTOTE_SVG, backend="local")
+
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_uncached)
+    segments = build_statement_render_segments(
+        "[asy]draw(unitcircle);[/asy] then [asy]dot((0,0));[/asy] and [asy]draw(unitcircle);[/asy]",
+    )
+
+    asymptote_segments = [segment for segment in segments if segment["kind"] == "asymptote"]
+    assert [segment["svg_markup"] for segment in asymptote_segments] == [FAKE_ASYMPTOTE_SVG] * 3
+    assert all(not segment["error"] for segment in asymptote_segments)
+    assert AsymptoteRender.objects.count() == EXPECTED_ASYMPTOTE_PARALLEL_STORED_TOTAL
+
+
+def test_build_statement_render_segments_marks_blocks_over_the_time_budget(monkeypatch, settings):
+    settings.ASYMPTOTE_STATEMENT_RENDER_BUDGET = 0.2
+    release_slow_render = threading.Event()
+
+    def fake_uncached(code: str) -> AsymptoteRenderResult:
+        if "slow" in code:
+            release_slow_render.wait(timeout=5)
+        return AsymptoteRenderResult(svg_markup=FAKE_ASYMPTOTE_SVG, backend="local")
+
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_uncached)
+    try:
+        segments = build_statement_render_segments("Before [asy]dot((0,0));[/asy] [asy]slow();[/asy] after.")
+    finally:
+        release_slow_render.set()
+
+    assert [segment["kind"] for segment in segments] == ["text", "asymptote", "text", "asymptote", "text"]
+    assert segments[1]["svg_markup"] == FAKE_ASYMPTOTE_SVG
+    assert segments[3]["svg_markup"] == ""
+    assert "still rendering" in segments[3]["error"]
+    assert segments[4]["content"] == " after."
+
+    # The late render is kept and stored by the next lookup.
+    for _attempt in range(50):
+        late = cached_asymptote_render("slow();")
+        if late is not None:
+            break
+        time.sleep(0.05)
+    assert late is not None
+    assert late.svg_markup == FAKE_ASYMPTOTE_SVG
+    assert AsymptoteRender.objects.filter(code_hash=asymptote_render_key("slow();")).exists()
+
+
+def test_statement_render_payloads_are_cached_by_statement_content(monkeypatch):
+    built = []
+
+    def fake_segments(statement_latex: str) -> list[dict]:
+        built.append(statement_latex)
+        return [{"kind": "text", "content": statement_latex}]
+
+    monkeypatch.setattr("inspinia.pages.statement_render.build_statement_render_segments", fake_segments)
+
+    first = statement_render_payloads(["Prove $x=y$.", "Find all $n$."])
+    again = statement_render_payloads(["Find all $n$.", "Prove $x=y$."])
+    edited = statement_render_payload("Prove $x = y$.")
+
+    assert built == ["Prove $x=y$.", "Find all $n$.", "Prove $x = y$."]
+    assert again == first
+    assert edited["statement_render_segments"] == [{"kind": "text", "content": "Prove $x = y$."}]
+    assert statement_preview_texts(["  Prove\n\n$x=y$.  "]) == {"  Prove\n\n$x=y$.  ": "Prove $x=y$."}
+
+
+def test_statement_render_payload_with_failed_asymptote_block_is_not_cached(monkeypatch):
+    render_results = iter(
+        [
+            AsymptoteRenderResult(svg_markup="", error="Remote Asymptote render failed."),
+            AsymptoteRenderResult(svg_markup=FAKE_ASYMPTOTE_SVG, backend="remote"),
+        ],
+    )
+    monkeypatch.setattr(
+        "inspinia.pages.asymptote_render.render_asymptote_svg_uncached",
+        lambda _code: next(render_results),
+    )
+    statement_latex = "Figure: [asy]draw(unitcircle);[/asy]"
+
+    failed = statement_render_payload(statement_latex)
+    clear_asymptote_render_cache()
+    retried = statement_render_payload(statement_latex)
+
+    assert failed["statement_render_segments"][1]["error"]
+    assert retried["statement_has_asymptote"] is True
+    assert retried["statement_render_segments"][1]["svg_markup"] == FAKE_ASYMPTOTE_SVG
+
+
+def test_prerender_asymptote_command_renders_only_blocks_missing_from_the_store(monkeypatch):
+    ContestProblemStatement.objects.create(
+        contest_year=2025,
+        contest_name="IMO",
+        problem_number=4,
+        problem_code="P4",
+        day_label="Day 2",
+        statement_latex="[asy]draw(unitcircle);[/asy] and [asy] dot((0,0)); [/asy] and [asy]draw(unitcircle);[/asy]",
+    )
+    AsymptoteRender.objects.create(
+        code_hash=asymptote_render_key("draw(unitcircle);"),
+        svg_markup=FAKE_ASYMPTOTE_SVG,
+    )
+    rendered_codes = []
+
+    def fake_uncached(code: str) -> AsymptoteRenderResult:
+        rendered_codes.append(code)
+        return AsymptoteRenderResult(svg_markup=FAKE_ASYMPTOTE_SVG, backend="local")
+
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_uncached)
+    stdout = StringIO()
+    call_command("prerender_asymptote", "--workers", "2", stdout=stdout)
+
+    assert rendered_codes == ["dot((0,0));"]
+    assert "2 distinct, 1 already stored, 1 rendered, 0 failed" in stdout.getvalue()
+    assert AsymptoteRender.objects.filter(code_hash=asymptote_render_key("dot((0,0));")).exists()
+
+
 def test_extract_svg_markup_strips_unsafe_svg_content():
     svg_markup = _extract_svg_markup(
         b'<svg xmlns="http://www.w3.org/2000/svg" onload="alert(1)">'
@@ -5015,26 +5241,30 @@ def test_problem_statement_delete_by_uuid_page_renders_for_admin(client):
     assert "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx" not in response_html
 
 
-def test_problem_statement_delete_by_uuid_datatable_limits_to_50_and_searches_all_rows(client):
+def test_problem_statement_delete_by_uuid_datatable_limits_to_50_and_searches_all_rows(
+    client,
+    django_capture_on_commit_callbacks,
+):
     admin_user = UserFactory(role=User.Role.ADMIN)
     client.force_login(admin_user)
-    for index in range(55):
-        ContestProblemStatement.objects.create(
-            contest_year=2200 + index,
-            contest_name=f"Bulk Contest {index}",
-            problem_number=index + 1,
-            problem_code=f"P{index + 1}",
-            day_label="Day 1",
-            statement_latex=f"Bulk statement row {index}",
+    with django_capture_on_commit_callbacks(execute=True):
+        for index in range(55):
+            ContestProblemStatement.objects.create(
+                contest_year=2200 + index,
+                contest_name=f"Bulk Contest {index}",
+                problem_number=index + 1,
+                problem_code=f"P{index + 1}",
+                day_label="Day 1",
+                statement_latex=f"Bulk statement row {index}",
+            )
+        hidden_statement = ContestProblemStatement.objects.create(
+            contest_year=2015,
+            contest_name="JBMO Shortlist",
+            problem_number=2,
+            problem_code="C2",
+            day_label="Combinatorics",
+            statement_latex="Needle row outside the first page",
         )
-    hidden_statement = ContestProblemStatement.objects.create(
-        contest_year=2015,
-        contest_name="JBMO Shortlist",
-        problem_number=2,
-        problem_code="C2",
-        day_label="Combinatorics",
-        statement_latex="Needle row outside the first page",
-    )
 
     response = client.get(
         reverse("pages:problem_statement_delete_by_uuid"),
@@ -9612,43 +9842,44 @@ def test_page_view_analytics_requires_admin_access(client):
     assert response.status_code == HTTPStatus.FORBIDDEN
 
 
-def test_completion_record_list_applies_query_filters(client):
+def test_completion_record_list_applies_query_filters(client, django_capture_on_commit_callbacks):
     admin_user = UserFactory(role=User.Role.ADMIN)
     matching_user = UserFactory(name="Ada Lovelace", email="ada@example.com")
     other_user = UserFactory(name="Grace Hopper", email="grace@example.com")
     client.force_login(admin_user)
 
-    problem_one = ProblemSolveRecord.objects.create(
-        year=2026,
-        topic="ALG",
-        mohs=6,
-        contest="USAMO",
-        problem="P1",
-        contest_year_problem="USAMO 2026 P1",
-    )
-    problem_two = ProblemSolveRecord.objects.create(
-        year=2025,
-        topic="GEO",
-        mohs=5,
-        contest="IMO",
-        problem="P2",
-        contest_year_problem="IMO 2025 P2",
-    )
-    UserProblemCompletion.objects.create(
-        user=matching_user,
-        problem=problem_one,
-        completion_date=date(2026, 7, 10),
-    )
-    UserProblemCompletion.objects.create(
-        user=other_user,
-        problem=problem_two,
-        completion_date=None,
-    )
-    ProblemSolution.objects.create(
-        problem=problem_one,
-        author=matching_user,
-        status=ProblemSolution.Status.DRAFT,
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        problem_one = ProblemSolveRecord.objects.create(
+            year=2026,
+            topic="ALG",
+            mohs=6,
+            contest="USAMO",
+            problem="P1",
+            contest_year_problem="USAMO 2026 P1",
+        )
+        problem_two = ProblemSolveRecord.objects.create(
+            year=2025,
+            topic="GEO",
+            mohs=5,
+            contest="IMO",
+            problem="P2",
+            contest_year_problem="IMO 2025 P2",
+        )
+        UserProblemCompletion.objects.create(
+            user=matching_user,
+            problem=problem_one,
+            completion_date=date(2026, 7, 10),
+        )
+        UserProblemCompletion.objects.create(
+            user=other_user,
+            problem=problem_two,
+            completion_date=None,
+        )
+        ProblemSolution.objects.create(
+            problem=problem_one,
+            author=matching_user,
+            status=ProblemSolution.Status.DRAFT,
+        )
 
     response = client.get(
         reverse("pages:completion_record_list"),
@@ -12409,6 +12640,50 @@ def test_problem_analytics_dashboard_can_show_empty_pivot_rows(client):
     }
 
 
+def test_contest_year_mohs_pivot_payload_orders_rows_and_counts_mohs():
+    rows = [
+        {"contest_name": "imo", "contest_year": 2023, "contest_year_label": "imo 2023", "mohs": 20},
+        {"contest_name": "APMO", "contest_year": 2024, "contest_year_label": "APMO 2024", "mohs": None},
+        {"contest_name": "IMO", "contest_year": 2024, "contest_year_label": "IMO 2024", "mohs": 20},
+        {"contest_name": "IMO", "contest_year": 2024, "contest_year_label": "IMO 2024", "mohs": 5},
+    ]
+
+    payload = contest_year_mohs_pivot_payload(rows, hide_empty=True)
+    table_rows = payload["table_rows"]
+
+    assert isinstance(table_rows, list)
+    assert [row["contest_year_label"] for row in table_rows] == ["IMO 2024", "imo 2023"]
+    assert table_rows[0]["mohs_counts"] == {"5": 1, "20": 1}
+    assert payload["column_totals"] == {"5": 1, "20": 2}
+    assert payload["grand_total"] == EXPECTED_PIVOT_GRAND_TOTAL
+    assert payload["max_cell_count"] == 1
+    assert payload["hidden_empty_rows"] == 1
+    assert payload["empty_rows_available"] == 1
+    assert payload["year_values"] == ["2024", "2023"]
+
+
+def test_contest_year_heatmap_payload_keeps_urls_only_for_non_zero_cells():
+    rows = [
+        {"contest_name": "ISL", "contest_year": 2022, "statement_count": 0, "contest_year_url": "/isl/2022/"},
+        {"contest_name": "ISL", "contest_year": 2024, "statement_count": 3, "contest_year_url": "/isl/2024/"},
+        {"contest_name": "EGMO", "contest_year": 2024, "statement_count": 6, "contest_year_url": None},
+    ]
+
+    payload = contest_year_heatmap_payload(
+        rows,
+        value_key="statement_count",
+        config={"metric_label": "Statement rows", "url_key": "contest_year_url"},
+    )
+
+    assert payload["years"] == ["2022", "2024"]
+    assert payload["max_value"] == EXPECTED_HEATMAP_MAX_VALUE
+    assert payload["series"] == [
+        {"data": [{"x": "2022", "y": 0}, {"x": "2024", "y": 6}], "name": "EGMO"},
+        {"data": [{"x": "2022", "y": 0}, {"x": "2024", "y": 3, "url": "/isl/2024/"}], "name": "ISL"},
+    ]
+    assert json.dumps(payload)
+
+
 def test_problem_analytics_dashboard_uses_problem_uuid_mohs_fallback(client):
     admin_user = UserFactory(role=User.Role.ADMIN)
     client.force_login(admin_user)
@@ -12791,6 +13066,118 @@ def test_check_cache_health_command_succeeds():
     assert "backend=" in output_text
 
 
+def test_benchmark_analytics_pivots_command_reports_timings():
+    output = StringIO()
+
+    call_command("benchmark_analytics_pivots", statements=200, contests=5, repeat=1, stdout=output)
+
+    output_text = output.getvalue()
+    assert "Synthetic archive: 200 statement(s)" in output_text
+    assert "contest x MOHS pivot (statements):" in output_text
+    assert "Analytics pivot benchmark complete." in output_text
+
+
+def test_search_documents_follow_saves_and_rebuild_command_repairs_raw_updates(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        problem = ProblemSolveRecord.objects.create(
+            year=2021,
+            topic="GEO",
+            mohs=20,
+            contest="ISL",
+            problem="G5",
+            contest_year_problem="ISL 2021 G5",
+        )
+        statement = ContestProblemStatement.objects.create(
+            linked_problem=problem,
+            contest_year=2021,
+            contest_name="ISL",
+            problem_number=5,
+            problem_code="G5",
+            day_label="Geometry",
+            statement_latex="Let  $ABC$ be an\nacute TRIANGLE.",
+        )
+        other_statement = ContestProblemStatement.objects.create(
+            contest_year=2020,
+            contest_name="Triangle Cup",
+            problem_number=1,
+            problem_code="P1",
+            statement_latex="Find all functions.",
+        )
+        StatementTopicTechnique.objects.create(statement=statement, technique="Radical axis", domains=["GEO"])
+
+    statement_document = SearchDocument.objects.get(kind=SearchDocument.Kind.STATEMENT, object_id=statement.id)
+    problem_document = SearchDocument.objects.get(kind=SearchDocument.Kind.PROBLEM, object_id=problem.id)
+    assert statement_document.label == "isl 2021 g5"
+    assert "let $abc$ be an acute triangle." in statement_document.document
+    assert "radical axis" in statement_document.document
+    assert "acute triangle" in problem_document.document
+    assert [row.object_id for row in ranked_search_documents(SearchDocument.Kind.STATEMENT, "triangle")] == [
+        other_statement.id,
+        statement.id,
+    ]
+
+    ContestProblemStatement.objects.filter(id=other_statement.id).update(statement_latex="Find all primes.")
+    assert other_statement.id in set(search_document_ids(SearchDocument.Kind.STATEMENT, "functions").values_list(
+        "object_id",
+        flat=True,
+    ))
+    SearchDocument.objects.create(kind=SearchDocument.Kind.PROBLEM, object_id=problem.id + 1000, document="orphan")
+    output = StringIO()
+
+    call_command("rebuild_search_index", stdout=output)
+
+    assert "removed 1 stale document(s)" in output.getvalue()
+    assert not search_document_ids(SearchDocument.Kind.STATEMENT, "functions").exists()
+    other_statement_id = other_statement.id
+    with django_capture_on_commit_callbacks(execute=True):
+        other_statement.delete()
+    assert not SearchDocument.objects.filter(kind=SearchDocument.Kind.STATEMENT, object_id=other_statement_id).exists()
+
+
+def test_search_documents_refresh_once_per_transaction_and_follow_relinked_statements(
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    from inspinia.pages import search_index
+
+    refresh_calls = []
+    refresh = search_index.refresh_search_documents
+
+    def _recording_refresh(**kwargs):
+        refresh_calls.append(kwargs)
+        return refresh(**kwargs)
+
+    monkeypatch.setattr(search_index, "refresh_search_documents", _recording_refresh)
+    with django_capture_on_commit_callbacks(execute=True):
+        old_problem = ProblemSolveRecord.objects.create(year=2019, topic="NT", mohs=15, contest="RMM", problem="P1")
+        new_problem = ProblemSolveRecord.objects.create(year=2019, topic="NT", mohs=15, contest="RMM", problem="P4")
+        statement = ContestProblemStatement.objects.create(
+            linked_problem=old_problem,
+            contest_year=2019,
+            contest_name="RMM",
+            problem_number=1,
+            problem_code="P1",
+            statement_latex="Prove that infinitely many Wieferich-like primes exist.",
+        )
+        StatementTopicTechnique.objects.create(statement=statement, technique="Zsigmondy", domains=["NT"])
+        assert not SearchDocument.objects.exists()
+
+    assert len(refresh_calls) == 1
+    assert refresh_calls[0]["problem_ids"] == {old_problem.id, new_problem.id}
+    assert set(search_document_ids(SearchDocument.Kind.PROBLEM, "wieferich").values_list("object_id", flat=True)) == {
+        old_problem.id,
+    }
+
+    statement = ContestProblemStatement.objects.get(pk=statement.pk)
+    statement.linked_problem = new_problem
+    with django_capture_on_commit_callbacks(execute=True):
+        statement.save()
+
+    assert set(search_document_ids(SearchDocument.Kind.PROBLEM, "wieferich").values_list("object_id", flat=True)) == {
+        new_problem.id,
+    }
+
+
 def test_check_cache_health_command_errors_when_cache_set_fails(monkeypatch):
     from inspinia.pages.management.commands import check_cache_health
 
@@ -19968,7 +20355,7 @@ def test_statement_render_preview_returns_rendered_asymptote_html(client, monkey
             backend="remote",
         )
 
-    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg", fake_render)
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_render)
 
     response = client.post(
         reverse("pages:statement_render_preview"),
@@ -26883,7 +27270,7 @@ def test_contest_problem_list_renders_asymptote_statement_blocks(client, monkeyp
             backend="remote",
         )
 
-    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg", fake_render)
+    monkeypatch.setattr("inspinia.pages.asymptote_render.render_asymptote_svg_uncached", fake_render)
 
     response = client.get(reverse("pages:contest_dashboard_listing"), {"contest": "IMO"})
 
@@ -27667,6 +28054,117 @@ def test_effective_topic_prefers_statement_column_over_linked_record():
     assert effective_topic(statement) == "C"
 
 
+@pytest.mark.django_db
+def test_statement_effective_analytics_columns_follow_statement_and_linked_record():
+    record = ProblemSolveRecord.objects.create(
+        year=2025,
+        topic="NT",
+        mohs=15,
+        contest="IMO",
+        problem="P3",
+    )
+    statement = ContestProblemStatement.objects.create(
+        contest_year=2025,
+        contest_name="IMO",
+        problem_number=3,
+        problem_code="P3",
+        statement_latex="x",
+        linked_problem=record,
+        topic=" ",
+    )
+    assert (statement.effective_topic, statement.effective_mohs) == ("NT", 15)
+
+    record.topic = "A"
+    record.mohs = 20
+    record.save()
+    statement.refresh_from_db()
+    assert (statement.effective_topic, statement.effective_mohs) == ("A", 20)
+
+    statement.mohs = UPDATED_MOHS
+    statement.save(update_fields=["mohs"])
+    statement.refresh_from_db()
+    assert statement.effective_mohs == UPDATED_MOHS
+
+    record.delete()
+    statement.refresh_from_db()
+    assert (statement.effective_topic, statement.effective_mohs) == ("", UPDATED_MOHS)
+
+
+@pytest.mark.django_db
+def test_sync_statement_analytics_refreshes_stale_effective_columns():
+    record = ProblemSolveRecord.objects.create(year=2024, topic="C", mohs=25, contest="EGMO", problem="P1")
+    statement = ContestProblemStatement.objects.create(
+        contest_year=2024,
+        contest_name="EGMO",
+        problem_number=1,
+        problem_code="P1",
+        statement_latex="x",
+        linked_problem=record,
+        topic="C",
+        mohs=25,
+    )
+    ContestProblemStatement.objects.filter(pk=statement.pk).update(effective_topic="", effective_mohs=None)
+    statement.refresh_from_db()
+
+    assert sync_statement_analytics_from_linked_problem(statement) is True
+    statement.refresh_from_db()
+    assert (statement.effective_topic, statement.effective_mohs) == ("C", 25)
+    assert list(
+        annotate_effective_statement_analytics(ContestProblemStatement.objects.filter(pk=statement.pk)).values_list(
+            "_eff_topic",
+            "_eff_mohs",
+        ),
+    ) == [("C", 25)]
+
+
+@pytest.mark.django_db
+def test_effective_topic_refresh_and_save_agree_on_unicode_whitespace():
+    record = ProblemSolveRecord.objects.create(year=2023, topic="G", mohs=10, contest="APMO", problem="P2")
+    statement = ContestProblemStatement.objects.create(
+        contest_year=2023,
+        contest_name="APMO",
+        problem_number=2,
+        problem_code="P2",
+        statement_latex="x",
+        linked_problem=record,
+        topic="\t\u00a0",
+    )
+    assert statement.effective_topic == "G"
+
+    ContestProblemStatement.objects.filter(pk=statement.pk).update(effective_topic="", effective_mohs=None)
+    assert refresh_effective_statement_analytics(ContestProblemStatement.objects.filter(pk=statement.pk)) == 1
+    statement.refresh_from_db()
+    assert (statement.effective_topic, statement.effective_mohs) == ("G", 10)
+    assert refresh_effective_statement_analytics(ContestProblemStatement.objects.filter(pk=statement.pk)) == 0
+
+
+@pytest.mark.django_db
+def test_statement_save_resyncs_problem_uuid_and_reads_linked_problem_once():
+    record = ProblemSolveRecord.objects.create(year=2023, topic="G", mohs=10, contest="APMO", problem="P3")
+    ContestProblemStatement.objects.create(
+        contest_year=2023,
+        contest_name="APMO",
+        problem_number=3,
+        problem_code="P3",
+        statement_latex="x",
+        linked_problem=record,
+    )
+    statement = ContestProblemStatement.objects.get(linked_problem=record)
+    statement.problem_uuid = uuid.uuid4()
+    statement.statement_latex = "y"
+    with CaptureQueriesContext(connection) as queries:
+        statement.save()
+    linked_lookup = f'WHERE "pages_problemsolverecord"."id" = {record.pk} LIMIT 21'
+    assert len([query for query in queries if linked_lookup in query["sql"]]) == 1
+    statement.refresh_from_db()
+    assert statement.problem_uuid == record.problem_uuid
+
+    statement.topic = "NT"
+    statement.save(update_fields=["topic"])
+    statement.refresh_from_db()
+    assert statement.effective_topic == "NT"
+
+
 @pytest.mark.django_db
 def test_sync_statement_analytics_from_linked_problem_copies_when_statement_empty():
     record = ProblemSolveRecord.objects.create(
@@ -13,6 +13,7 @@ from urllib.parse import urlencode
 from zoneinfo import ZoneInfo
 from zoneinfo import ZoneInfoNotFoundError
 
+import pandas as pd
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -32,7 +33,6 @@ from django.db.models import OuterRef
 from django.db.models import Q
 from django.db.models import Subquery
 from django.db.models import Value
-from django.db.models.functions import Cast
 from django.db.models.functions import Coalesce
 from django.http import Http404
 from django.http import HttpResponse
@@ -46,8 +46,8 @@ from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.text import slugify
 from django.views.decorators.http import require_POST
 
-from inspinia.pages.asymptote_render import build_statement_render_segments
-from inspinia.pages.asymptote_render import has_asymptote_blocks
+from inspinia.pages.analytics_pivots import analytics_frame
+from inspinia.pages.analytics_pivots import contest_year_heatmap_payload
 from inspinia.pages.completion_duplicates import upsert_exact_duplicate_statement_completions
 from inspinia.pages.completion_progress import COMPLETION_PROGRESS_RANGE_OPTIONS
 from inspinia.pages.completion_progress import CompletionProgressFilters
@@ -106,6 +106,7 @@ from inspinia.pages.models import ContestProblemStatement
 from inspinia.pages.models import PageViewEvent
 from inspinia.pages.models import ProblemSolveRecord
 from inspinia.pages.models import ProblemTopicTechnique
+from inspinia.pages.models import SearchDocument
 from inspinia.pages.models import StatementTopicTechnique
 from inspinia.pages.models import TechniqueBenchmarkExportBatch
 from inspinia.pages.models import TechniqueBenchmarkImportBatch
@@ -123,6 +124,8 @@ from inspinia.pages.problem_import import build_problem_export_workbook_bytes
 from inspinia.pages.problem_import import build_problem_statement_export_workbook_bytes
 from inspinia.pages.problem_import import dataframe_from_excel
 from inspinia.pages.problem_import import import_problem_dataframe
+from inspinia.pages.search_index import search_document_ids
+from inspinia.pages.search_index import search_tokens
 from inspinia.pages.statement_analytics import annotate_effective_statement_analytics
 from inspinia.pages.statement_analytics import contest_key_for_public_slug
 from inspinia.pages.statement_analytics import effective_confidence
@@ -153,6 +156,10 @@ from inspinia.pages.statement_metadata_backfill import import_statement_metadata
 from inspinia.pages.statement_metadata_backfill import statement_metadata_dataframe_from_excel
 from inspinia.pages.statement_metadata_backfill import statement_metadata_dataframe_from_rows
 from inspinia.pages.statement_metadata_backfill import statement_metadata_dataframe_from_text
+from inspinia.pages.statement_render import build_statement_render_payload
+from inspinia.pages.statement_render import statement_preview_texts
+from inspinia.pages.statement_render import statement_render_payload
+from inspinia.pages.statement_render import statement_render_payloads
 from inspinia.pages.subtopic_cleanup import apply_subtopic_cleanup
 from inspinia.pages.subtopic_cleanup import build_subtopic_cleanup_preview
 from inspinia.pages.technique_benchmarking.batches import BATCH_SIZE_CHOICES
@@ -235,6 +242,13 @@ STATEMENT_ANALYTICS_LOW_COVERAGE_MIN_STATEMENTS = 5
 STATEMENT_ANALYTICS_RECENT_YEAR = 2020
 STATEMENT_ANALYTICS_SUCCESS_RATE = 90
 STATEMENT_ANALYTICS_WARNING_RATE = 60
+STATEMENT_HEATMAP_FRAME_COLUMNS = (
+    "contest_name",
+    "contest_year",
+    "statement_count",
+    "unlinked_count",
+    "contest_year_url",
+)
 COMPLETION_BOARD_INITIAL_ROW_LIMIT = 30
 COMPLETION_BOARD_ROW_LOAD_STEP = 30
 COMPLETION_TIMEZONE_MAX_LENGTH = 128
@@ -291,7 +305,7 @@ def latex_preview_view(request):
                     form = ProblemStatementImportForm(initial={"source_text": source_text})
                 parsed_statement_payload = build_problem_statement_preview_payload(parsed_import)
                 for problem in parsed_statement_payload["problems"]:
-                    problem.update(_statement_render_payload(problem["statement_latex"]))
+                    problem.update(build_statement_render_payload(problem["statement_latex"]))
                 statement_save_preview = build_problem_statement_save_preview(parsed_import)
                 if action == "save":
                     save_result = import_problem_statements(parsed_import)
@@ -420,7 +434,7 @@ def statement_render_preview_view(request):
         return JsonResponse({"error": "POST required.", "ok": False}, status=405)
 
     statement_latex = request.POST.get("source_text", "")
-    render_payload = _statement_render_payload(statement_latex)
+    render_payload = build_statement_render_payload(statement_latex)
     html = render_to_string(
         "partials/statement-render-content.html",
         {
@@ -469,14 +483,14 @@ def _with_bar_payload_metadata(payload: dict, *, series_name: str, filter_param:
     }
 
 
-def _statement_preview_text(statement_latex: str, *, max_length: int = 220) -> str:
-    collapsed = re.sub(r"\s+", " ", statement_latex.strip())
-    if len(collapsed) <= max_length:
-        return collapsed
-    return f"{collapsed[: max_length - 1].rstrip()}…"
+def _statement_preview_text(preview_text: str, *, max_length: int = 220) -> str:
+    """Truncate whitespace-collapsed statement text from ``statement_preview_texts``."""
+    if len(preview_text) <= max_length:
+        return preview_text
+    return f"{preview_text[: max_length - 1].rstrip()}…"
 
 
-def _statement_delete_row(statement: ContestProblemStatement) -> dict[str, str]:
+def _statement_delete_row(statement: ContestProblemStatement, *, preview_text: str) -> dict[str, str]:
     return {
         "contest_name": statement.contest_name,
         "contest_year": str(statement.contest_year),
@@ -484,7 +498,7 @@ def _statement_delete_row(statement: ContestProblemStatement) -> dict[str, str]:
         "problem_code": statement.problem_code,
         "statement_uuid": str(statement.statement_uuid),
         "contest_year_problem": statement.contest_year_problem,
-        "statement_preview": _statement_preview_text(statement.statement_latex, max_length=120),
+        "statement_preview": _statement_preview_text(preview_text, max_length=120),
     }
 
 
@@ -500,26 +514,9 @@ def _statement_delete_inventory_queryset():
 
 def _statement_delete_filtered_queryset(raw_search: str):
     queryset = _statement_delete_inventory_queryset()
-    search_terms = [term for term in re.split(r"\s+", raw_search.strip()) if term]
-    if not search_terms:
+    if not search_tokens(raw_search):
         return queryset
-
-    queryset = queryset.annotate(
-        contest_year_text=Cast("contest_year", output_field=CharField()),
-        problem_number_text=Cast("problem_number", output_field=CharField()),
-        statement_uuid_text=Cast("statement_uuid", output_field=CharField()),
-    )
-    for term in search_terms:
-        queryset = queryset.filter(
-            Q(contest_name__icontains=term)
-            | Q(contest_year_text__icontains=term)
-            | Q(day_label__icontains=term)
-            | Q(problem_number_text__icontains=term)
-            | Q(problem_code__icontains=term)
-            | Q(statement_uuid_text__icontains=term)
-            | Q(statement_latex__icontains=term),
-        )
-    return queryset
+    return queryset.filter(id__in=search_document_ids(SearchDocument.Kind.STATEMENT, raw_search))
 
 
 def _statement_delete_datatable_int(raw_value: str | None, *, default: int = 0) -> int:
@@ -547,12 +544,16 @@ def _statement_delete_datatable_payload(request) -> dict[str, object]:
     filtered_queryset = _statement_delete_filtered_queryset(raw_search)
     records_filtered = filtered_queryset.count()
     statement_page = list(filtered_queryset[start : start + page_length])
+    preview_by_latex = statement_preview_texts(statement.statement_latex for statement in statement_page)
 
     return {
         "draw": draw,
         "recordsTotal": records_total,
         "recordsFiltered": records_filtered,
-        "data": [_statement_delete_row(statement) for statement in statement_page],
+        "data": [
+            _statement_delete_row(statement, preview_text=preview_by_latex[statement.statement_latex])
+            for statement in statement_page
+        ],
     }
 
 
@@ -564,13 +565,6 @@ def _statement_delete_preview(labels: list[str]) -> str:
     return preview
 
 
-def _statement_render_payload(statement_latex: str) -> dict:
-    return {
-        "statement_has_asymptote": has_asymptote_blocks(statement_latex),
-        "statement_render_segments": build_statement_render_segments(statement_latex),
-    }
-
-
 def _json_script_safe(value):
     """Make values safe for {% json_script %} / browser JSON.parse (no NaN/Infinity)."""
     if isinstance(value, dict):
@@ -1334,6 +1328,7 @@ def _statement_linker_payload() -> dict[str, object]:
         "-id",
     )
     statements = list(table_qs[:ADMIN_TABLE_LATEST_LIMIT])
+    preview_by_latex = statement_preview_texts(statement.statement_latex for statement in statements)
 
     visible_contest_years = {
         (statement.contest_name, int(statement.contest_year)) for statement in statements
@@ -1396,7 +1391,10 @@ def _statement_linker_payload() -> dict[str, object]:
                 "problem_code": statement.problem_code,
                 "problem_uuid": str(statement.problem_uuid),
                 "statement_id": statement.id,
-                "statement_preview": _statement_preview_text(statement.statement_latex, max_length=180),
+                "statement_preview": _statement_preview_text(
+                    preview_by_latex[statement.statement_latex],
+                    max_length=180,
+                ),
                 "suggested_problem_id": (
                     suggested_problem.id
                     if linked_problem is None and suggested_problem is not None
@@ -1814,9 +1812,8 @@ def _statement_contest_totals(rows: list[dict]) -> dict[str, dict[str, int | flo
     return totals
 
 
-def _statement_rows_for_contests(rows: list[dict], contest_names: list[str]) -> list[dict]:
-    selected = set(contest_names)
-    return [row for row in rows if row["contest_name"] in selected]
+def _statement_rows_for_contests(frame: pd.DataFrame, contest_names: list[str]) -> pd.DataFrame:
+    return frame[frame["contest_name"].isin(contest_names)]
 
 
 def _statement_heatmap_contests_by_backlog(rows: list[dict]) -> list[str]:
@@ -1889,7 +1886,7 @@ def _statement_heatmap_contests_by_recent_backlog(rows: list[dict]) -> list[str]
 
 
 def _statement_heatmap_payload(rows: list[dict]) -> dict[str, object]:
-    return _contest_year_heatmap_payload(
+    return contest_year_heatmap_payload(
         rows,
         value_key="statement_count",
         config={
@@ -1899,85 +1896,6 @@ def _statement_heatmap_payload(rows: list[dict]) -> dict[str, object]:
     )
 
 
-def _contest_year_heatmap_payload(
-    rows: list[dict],
-    *,
-    value_key: str,
-    config: dict[str, object] | None = None,
-) -> dict[str, object]:
-    payload_config = config or {}
-    url_key_value = str(payload_config.get("url_key") or "")
-    url_key = url_key_value or None
-    metric_label = str(payload_config.get("metric_label") or "")
-    mode = str(payload_config.get("mode") or "")
-    ordered_contests = payload_config.get("ordered_contests")
-    is_limited = bool(payload_config.get("is_limited", False))
-
-    if not rows:
-        return {
-            "is_limited": is_limited,
-            "max_value": 0,
-            "metric_label": metric_label,
-            "mode": mode,
-            "series": [],
-            "years": [],
-        }
-
-    years = sorted({int(row["contest_year"]) for row in rows})
-    value_by_contest_year: dict[str, dict[int, int]] = defaultdict(dict)
-    url_by_contest_year: dict[str, dict[int, str]] = defaultdict(dict)
-    contest_totals: dict[str, int] = defaultdict(int)
-
-    for row in rows:
-        contest_name = row["contest_name"]
-        contest_year = int(row["contest_year"])
-        value = int(row[value_key] or 0)
-        value_by_contest_year[contest_name][contest_year] = value
-        if url_key:
-            url = str(row.get(url_key) or "")
-            if url and value:
-                url_by_contest_year[contest_name][contest_year] = url
-        contest_totals[contest_name] += value
-
-    if not isinstance(ordered_contests, list):
-        ordered_contests = sorted(
-            contest_totals,
-            key=lambda contest_name: (-contest_totals[contest_name], contest_name),
-        )
-    else:
-        ordered_contests = [contest_name for contest_name in ordered_contests if contest_name in contest_totals]
-    max_value = max(int(row[value_key] or 0) for row in rows)
-
-    return {
-        "is_limited": is_limited,
-        "max_value": max_value,
-        "metric_label": metric_label,
-        "mode": mode,
-        "series": [
-            {
-                "data": [
-                    (
-                        {
-                            "x": str(year),
-                            "y": value_by_contest_year[contest_name].get(year, 0),
-                            "url": url_by_contest_year[contest_name][year],
-                        }
-                        if year in url_by_contest_year[contest_name]
-                        else {
-                            "x": str(year),
-                            "y": value_by_contest_year[contest_name].get(year, 0),
-                        }
-                    )
-                    for year in years
-                ],
-                "name": contest_name,
-            }
-            for contest_name in ordered_contests
-        ],
-        "years": [str(year) for year in years],
-    }
-
-
 def _statement_heatmap_views(rows: list[dict]) -> dict[str, dict[str, object]]:
     backlog_contests = _statement_heatmap_contests_by_backlog(rows)
     low_coverage_contests = _statement_heatmap_contests_by_low_coverage(rows)
@@ -1994,10 +1912,11 @@ def _statement_heatmap_views(rows: list[dict]) -> dict[str, dict[str, object]]:
     low_coverage_limited = low_coverage_contests[:STATEMENT_ANALYTICS_HEATMAP_LIMIT]
     volume_limited = volume_contests[:STATEMENT_ANALYTICS_HEATMAP_LIMIT]
     recent_limited = recent_contests[:STATEMENT_ANALYTICS_HEATMAP_LIMIT]
+    heatmap_frame = analytics_frame(rows, STATEMENT_HEATMAP_FRAME_COLUMNS)
 
     return {
-        "backlog": _contest_year_heatmap_payload(
-            _statement_rows_for_contests(rows, backlog_limited),
+        "backlog": contest_year_heatmap_payload(
+            _statement_rows_for_contests(heatmap_frame, backlog_limited),
             value_key="unlinked_count",
             config={
                 "is_limited": len(backlog_contests) > STATEMENT_ANALYTICS_HEATMAP_LIMIT,
@@ -2007,8 +1926,8 @@ def _statement_heatmap_views(rows: list[dict]) -> dict[str, dict[str, object]]:
                 "url_key": "contest_year_url",
             },
         ),
-        "lowCoverage": _contest_year_heatmap_payload(
-            _statement_rows_for_contests(rows, low_coverage_limited),
+        "lowCoverage": contest_year_heatmap_payload(
+            _statement_rows_for_contests(heatmap_frame, low_coverage_limited),
             value_key="unlinked_count",
             config={
                 "is_limited": len(low_coverage_contests) > STATEMENT_ANALYTICS_HEATMAP_LIMIT,
@@ -2018,8 +1937,8 @@ def _statement_heatmap_views(rows: list[dict]) -> dict[str, dict[str, object]]:
                 "url_key": "contest_year_url",
             },
         ),
-        "volume": _contest_year_heatmap_payload(
-            _statement_rows_for_contests(rows, volume_limited),
+        "volume": contest_year_heatmap_payload(
+            _statement_rows_for_contests(heatmap_frame, volume_limited),
             value_key="statement_count",
             config={
                 "is_limited": len(volume_contests) > STATEMENT_ANALYTICS_HEATMAP_LIMIT,
@@ -2029,8 +1948,8 @@ def _statement_heatmap_views(rows: list[dict]) -> dict[str, dict[str, object]]:
                 "url_key": "contest_year_url",
             },
         ),
-        "recent": _contest_year_heatmap_payload(
-            _statement_rows_for_contests(rows, recent_limited),
+        "recent": contest_year_heatmap_payload(
+            _statement_rows_for_contests(heatmap_frame, recent_limited),
             value_key="unlinked_count",
             config={
                 "is_limited": len(recent_contests) > STATEMENT_ANALYTICS_HEATMAP_LIMIT,
@@ -2040,8 +1959,8 @@ def _statement_heatmap_views(rows: list[dict]) -> dict[str, dict[str, object]]:
                 "url_key": "contest_year_url",
             },
         ),
-        "all": _contest_year_heatmap_payload(
-            _statement_rows_for_contests(rows, all_contests),
+        "all": contest_year_heatmap_payload(
+            _statement_rows_for_contests(heatmap_frame, all_contests),
             value_key="unlinked_count",
             config={
                 "metric_label": "Unlinked statement rows",
@@ -2087,115 +2006,6 @@ def _contest_completion_heatmap_chart_payload(
     }
 
 
-def _contest_year_mohs_pivot_payload() -> dict[str, object]:
-    statement_rows = list(
-        _active_dashboard_statements().values(
-            "contest_name",
-            "contest_year",
-            "problem_code",
-            "problem_uuid",
-            "mohs",
-        ).order_by("contest_name", "-contest_year", "problem_code", "problem_uuid"),
-    )
-    if not statement_rows:
-        return {
-            "contest_names": [],
-            "mohs_values": [],
-            "table_rows": [],
-            "year_values": [],
-        }
-
-    problem_by_uuid = {
-        problem_row["problem_uuid"]: int(problem_row["mohs"])
-        for problem_row in ProblemSolveRecord.objects.filter(
-            problem_uuid__in=[row["problem_uuid"] for row in statement_rows],
-        ).values("problem_uuid", "mohs")
-    }
-    statement_problem_code_counts = Counter(
-        (
-            row["contest_name"],
-            int(row["contest_year"]),
-            (row["problem_code"] or "").strip().upper(),
-        )
-        for row in statement_rows
-    )
-    statement_problem_keys = {
-        (
-            row["contest_name"],
-            int(row["contest_year"]),
-            (row["problem_code"] or "").strip().upper(),
-        )
-        for row in statement_rows
-        if (row["problem_code"] or "").strip()
-    }
-    problem_by_statement_key = {
-        (
-            problem_row["contest"],
-            int(problem_row["year"]),
-            (problem_row["problem"] or "").strip().upper(),
-        ): int(problem_row["mohs"])
-        for problem_row in ProblemSolveRecord.objects.filter(
-            year__in={key[1] for key in statement_problem_keys},
-            contest__in={key[0] for key in statement_problem_keys},
-            problem__in={key[2] for key in statement_problem_keys},
-        ).values("contest", "year", "problem", "mohs")
-    }
-
-    mohs_values: set[int] = set()
-    counts_by_contest_year_mohs: dict[tuple[str, int], Counter[int]] = defaultdict(Counter)
-    ordered_contest_year_keys: list[tuple[str, int]] = []
-    seen_contest_year_keys: set[tuple[str, int]] = set()
-    ordered_contest_names: list[str] = []
-    seen_contest_names: set[str] = set()
-    seen_year_values: set[int] = set()
-
-    for row in statement_rows:
-        contest_name = row["contest_name"]
-        contest_year = int(row["contest_year"])
-        contest_year_key = (contest_name, contest_year)
-        if contest_year_key not in seen_contest_year_keys:
-            seen_contest_year_keys.add(contest_year_key)
-            ordered_contest_year_keys.append(contest_year_key)
-        if contest_name not in seen_contest_names:
-            seen_contest_names.add(contest_name)
-            ordered_contest_names.append(contest_name)
-        seen_year_values.add(contest_year)
-
-        problem_code = (row["problem_code"] or "").strip().upper()
-        mohs = row.get("mohs")
-        if mohs is None:
-            mohs = problem_by_uuid.get(row["problem_uuid"])
-        if mohs is None and problem_code:
-            statement_problem_key = (contest_name, contest_year, problem_code)
-            if statement_problem_code_counts[statement_problem_key] == 1:
-                mohs = problem_by_statement_key.get(statement_problem_key)
-        if mohs is None:
-            continue
-
-        mohs_values.add(mohs)
-        counts_by_contest_year_mohs[contest_year_key][mohs] += 1
-
-    table_rows = [
-        {
-            "contest_name": contest_name,
-            "contest_year": contest_year,
-            "contest_year_label": f"{contest_name} {contest_year}",
-            "mohs_counts": {
-                str(mohs): counts_by_contest_year_mohs[(contest_name, contest_year)].get(mohs, 0)
-                for mohs in sorted(mohs_values)
-            },
-        }
-        for contest_name, contest_year in ordered_contest_year_keys
-    ]
-
-    return {
-        "contest_names": ordered_contest_names,
-        "mohs_values": [str(mohs) for mohs in sorted(mohs_values)],
-        "table_rows": table_rows,
-        "year_values": [str(year) for year in sorted(seen_year_values, reverse=True)],
-    }
-
-
 def _completion_statement_label(completion: UserProblemCompletion) -> str:
     if completion.statement is not None:
         return completion.statement.contest_year_problem
@@ -3364,10 +3174,8 @@ def _completion_record_apply_search(
         token_query = (
             Q(user__name__icontains=token)
             | Q(user__email__icontains=token)
-            | Q(_effective_contest__icontains=token)
-            | Q(_effective_problem__icontains=token)
-            | Q(_effective_problem_label__icontains=token)
-            | Q(_effective_topic__icontains=token)
+            | Q(statement_id__in=search_document_ids(SearchDocument.Kind.STATEMENT, token))
+            | Q(statement__isnull=True, problem_id__in=search_document_ids(SearchDocument.Kind.PROBLEM, token))
             | Q(_effective_solution_status__icontains=token)
             | Q(status__icontains=token)
             | Q(main_obstacle__icontains=token)
@@ -5647,7 +5455,7 @@ def problem_statement_detail_view(request, statement_uuid: uuid.UUID):
     except ContestProblemStatement.DoesNotExist as exc:
         raise Http404 from exc
 
-    render_payload = _statement_render_payload(statement.statement_latex)
+    render_payload = statement_render_payload(statement.statement_latex)
     topic = effective_topic(statement)
     mohs = effective_mohs(statement)
     label = statement.contest_year_problem or (
@@ -5828,7 +5636,7 @@ def user_activity_dashboard_view(request):
     unknown_completion_total = len(solved_completions) - len(dated_completion_dates)
     table_rows, filter_options = _user_completion_table_rows(completions)
     statement_completion_rows = _user_statement_completion_rows(solved_completions)
-    statement_completion_heatmap = _contest_year_heatmap_payload(
+    statement_completion_heatmap = contest_year_heatmap_payload(
         statement_completion_rows,
         value_key="completed_count",
     )
@@ -7230,13 +7038,14 @@ def _build_dashboard_contest_statement_listing_context(
         ).values("problem_id", "status")
     }
 
+    render_payload_by_latex = statement_render_payloads(statement.statement_latex for statement in statements)
     problem_rows: list[dict[str, object]] = []
     for statement in statements:
         linked_problem = statement.linked_problem
         topic_tags = topic_tags_by_statement_id.get(statement.id, [])
         if not topic_tags:
             topic_tags = topic_tags_by_problem_id.get(statement.linked_problem_id, [])
-        render_payload = _statement_render_payload(statement.statement_latex)
+        render_payload = render_payload_by_latex[statement.statement_latex]
         is_linked = linked_problem is not None
         completion_date = completion_by_statement_id.get(statement.id)
         is_completed = statement.id in completion_by_statement_id
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class ProblemsetsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "inspinia.problemsets"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import inspinia.problemsets.signals  # noqa: F401
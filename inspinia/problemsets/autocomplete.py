@@ -0,0 +1,197 @@
+"""In-process prefix index for problem picker search-as-you-type.
+
+Each worker keeps a sorted array of word-start suffixes of every active
+problem's "contest year problem" label plus the sorted problem UUIDs, so a
+keystroke is a table lookup (prefixes of up to three characters) or a
+``bisect`` range scan instead of a ranked database query.
+The index is rebuilt when the search index marker changes (any problem or
+statement save refreshes it), so edits show up on the next keystroke.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from collections import defaultdict
+from dataclasses import dataclass
+
+from inspinia.pages.models import ProblemSolveRecord
+from inspinia.pages.search_index import normalize_search_text
+from inspinia.pages.search_index import search_index_marker
+
+PROBLEM_AUTOCOMPLETE_LIMIT = 10
+PROBLEM_AUTOCOMPLETE_MAX_LIMIT = 25
+PROBLEM_AUTOCOMPLETE_MIN_UUID_PREFIX = 4
+_UUID_CHARACTERS = frozenset("0123456789abcdef-")
+_SHORT_PREFIX_LENGTH = 3
+_LONG_PREFIX_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemLabelEntry:
+    problem_id: int
+    problem_uuid: str
+    label: str
+    contest: str
+    year: int
+    problem: str
+    topic: str
+    mohs: int
+
+
+class ProblemLabelIndex:
+    def __init__(self, entries: list[ProblemLabelEntry]) -> None:
+        self.entries = entries
+        entry_ranks = {
+            entry_index: rank
+            for rank, entry_index in enumerate(
+                sorted(range(len(entries)), key=lambda index: (-entries[index].year, entries[index].label.casefold())),
+            )
+        }
+        label_keys: list[tuple[str, int, int]] = []
+        for entry_index, entry in enumerate(entries):
+            words = normalize_search_text(entry.label).split(" ")
+            label_keys.extend(
+                (" ".join(words[word_offset:]), word_offset, entry_index) for word_offset in range(len(words))
+            )
+        self._entry_ranks = entry_ranks
+        self._short_prefix_matches = _short_prefix_matches(label_keys, entry_ranks)
+        label_keys.sort()
+        self._label_keys = [key for key, _word_offset, _entry_index in label_keys]
+        self._label_matches = [(word_offset, entry_index) for _key, word_offset, entry_index in label_keys]
+        uuid_keys = sorted((entry.problem_uuid, entry_index) for entry_index, entry in enumerate(entries))
+        self._uuid_keys = [key for key, _entry_index in uuid_keys]
+        self._uuid_entry_indexes = [entry_index for _key, entry_index in uuid_keys]
+        self._long_prefix_matches: OrderedDict[str, list[int]] = OrderedDict()
+        self._long_prefix_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, search_text: str, *, limit: int = PROBLEM_AUTOCOMPLETE_LIMIT) -> list[ProblemLabelEntry]:
+        """Return up to ``limit`` entries whose label or UUID starts with ``search_text``.
+
+        Labels matching from their first word rank ahead of matches that start
+        later in the label (``"2024 p3"`` still finds ``"Balkan MO 2024 P3"``);
+        ties go to the newest year, then the label.
+        """
+        prefix = normalize_search_text(search_text)
+        limit = min(limit, PROBLEM_AUTOCOMPLETE_MAX_LIMIT)
+        if not prefix or limit < 1:
+            return []
+        if len(prefix) <= _SHORT_PREFIX_LENGTH:
+            entry_indexes = self._short_prefix_matches.get(prefix, [])
+        else:
+            entry_indexes = self._cached_long_prefix_matches(prefix)
+        return [self.entries[entry_index] for entry_index in entry_indexes[:limit]]
+
+    def _cached_long_prefix_matches(self, prefix: str) -> list[int]:
+        with self._long_prefix_lock:
+            entry_indexes = self._long_prefix_matches.get(prefix)
+            if entry_indexes is not None:
+                self._long_prefix_matches.move_to_end(prefix)
+                return entry_indexes
+
+        entry_indexes = self._scan_long_prefix(prefix)
+        with self._long_prefix_lock:
+            self._long_prefix_matches[prefix] = entry_indexes
+            while len(self._long_prefix_matches) > _LONG_PREFIX_CACHE_SIZE:
+                self._long_prefix_matches.popitem(last=False)
+        return entry_indexes
+
+    def _scan_long_prefix(self, prefix: str) -> list[int]:
+        best_offset_by_entry: dict[int, int] = {}
+        start = bisect_left(self._label_keys, prefix)
+        for position in range(start, len(self._label_keys)):
+            if not self._label_keys[position].startswith(prefix):
+                break
+            word_offset, entry_index = self._label_matches[position]
+            best_offset_by_entry[entry_index] = min(word_offset, best_offset_by_entry.get(entry_index, word_offset))
+
+        if len(prefix) >= PROBLEM_AUTOCOMPLETE_MIN_UUID_PREFIX and set(prefix) <= _UUID_CHARACTERS:
+            start = bisect_left(self._uuid_keys, prefix)
+            for position in range(start, len(self._uuid_keys)):
+                if not self._uuid_keys[position].startswith(prefix):
+                    break
+                best_offset_by_entry.setdefault(self._uuid_entry_indexes[position], 0)
+
+        return heapq.nsmallest(
+            PROBLEM_AUTOCOMPLETE_MAX_LIMIT,
+            best_offset_by_entry,
+            key=lambda entry_index: (best_offset_by_entry[entry_index], self._entry_ranks[entry_index]),
+        )
+
+
+def _short_prefix_matches(
+    label_keys: list[tuple[str, int, int]],
+    entry_ranks: dict[int, int],
+) -> dict[str, list[int]]:
+    """Precompute the ranked top matches for every label prefix of up to three characters.
+
+    Short prefixes match most of the archive, so scanning them per keystroke
+    would be the slow path; walking the suffixes once in rank order fills each
+    bucket with its best entries.
+    """
+    matches: dict[str, list[int]] = defaultdict(list)
+    for key, _word_offset, entry_index in sorted(
+        label_keys,
+        key=lambda label_key: (label_key[1], entry_ranks[label_key[2]]),
+    ):
+        for prefix_length in range(1, min(len(key), _SHORT_PREFIX_LENGTH) + 1):
+            bucket = matches[key[:prefix_length]]
+            if len(bucket) < PROBLEM_AUTOCOMPLETE_MAX_LIMIT and entry_index not in bucket:
+                bucket.append(entry_index)
+    return dict(matches)
+
+
+_index_lock = threading.Lock()
+_cached_index: tuple[str, ProblemLabelIndex] | None = None
+
+
+def problem_label_index() -> ProblemLabelIndex:
+    """Return this process's label index, rebuilding it when the search marker moved."""
+    global _cached_index  # noqa: PLW0603
+    marker = search_index_marker()
+    cached_index = _cached_index
+    if cached_index is not None and cached_index[0] == marker:
+        return cached_index[1]
+
+    with _index_lock:
+        if _cached_index is not None and _cached_index[0] == marker:
+            return _cached_index[1]
+        index = build_problem_label_index()
+        _cached_index = (marker, index)
+        return index
+
+
+def build_problem_label_index() -> ProblemLabelIndex:
+    return ProblemLabelIndex(
+        [
+            ProblemLabelEntry(
+                problem_id=problem_id,
+                problem_uuid=str(problem_uuid),
+                label=contest_year_problem or f"{contest} {year} {problem}",
+                contest=contest,
+                year=year,
+                problem=problem,
+                topic=topic,
+                mohs=mohs,
+            )
+            for problem_id, problem_uuid, contest_year_problem, contest, year, problem, topic, mohs in (
+                ProblemSolveRecord.objects.filter(is_active=True)
+                .order_by("id")
+                .values_list(
+                    "id",
+                    "problem_uuid",
+                    "contest_year_problem",
+                    "contest",
+                    "year",
+                    "problem",
+                    "topic",
+                    "mohs",
+                )
+            )
+        ],
+    )
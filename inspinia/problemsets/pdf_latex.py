@@ -5,11 +5,14 @@ from typing import TYPE_CHECKING
 
 from django.utils import timezone
 
-from inspinia.solutions.pdf_latex import compile_solution_tex_to_pdf
+from inspinia.solutions.pdf_latex import PdfCompileRequest
+from inspinia.solutions.pdf_latex import compile_pdf_request
 from inspinia.solutions.pdf_latex import latex_escape_plain_text
-from inspinia.solutions.pdf_latex import latex_unicode_character_declarations
+from inspinia.solutions.pdf_latex import shared_latex_preamble_lines
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from inspinia.problemsets.models import ProblemList
 
 
@@ -23,10 +26,17 @@ def compile_problem_list_to_pdf(
     problem_list: ProblemList,
     item_rows: list[dict],
     params: ProblemListPdfCompileParams,
-) -> bytes:
-    tex_source = build_problem_list_tex_source(problem_list, item_rows)
-    return compile_solution_tex_to_pdf(
-        tex_source,
+) -> Path:
+    return compile_pdf_request(problem_list_pdf_compile_request(problem_list, item_rows, params))
+
+
+def problem_list_pdf_compile_request(
+    problem_list: ProblemList,
+    item_rows: list[dict],
+    params: ProblemListPdfCompileParams,
+) -> PdfCompileRequest:
+    return PdfCompileRequest(
+        tex_source=build_problem_list_tex_source(problem_list, item_rows),
         timeout=params.timeout,
         latex_binary=params.latex_binary,
     )
@@ -39,9 +49,7 @@ def build_problem_list_tex_source(problem_list: ProblemList, item_rows: list[dic
     date_str = latex_escape_plain_text(timezone.localtime(dt_ref).strftime("%Y-%m-%d"))
 
     lines: list[str] = [
-        r"\documentclass[11pt]{scrartcl}",
-        r"\usepackage[sexy,noasy]{evan}",
-        *latex_unicode_character_declarations(),
+        *shared_latex_preamble_lines(),
         rf"\title{{{title}}}",
         rf"\author{{{author}}}",
         rf"\date{{{date_str}}}",
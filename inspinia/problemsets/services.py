@@ -12,6 +12,8 @@ from inspinia.problemsets.models import PROBLEM_LIST_ITEM_CUSTOM_TITLE_MAX_LENGT
 from inspinia.problemsets.models import ProblemList
 from inspinia.problemsets.models import ProblemListItem
 from inspinia.problemsets.models import ProblemListVote
+from inspinia.solutions.pdf_prerender import PDF_PRERENDER_PROBLEM_LIST
+from inspinia.solutions.pdf_prerender import queue_pdf_prerender
 
 
 class ProblemListServiceError(ValueError):
@@ -74,6 +76,8 @@ def reorder_problem_list_items(problem_list: ProblemList, item_ids: list[int]) -
         for position, item in enumerate(reordered_items, start=1):
             item.position = position
         ProblemListItem.objects.bulk_update(reordered_items, ["position"])
+        # bulk_update skips the item signals that pre-render public list PDFs.
+        queue_pdf_prerender(PDF_PRERENDER_PROBLEM_LIST, problem_list.pk)
 
 
 def replace_problem_list_items(
@@ -143,6 +147,7 @@ def replace_problem_list_items(
             update_custom_titles=normalized_custom_titles is not None,
             update_hints=normalized_hints is not None,
         )
+        queue_pdf_prerender(PDF_PRERENDER_PROBLEM_LIST, locked_list.pk)
         return ordered_items
 
 
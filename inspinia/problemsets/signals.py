@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from inspinia.problemsets.models import ProblemList
+from inspinia.problemsets.models import ProblemListItem
+from inspinia.solutions.pdf_prerender import PDF_PRERENDER_PROBLEM_LIST
+from inspinia.solutions.pdf_prerender import queue_pdf_prerender
+
+
+@receiver(post_save, sender=ProblemList)
+def prerender_public_problem_list_pdf(sender, instance: ProblemList, **kwargs) -> None:
+    if instance.is_public:
+        queue_pdf_prerender(PDF_PRERENDER_PROBLEM_LIST, instance.pk)
+
+
+@receiver(post_save, sender=ProblemListItem)
+@receiver(post_delete, sender=ProblemListItem)
+def prerender_problem_list_pdf_after_item_change(sender, instance: ProblemListItem, **kwargs) -> None:
+    # Private lists are skipped when the debounced pre-render runs.
+    queue_pdf_prerender(PDF_PRERENDER_PROBLEM_LIST, instance.problem_list_id)
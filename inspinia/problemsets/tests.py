@@ -332,26 +332,30 @@ def test_replace_problem_list_items_preserves_existing_inactive_rows_when_submit
     assert problem_list.items.count() == 0
 
 
-def test_problem_list_problem_search_requires_author_and_returns_active_problem_rows(client):
+def test_problem_list_problem_search_requires_author_and_returns_active_problem_rows(
+    client,
+    django_capture_on_commit_callbacks,
+):
     author = UserFactory()
     other_user = UserFactory()
     client.force_login(author)
     problem_list = _problem_list(author=author)
-    existing_problem = _problem(problem="P1", topic="ALG", mohs=5)
-    author_user_mohs = 17
-    searchable_year = 2025
-    searchable_mohs = 12
-    searchable_problem = _problem(
-        problem="P2",
-        contest="USAMO",
-        year=searchable_year,
-        topic="GEO",
-        mohs=searchable_mohs,
-    )
-    searchable_statement = _statement(searchable_problem)
-    inactive_problem = _problem(problem="P3", contest="USAMO", year=2024, is_active=False)
-    ProblemListItem.objects.create(problem_list=problem_list, problem=existing_problem, position=1)
-    ProblemTopicTechnique.objects.create(record=searchable_problem, technique="ANGLE CHASE", domains=["GEO"])
+    with django_capture_on_commit_callbacks(execute=True):
+        existing_problem = _problem(problem="P1", topic="ALG", mohs=5)
+        author_user_mohs = 17
+        searchable_year = 2025
+        searchable_mohs = 12
+        searchable_problem = _problem(
+            problem="P2",
+            contest="USAMO",
+            year=searchable_year,
+            topic="GEO",
+            mohs=searchable_mohs,
+        )
+        searchable_statement = _statement(searchable_problem)
+        inactive_problem = _problem(problem="P3", contest="USAMO", year=2024, is_active=False)
+        ProblemListItem.objects.create(problem_list=problem_list, problem=existing_problem, position=1)
+        ProblemTopicTechnique.objects.create(record=searchable_problem, technique="ANGLE CHASE", domains=["GEO"])
     UserProblemDifficultyRating.objects.create(user=author, statement=searchable_statement, rating=author_user_mohs)
     UserProblemDifficultyRating.objects.create(user=other_user, statement=searchable_statement, rating=44)
 
@@ -487,6 +491,72 @@ def test_problem_list_problem_search_filters_facets_ranks_and_paginates(client):
     assert [row["problem_uuid"] for row in next_payload["results"]] == [str(second_match.problem_uuid)]
 
 
+def test_problem_list_problem_search_caches_facets_until_search_documents_change(
+    client,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    from inspinia.problemsets import selectors
+
+    author = UserFactory()
+    client.force_login(author)
+    problem_list = _problem_list(author=author)
+    with django_capture_on_commit_callbacks(execute=True):
+        _problem(contest="Balkan MO", problem="P1")
+    search_url = reverse("problemsets:problem_search", args=[problem_list.list_uuid])
+    facet_builds = []
+    build_facets = selectors._problem_search_facets  # noqa: SLF001
+
+    def _recording_build_facets(queryset):
+        facet_builds.append(queryset)
+        return build_facets(queryset)
+
+    monkeypatch.setattr(selectors, "_problem_search_facets", _recording_build_facets)
+
+    first_payload = client.get(search_url, {"q": "balkan"}).json()
+    offset_payload = client.get(search_url, {"q": "  BALKAN ", "offset": "1"}).json()
+    with django_capture_on_commit_callbacks(execute=True):
+        _problem(contest="Balkan MO", problem="P2")
+    refreshed_payload = client.get(search_url, {"q": "balkan"}).json()
+
+    assert len(facet_builds) == EXPECTED_TWO_PROBLEM_SEARCH_MATCHES
+    assert offset_payload["facets"] == first_payload["facets"]
+    assert first_payload["facets"]["contests"] == [{"count": 1, "label": "Balkan MO", "value": "Balkan MO"}]
+    assert refreshed_payload["facets"]["contests"] == [
+        {"count": EXPECTED_TWO_PROBLEM_SEARCH_MATCHES, "label": "Balkan MO", "value": "Balkan MO"},
+    ]
+
+
+def test_problem_list_problem_autocomplete_prefix_matches_labels_and_uuids(client, django_capture_on_commit_callbacks):
+    author = UserFactory()
+    client.force_login(author)
+    problem_list = _problem_list(author=author)
+    with django_capture_on_commit_callbacks(execute=True):
+        balkan = _problem(contest="Balkan MO", problem="P3", year=2023)
+        newer_balkan = _problem(contest="Balkan MO", problem="P3", year=2024)
+        junior = _problem(contest="Junior Balkan MO", problem="P1", year=2024)
+        _problem(contest="Balkan MO", problem="P4", year=2024, is_active=False)
+        ProblemListItem.objects.create(problem_list=problem_list, problem=junior, position=1)
+    autocomplete_url = reverse("problemsets:problem_autocomplete", args=[problem_list.list_uuid])
+
+    label_payload = client.get(autocomplete_url, {"q": "balkan"}).json()
+    suffix_payload = client.get(autocomplete_url, {"q": "2023 p"}).json()
+    uuid_payload = client.get(autocomplete_url, {"q": str(balkan.problem_uuid)[:8].upper()}).json()
+    with django_capture_on_commit_callbacks(execute=True):
+        _problem(contest="Baltic Way", problem="P2", year=2024)
+    refreshed_payload = client.get(autocomplete_url, {"q": "balt", "limit": "5"}).json()
+
+    assert [row["problem_uuid"] for row in label_payload["results"]] == [
+        str(newer_balkan.problem_uuid),
+        str(balkan.problem_uuid),
+        str(junior.problem_uuid),
+    ]
+    assert [row["is_in_list"] for row in label_payload["results"]] == [False, False, True]
+    assert [row["problem_label"] for row in suffix_payload["results"]] == ["Balkan MO 2023 P3"]
+    assert str(balkan.problem_uuid) in [row["problem_uuid"] for row in uuid_payload["results"]]
+    assert [row["problem_label"] for row in refreshed_payload["results"]] == ["Baltic Way 2024 P2"]
+
+
 def test_problem_list_problem_search_applies_advanced_filters(client):
     author = UserFactory()
     client.force_login(author)
@@ -536,32 +606,36 @@ def test_problem_list_problem_search_applies_advanced_filters(client):
     assert [row["problem_uuid"] for row in payload["results"]] == [str(matching_problem.problem_uuid)]
 
 
-def test_problem_list_problem_search_includes_problem_and_statement_note_content(client):
+def test_problem_list_problem_search_includes_problem_and_statement_note_content(
+    client,
+    django_capture_on_commit_callbacks,
+):
     author = UserFactory()
     client.force_login(author)
     problem_list = _problem_list(author=author)
-    archive_note_problem = _problem(
-        contest="Balkan MO",
-        core_ideas="Core ideas: Use telescoping after pairing the fractions.",
-        pitfalls="Common pitfalls: Dropping the sign after pairing.",
-        problem="P4",
-        rationale="Rationale: This keeps cancellation visible.",
-        year=2024,
-    )
-    statement_note_problem = _problem(
-        contest="USAMO",
-        core_ideas="Core ideas: Archive fallback.",
-        pitfalls="Common pitfalls: Archive fallback.",
-        problem="P5",
-        rationale="",
-        year=2025,
-    )
-    _statement(
-        statement_note_problem,
-        core_ideas="Core ideas: Prefer the inversion center.",
-        pitfalls="Common pitfalls: Forgetting the orientation.",
-        rationale="Rationale: Inversion makes the cyclic angles visible.",
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        archive_note_problem = _problem(
+            contest="Balkan MO",
+            core_ideas="Core ideas: Use telescoping after pairing the fractions.",
+            pitfalls="Common pitfalls: Dropping the sign after pairing.",
+            problem="P4",
+            rationale="Rationale: This keeps cancellation visible.",
+            year=2024,
+        )
+        statement_note_problem = _problem(
+            contest="USAMO",
+            core_ideas="Core ideas: Archive fallback.",
+            pitfalls="Common pitfalls: Archive fallback.",
+            problem="P5",
+            rationale="",
+            year=2025,
+        )
+        _statement(
+            statement_note_problem,
+            core_ideas="Core ideas: Prefer the inversion center.",
+            pitfalls="Common pitfalls: Forgetting the orientation.",
+            rationale="Rationale: Inversion makes the cyclic angles visible.",
+        )
 
     archive_response = client.get(
         reverse("problemsets:problem_search", args=[problem_list.list_uuid]),
@@ -592,6 +666,33 @@ def test_problem_list_problem_search_includes_problem_and_statement_note_content
     ]
 
 
+def test_problem_list_problem_search_matches_statement_latex_and_techniques(
+    client,
+    django_capture_on_commit_callbacks,
+):
+    author = UserFactory()
+    client.force_login(author)
+    problem_list = _problem_list(author=author)
+    with django_capture_on_commit_callbacks(execute=True):
+        latex_problem = _problem(contest="EGMO", problem="P2", year=2023)
+        _statement(latex_problem, statement_latex="Let $ABCD$ be a cyclic quadrilateral with $AB = CD$.")
+        technique_problem = _problem(contest="ISL", problem="G3", year=2022)
+        ProblemTopicTechnique.objects.create(record=technique_problem, technique="Spiral similarity", domains=["GEO"])
+    search_url = reverse("problemsets:problem_search", args=[problem_list.list_uuid])
+
+    latex_response = client.get(search_url, {"q": "Cyclic quadrilateral"})
+    technique_response = client.get(search_url, {"q": "spiral SIMILARITY"})
+    with django_capture_on_commit_callbacks(execute=True):
+        technique_problem.topic_techniques.all().delete()
+    removed_response = client.get(search_url, {"q": "spiral"})
+
+    assert [row["problem_uuid"] for row in latex_response.json()["results"]] == [str(latex_problem.problem_uuid)]
+    assert [row["problem_uuid"] for row in technique_response.json()["results"]] == [
+        str(technique_problem.problem_uuid),
+    ]
+    assert removed_response.json()["results"] == []
+
+
 def test_problem_list_save_items_endpoint_requires_author_and_replaces_sequence(client):
     author = UserFactory()
     other_user = UserFactory()
@@ -1143,13 +1244,12 @@ def test_public_share_pdf_returns_attachment_when_compile_succeeds(monkeypatch,
     )
     captured = {}
 
-    def _compile_problem_list(problem_list_arg, item_rows, params):
-        captured["problem_list"] = problem_list_arg
-        captured["item_rows"] = item_rows
-        captured["params"] = params
+    def _compile_tex(tex_source, *, timeout, latex_binary):
+        captured["tex_source"] = tex_source
+        captured["latex_binary"] = latex_binary
         return b"%PDF-1.4\n"
 
-    monkeypatch.setattr("inspinia.problemsets.views.compile_problem_list_to_pdf", _compile_problem_list)
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _compile_tex)
 
     response = client.get(reverse("problemsets:public_pdf", args=[problem_list.share_token, problem_list.public_slug]))
 
@@ -1157,9 +1257,9 @@ def test_public_share_pdf_returns_attachment_when_compile_succeeds(monkeypatch,
     assert response["Content-Type"] == "application/pdf"
     assert "attachment" in response["Content-Disposition"]
     assert "mock-paper.pdf" in response["Content-Disposition"]
-    assert captured["problem_list"] == problem_list
-    assert captured["item_rows"][0]["display_label"] == "Challenge 1"
-    assert captured["params"].latex_binary == settings.SOLUTION_PDF_LATEX_BINARY
+    assert "Challenge 1" in captured["tex_source"]
+    assert "Mock paper" in captured["tex_source"]
+    assert captured["latex_binary"] == settings.SOLUTION_PDF_LATEX_BINARY
 
 
 def test_public_share_pdf_requires_login(client):
@@ -1186,7 +1286,7 @@ def test_public_share_pdf_tool_missing_returns_503(monkeypatch, client):
         msg = "latexmk not found"
         raise SolutionPdfToolError(msg)
 
-    monkeypatch.setattr("inspinia.problemsets.views.compile_problem_list_to_pdf", _boom)
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _boom)
 
     response = client.get(reverse("problemsets:public_pdf", args=[problem_list.share_token, problem_list.public_slug]))
 
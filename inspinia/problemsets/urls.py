@@ -6,6 +6,7 @@ from inspinia.problemsets.views import detail_view
 from inspinia.problemsets.views import discover_view
 from inspinia.problemsets.views import edit_view
 from inspinia.problemsets.views import my_lists_view
+from inspinia.problemsets.views import problem_autocomplete_view
 from inspinia.problemsets.views import problem_search_view
 from inspinia.problemsets.views import public_detail_view
 from inspinia.problemsets.views import public_pdf_view
@@ -24,6 +25,7 @@ urlpatterns = [
     path("<uuid:list_uuid>/", detail_view, name="detail"),
     path("<uuid:list_uuid>/edit/", edit_view, name="edit"),
     path("<uuid:list_uuid>/problem-search/", problem_search_view, name="problem_search"),
+    path("<uuid:list_uuid>/problem-autocomplete/", problem_autocomplete_view, name="problem_autocomplete"),
     path("<uuid:list_uuid>/add/", add_item_view, name="add_item"),
     path("<uuid:list_uuid>/items/save/", save_items_view, name="save_items"),
     path("<uuid:list_uuid>/items/<int:item_id>/remove/", remove_item_view, name="remove_item"),
@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-from io import BytesIO
-
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import FileResponse
@@ -24,11 +21,10 @@ from inspinia.problemsets.forms import ProblemListAddProblemForm
 from inspinia.problemsets.forms import ProblemListForm
 from inspinia.problemsets.forms import ProblemListSearchForm
 from inspinia.problemsets.models import ProblemList
-from inspinia.problemsets.pdf_latex import ProblemListPdfCompileParams
-from inspinia.problemsets.pdf_latex import compile_problem_list_to_pdf
 from inspinia.problemsets.selectors import author_label
 from inspinia.problemsets.selectors import discover_problem_lists_queryset
 from inspinia.problemsets.selectors import my_problem_lists_queryset
+from inspinia.problemsets.selectors import problem_autocomplete_payload
 from inspinia.problemsets.selectors import problem_list_item_rows
 from inspinia.problemsets.selectors import problem_list_picker_rows
 from inspinia.problemsets.selectors import problem_list_summary_rows
@@ -41,9 +37,14 @@ from inspinia.problemsets.services import reorder_problem_list_items
 from inspinia.problemsets.services import replace_problem_list_items
 from inspinia.problemsets.services import set_problem_list_visibility
 from inspinia.problemsets.services import toggle_problem_list_vote
+from inspinia.solutions.pdf_compile_queue import PDF_COMPILE_RETRY_AFTER_SECONDS
+from inspinia.solutions.pdf_compile_queue import SolutionPdfCompilePendingError
+from inspinia.solutions.pdf_compile_queue import SolutionPdfQueueFullError
+from inspinia.solutions.pdf_compile_queue import run_pdf_compile
 from inspinia.solutions.pdf_latex import SolutionPdfCompileError
 from inspinia.solutions.pdf_latex import SolutionPdfError
 from inspinia.solutions.pdf_latex import SolutionPdfToolError
+from inspinia.solutions.pdf_prerender import problem_list_pdf_download_request
 from inspinia.users.roles import user_can_access_app_features
 from inspinia.users.roles import user_has_admin_role
 
@@ -175,6 +176,13 @@ def add_item_view(request, list_uuid):
     return redirect(redirect_url)
 
 
+@login_required
+@require_GET
+def problem_autocomplete_view(request, list_uuid):
+    problem_list = get_object_or_404(ProblemList, list_uuid=list_uuid, author=request.user)
+    return JsonResponse(problem_autocomplete_payload(problem_list, request.GET))
+
+
 @login_required
 @require_GET
 def problem_search_view(request, list_uuid):
@@ -315,14 +323,35 @@ def public_detail_view(request, share_token, slug):
 def public_pdf_view(request, share_token, slug):
     problem_list = _get_public_problem_list_or_404(share_token, slug)
     try:
-        pdf_bytes = compile_problem_list_to_pdf(
-            problem_list,
-            problem_list_item_rows(problem_list),
-            ProblemListPdfCompileParams(
-                timeout=settings.SOLUTION_PDF_LATEX_TIMEOUT,
-                latex_binary=settings.SOLUTION_PDF_LATEX_BINARY,
-            ),
+        pdf_path = run_pdf_compile(
+            problem_list_pdf_download_request(problem_list),
+            user_id=request.user.pk,
+            previous_job_id=request.GET.get("job", ""),
+        )
+    except SolutionPdfCompilePendingError as exc:
+        return render(
+            request,
+            "problemsets/pdf-pending.html",
+            {
+                "download_url": request.path,
+                "job": exc.job,
+                "problem_list": problem_list,
+                "status_url": reverse("solutions:pdf_compile_status", args=[exc.job.job_id]),
+            },
+            status=202,
+        )
+    except SolutionPdfQueueFullError as exc:
+        response = render(
+            request,
+            "problemsets/pdf-unavailable.html",
+            {
+                "problem_list": problem_list,
+                "reason": str(exc),
+            },
+            status=503,
         )
+        response["Retry-After"] = str(PDF_COMPILE_RETRY_AFTER_SECONDS)
+        return response
     except SolutionPdfToolError as exc:
         return render(
             request,
@@ -360,7 +389,7 @@ def public_pdf_view(request, share_token, slug):
 
     filename = f"{slugify(problem_list.title) or 'problem-list'}.pdf"
     return FileResponse(
-        BytesIO(pdf_bytes),
+        pdf_path.open("rb"),
         as_attachment=True,
         filename=filename,
         content_type="application/pdf",
@@ -1,6 +1,5 @@
 from django.contrib import admin
 from django.contrib import messages
-from django.db.models import Prefetch
 
 from .models import Assessment
 from .models import ImportBatch
@@ -12,7 +11,7 @@ from .models import School
 from .models import Student
 from .models import StudentResult
 from .models import StudentSelectionStatus
-from .services.ranking_compute import compute_rank_rows
+from .services.ranking_compute_batch import compute_rank_rows_batch
 from .services.ranking_snapshot_store import clear_ranking_snapshots
 from .services.ranking_snapshot_store import lock_formula_for_snapshot_refresh
 from .services.ranking_snapshot_store import store_ranking_snapshots
@@ -87,19 +86,8 @@ class RankingFormulaAdmin(admin.ModelAdmin):
                     )
                     continue
 
-                assessment_ids = list(
-                    locked_formula.items.order_by("sort_order", "id").values_list("assessment_id", flat=True),
-                )
-                students = Student.objects.filter(active=True).prefetch_related(
-                    Prefetch(
-                        "results",
-                        queryset=StudentResult.objects.filter(assessment_id__in=assessment_ids).order_by(
-                            "assessment_id",
-                            "id",
-                        ),
-                    ),
-                )
-                rows = compute_rank_rows(formula=locked_formula, students=students)
+                students = Student.objects.filter(active=True).only("id", "normalized_name")
+                rows = compute_rank_rows_batch(formula=locked_formula, students=students)
                 snapshot_count += store_ranking_snapshots(
                     formula=locked_formula,
                     rows=rows,
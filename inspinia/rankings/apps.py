@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class RankingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "inspinia.rankings"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import inspinia.rankings.signals  # noqa: F401
@@ -3,7 +3,6 @@
 
 from __future__ import annotations
 
-import io
 from contextlib import suppress
 from dataclasses import dataclass
 from dataclasses import field
@@ -11,7 +10,6 @@ from datetime import date
 from datetime import datetime
 from decimal import Decimal
 from decimal import InvalidOperation
-from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import BinaryIO
@@ -20,15 +18,25 @@ import pandas as pd
 from django.db import transaction
 from django.utils import timezone
 
+from inspinia.pages.tabular_reader import TABULAR_CHUNK_SIZE
+from inspinia.pages.tabular_reader import concat_tabular_chunks
+from inspinia.pages.tabular_reader import dataframe_chunks
+from inspinia.pages.tabular_reader import iter_tabular_chunks
+from inspinia.rankings.imports.bulk_apply import bulk_upsert
+from inspinia.rankings.imports.student_index import StudentIndex
 from inspinia.rankings.models import Assessment
 from inspinia.rankings.models import ImportBatch
 from inspinia.rankings.models import ImportRowIssue
 from inspinia.rankings.models import Student
 from inspinia.rankings.models import StudentResult
 from inspinia.rankings.models import normalize_whitespace
+from inspinia.rankings.services.ranking_snapshot_refresh import refresh_rankings_for_results
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
     from collections.abc import Mapping
+    from pathlib import Path
 
     from pandas import Series
 
@@ -50,6 +58,8 @@ PREVIEW_STATUS_INVALID = "invalid"
 ISSUE_CODE_MISSING_STUDENT = "missing_student"
 ISSUE_CODE_INVALID = "invalid"
 SCORE_QUANTIZER = Decimal("0.01")
+# A re-imported result only counts as updated when one of these differs.
+RESULT_COMPARE_FIELDS = ("raw_score", "medal", "band", "status_text", "remarks", "source_url")
 
 
 class AssessmentResultImportValidationError(ValueError):
@@ -90,6 +100,7 @@ class AssessmentResultImportApplyResult:
     invalid_count: int = 0
     created_count: int = 0
     updated_count: int = 0
+    unchanged_count: int = 0
     rows: list[PreparedAssessmentResultRow] = field(default_factory=list)
 
     @property
@@ -106,14 +117,12 @@ class _StudentResolution:
 
 def assessment_result_dataframe_from_excel(source: Path | str | BinaryIO | bytes) -> pd.DataFrame:
     """Load an Excel workbook and normalize its column labels."""
-    dataframe = _read_tabular_source(source, prefer_excel=True)
-    return _normalize_dataframe_columns(dataframe)
+    return assessment_result_dataframe_from_source(source)
 
 
 def assessment_result_dataframe_from_csv(source: Path | str | BinaryIO | bytes) -> pd.DataFrame:
     """Load a CSV workbook and normalize its column labels."""
-    dataframe = _read_tabular_source(source, prefer_excel=False)
-    return _normalize_dataframe_columns(dataframe)
+    return assessment_result_dataframe_from_source(source)
 
 
 def assessment_result_dataframe_from_source(source: Path | str | BinaryIO | bytes | pd.DataFrame) -> pd.DataFrame:
@@ -121,7 +130,21 @@ def assessment_result_dataframe_from_source(source: Path | str | BinaryIO | byte
     if isinstance(source, pd.DataFrame):
         return _normalize_dataframe_columns(source.copy())
 
-    return _normalize_dataframe_columns(_read_tabular_source(source))
+    return concat_tabular_chunks(iter_assessment_result_chunks(source))
+
+
+def iter_assessment_result_chunks(
+    source: Path | str | BinaryIO | bytes,
+    *,
+    chunk_size: int = TABULAR_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Stream an upload as normalized dataframe chunks for preview/apply.
+
+    Cells arrive untyped, so identifiers such as ``00123`` keep their leading
+    zeros; row preparation parses scores and text from them explicitly.
+    """
+    for chunk in iter_tabular_chunks(source, chunk_size=chunk_size):
+        yield _normalize_dataframe_columns(chunk)
 
 
 def preview_assessment_result_import(
@@ -222,107 +245,122 @@ def import_assessment_result_dataframe(  # noqa: PLR0913
 
 
 def prepare_assessment_result_rows(
-    df: pd.DataFrame,
+    df: pd.DataFrame | Iterable[pd.DataFrame],
     *,
     column_map: Mapping[str, str] | None = None,
 ) -> list[PreparedAssessmentResultRow]:
-    normalized_df = _normalize_dataframe_columns(df.copy())
+    """Match and parse every row; ``df`` may be one dataframe or a stream of chunks."""
     resolved_column_map = _normalize_column_map(column_map)
-    student_identifier_column = resolved_column_map["student_identifier"]
-    if student_identifier_column not in normalized_df.columns:
-        msg = (
-            f"Missing required column: {student_identifier_column}. "
-            f"Found columns: {list(normalized_df.columns)}"
-        )
-        raise AssessmentResultImportValidationError(msg)
-
+    student_index: StudentIndex | None = None
     student_cache: dict[str, _StudentResolution] = {}
     prepared_rows: list[PreparedAssessmentResultRow] = []
-
-    for row_number, (_, row) in enumerate(normalized_df.iterrows(), start=2):
-        row_data = _json_safe_mapping(row.to_dict())
-        student_identifier = _cell_text(_row_value(row, resolved_column_map, "student_identifier"))
-        if not student_identifier:
+    row_number = 1
+
+    for chunk in dataframe_chunks(df):
+        normalized_df = _normalize_dataframe_columns(chunk.copy())
+        if student_index is None:
+            _require_student_identifier_column(normalized_df, column_map=resolved_column_map)
+            student_index = StudentIndex.load()
+        for _, row in normalized_df.iterrows():
+            row_number += 1
             prepared_rows.append(
-                PreparedAssessmentResultRow(
+                _prepare_row(
+                    row,
                     row_number=row_number,
-                    status=PREVIEW_STATUS_MISSING_STUDENT,
-                    student_identifier="",
-                    student_id=None,
-                    raw_score=None,
-                    medal="",
-                    band="",
-                    status_text="",
-                    remarks="",
-                    source_url="",
-                    issue_code=ISSUE_CODE_MISSING_STUDENT,
-                    issue_message="Missing student identifier.",
-                    raw_row_json=row_data,
+                    column_map=resolved_column_map,
+                    student_index=student_index,
+                    student_cache=student_cache,
                 ),
             )
-            continue
 
-        resolution = _resolve_student(student_identifier, student_cache=student_cache)
-        if resolution.student is None:
-            prepared_rows.append(
-                PreparedAssessmentResultRow(
-                    row_number=row_number,
-                    status=resolution.status,
-                    student_identifier=student_identifier,
-                    student_id=None,
-                    raw_score=None,
-                    medal="",
-                    band="",
-                    status_text="",
-                    remarks="",
-                    source_url="",
-                    issue_code=ISSUE_CODE_MISSING_STUDENT
-                    if resolution.status == PREVIEW_STATUS_MISSING_STUDENT
-                    else ISSUE_CODE_INVALID,
-                    issue_message=resolution.issue_message,
-                    raw_row_json=row_data,
-                ),
-            )
-            continue
+    return prepared_rows
 
-        raw_score, raw_score_error = _parse_decimal_cell(_row_value(row, resolved_column_map, "raw_score"))
-        if raw_score_error is not None:
-            prepared_rows.append(
-                PreparedAssessmentResultRow(
-                    row_number=row_number,
-                    status=PREVIEW_STATUS_INVALID,
-                    student_identifier=student_identifier,
-                    student_id=resolution.student.id,
-                    raw_score=None,
-                    medal="",
-                    band="",
-                    status_text="",
-                    remarks="",
-                    source_url="",
-                    issue_code=ISSUE_CODE_INVALID,
-                    issue_message=raw_score_error,
-                    raw_row_json=row_data,
-                ),
-            )
-            continue
 
-        prepared_rows.append(
-            PreparedAssessmentResultRow(
-                row_number=row_number,
-                status=PREVIEW_STATUS_MATCHED,
-                student_identifier=student_identifier,
-                student_id=resolution.student.id,
-                raw_score=raw_score,
-                medal=_optional_whitespace_text(_row_value(row, resolved_column_map, "medal")),
-                band=_optional_whitespace_text(_row_value(row, resolved_column_map, "band")),
-                status_text=_optional_whitespace_text(_row_value(row, resolved_column_map, "status_text")),
-                remarks=_optional_text(_row_value(row, resolved_column_map, "remarks"), collapse_whitespace=False),
-                source_url=_optional_whitespace_text(_row_value(row, resolved_column_map, "source_url")),
-                raw_row_json=row_data,
-            ),
+def _require_student_identifier_column(df: pd.DataFrame, *, column_map: Mapping[str, str]) -> None:
+    student_identifier_column = column_map["student_identifier"]
+    if student_identifier_column not in df.columns:
+        msg = f"Missing required column: {student_identifier_column}. Found columns: {list(df.columns)}"
+        raise AssessmentResultImportValidationError(msg)
+
+
+def _prepare_row(
+    row: Series,
+    *,
+    row_number: int,
+    column_map: Mapping[str, str],
+    student_index: StudentIndex,
+    student_cache: dict[str, _StudentResolution],
+) -> PreparedAssessmentResultRow:
+    row_data = _json_safe_mapping(row.to_dict())
+    student_identifier = _cell_text(_row_value(row, column_map, "student_identifier"))
+    if not student_identifier:
+        return PreparedAssessmentResultRow(
+            row_number=row_number,
+            status=PREVIEW_STATUS_MISSING_STUDENT,
+            student_identifier="",
+            student_id=None,
+            raw_score=None,
+            medal="",
+            band="",
+            status_text="",
+            remarks="",
+            source_url="",
+            issue_code=ISSUE_CODE_MISSING_STUDENT,
+            issue_message="Missing student identifier.",
+            raw_row_json=row_data,
         )
 
-    return prepared_rows
+    resolution = _resolve_student(student_identifier, student_index=student_index, student_cache=student_cache)
+    if resolution.student is None:
+        return PreparedAssessmentResultRow(
+            row_number=row_number,
+            status=resolution.status,
+            student_identifier=student_identifier,
+            student_id=None,
+            raw_score=None,
+            medal="",
+            band="",
+            status_text="",
+            remarks="",
+            source_url="",
+            issue_code=ISSUE_CODE_MISSING_STUDENT
+            if resolution.status == PREVIEW_STATUS_MISSING_STUDENT
+            else ISSUE_CODE_INVALID,
+            issue_message=resolution.issue_message,
+            raw_row_json=row_data,
+        )
+
+    raw_score, raw_score_error = _parse_decimal_cell(_row_value(row, column_map, "raw_score"))
+    if raw_score_error is not None:
+        return PreparedAssessmentResultRow(
+            row_number=row_number,
+            status=PREVIEW_STATUS_INVALID,
+            student_identifier=student_identifier,
+            student_id=resolution.student.id,
+            raw_score=None,
+            medal="",
+            band="",
+            status_text="",
+            remarks="",
+            source_url="",
+            issue_code=ISSUE_CODE_INVALID,
+            issue_message=raw_score_error,
+            raw_row_json=row_data,
+        )
+
+    return PreparedAssessmentResultRow(
+        row_number=row_number,
+        status=PREVIEW_STATUS_MATCHED,
+        student_identifier=student_identifier,
+        student_id=resolution.student.id,
+        raw_score=raw_score,
+        medal=_optional_whitespace_text(_row_value(row, column_map, "medal")),
+        band=_optional_whitespace_text(_row_value(row, column_map, "band")),
+        status_text=_optional_whitespace_text(_row_value(row, column_map, "status_text")),
+        remarks=_optional_text(_row_value(row, column_map, "remarks"), collapse_whitespace=False),
+        source_url=_optional_whitespace_text(_row_value(row, column_map, "source_url")),
+        raw_row_json=row_data,
+    )
 
 
 def _apply_rows(  # noqa: PLR0913
@@ -340,30 +378,33 @@ def _apply_rows(  # noqa: PLR0913
     result.missing_student_count = sum(1 for row in result.rows if row.status == PREVIEW_STATUS_MISSING_STUDENT)
     result.invalid_count = sum(1 for row in result.rows if row.status == PREVIEW_STATUS_INVALID)
 
-    with transaction.atomic():
-        for row in result.rows:
-            if row.status != PREVIEW_STATUS_MATCHED:
-                continue
+    imported_at = timezone.now()
+    incoming = {
+        (row.student_id, assessment.id): {
+            "raw_score": row.raw_score,
+            "medal": row.medal,
+            "band": row.band,
+            "status_text": row.status_text,
+            "remarks": row.remarks,
+            "source_url": row.source_url,
+            "source_file_name": resolved_source_file_name,
+            "imported_by": imported_by,
+            "imported_at": imported_at,
+        }
+        for row in result.rows
+        if row.status == PREVIEW_STATUS_MATCHED
+    }
 
-            _, created = StudentResult.objects.update_or_create(
-                student_id=row.student_id,
-                assessment=assessment,
-                defaults={
-                    "raw_score": row.raw_score,
-                    "medal": row.medal,
-                    "band": row.band,
-                    "status_text": row.status_text,
-                    "remarks": row.remarks,
-                    "source_url": row.source_url,
-                    "source_file_name": resolved_source_file_name,
-                    "imported_by": imported_by,
-                    "imported_at": timezone.now(),
-                },
-            )
-            if created:
-                result.created_count += 1
-            else:
-                result.updated_count += 1
+    with transaction.atomic():
+        upsert = bulk_upsert(
+            StudentResult,
+            incoming,
+            key_fields=("student_id", "assessment_id"),
+            compare_fields=RESULT_COMPARE_FIELDS,
+        )
+        result.created_count = upsert.counts.inserted
+        result.updated_count = upsert.counts.updated
+        result.unchanged_count = upsert.counts.unchanged
 
         _save_batch_result(
             batch=batch,
@@ -377,6 +418,11 @@ def _apply_rows(  # noqa: PLR0913
             status=_apply_batch_status(result),
         )
 
+    refresh_rankings_for_results(
+        assessment_ids=[assessment.id],
+        student_ids=[student_id for student_id, _assessment_id in upsert.written_keys],
+    )
+
 
 def _finalize_preview(
     *,
@@ -448,6 +494,7 @@ def _build_summary(
         "invalid_count": result.invalid_count,
         "created_count": getattr(result, "created_count", 0),
         "updated_count": getattr(result, "updated_count", 0),
+        "unchanged_count": getattr(result, "unchanged_count", 0),
         "upserted_count": getattr(result, "upserted_count", 0),
         "source_file_name": source_file_name,
         "column_map": _normalize_column_map(column_map),
@@ -488,47 +535,19 @@ def _normalize_dataframe_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _read_tabular_source(source: Path | str | BinaryIO | bytes, *, prefer_excel: bool = True) -> pd.DataFrame:  # noqa: PLR0911
-    if isinstance(source, bytes):
-        buffer = io.BytesIO(source)
-        return _read_tabular_source(buffer, prefer_excel=prefer_excel)
-
-    if isinstance(source, (str, Path)):
-        path = Path(source)
-        suffix = path.suffix.lower()
-        if suffix in {".csv", ".tsv"}:
-            return pd.read_csv(path)
-        return pd.read_excel(path)
-
-    if prefer_excel:
-        try:
-            return pd.read_excel(source)
-        except (ValueError, TypeError, OSError):
-            _rewind_source(source)
-            return pd.read_csv(source)
-
-    try:
-        return pd.read_csv(source)
-    except (ValueError, TypeError, OSError):
-        _rewind_source(source)
-        return pd.read_excel(source)
-
-
-def _rewind_source(source: BinaryIO) -> None:
-    seek = getattr(source, "seek", None)
-    if callable(seek):
-        with suppress(Exception):
-            seek(0)
-
-
-def _resolve_student(identifier: str, *, student_cache: dict[str, _StudentResolution]) -> _StudentResolution:
+def _resolve_student(
+    identifier: str,
+    *,
+    student_index: StudentIndex,
+    student_cache: dict[str, _StudentResolution],
+) -> _StudentResolution:
     cache_key = identifier.casefold()
     cached = student_cache.get(cache_key)
     if cached is not None:
         return cached
 
     for lookup in ("external_code", "legacy_code", "full_name"):
-        matches = list(Student.objects.filter(**{f"{lookup}__iexact": identifier}).order_by("id")[:2])
+        matches = student_index.iexact(lookup, identifier)
         if len(matches) == 1:
             resolution = _StudentResolution(student=matches[0], status=PREVIEW_STATUS_MATCHED)
             student_cache[cache_key] = resolution
@@ -543,7 +562,7 @@ def _resolve_student(identifier: str, *, student_cache: dict[str, _StudentResolu
             return resolution
 
     if identifier.isdigit():
-        student = Student.objects.filter(pk=int(identifier)).first()
+        student = student_index.get(int(identifier))
         if student is not None:
             resolution = _StudentResolution(student=student, status=PREVIEW_STATUS_MATCHED)
             student_cache[cache_key] = resolution
@@ -656,6 +675,7 @@ __all__ = [  # noqa: RUF022
     "assessment_result_dataframe_from_excel",
     "assessment_result_dataframe_from_source",
     "import_assessment_result_dataframe",
+    "iter_assessment_result_chunks",
     "prepare_assessment_result_rows",
     "preview_assessment_result_import",
     "preview_assessment_results_dataframe",
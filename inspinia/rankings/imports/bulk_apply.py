@@ -0,0 +1,184 @@
+# ruff: noqa: INP001
+"""Chunked bulk writes shared by the ranking import apply paths.
+
+Applying an import used to cost one ``update_or_create``/``save()`` round trip
+per row and entity. ``bulk_upsert`` instead loads the existing rows for every
+incoming natural key in a few queries, diffs the incoming values in memory and
+writes only what changed: new keys through ``bulk_create(update_conflicts=True)``
+(so a concurrent insert of the same key turns into an update) and changed rows
+through ``bulk_update``, both in chunks of ``BULK_APPLY_BATCH_SIZE``.
+
+Bulk writes skip ``save()`` and model signals, so callers normalize values the
+way ``save()`` would and refresh derived data (ranking snapshots, the snapshot
+read model) themselves.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from itertools import batched
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
+    from django.db.models import Manager
+    from django.db.models import Model
+
+BULK_APPLY_BATCH_SIZE = 500
+
+
+@dataclass(slots=True)
+class BulkApplyCounts:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated
+
+    def to_summary_json(self) -> dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated, "unchanged": self.unchanged}
+
+
+@dataclass(slots=True)
+class BulkUpsertResult:
+    counts: BulkApplyCounts = field(default_factory=BulkApplyCounts)
+    written_keys: list[tuple] = field(default_factory=list)
+
+
+def bulk_upsert(
+    model: type[Model],
+    rows: Mapping[tuple, Mapping[str, Any]],
+    *,
+    key_fields: tuple[str, ...],
+    compare_fields: tuple[str, ...],
+    update_existing: bool = True,
+) -> BulkUpsertResult:
+    """Insert missing keys and update existing rows whose ``compare_fields`` changed.
+
+    ``rows`` maps natural-key tuples (values of ``key_fields``, which must be
+    covered by a unique constraint) to the other field values to write. Fields
+    outside ``compare_fields``, such as ``imported_at``, are written along with
+    a change but never cause one. With ``update_existing=False`` existing rows
+    are left as they are, like ``get_or_create``.
+    """
+    result = BulkUpsertResult()
+    existing_by_key = _load_existing(model, rows.keys(), key_fields=key_fields)
+    now = timezone.now()
+    creates: list[Model] = []
+    updates: list[Model] = []
+    update_fields: set[str] = set()
+
+    for key, values in rows.items():
+        instance = existing_by_key.get(key)
+        if instance is None:
+            creates.append(model(**dict(zip(key_fields, key, strict=True)), **values))
+            result.written_keys.append(key)
+            continue
+        if not update_existing or all(
+            getattr(instance, field_name) == values[field_name]
+            for field_name in compare_fields
+            if field_name in values
+        ):
+            result.counts.unchanged += 1
+            continue
+        for field_name, value in values.items():
+            setattr(instance, field_name, value)
+        update_fields.update(values)
+        updates.append(instance)
+        result.written_keys.append(key)
+
+    if creates:
+        write_fields = sorted({field_name for values in rows.values() for field_name in values})
+        conflict_options: dict[str, Any] = (
+            {"update_conflicts": True, "unique_fields": list(key_fields), "update_fields": write_fields}
+            if update_existing and write_fields
+            else {"ignore_conflicts": True}
+        )
+        _manager(model).bulk_create(creates, batch_size=BULK_APPLY_BATCH_SIZE, **conflict_options)
+    bulk_save(model, updates=updates, fields=update_fields, now=now)
+    result.counts.inserted = len(creates)
+    result.counts.updated = len(updates)
+    return result
+
+
+def bulk_save(
+    model: type[Model],
+    *,
+    creates: Iterable[Model] = (),
+    updates: Iterable[Model] = (),
+    fields: Iterable[str] = (),
+    now=None,
+) -> None:
+    """``bulk_create`` new instances and ``bulk_update`` edited ones, stamping ``updated_at``."""
+    create_list = list(creates)
+    if create_list:
+        _manager(model).bulk_create(create_list, batch_size=BULK_APPLY_BATCH_SIZE)
+
+    update_list = list(updates)
+    field_names = set(fields)
+    if not update_list or not field_names:
+        return
+    if _has_field(model, "updated_at"):
+        stamp = now or timezone.now()
+        for instance in update_list:
+            instance.updated_at = stamp  # type: ignore[attr-defined]
+        field_names.add("updated_at")
+    _manager(model).bulk_update(update_list, sorted(field_names), batch_size=BULK_APPLY_BATCH_SIZE)
+
+
+def assign_changed_fields(instance: Model, values: Mapping[str, Any]) -> set[str]:
+    """Set the differing ``values`` on ``instance`` and return the changed field names."""
+    changed: set[str] = set()
+    for field_name, value in values.items():
+        if getattr(instance, field_name) != value:
+            setattr(instance, field_name, value)
+            changed.add(field_name)
+    return changed
+
+
+def _load_existing(
+    model: type[Model],
+    keys: Iterable[tuple],
+    *,
+    key_fields: tuple[str, ...],
+) -> dict[tuple, Model]:
+    wanted_keys = set(keys)
+    if not wanted_keys:
+        return {}
+
+    # Chunk on the leading key field; the others narrow each chunk with an IN filter.
+    other_filters = {
+        f"{field_name}__in": {key[index] for key in wanted_keys}
+        for index, field_name in enumerate(key_fields[1:], start=1)
+    }
+    leading_values: set[Hashable] = {key[0] for key in wanted_keys}
+    existing_by_key: dict[tuple, Model] = {}
+    for chunk in batched(leading_values, BULK_APPLY_BATCH_SIZE):
+        for instance in _manager(model).filter(**{f"{key_fields[0]}__in": chunk}, **other_filters):
+            key = tuple(getattr(instance, field_name) for field_name in key_fields)
+            if key in wanted_keys:
+                existing_by_key[key] = instance
+    return existing_by_key
+
+
+def _manager(model: type[Model]) -> Manager:
+    # Model does not declare ``objects``; every model has a default manager.
+    return model._default_manager  # noqa: SLF001
+
+
+def _has_field(model: type[Model], field_name: str) -> bool:
+    try:
+        model._meta.get_field(field_name)  # noqa: SLF001
+    except FieldDoesNotExist:
+        return False
+    return True
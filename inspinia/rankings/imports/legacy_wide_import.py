@@ -7,6 +7,8 @@ from dataclasses import dataclass
 from dataclasses import field
 from decimal import Decimal
 from decimal import InvalidOperation
+from itertools import chain
+from typing import TYPE_CHECKING
 from typing import Any
 
 import pandas as pd
@@ -14,6 +16,12 @@ from django.db import transaction
 from django.utils import timezone
 from django.utils.text import slugify
 
+from inspinia.pages.tabular_reader import dataframe_chunks
+from inspinia.rankings.imports.bulk_apply import BULK_APPLY_BATCH_SIZE
+from inspinia.rankings.imports.bulk_apply import assign_changed_fields
+from inspinia.rankings.imports.bulk_apply import bulk_save
+from inspinia.rankings.imports.bulk_apply import bulk_upsert
+from inspinia.rankings.imports.student_index import StudentIndex
 from inspinia.rankings.models import Assessment
 from inspinia.rankings.models import ImportBatch
 from inspinia.rankings.models import ImportRowIssue
@@ -23,6 +31,12 @@ from inspinia.rankings.models import StudentResult
 from inspinia.rankings.models import StudentSelectionStatus
 from inspinia.rankings.models import normalize_name
 from inspinia.rankings.models import normalize_whitespace
+from inspinia.rankings.services.ranking_dashboard import invalidate_ranking_filter_options
+from inspinia.rankings.services.ranking_read_model import refresh_snapshot_read_model
+from inspinia.rankings.services.ranking_snapshot_refresh import refresh_rankings_for_results
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 STUDENT_COLUMN_TOKENS = {
     "active",
@@ -59,6 +73,10 @@ STATUS_VALUE_ALIASES = {
     "watch list": "watchlist",
 }
 
+STAGED_CREATED = "created"
+STAGED_UPDATED = "updated"
+STAGED_UNCHANGED = "unchanged"
+
 AMBIGUOUS_COLUMN_RE = re.compile(r"^(status|selection)(\b|[_\s:-])", flags=re.IGNORECASE)
 
 
@@ -100,13 +118,36 @@ class LegacyWidePreviewResult:
 class LegacyWideImportResult:
     created_students: int = 0
     updated_students: int = 0
+    unchanged_students: int = 0
     created_assessments: int = 0
     created_results: int = 0
+    updated_results: int = 0
+    unchanged_results: int = 0
     created_statuses: int = 0
+    unchanged_statuses: int = 0
     issues: int = 0
     rows: int = 0
 
 
+@dataclass(slots=True)
+class _StagedLegacyWrites:
+    """Rows collected during apply; students are referenced by ``id()`` until they have a pk."""
+
+    student_index: StudentIndex
+    schools_by_normalized_name: dict[str, School] = field(default_factory=dict)
+    students_by_token: dict[int, Student] = field(default_factory=dict)
+    new_students: list[Student] = field(default_factory=list)
+    changed_students: dict[int, Student] = field(default_factory=dict)
+    changed_student_fields: set[str] = field(default_factory=set)
+    assessment_names: dict[str, str] = field(default_factory=dict)
+    results: dict[tuple[int, str], Decimal] = field(default_factory=dict)
+    statuses: dict[tuple[int, str], str] = field(default_factory=dict)
+
+    def stage_status(self, student: Student, status: str, *, notes: str) -> None:
+        # Like get_or_create, the first row naming a status keeps its notes.
+        self.statuses.setdefault((id(student), status), notes)
+
+
 def classify_legacy_wide_columns(
     columns: list[str] | tuple[str, ...] | pd.Index | list[object],
 ) -> LegacyWideColumnClassification:
@@ -129,14 +170,16 @@ def classify_legacy_wide_columns(
 
 def preview_legacy_wide_import(
     *,
-    dataframe: pd.DataFrame,
+    dataframe: pd.DataFrame | Iterable[pd.DataFrame],
     import_batch: ImportBatch,
 ) -> LegacyWidePreviewResult:
-    working_dataframe = dataframe.copy()
-    working_dataframe.columns = [normalize_whitespace(str(column)) for column in working_dataframe.columns]
-    classification = classify_legacy_wide_columns(list(working_dataframe.columns))
+    """Classify the header columns, then build preview rows chunk by chunk."""
+    chunks = dataframe_chunks(dataframe)
+    first_chunk = _normalize_column_labels(next(chunks, pd.DataFrame()))
+    classification = classify_legacy_wide_columns(list(first_chunk.columns))
     preview_rows: list[LegacyWidePreviewRow] = []
     issues: list[LegacyWideCellIssue] = []
+    issue_rows: list[ImportRowIssue] = []
 
     with transaction.atomic():
         for ambiguous_column in classification.ambiguous_columns:
@@ -148,16 +191,22 @@ def preview_legacy_wide_import(
                 raw_value=None,
             )
             issues.append(issue)
-            ImportRowIssue.objects.create(
-                import_batch=import_batch,
-                row_number=1,
-                severity=ImportRowIssue.Severity.WARNING,
-                issue_code=issue.issue_code,
-                message=issue.message,
-                raw_row_json={"column": ambiguous_column},
+            issue_rows.append(
+                ImportRowIssue(
+                    import_batch=import_batch,
+                    row_number=1,
+                    severity=ImportRowIssue.Severity.WARNING,
+                    issue_code=issue.issue_code,
+                    message=issue.message,
+                    raw_row_json={"column": ambiguous_column},
+                ),
             )
 
-        for row_number, raw_row in enumerate(working_dataframe.to_dict(orient="records"), start=2):
+        raw_rows = chain.from_iterable(
+            chunk.to_dict(orient="records")
+            for chunk in chain([first_chunk], map(_normalize_column_labels, chunks))
+        )
+        for row_number, raw_row in enumerate(raw_rows, start=2):
             preview_row = _build_preview_row(
                 row_number=row_number,
                 raw_row=raw_row,
@@ -165,8 +214,8 @@ def preview_legacy_wide_import(
             )
             preview_rows.append(preview_row)
             issues.extend(preview_row.issues)
-            for issue in preview_row.issues:
-                ImportRowIssue.objects.create(
+            issue_rows.extend(
+                ImportRowIssue(
                     import_batch=import_batch,
                     row_number=issue.row_number,
                     severity=ImportRowIssue.Severity.WARNING,
@@ -174,7 +223,10 @@ def preview_legacy_wide_import(
                     message=issue.message,
                     raw_row_json={"column": issue.column, "value": issue.raw_value},
                 )
+                for issue in preview_row.issues
+            )
 
+        ImportRowIssue.objects.bulk_create(issue_rows, batch_size=BULK_APPLY_BATCH_SIZE)
         import_batch.status = ImportBatch.Status.PREVIEWED
         import_batch.summary_json = {
             "classification": _classification_summary(classification),
@@ -190,107 +242,174 @@ def preview_legacy_wide_import(
     )
 
 
-def apply_legacy_wide_import(  # noqa: C901, PLR0912
+def _normalize_column_labels(chunk: pd.DataFrame) -> pd.DataFrame:
+    working_chunk = chunk.copy()
+    working_chunk.columns = [normalize_whitespace(str(column)) for column in working_chunk.columns]
+    return working_chunk
+
+
+def apply_legacy_wide_import(
     *,
     preview: LegacyWidePreviewResult,
     import_batch: ImportBatch,
     season_year: int,
     actor: Any | None = None,
 ) -> LegacyWideImportResult:
+    """Stage every row in memory, then write students, results and statuses in bulk."""
     result = LegacyWideImportResult(rows=len(preview.rows), issues=len(preview.issues))
-    now = timezone.now()
 
     with transaction.atomic():
+        staged = _StagedLegacyWrites(student_index=StudentIndex.load())
         for preview_row in preview.rows:
             try:
-                student, created = _upsert_student(preview_row.student_values)
+                student, outcome = _stage_student(preview_row.student_values, staged=staged)
             except ValueError:
                 result.issues += 1
                 continue
-            if created:
+            if outcome == STAGED_CREATED:
                 result.created_students += 1
-            else:
+            elif outcome == STAGED_UPDATED:
                 result.updated_students += 1
+            else:
+                result.unchanged_students += 1
 
-            row_has_issue = bool(preview_row.issues)
-
-            for column_name, raw_value in preview_row.assessment_values.items():
-                cell_value = _coerce_score_value(raw_value)
-                if cell_value is not None:
-                    assessment, assessment_created = _get_or_create_assessment(
-                        column_name=column_name,
-                        season_year=season_year,
-                    )
-                    if assessment_created:
-                        result.created_assessments += 1
-                    StudentResult.objects.update_or_create(
-                        student=student,
-                        assessment=assessment,
-                        defaults={
-                            "raw_score": cell_value,
-                            "imported_by": actor,
-                            "imported_at": now,
-                        },
-                    )
-                    result.created_results += 1
-                    continue
-
-                normalized_status = _normalize_status_value(raw_value)
-                if normalized_status is not None:
-                    StudentSelectionStatus.objects.get_or_create(
-                        student=student,
-                        season_year=season_year,
-                        division="",
-                        status=normalized_status,
-                        defaults={
-                            "created_by": actor,
-                            "notes": f"Imported from {column_name}: {raw_value}",
-                        },
-                    )
-                    result.created_statuses += 1
-                    continue
-
-                if not _is_blank_value(raw_value):
-                    row_has_issue = True
-
-            for column_name, raw_value in preview_row.status_values.items():
-                normalized_status = _normalize_status_value(raw_value)
-                if normalized_status is None:
-                    if not _is_blank_value(raw_value):
-                        row_has_issue = True
-                    continue
-                StudentSelectionStatus.objects.get_or_create(
-                    student=student,
-                    season_year=season_year,
-                    division="",
-                    status=normalized_status,
-                    defaults={
-                        "created_by": actor,
-                        "notes": f"Imported from {column_name}: {raw_value}",
-                    },
-                )
-                result.created_statuses += 1
-
-            if row_has_issue:
+            if _stage_row_cells(preview_row, student=student, staged=staged, actor=actor):
                 result.issues += 1
 
+        written_result_keys = _write_staged(staged, result=result, season_year=season_year, actor=actor)
+
         import_batch.status = (
             ImportBatch.Status.PARTIAL if result.issues else ImportBatch.Status.APPLIED
         )
         import_batch.summary_json = {
             "created_students": result.created_students,
             "updated_students": result.updated_students,
+            "unchanged_students": result.unchanged_students,
             "created_assessments": result.created_assessments,
             "created_results": result.created_results,
+            "updated_results": result.updated_results,
+            "unchanged_results": result.unchanged_results,
             "created_statuses": result.created_statuses,
+            "unchanged_statuses": result.unchanged_statuses,
             "issues": result.issues,
             "rows": result.rows,
         }
         import_batch.save(update_fields={"status", "summary_json", "updated_at"})
 
+    refresh_rankings_for_results(
+        assessment_ids={assessment_id for _student_id, assessment_id in written_result_keys},
+        student_ids={student_id for student_id, _assessment_id in written_result_keys},
+    )
     return result
 
 
+def _stage_row_cells(
+    preview_row: LegacyWidePreviewRow,
+    *,
+    student: Student,
+    staged: _StagedLegacyWrites,
+    actor: Any | None,
+) -> bool:
+    """Stage a row's scores and statuses; return whether any cell was unusable."""
+    row_has_issue = bool(preview_row.issues)
+
+    for column_name, raw_value in preview_row.assessment_values.items():
+        cell_value = _coerce_score_value(raw_value)
+        if cell_value is not None:
+            code = _assessment_code_for_column(column_name)
+            staged.assessment_names.setdefault(code, column_name)
+            # Later rows for the same student and assessment win, as sequential upserts did.
+            staged.results[(id(student), code)] = cell_value
+            continue
+
+        normalized_status = _normalize_status_value(raw_value)
+        if normalized_status is not None:
+            staged.stage_status(student, normalized_status, notes=f"Imported from {column_name}: {raw_value}")
+            continue
+
+        if not _is_blank_value(raw_value):
+            row_has_issue = True
+
+    for column_name, raw_value in preview_row.status_values.items():
+        normalized_status = _normalize_status_value(raw_value)
+        if normalized_status is None:
+            if not _is_blank_value(raw_value):
+                row_has_issue = True
+            continue
+        staged.stage_status(student, normalized_status, notes=f"Imported from {column_name}: {raw_value}")
+
+    return row_has_issue
+
+
+def _write_staged(
+    staged: _StagedLegacyWrites,
+    *,
+    result: LegacyWideImportResult,
+    season_year: int,
+    actor: Any | None,
+) -> list[tuple]:
+    """Flush staged writes in dependency order and return the written result keys."""
+    bulk_save(
+        Student,
+        creates=staged.new_students,
+        updates=staged.changed_students.values(),
+        fields=staged.changed_student_fields | {"normalized_name"},
+    )
+
+    assessments_by_code = {
+        assessment.code: assessment
+        for assessment in Assessment.objects.filter(season_year=season_year, code__in=list(staged.assessment_names))
+    }
+    for code, column_name in staged.assessment_names.items():
+        if code not in assessments_by_code:
+            assessments_by_code[code] = Assessment.objects.create(
+                code=code,
+                display_name=normalize_whitespace(column_name),
+                season_year=season_year,
+                category=Assessment.Category.OTHER,
+                result_type=Assessment.ResultType.SCORE,
+            )
+            result.created_assessments += 1
+
+    imported_at = timezone.now()
+    result_upsert = bulk_upsert(
+        StudentResult,
+        {
+            (staged.students_by_token[token].id, assessments_by_code[code].id): {
+                "raw_score": raw_score,
+                "imported_by": actor,
+                "imported_at": imported_at,
+            }
+            for (token, code), raw_score in staged.results.items()
+        },
+        key_fields=("student_id", "assessment_id"),
+        compare_fields=("raw_score",),
+    )
+    result.created_results = result_upsert.counts.inserted
+    result.updated_results = result_upsert.counts.updated
+    result.unchanged_results = result_upsert.counts.unchanged
+
+    status_upsert = bulk_upsert(
+        StudentSelectionStatus,
+        {
+            (staged.students_by_token[token].id, season_year, "", status): {"created_by": actor, "notes": notes}
+            for (token, status), notes in staged.statuses.items()
+        },
+        key_fields=("student_id", "season_year", "division", "status"),
+        compare_fields=(),
+        update_existing=False,
+    )
+    result.created_statuses = status_upsert.counts.inserted
+    result.unchanged_statuses = status_upsert.counts.unchanged
+
+    # Bulk writes skip the signals that keep ranking snapshot display fields current.
+    refresh_snapshot_read_model(
+        student_ids={*staged.changed_students, *(key[0] for key in status_upsert.written_keys)},
+    )
+    invalidate_ranking_filter_options()
+    return result_upsert.written_keys
+
+
 def _build_preview_row(
     *,
     row_number: int,
@@ -424,7 +543,11 @@ def _student_payload_empty(student_values: dict[str, Any]) -> bool:
     return _student_name_value(student_values) is None
 
 
-def _upsert_student(student_values: dict[str, Any]) -> tuple[Student, bool]:  # noqa: C901
+def _stage_student(
+    student_values: dict[str, Any],
+    *,
+    staged: _StagedLegacyWrites,
+) -> tuple[Student, str]:
     full_name = _student_name_value(student_values)
     if full_name is None:
         msg = "Student rows require a full name."
@@ -433,32 +556,29 @@ def _upsert_student(student_values: dict[str, Any]) -> tuple[Student, bool]:  #
     external_code = _student_text_value(student_values.get("external_code"))
     legacy_code = _student_text_value(student_values.get("legacy_code"))
     birth_year = _student_int_value(student_values.get("birth_year"))
+    student_index = staged.student_index
 
     student = None
     if external_code:
-        student = Student.objects.filter(external_code=external_code.upper()).first()
+        student = next(iter(student_index.iexact("external_code", external_code)), None)
     if student is None and full_name and birth_year is not None:
-        matches = list(
-            Student.objects.filter(
-                normalized_name=normalize_name(full_name),
-                birth_year=birth_year,
-            ).order_by("id"),
-        )
+        matches = student_index.by_name(full_name, birth_year=birth_year)
         if len(matches) == 1:
             student = matches[0]
     if student is None and full_name:
-        matches = list(Student.objects.filter(normalized_name=normalize_name(full_name)).order_by("id"))
+        matches = student_index.by_name(full_name)
         if len(matches) == 1:
             student = matches[0]
 
+    school = _resolve_school(student_values.get("school"), schools=staged.schools_by_normalized_name)
     payload = {
         "full_name": full_name,
         "birth_year": birth_year,
-        "school": _resolve_school(student_values.get("school")),
+        "school_id": school.id if school is not None else None,
         "state": _student_text_value(student_values.get("state")) or "",
         "masked_nric": _student_text_value(student_values.get("masked_nric")) or "",
         "full_nric": _student_text_value(student_values.get("full_nric")) or "",
-        "external_code": external_code or "",
+        "external_code": (external_code or "").upper(),
         "legacy_code": legacy_code or "",
         "gender": _normalize_gender_value(student_values.get("gender")),
         "active": _student_bool_value(student_values.get("active"), default=True),
@@ -466,58 +586,41 @@ def _upsert_student(student_values: dict[str, Any]) -> tuple[Student, bool]:  #
     }
 
     if student is None:
-        return Student.objects.create(**payload), True
-
-    update_fields: set[str] = set()
-    for field_name, field_value in payload.items():
-        if field_name == "active":
-            if field_value != student.active:
-                student.active = field_value
-                update_fields.add(field_name)
-            continue
-        if getattr(student, field_name) != field_value:
-            setattr(student, field_name, field_value)
-            update_fields.add(field_name)
-
-    if update_fields:
-        student.save(update_fields=update_fields | {"updated_at"})
-    return student, False
-
-
-def _resolve_school(value: Any) -> School | None:
+        student = Student(**payload)
+        student.normalize_fields()
+        student_index.add(student)
+        staged.students_by_token[id(student)] = student
+        staged.new_students.append(student)
+        return student, STAGED_CREATED
+
+    staged.students_by_token[id(student)] = student
+    changed_fields = assign_changed_fields(student, payload)
+    if not changed_fields:
+        return student, STAGED_UNCHANGED
+
+    student.normalize_fields()
+    student_index.reindex(student)
+    if student.pk is not None:
+        staged.changed_students[student.pk] = student
+        staged.changed_student_fields.update(changed_fields)
+    return student, STAGED_UPDATED
+
+
+def _resolve_school(value: Any, *, schools: dict[str, School]) -> School | None:
     school_name = _student_text_value(value)
     if not school_name:
         return None
     normalized_name = normalize_name(school_name)
-    school, _created = School.objects.get_or_create(
-        normalized_name=normalized_name,
-        defaults={"name": school_name},
-    )
+    school = schools.get(normalized_name)
+    if school is None:
+        school, _created = School.objects.get_or_create(
+            normalized_name=normalized_name,
+            defaults={"name": school_name},
+        )
+        schools[normalized_name] = school
     return school
 
 
-def _get_or_create_assessment(
-    *,
-    column_name: str,
-    season_year: int,
-) -> tuple[Assessment, bool]:
-    code = _assessment_code_for_column(column_name)
-    assessment = Assessment.objects.filter(code=code, season_year=season_year).first()
-    if assessment is not None:
-        return assessment, False
-
-    return (
-        Assessment.objects.create(
-            code=code,
-            display_name=normalize_whitespace(column_name),
-            season_year=season_year,
-            category=Assessment.Category.OTHER,
-            result_type=Assessment.ResultType.SCORE,
-        ),
-        True,
-    )
-
-
 def _assessment_code_for_column(column_name: str) -> str:
     slug = slugify(normalize_whitespace(column_name), allow_unicode=False)
     if not slug:
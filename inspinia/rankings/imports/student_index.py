@@ -0,0 +1,116 @@
+# ruff: noqa: INP001
+"""In-memory student lookups shared by the ranking imports.
+
+Matching every sheet row with its own ``iexact`` queries costs several round
+trips per row. ``StudentIndex.load()`` reads all students once and answers the
+same lookups from dictionaries, so previewing or applying a large sheet runs a
+constant number of student queries. Imports that create or edit students keep
+the index current with ``add`` and ``reindex``; staged students that are not
+saved yet are indexed too and sort after saved ones.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import normalize_name
+from inspinia.rankings.models import normalize_whitespace
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+
+CASE_INSENSITIVE_FIELDS = ("external_code", "legacy_code", "full_name")
+
+
+class StudentIndex:
+    """Students keyed by the identifiers imports match on, in id order."""
+
+    def __init__(self, students: Iterable[Student] = ()) -> None:
+        self._by_id: dict[int, Student] = {}
+        # Keyed by object identity so unsaved students can be indexed as well.
+        self._keys_by_student: dict[int, list[Hashable]] = {}
+        self._students_by_key: dict[Hashable, list[Student]] = defaultdict(list)
+        for student in students:
+            self.add(student)
+
+    @classmethod
+    def load(cls) -> StudentIndex:
+        return cls(Student.objects.order_by("id"))
+
+    def __len__(self) -> int:
+        return len(self._keys_by_student)
+
+    def get(self, student_id: int) -> Student | None:
+        return self._by_id.get(student_id)
+
+    def iexact(self, field_name: str, value: str) -> list[Student]:
+        """Students whose ``field_name`` equals ``value`` ignoring case, like ``__iexact``."""
+        if field_name not in CASE_INSENSITIVE_FIELDS:
+            msg = f"Unsupported case-insensitive student field: {field_name}."
+            raise ValueError(msg)
+        text = normalize_whitespace(value)
+        if not text:
+            return []
+        return list(self._students_by_key.get((field_name, text.casefold()), ()))
+
+    def by_full_nric(self, full_nric: str) -> list[Student]:
+        text = normalize_whitespace(full_nric)
+        if not text:
+            return []
+        return list(self._students_by_key.get(("full_nric", text), ()))
+
+    def by_name(self, full_name: str, *, birth_year: int | None = None) -> list[Student]:
+        """Students with the same normalized name, optionally also the same birth year."""
+        normalized_name = normalize_name(full_name)
+        if not normalized_name:
+            return []
+        key: Hashable
+        if birth_year is None:
+            key = ("normalized_name", normalized_name)
+        else:
+            key = ("normalized_name_birth_year", normalized_name, birth_year)
+        return list(self._students_by_key.get(key, ()))
+
+    def add(self, student: Student) -> None:
+        keys = _student_keys(student)
+        if student.pk is not None:
+            self._by_id[student.pk] = student
+        self._keys_by_student[id(student)] = keys
+        for key in keys:
+            self._students_by_key[key].append(student)
+
+    def reindex(self, student: Student) -> None:
+        """Refresh the keys of a student whose identifiers were edited in place."""
+        for key in self._keys_by_student.pop(id(student), []):
+            bucket = self._students_by_key[key]
+            bucket[:] = [indexed for indexed in bucket if indexed is not student]
+        keys = _student_keys(student)
+        self._keys_by_student[id(student)] = keys
+        for key in keys:
+            bucket = self._students_by_key[key]
+            bucket.append(student)
+            bucket.sort(key=_index_order)
+
+
+def _index_order(student: Student) -> tuple[bool, int]:
+    return (student.pk is None, student.pk or 0)
+
+
+def _student_keys(student: Student) -> list[Hashable]:
+    keys: list[Hashable] = [
+        (field_name, normalize_whitespace(getattr(student, field_name)).casefold())
+        for field_name in CASE_INSENSITIVE_FIELDS
+        if normalize_whitespace(getattr(student, field_name))
+    ]
+    full_nric = normalize_whitespace(student.full_nric)
+    if full_nric:
+        keys.append(("full_nric", full_nric))
+    normalized_name = normalize_name(student.full_name)
+    if normalized_name:
+        keys.append(("normalized_name", normalized_name))
+        if student.birth_year is not None:
+            keys.append(("normalized_name_birth_year", normalized_name, student.birth_year))
+    return keys
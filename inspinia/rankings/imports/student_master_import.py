@@ -16,11 +16,16 @@ from typing import Any
 from django.db import transaction
 from openpyxl import load_workbook
 
+from inspinia.rankings.imports.bulk_apply import assign_changed_fields
+from inspinia.rankings.imports.bulk_apply import bulk_save
+from inspinia.rankings.imports.student_index import StudentIndex
 from inspinia.rankings.models import ImportBatch
 from inspinia.rankings.models import ImportRowIssue
 from inspinia.rankings.models import Student
 from inspinia.rankings.models import normalize_name
 from inspinia.rankings.models import normalize_whitespace
+from inspinia.rankings.services.ranking_dashboard import invalidate_ranking_filter_options
+from inspinia.rankings.services.ranking_read_model import refresh_snapshot_read_model
 from inspinia.users.roles import user_has_admin_role
 
 CSV_ISSUE_MESSAGE = "Unsupported upload format."
@@ -163,12 +168,14 @@ class StudentMasterImportApplyResult:
     created: int
     updated: int
     skipped: int
+    unchanged: int = 0
 
     def to_summary_json(self, preview: StudentMasterImportPreview) -> dict[str, Any]:
         return {
             "rows_processed": preview.rows_processed,
             "created": self.created,
             "updated": self.updated,
+            "unchanged": self.unchanged,
             "skipped": self.skipped,
             "match_count": preview.match_count,
             "create_count": preview.create_count,
@@ -202,6 +209,7 @@ def preview_student_master_import(*, import_batch: ImportBatch, actor: object |
     matched_by_name_birth_year = 0
 
     import_batch.row_issues.all().delete()
+    student_index = StudentIndex.load()
 
     for row_number, raw_row in raw_rows:
         data, parse_issues = StudentMasterRowData.from_mapping(raw_row)
@@ -229,7 +237,7 @@ def preview_student_master_import(*, import_batch: ImportBatch, actor: object |
             )
             continue
 
-        match_result = _match_student_row(data, actor=actor)
+        match_result = _match_student_row(data, actor=actor, student_index=student_index)
         if match_result.bucket == "matched" and match_result.student is not None:
             match_count += 1
             if match_result.strategy == "external_code":
@@ -320,31 +328,51 @@ def apply_student_master_import(
         msg = "Preview and batch must refer to the same import batch."
         raise ValueError(msg)
 
-    created = 0
-    updated = 0
+    matched_rows = [row for row in preview.rows if row.bucket == "matched"]
+    if any(row.matched_student_id is None for row in matched_rows):
+        msg = "Matched preview rows must carry a student id."
+        raise ValueError(msg)
+
+    created_students: list[Student] = []
+    changed_students: dict[int, Student] = {}
+    changed_fields: set[str] = set()
+    unchanged_ids: set[int] = set()
 
     with transaction.atomic():
+        students_by_id = Student.objects.select_for_update().in_bulk(
+            [row.matched_student_id for row in matched_rows],
+        )
         for row in preview.rows:
             if row.bucket == "matched":
-                if row.matched_student_id is None:
-                    msg = "Matched preview rows must carry a student id."
-                    raise ValueError(msg)
-                student = Student.objects.select_for_update().get(pk=row.matched_student_id)
-                _apply_row_to_student(student, row.data, actor=actor)
-                student.save()
-                updated += 1
+                student = students_by_id[row.matched_student_id]
+                row_changed_fields = _apply_row_to_student(student, row.data, actor=actor)
+                if row_changed_fields:
+                    changed_fields |= row_changed_fields
+                    changed_students[student.id] = student
+                    unchanged_ids.discard(student.id)
+                elif student.id not in changed_students:
+                    unchanged_ids.add(student.id)
                 continue
 
             if row.bucket == "create":
                 student = Student()
                 _apply_row_to_student(student, row.data, actor=actor)
-                student.save()
-                created += 1
+                created_students.append(student)
+
+        bulk_save(
+            Student,
+            creates=created_students,
+            updates=changed_students.values(),
+            fields=changed_fields | {"normalized_name"},
+        )
+        refresh_snapshot_read_model(student_ids=changed_students)
+        invalidate_ranking_filter_options()
 
     result = StudentMasterImportApplyResult(
-        created=created,
-        updated=updated,
+        created=len(created_students),
+        updated=len(changed_students),
         skipped=preview.skipped_count,
+        unchanged=len(unchanged_ids),
     )
     import_batch.status = (
         ImportBatch.Status.PARTIAL
@@ -356,31 +384,48 @@ def apply_student_master_import(
     return result
 
 
-def _apply_row_to_student(student: Student, row: StudentMasterRowData, *, actor: object | None) -> None:
-    student.full_name = row.full_name
-    student.birth_year = row.birth_year if row.birth_year is not None else student.birth_year
-    student.date_of_birth = row.date_of_birth if row.date_of_birth is not None else student.date_of_birth
-    student.active = row.active if row.active is not None else student.active
-
-    for field_name, value in (
-        ("gender", row.gender),
-        ("state", row.state),
-        ("masked_nric", row.masked_nric),
-        ("external_code", row.external_code),
-        ("legacy_code", row.legacy_code),
-        ("notes", row.notes),
-    ):
-        if value:
-            setattr(student, field_name, value)
+def _apply_row_to_student(student: Student, row: StudentMasterRowData, *, actor: object | None) -> set[str]:
+    """Copy a sheet row onto ``student`` and return the fields it changed."""
+    values: dict[str, Any] = {"full_name": row.full_name}
+    if row.birth_year is not None:
+        values["birth_year"] = row.birth_year
+    if row.date_of_birth is not None:
+        values["date_of_birth"] = row.date_of_birth
+    if row.active is not None:
+        values["active"] = row.active
+
+    values.update(
+        {
+            field_name: value
+            for field_name, value in (
+                ("gender", row.gender),
+                ("state", row.state),
+                ("masked_nric", row.masked_nric),
+                ("external_code", row.external_code),
+                ("legacy_code", row.legacy_code),
+                ("notes", row.notes),
+            )
+            if value
+        },
+    )
 
     if _can_use_full_nric(actor) and row.full_nric:
-        student.full_nric = row.full_nric
+        values["full_nric"] = row.full_nric
 
+    changed_fields = assign_changed_fields(student, values)
+    student.normalize_fields()
+    return changed_fields
 
-def _match_student_row(row: StudentMasterRowData, *, actor: object | None) -> StudentMatchResult:
+
+def _match_student_row(
+    row: StudentMasterRowData,
+    *,
+    actor: object | None,
+    student_index: StudentIndex,
+) -> StudentMatchResult:
     if row.external_code:
         result = _match_unique_students(
-            list(Student.objects.filter(external_code=row.external_code)),
+            student_index.iexact("external_code", row.external_code),
             strategy="external_code",
             issue_code=AMBIGUOUS_EXTERNAL_CODE,
             issue_message=f"Multiple students match external code {row.external_code}.",
@@ -390,7 +435,7 @@ def _match_student_row(row: StudentMasterRowData, *, actor: object | None) -> St
 
     if _can_use_full_nric(actor) and row.full_nric:
         result = _match_unique_students(
-            list(Student.objects.filter(full_nric=row.full_nric)),
+            student_index.by_full_nric(row.full_nric),
             strategy="full_nric",
             issue_code=AMBIGUOUS_FULL_NRIC,
             issue_message=f"Multiple students match full NRIC {row.full_nric}.",
@@ -400,12 +445,7 @@ def _match_student_row(row: StudentMasterRowData, *, actor: object | None) -> St
 
     if row.normalized_name and row.birth_year is not None:
         result = _match_unique_students(
-            list(
-                Student.objects.filter(
-                    normalized_name=row.normalized_name,
-                    birth_year=row.birth_year,
-                ),
-            ),
+            student_index.by_name(row.normalized_name, birth_year=row.birth_year),
             strategy="normalized_name_birth_year",
             issue_code=AMBIGUOUS_NAME_BIRTH_YEAR,
             issue_message="Multiple students match normalized name + birth year.",
@@ -2,15 +2,14 @@ from __future__ import annotations
 
 from django.core.management.base import BaseCommand
 from django.core.management.base import CommandError
-from django.db.models import Prefetch
+from django.db import connection
 
 from inspinia.rankings.models import RankingFormula
-from inspinia.rankings.models import Student
-from inspinia.rankings.models import StudentResult
-from inspinia.rankings.services.ranking_compute import compute_rank_rows
-from inspinia.rankings.services.ranking_snapshot_store import clear_ranking_snapshots
+from inspinia.rankings.services.ranking_recompute import FormulaRecomputeResult
+from inspinia.rankings.services.ranking_recompute import group_formula_ids
+from inspinia.rankings.services.ranking_recompute import recompute_formula_groups
+from inspinia.rankings.services.ranking_snapshot_refresh import refresh_ranking_snapshots_for_students
 from inspinia.rankings.services.ranking_snapshot_store import lock_formula_for_snapshot_refresh
-from inspinia.rankings.services.ranking_snapshot_store import store_ranking_snapshots
 
 
 class Command(BaseCommand):
@@ -20,11 +19,32 @@ class Command(BaseCommand):
         parser.add_argument("--formula", type=int, help="RankingFormula ID to recompute.")
         parser.add_argument("--season", type=int, help="Season year to recompute.")
         parser.add_argument("--division", type=str, help="Division to recompute within a season.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help=(
+                "Worker processes for full recomputes (default 1). Formulas sharing a season and division "
+                "run in the same worker and share one student/result load."
+            ),
+        )
+        parser.add_argument(
+            "--student",
+            type=int,
+            action="append",
+            dest="student_ids",
+            help=(
+                "Student ID whose results changed (repeatable). Only these students' snapshots are recomputed "
+                "and re-ranked when the formula's snapshots are current."
+            ),
+        )
 
     def handle(self, *args, **options) -> None:
         formula_id = options.get("formula")
         season_year = options.get("season")
         division = options.get("division")
+        student_ids = options.get("student_ids") or []
+        workers = options.get("workers") or 1
 
         if formula_id is not None and formula_id < 1:
             msg = "--formula must be a positive integer."
@@ -35,41 +55,69 @@ class Command(BaseCommand):
         if division and season_year is None:
             msg = "--division requires --season."
             raise CommandError(msg)
+        if any(student_id < 1 for student_id in student_ids):
+            msg = "--student must be a positive integer."
+            raise CommandError(msg)
+        if workers < 1:
+            msg = "--workers must be a positive integer."
+            raise CommandError(msg)
+        if workers > 1 and student_ids:
+            msg = "--workers cannot be combined with --student."
+            raise CommandError(msg)
 
         formulas = list(self._get_formulas(formula_id=formula_id, season_year=season_year, division=division))
         if formula_id is not None and not formulas:
             msg = f"RankingFormula {formula_id} does not exist."
             raise CommandError(msg)
 
+        if student_ids:
+            self._refresh_students(formulas=formulas, student_ids=student_ids)
+            return
+
+        if workers > 1 and connection.vendor == "sqlite":
+            self.stdout.write(self.style.WARNING("SQLite serializes writers; recomputing with 1 worker."))
+            workers = 1
+
+        results = recompute_formula_groups(group_formula_ids(formulas), workers=workers, on_result=self._write_result)
+        recomputed_results = [result for result in results if not result.skipped]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed {len(recomputed_results)} formula(s), "
+                f"stored {sum(result.snapshot_count for result in recomputed_results)} snapshot(s).",
+            ),
+        )
+
+    def _write_result(self, result: FormulaRecomputeResult) -> None:
+        if result.skipped:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped RankingFormula {result.formula_id} ({result.formula_name}): "
+                    f"no formula items configured; cleared {result.cleared_count} existing snapshot(s).",
+                ),
+            )
+            return
+        self.stdout.write(
+            f"RankingFormula {result.formula_id} ({result.formula_name}): "
+            f"{result.snapshot_count} snapshot(s) in {result.elapsed_seconds:.2f}s.",
+        )
+
+    def _refresh_students(self, *, formulas: list[RankingFormula], student_ids: list[int]) -> None:
         snapshot_count = 0
-        recomputed_formula_count = 0
+        refreshed_formula_count = 0
         for formula in formulas:
             with lock_formula_for_snapshot_refresh(formula_id=formula.id) as locked_formula:
-                if not locked_formula.items.exists():
-                    deleted_count = clear_ranking_snapshots(
-                        formula=locked_formula,
-                        formula_locked=True,
-                    )
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Skipped RankingFormula {locked_formula.id} ({locked_formula.name}): "
-                            f"no formula items configured; cleared {deleted_count} existing snapshot(s).",
-                        ),
-                    )
-                    continue
-
-                students = self._get_students_for_formula(locked_formula)
-                rows = compute_rank_rows(formula=locked_formula, students=students)
-                snapshot_count += store_ranking_snapshots(
+                refresh_result = refresh_ranking_snapshots_for_students(
                     formula=locked_formula,
-                    rows=rows,
+                    student_ids=student_ids,
                     formula_locked=True,
                 )
-            recomputed_formula_count += 1
+            snapshot_count += refresh_result.written_count
+            refreshed_formula_count += 1
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Recomputed {recomputed_formula_count} formula(s), stored {snapshot_count} snapshot(s).",
+                f"Refreshed {refreshed_formula_count} formula(s) for {len(set(student_ids))} student(s), "
+                f"wrote {snapshot_count} snapshot change(s).",
             ),
         )
 
@@ -89,14 +137,3 @@ class Command(BaseCommand):
         if division:
             queryset = queryset.filter(division=division.strip())
         return queryset.order_by("season_year", "division", "id")
-
-    def _get_students_for_formula(self, formula: RankingFormula):
-        assessment_ids = list(
-            formula.items.order_by("sort_order", "id").values_list("assessment_id", flat=True),
-        )
-        results_queryset = StudentResult.objects.filter(
-            assessment_id__in=assessment_ids,
-        ).order_by("assessment_id", "id")
-        return Student.objects.filter(active=True).prefetch_related(
-            Prefetch("results", queryset=results_queryset),
-        )
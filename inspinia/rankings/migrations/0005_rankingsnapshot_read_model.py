@@ -0,0 +1,140 @@
+# Generated by Django 5.1.9 on 2026-10-19 15:01
+
+from collections import defaultdict
+
+from django.db import migrations
+from django.db import models
+
+from inspinia.rankings.models import breakdown_scores_by_assessment
+from inspinia.rankings.models import pick_selection_status
+
+
+def _backfill_snapshot_read_model(apps, schema_editor):
+    snapshot_model = apps.get_model("rankings", "RankingSnapshot")
+    formula_item_model = apps.get_model("rankings", "RankingFormulaItem")
+    student_model = apps.get_model("rankings", "Student")
+    status_model = apps.get_model("rankings", "StudentSelectionStatus")
+
+    assessment_ids_by_formula_id: dict[int, list[int]] = defaultdict(list)
+    for formula_id, assessment_id in formula_item_model.objects.order_by("sort_order", "id").values_list(
+        "ranking_formula_id",
+        "assessment_id",
+    ):
+        assessment_ids_by_formula_id[formula_id].append(assessment_id)
+
+    students_by_id = {
+        student_id: (full_name, normalized_name, school_name or "", state, active)
+        for student_id, full_name, normalized_name, school_name, state, active in student_model.objects.values_list(
+            "id",
+            "full_name",
+            "normalized_name",
+            "school__name",
+            "state",
+            "active",
+        )
+    }
+    statuses_by_student_id: dict[int, list[tuple[int, str, str]]] = defaultdict(list)
+    for student_id, season_year, division, status in status_model.objects.order_by(
+        "-season_year",
+        "division",
+        "status",
+        "id",
+    ).values_list("student_id", "season_year", "division", "status"):
+        statuses_by_student_id[student_id].append((season_year, division, status))
+
+    pending = []
+    for snapshot in snapshot_model.objects.order_by("id").iterator(chunk_size=500):
+        full_name, normalized_name, school_name, state, active = students_by_id.get(
+            snapshot.student_id,
+            ("", "", "", "", True),
+        )
+        snapshot.student_name = full_name
+        snapshot.student_normalized_name = normalized_name
+        snapshot.school_name = school_name
+        snapshot.student_state = state
+        snapshot.student_active = active
+        snapshot.selection_status = pick_selection_status(
+            statuses_by_student_id.get(snapshot.student_id, ()),
+            season_year=snapshot.season_year,
+            division=snapshot.division,
+        )
+        scores = breakdown_scores_by_assessment(snapshot.score_breakdown_json)
+        snapshot.assessment_scores = [
+            scores.get(assessment_id, "")
+            for assessment_id in assessment_ids_by_formula_id.get(snapshot.ranking_formula_id, [])
+        ]
+        pending.append(snapshot)
+        if len(pending) >= 500:
+            _write_read_model(snapshot_model, pending)
+            pending = []
+    _write_read_model(snapshot_model, pending)
+
+
+def _write_read_model(snapshot_model, snapshots):
+    if snapshots:
+        snapshot_model.objects.bulk_update(
+            snapshots,
+            [
+                "student_name",
+                "student_normalized_name",
+                "school_name",
+                "student_state",
+                "student_active",
+                "selection_status",
+                "assessment_scores",
+            ],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rankings", "0004_remove_rankingsnapshot_rank_snap_season_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="assessment_scores",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="school_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="selection_status",
+            field=models.CharField(blank=True, choices=[("team", "Team"), ("squad", "Squad"), ("watchlist", "Watchlist"), ("senior", "Senior"), ("junior", "Junior"), ("primary", "Primary"), ("pioneer", "Pioneer"), ("beginner", "Beginner"), ("none", "None")], max_length=32),
+        ),
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="student_active",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="student_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="student_normalized_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="rankingsnapshot",
+            name="student_state",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="rankingsnapshot",
+            index=models.Index(fields=["ranking_formula", "season_year", "division", "rank_overall"], name="rank_snap_formula_rank_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="rankingsnapshot",
+            index=models.Index(fields=["ranking_formula", "selection_status", "rank_overall"], name="rank_snap_formula_status_idx"),
+        ),
+        migrations.RunPython(_backfill_snapshot_read_model, migrations.RunPython.noop),
+    ]
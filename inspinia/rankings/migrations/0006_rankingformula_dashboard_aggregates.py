@@ -0,0 +1,40 @@
+# Generated by Django 5.1.9 on 2026-10-19 15:28
+
+from django.db import migrations
+from django.db import models
+from django.utils import timezone
+
+from inspinia.rankings.models import build_ranking_dashboard_aggregates
+
+
+def _backfill_dashboard_aggregates(apps, schema_editor):
+    formula_model = apps.get_model("rankings", "RankingFormula")
+    snapshot_model = apps.get_model("rankings", "RankingSnapshot")
+
+    computed_at = timezone.now().isoformat()
+    for formula_id in formula_model.objects.order_by("id").values_list("id", flat=True):
+        aggregates = build_ranking_dashboard_aggregates(
+            snapshot_model.objects.filter(ranking_formula_id=formula_id).values_list(
+                "total_score",
+                "school_name",
+                "student_state",
+            ),
+        )
+        aggregates["computed_at"] = computed_at
+        formula_model.objects.filter(pk=formula_id).update(dashboard_aggregates=aggregates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rankings", "0005_rankingsnapshot_read_model"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rankingformula",
+            name="dashboard_aggregates",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.RunPython(_backfill_dashboard_aggregates, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,8 @@
 import re
+import statistics
+from collections import Counter
+from decimal import ROUND_HALF_UP
+from decimal import Decimal
 
 from django.db import models
 from django.db.models import Q
@@ -14,6 +18,114 @@ def normalize_name(value: str) -> str:
     return normalize_whitespace(value).casefold()
 
 
+def pick_selection_status(statuses, *, season_year: int, division: str) -> str:
+    """Status code shown for a ranking scope.
+
+    ``statuses`` are ``(season_year, division, status)`` tuples in
+    ``StudentSelectionStatus`` default ordering. An exact division match wins;
+    otherwise a season-wide (blank division) status applies.
+    """
+    season_match = ""
+    for status_season_year, status_division, status in statuses:
+        if status_season_year != season_year:
+            continue
+        if status_division == division:
+            return status
+        if not status_division:
+            season_match = status
+    return season_match
+
+
+def breakdown_scores_by_assessment(breakdown) -> dict[int, str]:
+    """Normalized score strings keyed by assessment id from a stored score breakdown."""
+    if not isinstance(breakdown, dict):
+        return {}
+
+    by_assessment_id: dict[int, str] = {}
+    for item in breakdown.values():
+        if not isinstance(item, dict):
+            continue
+        try:
+            assessment_id = int(item.get("assessment_id", ""))
+        except (TypeError, ValueError):
+            continue
+
+        value = item.get("normalized_score")
+        by_assessment_id[assessment_id] = "" if value is None else str(value)
+    return by_assessment_id
+
+
+RANKING_DASHBOARD_TOP_GROUPS = 10
+RANKING_SCORE_DISTRIBUTION_BUCKETS = 10
+_DASHBOARD_SCORE_QUANTUM = Decimal("0.0001")
+
+
+def build_ranking_dashboard_aggregates(rows) -> dict:
+    """Dashboard summary of one formula's snapshots, as stored on ``RankingFormula``.
+
+    ``rows`` are ``(total_score, school_name, student_state)`` tuples, one per
+    snapshot.
+    """
+    totals: list[Decimal] = []
+    school_counts: Counter[str] = Counter()
+    school_sums: dict[str, Decimal] = {}
+    state_counts: Counter[str] = Counter()
+    for total_score, school_name, student_state in rows:
+        total = Decimal(total_score)
+        totals.append(total)
+        school_counts[school_name] += 1
+        school_sums[school_name] = school_sums.get(school_name, Decimal(0)) + total
+        state_counts[student_state] += 1
+
+    top_schools = sorted(school_counts.items(), key=lambda item: (-item[1], item[0]))[:RANKING_DASHBOARD_TOP_GROUPS]
+    top_states = sorted(state_counts.items(), key=lambda item: (-item[1], item[0]))[:RANKING_DASHBOARD_TOP_GROUPS]
+    return {
+        "snapshot_count": len(totals),
+        "school_stats": [
+            {
+                "school_name": school_name,
+                "student_count": count,
+                "average_total": _dashboard_score(school_sums[school_name] / count),
+            }
+            for school_name, count in top_schools
+        ],
+        "state_stats": [{"student_state": state, "student_count": count} for state, count in top_states],
+        "score_distribution": _score_distribution(totals),
+    }
+
+
+def _score_distribution(totals: list[Decimal]) -> dict:
+    if not totals:
+        return {"min": None, "max": None, "mean": None, "median": None, "buckets": []}
+
+    low = min(totals)
+    high = max(totals)
+    bucket_count = RANKING_SCORE_DISTRIBUTION_BUCKETS if high > low else 1
+    width = (high - low) / bucket_count
+    counts = [0] * bucket_count
+    for total in totals:
+        index = bucket_count - 1 if width == 0 else min(int((total - low) / width), bucket_count - 1)
+        counts[index] += 1
+    return {
+        "min": _dashboard_score(low),
+        "max": _dashboard_score(high),
+        "mean": _dashboard_score(sum(totals) / len(totals)),
+        "median": _dashboard_score(statistics.median(totals)),
+        "buckets": [
+            {
+                "lower": _dashboard_score(low + width * index),
+                "upper": _dashboard_score(high if index == bucket_count - 1 else low + width * (index + 1)),
+                "count": count,
+            }
+            for index, count in enumerate(counts)
+        ],
+    }
+
+
+def _dashboard_score(value: Decimal | float) -> str:
+    return str(Decimal(value).quantize(_DASHBOARD_SCORE_QUANTUM, rounding=ROUND_HALF_UP))
+
+
 def canonicalize_choice_token(value: str, aliases: dict[str, str]) -> str:
     token = normalize_whitespace(value).lower()
     return aliases.get(token, token)
@@ -59,6 +171,9 @@ class School(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Students of this school, kept by ``rankings.signals`` from pre_delete to post_delete.
+    _student_ids: list[int]
+
     class Meta:
         ordering = ["name", "id"]
 
@@ -115,6 +230,9 @@ class Student(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Formulas ranking this student, kept by ``rankings.signals`` from pre_delete to post_delete.
+    _ranking_formula_ids: list[int]
+
     class Meta:
         ordering = ["full_name", "id"]
         constraints = [
@@ -133,14 +251,7 @@ class Student(models.Model):
         return self.full_name
 
     def save(self, *args, **kwargs) -> None:
-        self.full_name = normalize_whitespace(self.full_name)
-        self.normalized_name = normalize_name(self.full_name)
-        self.gender = (self.gender or "").strip()
-        self.state = normalize_whitespace(self.state)
-        self.masked_nric = normalize_whitespace(self.masked_nric)
-        self.full_nric = normalize_whitespace(self.full_nric)
-        self.external_code = normalize_whitespace(self.external_code).upper()
-        self.legacy_code = normalize_whitespace(self.legacy_code)
+        self.normalize_fields()
 
         update_fields = kwargs.get("update_fields")
         if update_fields is not None:
@@ -157,6 +268,17 @@ class Student(models.Model):
 
         super().save(*args, **kwargs)
 
+    def normalize_fields(self) -> None:
+        """Apply ``save()`` normalization; bulk writers call this before ``bulk_create``/``bulk_update``."""
+        self.full_name = normalize_whitespace(self.full_name)
+        self.normalized_name = normalize_name(self.full_name)
+        self.gender = (self.gender or "").strip()
+        self.state = normalize_whitespace(self.state)
+        self.masked_nric = normalize_whitespace(self.masked_nric)
+        self.full_nric = normalize_whitespace(self.full_nric)
+        self.external_code = normalize_whitespace(self.external_code).upper()
+        self.legacy_code = normalize_whitespace(self.legacy_code)
+
 
 class Assessment(models.Model):
     class Category(TextChoices):
@@ -256,6 +378,8 @@ class RankingFormula(models.Model):
     tiebreak_policy = models.JSONField(blank=True, default=dict)
     is_active = models.BooleanField(default=True, db_index=True)
     version = models.PositiveIntegerField(default=1)
+    # Written with the snapshots; see build_ranking_dashboard_aggregates.
+    dashboard_aggregates = models.JSONField(blank=True, default=dict, editable=False)
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -476,6 +600,17 @@ class StudentSelectionStatus(models.Model):
         super().save(*args, **kwargs)
 
 
+RANKING_SNAPSHOT_STUDENT_FIELDS = (
+    "student_name",
+    "student_normalized_name",
+    "school_name",
+    "student_state",
+    "student_active",
+    "selection_status",
+)
+RANKING_SNAPSHOT_READ_MODEL_FIELDS = (*RANKING_SNAPSHOT_STUDENT_FIELDS, "assessment_scores")
+
+
 class RankingSnapshot(models.Model):
     ranking_formula = models.ForeignKey(
         RankingFormula,
@@ -496,6 +631,20 @@ class RankingSnapshot(models.Model):
     last_computed_at = models.DateTimeField(default=timezone.now)
     formula_version_label = models.CharField(max_length=64, blank=True)
     formula_version_hash = models.CharField(max_length=64, blank=True)
+    # Read model: display fields copied from the student, school and selection
+    # status so ranking pages filter and render from this table alone.
+    student_name = models.CharField(max_length=255, blank=True)
+    student_normalized_name = models.CharField(max_length=255, blank=True)
+    school_name = models.CharField(max_length=255, blank=True)
+    student_state = models.CharField(max_length=64, blank=True)
+    student_active = models.BooleanField(default=True)
+    selection_status = models.CharField(
+        max_length=32,
+        blank=True,
+        choices=StudentSelectionStatus.Status.choices,
+    )
+    # Normalized score strings in formula item order (sort_order, id).
+    assessment_scores = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -507,6 +656,16 @@ class RankingSnapshot(models.Model):
                 name="rank_snapshot_unique_pair",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["ranking_formula", "season_year", "division", "rank_overall"],
+                name="rank_snap_formula_rank_idx",
+            ),
+            models.Index(
+                fields=["ranking_formula", "selection_status", "rank_overall"],
+                name="rank_snap_formula_status_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.student} / {self.ranking_formula}"
@@ -517,6 +676,8 @@ class RankingSnapshot(models.Model):
         self.formula_version_label = normalize_whitespace(self.formula_version_label)
         self.formula_version_hash = normalize_whitespace(self.formula_version_hash)
 
+        self.populate_read_model()
+
         update_fields = kwargs.get("update_fields")
         if update_fields is not None:
             kwargs["update_fields"] = set(update_fields) | {
@@ -524,10 +685,16 @@ class RankingSnapshot(models.Model):
                 "division",
                 "formula_version_label",
                 "formula_version_hash",
+                *RANKING_SNAPSHOT_READ_MODEL_FIELDS,
             }
 
         super().save(*args, **kwargs)
 
+    def populate_read_model(self) -> None:
+        from inspinia.rankings.services.ranking_read_model import apply_snapshot_read_model
+
+        apply_snapshot_read_model([self], formula=self.ranking_formula)
+
 
 class ImportBatch(models.Model):
     class ImportType(TextChoices):
@@ -0,0 +1,27 @@
+"""Process-pool entry points for ``recompute_formula_groups``.
+
+Spawned workers unpickle these functions before Django is configured, so this
+module must not import models (or ``inspinia.rankings.services``) at import time.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from inspinia.rankings.services.ranking_recompute import FormulaRecomputeResult
+
+
+def initialize_worker() -> None:
+    import django
+    from django.db import connections
+
+    django.setup()
+    # Each worker opens its own connection instead of reusing inherited handles.
+    connections.close_all()
+
+
+def recompute_formula_group_in_worker(formula_ids: list[int]) -> list[FormulaRecomputeResult]:
+    from inspinia.rankings.services.ranking_recompute import recompute_formula_group
+
+    return recompute_formula_group(formula_ids)
@@ -0,0 +1,416 @@
+"""Vectorized ranking computation for whole cohorts.
+
+``compute_rank_rows`` walks students x formula items with ``Decimal`` math per
+cell. This module loads the cohort into a student x assessment matrix of
+integer scores in units of ``SCORE_QUANTUM`` (``1 / SCORE_SCALE``)
+(``build_cohort_score_matrix``) and applies each normalization method, the
+weighted totals (``score_formula``) and the tie-break ordering (``rank_order``)
+with NumPy column operations. Every rounding step is an exact integer
+``ROUND_HALF_UP`` division, so the rows are identical to the per-cell engine;
+``Decimal`` values are only created for the returned rows.
+
+Inputs the integer matrix cannot represent exactly (negative scores, more than
+four decimal places, or magnitudes that could overflow int64) fall back to
+``compute_rank_rows`` so callers never have to choose.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingFormulaItem
+from inspinia.rankings.models import StudentResult
+from inspinia.rankings.services.ranking_compute import ComputedRankRow
+from inspinia.rankings.services.ranking_compute import _build_breakdown_key
+from inspinia.rankings.services.ranking_compute import compute_rank_rows
+from inspinia.rankings.services.ranking_normalization import ZERO
+from inspinia.rankings.services.ranking_tiebreak import resolve_tiebreak_criteria
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
+    from inspinia.rankings.models import Student
+
+ResultValues = tuple[Decimal | None, Decimal | None]
+
+SCORE_SCALE = 10_000
+_PERCENT_NUMERATOR_SCALE = 100 * SCORE_SCALE
+# Keeps every intermediate (score units x weight units x item count, doubled
+# by the half-up division) inside int64.
+_MAX_SCALED_PRODUCT = 2**60
+
+
+class InexactMatrixInputError(ValueError):
+    """Raised when an input cannot be represented exactly in score units."""
+
+
+@dataclass(slots=True)
+class CohortScoreMatrix:
+    """A cohort's results in score units, one row per student and one column per assessment.
+
+    The matrix does not depend on any formula, so it can be scored under
+    several formulas (or candidate weights) over the same assessments.
+    """
+
+    student_ids: list[int]
+    normalized_names: list[str]
+    assessment_ids: list[int]
+    raw_units: np.ndarray
+    raw_present: np.ndarray
+    normalized_units: np.ndarray
+    normalized_present: np.ndarray
+    raw_scores: list[list[Decimal | None]]
+    column_by_assessment: dict[int, int] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.column_by_assessment = {assessment_id: column for column, assessment_id in enumerate(self.assessment_ids)}
+
+
+@dataclass(slots=True)
+class FormulaScores:
+    """A formula scored over a ``CohortScoreMatrix``; columns follow the formula items."""
+
+    scores: np.ndarray
+    present: np.ndarray
+    counted: np.ndarray
+    weighted: np.ndarray
+    totals: np.ndarray
+    denominators: np.ndarray
+
+
+def compute_rank_rows_batch(
+    formula: RankingFormula,
+    students: Iterable[Student],
+    *,
+    result_values: Mapping[tuple[int, int], ResultValues] | None = None,
+) -> list[ComputedRankRow]:
+    """Vectorized ``compute_rank_rows``; returns the same rows in the same order.
+
+    ``result_values`` maps ``(student_id, assessment_id)`` to ``(raw_score,
+    normalized_score)``; when omitted it is read from prefetched ``results`` or
+    loaded with one ``values_list`` query. Callers recomputing several formulas over the same cohort can load
+    it once with ``load_result_values`` and share it.
+    """
+    formula_items = list(
+        formula.items.select_related("assessment").order_by("sort_order", "id"),
+    )
+    student_list = list(students)
+    if not student_list:
+        return []
+    if result_values is None:
+        result_values = _prefetched_result_values(student_list)
+    if result_values is None:
+        result_values = load_result_values(
+            student_ids=[student.id for student in student_list if student.id is not None],
+            assessment_ids=[item.assessment_id for item in formula_items],
+        )
+
+    try:
+        return _compute_rank_rows_matrix(
+            formula=formula,
+            formula_items=formula_items,
+            student_list=student_list,
+            result_values=result_values,
+        )
+    except InexactMatrixInputError:
+        return compute_rank_rows(formula=formula, students=student_list)
+
+
+def load_result_values(
+    *,
+    student_ids: Iterable[int],
+    assessment_ids: Iterable[int],
+) -> dict[tuple[int, int], ResultValues]:
+    student_id_list = list(student_ids)
+    assessment_id_list = list(set(assessment_ids))
+    if not student_id_list or not assessment_id_list:
+        return {}
+    return {
+        (student_id, assessment_id): (raw_score, normalized_score)
+        for student_id, assessment_id, raw_score, normalized_score in (
+            StudentResult.objects.filter(
+                student_id__in=student_id_list,
+                assessment_id__in=assessment_id_list,
+            )
+            .order_by("assessment_id", "id")
+            .values_list("student_id", "assessment_id", "raw_score", "normalized_score")
+        )
+    }
+
+
+def _prefetched_result_values(student_list: list[Student]) -> dict[tuple[int, int], ResultValues] | None:
+    result_values: dict[tuple[int, int], ResultValues] = {}
+    for student in student_list:
+        prefetched_cache = getattr(student, "_prefetched_objects_cache", {})
+        if "results" not in prefetched_cache:
+            return None
+        for result in prefetched_cache["results"]:
+            result_values[(result.student_id, result.assessment_id)] = (result.raw_score, result.normalized_score)
+    return result_values
+
+
+def build_cohort_score_matrix(
+    *,
+    students: list[Student],
+    assessment_ids: Iterable[int],
+    result_values: Mapping[tuple[int, int], ResultValues],
+) -> CohortScoreMatrix:
+    """Scale every result of ``students`` on ``assessment_ids`` into score units.
+
+    Raises ``InexactMatrixInputError`` when a score cannot be represented exactly.
+    """
+    assessment_id_list = list(dict.fromkeys(assessment_ids))
+    column_by_assessment = {assessment_id: column for column, assessment_id in enumerate(assessment_id_list)}
+    row_by_student = {student.id: row for row, student in enumerate(students) if student.id is not None}
+    column_count = len(assessment_id_list)
+    raw_units = [[0] * column_count for _student in students]
+    raw_present = [[False] * column_count for _student in students]
+    normalized_units = [[0] * column_count for _student in students]
+    normalized_present = [[False] * column_count for _student in students]
+    raw_scores: list[list[Decimal | None]] = [[None] * column_count for _student in students]
+    for (student_id, assessment_id), (raw_score, normalized_score) in result_values.items():
+        row = row_by_student.get(student_id)
+        column = column_by_assessment.get(assessment_id)
+        if row is None or column is None:
+            continue
+        if raw_score is not None:
+            raw_units[row][column] = _scaled_int(raw_score)
+            raw_present[row][column] = True
+            raw_scores[row][column] = raw_score
+        if normalized_score is not None:
+            normalized_units[row][column] = _scaled_int(normalized_score)
+            normalized_present[row][column] = True
+
+    shape = (len(students), column_count)
+    return CohortScoreMatrix(
+        student_ids=[student.id or 0 for student in students],
+        normalized_names=[student.normalized_name or str(student.id or "") for student in students],
+        assessment_ids=assessment_id_list,
+        raw_units=np.array(raw_units, dtype=np.int64).reshape(shape),
+        raw_present=np.array(raw_present, dtype=bool).reshape(shape),
+        normalized_units=np.array(normalized_units, dtype=np.int64).reshape(shape),
+        normalized_present=np.array(normalized_present, dtype=bool).reshape(shape),
+        raw_scores=raw_scores,
+    )
+
+
+def score_formula(
+    *,
+    formula: RankingFormula,
+    formula_items: list[RankingFormulaItem],
+    matrix: CohortScoreMatrix,
+) -> FormulaScores:
+    """Normalized scores, weighted totals and denominators for every student of ``matrix``."""
+    student_count = len(matrix.student_ids)
+    item_count = len(formula_items)
+    weights = np.array([_scaled_int(item.weight) for item in formula_items], dtype=np.int64)
+
+    scores = np.zeros((student_count, item_count), dtype=np.int64)
+    present = np.zeros((student_count, item_count), dtype=bool)
+    for column, item in enumerate(formula_items):
+        scores[:, column], present[:, column] = _normalized_column(item=item, matrix=matrix)
+
+    max_weight = int(weights.max()) if item_count else 0
+    if item_count and int(scores.max(initial=0)) * max(max_weight, 1) * item_count >= _MAX_SCALED_PRODUCT:
+        raise InexactMatrixInputError
+
+    counted = present | _always_counted_mask(formula=formula, formula_items=formula_items)[np.newaxis, :]
+    weighted = scores * weights[np.newaxis, :]
+    numerators = np.where(present, weighted, 0).sum(axis=1)
+    denominators = np.where(counted, weights[np.newaxis, :], 0).sum(axis=1)
+    safe_denominators = np.where(denominators == 0, 1, denominators)
+    totals = np.where(denominators == 0, 0, _divide_half_up(numerators, safe_denominators))
+    return FormulaScores(
+        scores=scores,
+        present=present,
+        counted=counted,
+        weighted=weighted,
+        totals=totals,
+        denominators=denominators,
+    )
+
+
+def rank_order(
+    *,
+    formula: RankingFormula,
+    formula_items: list[RankingFormulaItem],
+    matrix: CohortScoreMatrix,
+    formula_scores: FormulaScores,
+) -> np.ndarray:
+    """Matrix row indexes in rank order under the formula's tie-break criteria."""
+    first_column_by_assessment: dict[int | None, int] = {}
+    for column, item in enumerate(formula_items):
+        first_column_by_assessment.setdefault(item.assessment_id, column)
+
+    student_count = len(matrix.student_ids)
+    name_ranks: np.ndarray | None = None
+    sort_keys: list[np.ndarray] = []
+    for criterion in resolve_tiebreak_criteria(formula=formula, formula_items=formula_items):
+        if criterion.kind == "total_score":
+            sort_keys.append(-formula_scores.totals)
+        elif criterion.kind == "assessment_score":
+            assessment_column = first_column_by_assessment.get(criterion.assessment_id)
+            sort_keys.append(
+                -formula_scores.scores[:, assessment_column]
+                if assessment_column is not None
+                else np.zeros(student_count, dtype=np.int64),
+            )
+        elif criterion.kind == "alphabetical":
+            if name_ranks is None:
+                names = np.array(matrix.normalized_names, dtype=object)
+                name_ranks = np.unique(names, return_inverse=True)[1]
+            sort_keys.append(name_ranks)
+    sort_keys.append(np.array(matrix.student_ids, dtype=np.int64))
+    # np.lexsort treats the last key as the primary one.
+    return np.lexsort(sort_keys[::-1])
+
+
+def score_units_to_decimal(units: int) -> Decimal:
+    return Decimal(units).scaleb(-4)
+
+
+def _compute_rank_rows_matrix(
+    *,
+    formula: RankingFormula,
+    formula_items: list[RankingFormulaItem],
+    student_list: list[Student],
+    result_values: Mapping[tuple[int, int], ResultValues],
+) -> list[ComputedRankRow]:
+    matrix = build_cohort_score_matrix(
+        students=student_list,
+        assessment_ids=[item.assessment_id for item in formula_items],
+        result_values=result_values,
+    )
+    formula_scores = score_formula(formula=formula, formula_items=formula_items, matrix=matrix)
+    order = rank_order(formula=formula, formula_items=formula_items, matrix=matrix, formula_scores=formula_scores)
+    return _rank_rows(order=order, formula_items=formula_items, matrix=matrix, formula_scores=formula_scores)
+
+
+def _normalized_column(*, item: RankingFormulaItem, matrix: CohortScoreMatrix) -> tuple[np.ndarray, np.ndarray]:
+    column = matrix.column_by_assessment[item.assessment_id]
+    raw_array = matrix.raw_units[:, column]
+    raw_mask = matrix.raw_present[:, column]
+    method = item.normalization_method
+    if method == RankingFormulaItem.NormalizationMethod.PERCENT_OF_MAX:
+        return _percent_of_max(raw_array, item), raw_mask
+    if method == RankingFormulaItem.NormalizationMethod.FIXED_SCALE:
+        normalized_mask = matrix.normalized_present[:, column]
+        column_scores = np.where(
+            normalized_mask,
+            matrix.normalized_units[:, column],
+            _percent_of_max(raw_array, item),
+        )
+        return column_scores, normalized_mask | raw_mask
+    # RAW, the z-score placeholder and unknown methods all use the raw score.
+    return raw_array, raw_mask
+
+
+def _percent_of_max(raw_units: np.ndarray, item: RankingFormulaItem) -> np.ndarray:
+    max_score = item.assessment.max_score
+    if not max_score:
+        return raw_units
+    max_units = _scaled_int(max_score)
+    if int(raw_units.max(initial=0)) * _PERCENT_NUMERATOR_SCALE >= _MAX_SCALED_PRODUCT:
+        raise InexactMatrixInputError
+    return _divide_half_up(raw_units * _PERCENT_NUMERATOR_SCALE, max_units)
+
+
+def _always_counted_mask(
+    *,
+    formula: RankingFormula,
+    formula_items: list[RankingFormulaItem],
+) -> np.ndarray:
+    counts_missing = formula.missing_score_policy == RankingFormula.MissingScorePolicy.ZERO
+    return np.array([item.is_required or counts_missing for item in formula_items], dtype=bool)
+
+
+def _rank_rows(
+    *,
+    order: np.ndarray,
+    formula_items: list[RankingFormulaItem],
+    matrix: CohortScoreMatrix,
+    formula_scores: FormulaScores,
+) -> list[ComputedRankRow]:
+    to_decimal = _ScoreDecimals()
+    breakdown_keys: list[str] = []
+    seen_keys: dict[str, dict[str, Any]] = {}
+    for item in formula_items:
+        breakdown_key = _build_breakdown_key(item, seen_keys)
+        seen_keys[breakdown_key] = {}
+        breakdown_keys.append(breakdown_key)
+    matrix_columns = [matrix.column_by_assessment[item.assessment_id] for item in formula_items]
+
+    # Plain lists are much faster than NumPy scalars in the per-row loop below.
+    all_scores = formula_scores.scores.tolist()
+    all_present = formula_scores.present.tolist()
+    all_counted = formula_scores.counted.tolist()
+    all_contributions = _divide_half_up(formula_scores.weighted, SCORE_SCALE).tolist()
+    totals = formula_scores.totals.tolist()
+    denominators = formula_scores.denominators.tolist()
+
+    rows: list[ComputedRankRow] = []
+    for student_index in order.tolist():
+        present = all_present[student_index]
+        scores = all_scores[student_index]
+        contributions = all_contributions[student_index]
+        raw_scores = matrix.raw_scores[student_index]
+        breakdown: dict[str, dict[str, Any]] = {}
+        for column, item in enumerate(formula_items):
+            is_missing = not present[column]
+            breakdown[breakdown_keys[column]] = {
+                "assessment_id": item.assessment_id,
+                "assessment_code": item.assessment.code,
+                "weight": item.weight,
+                "normalization_method": item.normalization_method,
+                "is_required": item.is_required,
+                "is_missing": is_missing,
+                "counted_in_denominator": all_counted[student_index][column],
+                "raw_score": raw_scores[matrix_columns[column]],
+                "normalized_score": to_decimal(0 if is_missing else scores[column]),
+                "contribution": to_decimal(0 if is_missing else contributions[column]),
+            }
+        rows.append(
+            ComputedRankRow(
+                student_id=matrix.student_ids[student_index],
+                total_score=ZERO if denominators[student_index] == 0 else to_decimal(totals[student_index]),
+                breakdown=breakdown,
+                normalized_name=matrix.normalized_names[student_index],
+            ),
+        )
+    return rows
+
+
+class _ScoreDecimals:
+    """Memoized score-unit int -> ``Decimal`` with four decimal places."""
+
+    def __init__(self) -> None:
+        self._values: dict[int, Decimal] = {}
+
+    def __call__(self, units: int) -> Decimal:
+        value = self._values.get(units)
+        if value is None:
+            value = score_units_to_decimal(units)
+            self._values[units] = value
+        return value
+
+
+def _divide_half_up(numerators, denominator):
+    """``ROUND_HALF_UP`` integer division for non-negative numerators."""
+    return (2 * numerators + denominator) // (2 * denominator)
+
+
+def _scaled_int(value: Decimal) -> int:
+    if not isinstance(value, Decimal) or not value.is_finite() or value < 0:
+        raise InexactMatrixInputError
+    scaled = value.scaleb(4)
+    if scaled != scaled.to_integral_value():
+        raise InexactMatrixInputError
+    return int(scaled)
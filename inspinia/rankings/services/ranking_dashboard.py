@@ -0,0 +1,105 @@
+"""Precomputed ranking dashboard aggregates.
+
+The ranking dashboard used to group every snapshot of the selected formula on
+each page view. The summary of a formula's snapshots (school and state
+breakdowns and the score distribution) is instead computed by
+``build_ranking_dashboard_aggregates`` whenever the snapshots are written and
+stored on ``RankingFormula.dashboard_aggregates``, so rendering only reads the
+formula row.
+
+The filter choices (seasons and divisions with snapshots, active schools and
+student states) are cached as one entry. Writing aggregates, saving or deleting
+a school or student, and the bulk student imports drop that entry once their
+transaction commits, through ``invalidate_ranking_filter_options``.
+
+Snapshot writers call ``store_dashboard_aggregates`` with the rows they just
+wrote, or ``refresh_dashboard_aggregates`` after patching snapshots in place.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import School
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import build_ranking_dashboard_aggregates
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+DASHBOARD_AGGREGATE_FIELDS = ("total_score", "school_name", "student_state")
+RANKING_FILTER_OPTIONS_CACHE_KEY = "ranking-filter-options:v1"
+RANKING_FILTER_OPTIONS_CACHE_SECONDS = 60 * 60
+
+
+def store_dashboard_aggregates(formula: RankingFormula, snapshots: Iterable[RankingSnapshot]) -> dict:
+    """Summarize ``snapshots`` (every snapshot of ``formula``) onto the formula row."""
+    aggregates = build_ranking_dashboard_aggregates(
+        tuple(getattr(snapshot, field_name) for field_name in DASHBOARD_AGGREGATE_FIELDS) for snapshot in snapshots
+    )
+    return _write_aggregates(formula.pk, aggregates, formula=formula)
+
+
+def refresh_dashboard_aggregates(*, formula_ids: Iterable[int]) -> None:
+    """Recompute the stored aggregates of ``formula_ids`` from their current snapshots."""
+    for formula_id in sorted(set(formula_ids)):
+        aggregates = build_ranking_dashboard_aggregates(
+            RankingSnapshot.objects.filter(ranking_formula_id=formula_id).values_list(*DASHBOARD_AGGREGATE_FIELDS),
+        )
+        _write_aggregates(formula_id, aggregates)
+
+
+def ranking_filter_options() -> dict[str, list]:
+    """Season, division, school and state choices for the ranking filters.
+
+    Seasons and divisions are those of formulas with snapshots; schools are the
+    active schools and states every student state.
+    """
+    options = cache.get(RANKING_FILTER_OPTIONS_CACHE_KEY)
+    if options is None:
+        options = _uncached_ranking_filter_options()
+        cache.set(RANKING_FILTER_OPTIONS_CACHE_KEY, options, RANKING_FILTER_OPTIONS_CACHE_SECONDS)
+    return options
+
+
+def invalidate_ranking_filter_options() -> None:
+    """Drop the cached filter choices when the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(RANKING_FILTER_OPTIONS_CACHE_KEY))
+
+
+def _uncached_ranking_filter_options() -> dict[str, list]:
+    seasons: set[int] = set()
+    divisions: set[str] = set()
+    for season_year, division, aggregates in RankingFormula.objects.values_list(
+        "season_year",
+        "division",
+        "dashboard_aggregates",
+    ):
+        if not aggregates.get("snapshot_count"):
+            continue
+        seasons.add(season_year)
+        if division:
+            divisions.add(division)
+    return {
+        "season_options": sorted(seasons, reverse=True),
+        "division_options": sorted(divisions),
+        "school_options": list(School.objects.filter(is_active=True).order_by("name").values_list("name", flat=True)),
+        "state_options": [
+            state for state in Student.objects.order_by("state").values_list("state", flat=True).distinct() if state
+        ],
+    }
+
+
+def _write_aggregates(formula_id: int, aggregates: dict, *, formula: RankingFormula | None = None) -> dict:
+    aggregates["computed_at"] = timezone.now().isoformat()
+    RankingFormula.objects.filter(pk=formula_id).update(dashboard_aggregates=aggregates)
+    invalidate_ranking_filter_options()
+    if formula is not None:
+        formula.dashboard_aggregates = aggregates
+    return aggregates
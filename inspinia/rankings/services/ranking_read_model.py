@@ -0,0 +1,139 @@
+"""Denormalized display fields on ranking snapshots.
+
+Ranking pages filter, order and render straight from ``RankingSnapshot``
+rows: the student's name, school, state, active flag, current selection
+status and the per-assessment score array are copied onto every snapshot.
+Snapshot writers fill them in bulk through ``apply_snapshot_read_model``;
+``refresh_snapshot_read_model`` re-copies the student fields when a student,
+school or selection status changes, and refreshes the dashboard aggregates of
+the formulas whose snapshots moved.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from inspinia.rankings.models import RANKING_SNAPSHOT_STUDENT_FIELDS
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import StudentSelectionStatus
+from inspinia.rankings.models import breakdown_scores_by_assessment
+from inspinia.rankings.models import pick_selection_status
+from inspinia.rankings.services.ranking_dashboard import refresh_dashboard_aggregates
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+READ_MODEL_REFRESH_BATCH_SIZE = 500
+
+
+def formula_assessment_ids(formula: RankingFormula) -> list[int]:
+    """Assessment ids in the column order of ``RankingSnapshot.assessment_scores``."""
+    return list(formula.items.order_by("sort_order", "id").values_list("assessment_id", flat=True))
+
+
+def student_read_model_values(
+    student_ids: Iterable[int],
+    *,
+    season_year: int,
+    division: str,
+) -> dict[int, dict[str, object]]:
+    """Read-model student fields keyed by student id for one ranking scope."""
+    student_id_list = list(set(student_ids))
+    if not student_id_list:
+        return {}
+
+    statuses_by_student_id: dict[int, list[tuple[int, str, str]]] = defaultdict(list)
+    for student_id, status_season_year, status_division, status in (
+        StudentSelectionStatus.objects.filter(student_id__in=student_id_list, season_year=season_year)
+        .order_by("-season_year", "division", "status", "id")
+        .values_list("student_id", "season_year", "division", "status")
+    ):
+        statuses_by_student_id[student_id].append((status_season_year, status_division, status))
+
+    return {
+        student_id: {
+            "student_name": full_name,
+            "student_normalized_name": normalized_name,
+            "school_name": school_name or "",
+            "student_state": state,
+            "student_active": active,
+            "selection_status": pick_selection_status(
+                statuses_by_student_id.get(student_id, ()),
+                season_year=season_year,
+                division=division,
+            ),
+        }
+        for student_id, full_name, normalized_name, school_name, state, active in Student.objects.filter(
+            id__in=student_id_list,
+        ).values_list("id", "full_name", "normalized_name", "school__name", "state", "active")
+    }
+
+
+def apply_snapshot_read_model(
+    snapshots: Iterable[RankingSnapshot],
+    *,
+    formula: RankingFormula,
+    assessment_ids: list[int] | None = None,
+) -> None:
+    """Fill the read-model fields of unsaved or in-memory snapshots of one formula."""
+    snapshot_list = list(snapshots)
+    if not snapshot_list:
+        return
+
+    if assessment_ids is None:
+        assessment_ids = formula_assessment_ids(formula)
+    values_by_student_id = student_read_model_values(
+        (snapshot.student_id for snapshot in snapshot_list),
+        season_year=formula.season_year,
+        division=formula.division,
+    )
+    for snapshot in snapshot_list:
+        for field_name, value in values_by_student_id.get(snapshot.student_id, {}).items():
+            setattr(snapshot, field_name, value)
+        scores = breakdown_scores_by_assessment(snapshot.score_breakdown_json)
+        snapshot.assessment_scores = [scores.get(assessment_id, "") for assessment_id in assessment_ids]
+
+
+def refresh_snapshot_read_model(*, student_ids: Iterable[int]) -> int:
+    """Re-copy student, school and selection-status fields onto existing snapshots."""
+    student_id_list = list(set(student_ids))
+    if not student_id_list:
+        return 0
+
+    snapshots_by_scope: dict[tuple[int, str], list[RankingSnapshot]] = defaultdict(list)
+    for snapshot in RankingSnapshot.objects.filter(student_id__in=student_id_list).only(
+        "id",
+        "ranking_formula_id",
+        "student_id",
+        "season_year",
+        "division",
+        *RANKING_SNAPSHOT_STUDENT_FIELDS,
+    ):
+        snapshots_by_scope[(snapshot.season_year, snapshot.division)].append(snapshot)
+
+    changed: list[RankingSnapshot] = []
+    for (season_year, division), snapshots in snapshots_by_scope.items():
+        values_by_student_id = student_read_model_values(
+            student_id_list,
+            season_year=season_year,
+            division=division,
+        )
+        for snapshot in snapshots:
+            values = values_by_student_id.get(snapshot.student_id, {})
+            if all(getattr(snapshot, field_name) == value for field_name, value in values.items()):
+                continue
+            for field_name, value in values.items():
+                setattr(snapshot, field_name, value)
+            changed.append(snapshot)
+
+    if changed:
+        RankingSnapshot.objects.bulk_update(
+            changed,
+            list(RANKING_SNAPSHOT_STUDENT_FIELDS),
+            batch_size=READ_MODEL_REFRESH_BATCH_SIZE,
+        )
+        refresh_dashboard_aggregates(formula_ids={snapshot.ranking_formula_id for snapshot in changed})
+    return len(changed)
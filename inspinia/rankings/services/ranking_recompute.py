@@ -0,0 +1,136 @@
+"""Full snapshot recomputes for groups of formulas, optionally across processes.
+
+Formulas of the same season and division rank the same active cohort over
+overlapping assessments, so a group loads its students and results once and
+shares them between its formulas. The group transaction locks only the
+group's formula rows (in id order), then loads, ranks and writes the snapshots.
+Incremental refreshes take the same formula lock, so they either commit before
+the load and are included or wait and apply on top of the new snapshots.
+Assessments are not locked, so groups that share an assessment still run side
+by side, and ``recompute_formula_groups`` can fan them out to a process pool
+where each worker opens its own database connection.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import groupby
+from typing import TYPE_CHECKING
+
+from django.db import connections
+from django.db import transaction
+
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingFormulaItem
+from inspinia.rankings.models import Student
+from inspinia.rankings.recompute_worker import initialize_worker
+from inspinia.rankings.recompute_worker import recompute_formula_group_in_worker
+from inspinia.rankings.services.ranking_compute_batch import compute_rank_rows_batch
+from inspinia.rankings.services.ranking_compute_batch import load_result_values
+from inspinia.rankings.services.ranking_snapshot_store import clear_ranking_snapshots
+from inspinia.rankings.services.ranking_snapshot_store import lock_formulas_for_group_refresh
+from inspinia.rankings.services.ranking_snapshot_store import store_ranking_snapshots
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True, slots=True)
+class FormulaRecomputeResult:
+    formula_id: int
+    formula_name: str
+    snapshot_count: int
+    elapsed_seconds: float
+    skipped: bool = False
+    cleared_count: int = 0
+
+
+def group_formula_ids(formulas: Iterable[RankingFormula]) -> list[list[int]]:
+    """Formula ids grouped by season and division, in the given order."""
+    return [
+        [formula.id for formula in group]
+        for _scope, group in groupby(formulas, key=lambda formula: (formula.season_year, formula.division))
+    ]
+
+
+def recompute_formula_groups(
+    formula_id_groups: list[list[int]],
+    *,
+    workers: int = 1,
+    on_result: Callable[[FormulaRecomputeResult], None] | None = None,
+) -> list[FormulaRecomputeResult]:
+    """Recompute every group, in-process or with up to ``workers`` processes."""
+    results: list[FormulaRecomputeResult] = []
+
+    def collect(group_results: list[FormulaRecomputeResult]) -> None:
+        for result in group_results:
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    if workers <= 1 or len(formula_id_groups) <= 1:
+        for formula_ids in formula_id_groups:
+            collect(recompute_formula_group(formula_ids))
+        return results
+
+    # Children must not share the parent's database sockets.
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(formula_id_groups)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialize_worker,
+    ) as executor:
+        for group_results in executor.map(recompute_formula_group_in_worker, formula_id_groups):
+            collect(group_results)
+    return results
+
+
+def recompute_formula_group(formula_ids: list[int]) -> list[FormulaRecomputeResult]:
+    with transaction.atomic():
+        locked_formulas = lock_formulas_for_group_refresh(formula_ids)
+        # Loaded under the lock: an incremental refresh that committed first is
+        # included, and one that starts later waits and applies on top of these rows.
+        students = list(Student.objects.filter(active=True).only("id", "normalized_name").order_by("id"))
+        result_values = load_result_values(
+            student_ids=[student.id for student in students],
+            assessment_ids=RankingFormulaItem.objects.filter(ranking_formula_id__in=formula_ids).values_list(
+                "assessment_id",
+                flat=True,
+            ),
+        )
+        return [
+            _recompute_locked_formula(locked_formulas[formula_id], students=students, result_values=result_values)
+            for formula_id in formula_ids
+        ]
+
+
+def _recompute_locked_formula(
+    formula: RankingFormula,
+    *,
+    students: list[Student],
+    result_values: dict,
+) -> FormulaRecomputeResult:
+    started_at = time.perf_counter()
+    if not formula.items.exists():
+        cleared_count = clear_ranking_snapshots(formula=formula, formula_locked=True)
+        return FormulaRecomputeResult(
+            formula_id=formula.id,
+            formula_name=formula.name,
+            snapshot_count=0,
+            elapsed_seconds=time.perf_counter() - started_at,
+            skipped=True,
+            cleared_count=cleared_count,
+        )
+
+    rows = compute_rank_rows_batch(formula=formula, students=students, result_values=result_values)
+    snapshot_count = store_ranking_snapshots(formula=formula, rows=rows, formula_locked=True)
+    return FormulaRecomputeResult(
+        formula_id=formula.id,
+        formula_name=formula.name,
+        snapshot_count=snapshot_count,
+        elapsed_seconds=time.perf_counter() - started_at,
+    )
@@ -0,0 +1,344 @@
+"""Incremental ranking snapshot refresh for a handful of changed students.
+
+``store_ranking_snapshots`` rewrites every snapshot of a formula. When only a
+few students' results changed, their rows are recomputed, merged into the
+existing rank order (which is already sorted by the formula's tie-break key),
+and only snapshots whose score, breakdown or rank actually moved are written.
+Unaffected students keep their rows; those between the old and new positions
+of a changed student only get their rank fields shifted.
+
+Snapshots are only ever patched in place when every existing row carries the
+current ``formula_version_hash`` and the ranks are contiguous; otherwise the
+formula is rebuilt in full so a snapshot table never mixes formula versions.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+
+from inspinia.rankings.models import RANKING_SNAPSHOT_READ_MODEL_FIELDS
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import Student
+from inspinia.rankings.services.ranking_compute_batch import compute_rank_rows_batch
+from inspinia.rankings.services.ranking_dashboard import refresh_dashboard_aggregates
+from inspinia.rankings.services.ranking_normalization import ZERO
+from inspinia.rankings.services.ranking_read_model import apply_snapshot_read_model
+from inspinia.rankings.services.ranking_snapshot_store import _build_formula_version_hash
+from inspinia.rankings.services.ranking_snapshot_store import _serialize_breakdown
+from inspinia.rankings.services.ranking_snapshot_store import clear_ranking_snapshots
+from inspinia.rankings.services.ranking_snapshot_store import lock_formula_for_snapshot_refresh
+from inspinia.rankings.services.ranking_snapshot_store import store_ranking_snapshots
+from inspinia.rankings.services.ranking_tiebreak import TieBreakCriterion
+from inspinia.rankings.services.ranking_tiebreak import resolve_tiebreak_criteria
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from inspinia.rankings.services.ranking_compute import ComputedRankRow
+
+_RANK_FIELDS = ["rank_overall", "rank_within_division", "updated_at"]
+_SNAPSHOT_FIELDS = [
+    "total_score",
+    "rank_overall",
+    "rank_within_division",
+    "score_breakdown_json",
+    "last_computed_at",
+    "formula_version_label",
+    "formula_version_hash",
+    "updated_at",
+    *RANKING_SNAPSHOT_READ_MODEL_FIELDS,
+]
+
+
+@dataclass(slots=True)
+class SnapshotRefreshResult:
+    created_count: int = 0
+    updated_count: int = 0
+    unchanged_count: int = 0
+    rank_shifted_count: int = 0
+    deleted_count: int = 0
+    full_rebuild: bool = False
+
+    @property
+    def written_count(self) -> int:
+        return self.created_count + self.updated_count + self.rank_shifted_count + self.deleted_count
+
+
+def refresh_rankings_for_results(
+    *,
+    assessment_ids: Iterable[int],
+    student_ids: Iterable[int],
+) -> dict[int, SnapshotRefreshResult]:
+    """Refresh every active, already-computed formula that uses one of the assessments.
+
+    Formulas without snapshots are left for ``recompute_rankings`` so a result
+    import never silently publishes a ranking nobody has computed yet.
+    """
+    assessment_id_list = list(set(assessment_ids))
+    student_id_set = set(student_ids)
+    if not assessment_id_list or not student_id_set:
+        return {}
+
+    formula_ids = list(
+        RankingFormula.objects.filter(
+            is_active=True,
+            items__assessment_id__in=assessment_id_list,
+            snapshots__isnull=False,
+        )
+        .order_by("id")
+        .values_list("id", flat=True)
+        .distinct(),
+    )
+    results: dict[int, SnapshotRefreshResult] = {}
+    for formula_id in formula_ids:
+        with lock_formula_for_snapshot_refresh(formula_id=formula_id) as locked_formula:
+            results[formula_id] = refresh_ranking_snapshots_for_students(
+                formula=locked_formula,
+                student_ids=student_id_set,
+                formula_locked=True,
+            )
+    return results
+
+
+def refresh_ranking_snapshots_for_students(
+    *,
+    formula: RankingFormula,
+    student_ids: Iterable[int],
+    formula_locked: bool = False,
+) -> SnapshotRefreshResult:
+    if formula_locked and not transaction.get_connection().in_atomic_block:
+        msg = "formula_locked=True requires an active atomic transaction."
+        raise RuntimeError(msg)
+
+    if not formula_locked:
+        with lock_formula_for_snapshot_refresh(formula_id=formula.pk) as locked_formula:
+            return refresh_ranking_snapshots_for_students(
+                formula=locked_formula,
+                student_ids=student_ids,
+                formula_locked=True,
+            )
+
+    formula_items = list(formula.items.select_related("assessment").order_by("sort_order", "id"))
+    if not formula_items:
+        return SnapshotRefreshResult(
+            deleted_count=clear_ranking_snapshots(formula=formula, formula_locked=True),
+            full_rebuild=True,
+        )
+
+    version_hash = _build_formula_version_hash(formula)
+    ranked_snapshots = list(
+        RankingSnapshot.objects.filter(ranking_formula=formula)
+        .order_by("rank_overall", "id")
+        .values_list("id", "student_id", "rank_overall", "total_score", "formula_version_hash"),
+    )
+    if not _snapshots_are_current(ranked_snapshots, version_hash=version_hash):
+        rows = compute_rank_rows_batch(
+            formula=formula,
+            students=Student.objects.filter(active=True).only("id", "normalized_name"),
+        )
+        return SnapshotRefreshResult(
+            created_count=store_ranking_snapshots(formula=formula, rows=rows, formula_locked=True),
+            full_rebuild=True,
+        )
+
+    affected_student_ids = set(student_ids)
+    rows = compute_rank_rows_batch(
+        formula=formula,
+        students=Student.objects.filter(active=True, id__in=affected_student_ids).only("id", "normalized_name"),
+    )
+    result = _merge_changed_rows(
+        formula=formula,
+        formula_items=formula_items,
+        ranked_snapshots=ranked_snapshots,
+        affected_student_ids=affected_student_ids,
+        rows=rows,
+        version_hash=version_hash,
+    )
+    if result.deleted_count or result.updated_count or result.created_count:
+        refresh_dashboard_aggregates(formula_ids=[formula.pk])
+    return result
+
+
+def _snapshots_are_current(ranked_snapshots: list[tuple], *, version_hash: str) -> bool:
+    if not ranked_snapshots:
+        return False
+    return all(
+        rank_overall == position and snapshot_hash == version_hash
+        for position, (_id, _student_id, rank_overall, _total, snapshot_hash) in enumerate(ranked_snapshots, start=1)
+    )
+
+
+def _merge_changed_rows(  # noqa: PLR0913
+    *,
+    formula: RankingFormula,
+    formula_items: list,
+    ranked_snapshots: list[tuple],
+    affected_student_ids: set[int],
+    rows: list[ComputedRankRow],
+    version_hash: str,
+) -> SnapshotRefreshResult:
+    criteria = resolve_tiebreak_criteria(formula=formula, formula_items=formula_items)
+    kept_entries = _kept_entries(
+        formula=formula,
+        criteria=criteria,
+        kept_snapshots=[snapshot for snapshot in ranked_snapshots if snapshot[1] not in affected_student_ids],
+        changed_totals={row.total_score for row in rows},
+    )
+    changed_entries = sorted(
+        (
+            (_sort_key(criteria, row.total_score, row.breakdown, row.normalized_name, row.student_id), None, None, row)
+            for row in rows
+        ),
+        key=lambda entry: entry[0],
+    )
+
+    existing_by_student_id = {
+        student_id: (snapshot_id, rank_overall, total_score, breakdown)
+        for snapshot_id, student_id, rank_overall, total_score, breakdown in RankingSnapshot.objects.filter(
+            ranking_formula=formula,
+            student_id__in=affected_student_ids,
+        ).values_list("id", "student_id", "rank_overall", "total_score", "score_breakdown_json")
+    }
+
+    computed_at = timezone.now()
+    result = SnapshotRefreshResult()
+    rank_updates: list[RankingSnapshot] = []
+    snapshot_updates: list[RankingSnapshot] = []
+    snapshot_creates: list[RankingSnapshot] = []
+    merged = heapq.merge(kept_entries, changed_entries, key=lambda entry: entry[0])
+    for rank, (_sort_key_value, snapshot_id, previous_rank, row) in enumerate(merged, start=1):
+        if row is None:
+            if previous_rank != rank:
+                rank_updates.append(
+                    RankingSnapshot(
+                        id=snapshot_id,
+                        rank_overall=rank,
+                        rank_within_division=rank,
+                        updated_at=computed_at,
+                    ),
+                )
+            continue
+
+        snapshot = RankingSnapshot(
+            ranking_formula=formula,
+            student_id=row.student_id,
+            season_year=formula.season_year,
+            division=formula.division,
+            total_score=row.total_score,
+            rank_overall=rank,
+            rank_within_division=rank,
+            score_breakdown_json=_serialize_breakdown(row.breakdown),
+            last_computed_at=computed_at,
+            formula_version_label=f"v{formula.version}",
+            formula_version_hash=version_hash,
+            updated_at=computed_at,
+        )
+        existing = existing_by_student_id.pop(row.student_id, None)
+        if existing is None:
+            snapshot_creates.append(snapshot)
+            continue
+        existing_id, existing_rank, existing_total, existing_breakdown = existing
+        if (existing_rank, existing_total, existing_breakdown) == (
+            rank,
+            row.total_score,
+            snapshot.score_breakdown_json,
+        ):
+            result.unchanged_count += 1
+            continue
+        snapshot.id = existing_id
+        snapshot_updates.append(snapshot)
+
+    # Affected students that no longer rank (deactivated) lose their snapshot.
+    stale_snapshot_ids = [existing[0] for existing in existing_by_student_id.values()]
+    if stale_snapshot_ids:
+        result.deleted_count, _ = RankingSnapshot.objects.filter(id__in=stale_snapshot_ids).delete()
+    apply_snapshot_read_model(
+        [*snapshot_updates, *snapshot_creates],
+        formula=formula,
+        assessment_ids=[item.assessment_id for item in formula_items],
+    )
+    if rank_updates:
+        RankingSnapshot.objects.bulk_update(rank_updates, _RANK_FIELDS)
+    if snapshot_updates:
+        RankingSnapshot.objects.bulk_update(snapshot_updates, _SNAPSHOT_FIELDS)
+    if snapshot_creates:
+        RankingSnapshot.objects.bulk_create(snapshot_creates)
+    result.rank_shifted_count = len(rank_updates)
+    result.updated_count = len(snapshot_updates)
+    result.created_count = len(snapshot_creates)
+    return result
+
+
+def _kept_entries(
+    *,
+    formula: RankingFormula,
+    criteria: list[TieBreakCriterion],
+    kept_snapshots: list[tuple],
+    changed_totals: set[Decimal],
+) -> list[tuple]:
+    tie_details = _tie_sort_details(
+        formula=formula,
+        student_ids=[snapshot[1] for snapshot in kept_snapshots if snapshot[3] in changed_totals],
+    )
+    kept_entries = []
+    for snapshot_id, student_id, rank_overall, total_score, _hash in kept_snapshots:
+        details = tie_details.get(student_id)
+        # Only snapshots tied on total with a changed row are ever compared
+        # beyond the total, so the rest skip loading their breakdown.
+        sort_key = (
+            _sort_key(criteria, total_score, details[0], details[1], student_id)
+            if details is not None
+            else (-total_score,)
+        )
+        kept_entries.append((sort_key, snapshot_id, rank_overall, None))
+    return kept_entries
+
+
+def _tie_sort_details(*, formula: RankingFormula, student_ids: list[int]) -> dict[int, tuple[dict, str]]:
+    if not student_ids:
+        return {}
+    return {
+        student_id: (breakdown, normalized_name or str(student_id))
+        for student_id, breakdown, normalized_name in RankingSnapshot.objects.filter(
+            ranking_formula=formula,
+            student_id__in=student_ids,
+        ).values_list("student_id", "score_breakdown_json", "student__normalized_name")
+    }
+
+
+def _sort_key(
+    criteria: list[TieBreakCriterion],
+    total_score: Decimal,
+    breakdown: dict[str, dict[str, Any]],
+    normalized_name: str,
+    student_id: int,
+) -> tuple[object, ...]:
+    """``build_rank_sort_key`` over either a computed breakdown or its stored JSON."""
+    sort_key: list[object] = []
+    for criterion in criteria:
+        if criterion.kind == "total_score":
+            sort_key.append(-total_score)
+        elif criterion.kind == "assessment_score":
+            sort_key.append(-_breakdown_assessment_score(breakdown, criterion.assessment_id))
+        elif criterion.kind == "alphabetical":
+            sort_key.append(normalized_name)
+    sort_key.append(student_id)
+    return tuple(sort_key)
+
+
+def _breakdown_assessment_score(breakdown: dict[str, dict[str, Any]], assessment_id: int | None) -> Decimal:
+    if assessment_id is None:
+        return ZERO
+    for breakdown_item in breakdown.values():
+        if breakdown_item.get("assessment_id") == assessment_id:
+            score = breakdown_item.get("normalized_score")
+            return Decimal(score) if score is not None else ZERO
+    return ZERO
@@ -13,6 +13,8 @@ from inspinia.rankings.models import Assessment
 from inspinia.rankings.models import RankingFormula
 from inspinia.rankings.models import RankingFormulaItem
 from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.services.ranking_dashboard import store_dashboard_aggregates
+from inspinia.rankings.services.ranking_read_model import apply_snapshot_read_model
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -47,6 +49,33 @@ def lock_formula_for_snapshot_refresh(*, formula_id: int) -> Iterator[RankingFor
         yield formula
 
 
+def lock_formulas_for_group_refresh(formula_ids: Iterable[int]) -> dict[int, RankingFormula]:
+    """Lock formula rows and their items in id order inside the caller's transaction.
+
+    Unlike ``lock_formula_for_snapshot_refresh`` this leaves assessments unlocked,
+    so groups sharing an assessment can store snapshots concurrently.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        msg = "lock_formulas_for_group_refresh requires an active atomic transaction."
+        raise RuntimeError(msg)
+    requested_ids = sorted(set(formula_ids))
+    formulas = {
+        formula.id: formula
+        for formula in RankingFormula.objects.select_for_update().filter(id__in=requested_ids).order_by("id")
+    }
+    missing_ids = [formula_id for formula_id in requested_ids if formula_id not in formulas]
+    if missing_ids:
+        msg = f"Ranking formula(s) {missing_ids} no longer exist."
+        raise RankingFormula.DoesNotExist(msg)
+    list(
+        RankingFormulaItem.objects.select_for_update()
+        .filter(ranking_formula_id__in=requested_ids)
+        .order_by("id")
+        .values_list("id", flat=True),
+    )
+    return formulas
+
+
 def store_ranking_snapshots(
     *,
     formula: RankingFormula,
@@ -78,11 +107,13 @@ def store_ranking_snapshots(
         )
         for index, row in enumerate(row_list, start=1)
     ]
+    apply_snapshot_read_model(snapshots, formula=formula)
 
     if formula_locked:
         RankingSnapshot.objects.filter(ranking_formula=formula).delete()
         if snapshots:
             RankingSnapshot.objects.bulk_create(snapshots)
+        store_dashboard_aggregates(formula, snapshots)
         return len(snapshots)
 
     with transaction.atomic():
@@ -90,6 +121,7 @@ def store_ranking_snapshots(
         RankingSnapshot.objects.filter(ranking_formula=formula).delete()
         if snapshots:
             RankingSnapshot.objects.bulk_create(snapshots)
+        store_dashboard_aggregates(formula, snapshots)
 
     return len(snapshots)
 
@@ -105,11 +137,13 @@ def clear_ranking_snapshots(
 
     if formula_locked:
         deleted_count, _ = RankingSnapshot.objects.filter(ranking_formula=formula).delete()
+        store_dashboard_aggregates(formula, ())
         return deleted_count
 
     with transaction.atomic():
         RankingFormula.objects.select_for_update().get(pk=formula.pk)
         deleted_count, _ = RankingSnapshot.objects.filter(ranking_formula=formula).delete()
+        store_dashboard_aggregates(formula, ())
     return deleted_count
 
 
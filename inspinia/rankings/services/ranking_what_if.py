@@ -0,0 +1,368 @@
+"""What-if ranking simulations that never write to the database.
+
+Tuning a formula used to mean saving new weights and running
+``recompute_rankings``. ``simulate_formula_ranking`` instead scores the active
+cohort under candidate items, a missing-score policy and a tie-break policy in
+memory and reports every student's rank delta against the formula's current
+snapshots.
+
+Loading the cohort score matrix is the expensive part, so it is cached per
+season, division and result version. Any edit to a result of the season or to
+a student changes the version, and the next simulation reloads the matrix.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from decimal import InvalidOperation
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Q
+
+from inspinia.rankings.models import RANKING_FORMULA_ITEM_NORMALIZATION_METHOD_ALIASES
+from inspinia.rankings.models import RANKING_FORMULA_MISSING_SCORE_POLICY_ALIASES
+from inspinia.rankings.models import Assessment
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingFormulaItem
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import StudentResult
+from inspinia.rankings.models import canonicalize_choice_token
+from inspinia.rankings.services.ranking_compute_batch import CohortScoreMatrix
+from inspinia.rankings.services.ranking_compute_batch import InexactMatrixInputError
+from inspinia.rankings.services.ranking_compute_batch import build_cohort_score_matrix
+from inspinia.rankings.services.ranking_compute_batch import load_result_values
+from inspinia.rankings.services.ranking_compute_batch import rank_order
+from inspinia.rankings.services.ranking_compute_batch import score_formula
+from inspinia.rankings.services.ranking_compute_batch import score_units_to_decimal
+from inspinia.rankings.services.ranking_normalization import ZERO
+
+WHAT_IF_MATRIX_CACHE_SECONDS = 15 * 60
+WHAT_IF_MATRIX_CACHE_VERSION = "v1"
+# Same bounds as RankingFormulaItem.weight (max_digits=8, decimal_places=4).
+WHAT_IF_MAX_WEIGHT = Decimal("9999.9999")
+WHAT_IF_WEIGHT_EXPONENT = -4
+
+
+class RankingWhatIfError(ValueError):
+    """Raised when a what-if scenario is invalid or cannot be simulated."""
+
+
+@dataclass(frozen=True, slots=True)
+class WhatIfItem:
+    assessment_id: int
+    weight: Decimal
+    normalization_method: str = RankingFormulaItem.NormalizationMethod.RAW
+    is_required: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class WhatIfScenario:
+    items: tuple[WhatIfItem, ...]
+    missing_score_policy: str
+    tiebreak_policy: dict
+
+
+@dataclass(slots=True)
+class WhatIfCohort:
+    """The cached part of a simulation: the cohort matrix plus display names."""
+
+    version: str
+    matrix: CohortScoreMatrix
+    student_names: list[str]
+
+
+@dataclass(frozen=True, slots=True)
+class WhatIfRankRow:
+    student_id: int
+    student_name: str
+    total_score: Decimal
+    rank: int
+    current_rank: int | None
+
+    @property
+    def rank_delta(self) -> int | None:
+        """Places gained against the current snapshot; positive means moved up."""
+        if self.current_rank is None:
+            return None
+        return self.current_rank - self.rank
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "student_id": self.student_id,
+            "student_name": self.student_name,
+            "total_score": str(self.total_score),
+            "rank": self.rank,
+            "current_rank": self.current_rank,
+            "rank_delta": self.rank_delta,
+        }
+
+
+@dataclass(slots=True)
+class WhatIfResult:
+    formula_id: int
+    cohort_version: str
+    rows: list[WhatIfRankRow]
+    elapsed_seconds: float
+
+    @property
+    def moved_count(self) -> int:
+        return sum(1 for row in self.rows if row.rank_delta)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "formula_id": self.formula_id,
+            "cohort_version": self.cohort_version,
+            "student_count": len(self.rows),
+            "moved_count": self.moved_count,
+            "elapsed_ms": round(self.elapsed_seconds * 1000, 3),
+            "rows": [row.to_json() for row in self.rows],
+        }
+
+
+def current_formula_scenario(formula: RankingFormula) -> WhatIfScenario:
+    return WhatIfScenario(
+        items=tuple(
+            WhatIfItem(
+                assessment_id=item.assessment_id,
+                weight=item.weight,
+                normalization_method=item.normalization_method,
+                is_required=item.is_required,
+            )
+            for item in formula.items.order_by("sort_order", "id")
+        ),
+        missing_score_policy=formula.missing_score_policy,
+        tiebreak_policy=formula.tiebreak_policy if isinstance(formula.tiebreak_policy, dict) else {},
+    )
+
+
+def parse_what_if_scenario(payload: object, *, formula: RankingFormula) -> WhatIfScenario:
+    """Validate a JSON scenario; omitted keys keep the formula's current values."""
+    if not isinstance(payload, dict):
+        msg = "The scenario must be a JSON object."
+        raise RankingWhatIfError(msg)
+
+    current = current_formula_scenario(formula)
+    items = current.items
+    if "items" in payload:
+        items = _parse_items(payload["items"])
+
+    missing_score_policy = current.missing_score_policy
+    if "missing_score_policy" in payload:
+        missing_score_policy = canonicalize_choice_token(
+            str(payload["missing_score_policy"] or ""),
+            RANKING_FORMULA_MISSING_SCORE_POLICY_ALIASES,
+        )
+        if missing_score_policy not in RankingFormula.MissingScorePolicy.values:
+            msg = f"Unknown missing score policy: {payload['missing_score_policy']}."
+            raise RankingWhatIfError(msg)
+
+    tiebreak_policy = current.tiebreak_policy
+    if "tiebreak_policy" in payload:
+        tiebreak_policy = payload["tiebreak_policy"] or {}
+        if not isinstance(tiebreak_policy, dict):
+            msg = "tiebreak_policy must be a JSON object."
+            raise RankingWhatIfError(msg)
+
+    return WhatIfScenario(items=items, missing_score_policy=missing_score_policy, tiebreak_policy=tiebreak_policy)
+
+
+def simulate_formula_ranking(formula: RankingFormula, scenario: WhatIfScenario | None = None) -> WhatIfResult:
+    """Rank the active cohort under ``scenario`` and compare with the stored snapshots."""
+    started_at = time.perf_counter()
+    if scenario is None:
+        scenario = current_formula_scenario(formula)
+    if not scenario.items:
+        msg = "A scenario needs at least one formula item."
+        raise RankingWhatIfError(msg)
+
+    cohort = load_what_if_cohort(formula)
+    matrix = cohort.matrix
+    assessments_by_id = Assessment.objects.in_bulk([item.assessment_id for item in scenario.items])
+    unknown_ids = sorted(
+        {item.assessment_id for item in scenario.items} - (set(assessments_by_id) & set(matrix.column_by_assessment)),
+    )
+    if unknown_ids:
+        msg = f"Assessment(s) {unknown_ids} are not part of season {formula.season_year}."
+        raise RankingWhatIfError(msg)
+
+    candidate_formula = RankingFormula(
+        id=formula.id,
+        season_year=formula.season_year,
+        division=formula.division,
+        missing_score_policy=scenario.missing_score_policy,
+        tiebreak_policy=scenario.tiebreak_policy,
+    )
+    candidate_items = [
+        RankingFormulaItem(
+            assessment=assessments_by_id[item.assessment_id],
+            weight=item.weight,
+            normalization_method=item.normalization_method,
+            is_required=item.is_required,
+            sort_order=index,
+        )
+        for index, item in enumerate(scenario.items)
+    ]
+    try:
+        formula_scores = score_formula(formula=candidate_formula, formula_items=candidate_items, matrix=matrix)
+    except InexactMatrixInputError as exc:
+        msg = "These weights cannot be simulated exactly; save the formula and recompute instead."
+        raise RankingWhatIfError(msg) from exc
+    order = rank_order(
+        formula=candidate_formula,
+        formula_items=candidate_items,
+        matrix=matrix,
+        formula_scores=formula_scores,
+    )
+
+    current_ranks = dict(
+        RankingSnapshot.objects.filter(ranking_formula=formula).values_list("student_id", "rank_overall"),
+    )
+    totals = formula_scores.totals.tolist()
+    denominators = formula_scores.denominators.tolist()
+    rows = []
+    for rank, student_index in enumerate(order.tolist(), start=1):
+        student_id = matrix.student_ids[student_index]
+        total_units = totals[student_index]
+        rows.append(
+            WhatIfRankRow(
+                student_id=student_id,
+                student_name=cohort.student_names[student_index],
+                total_score=ZERO if denominators[student_index] == 0 else score_units_to_decimal(total_units),
+                rank=rank,
+                current_rank=current_ranks.get(student_id),
+            ),
+        )
+    return WhatIfResult(
+        formula_id=formula.id,
+        cohort_version=cohort.version,
+        rows=rows,
+        elapsed_seconds=time.perf_counter() - started_at,
+    )
+
+
+def load_what_if_cohort(formula: RankingFormula) -> WhatIfCohort:
+    """The cached score matrix of the active cohort over every assessment of the season."""
+    in_scope = Q(season_year=formula.season_year) | Q(ranking_formula_items__ranking_formula=formula)
+    assessment_ids = list(
+        Assessment.objects.filter(in_scope).order_by("id").values_list("id", flat=True).distinct(),
+    )
+    version = _cohort_version(assessment_ids=assessment_ids)
+    cache_key = (
+        f"ranking-what-if-matrix:{WHAT_IF_MATRIX_CACHE_VERSION}:"
+        f"{formula.season_year}:{formula.division or '-'}:{version}"
+    )
+    cached_cohort = cache.get(cache_key)
+    if cached_cohort is not None:
+        return cached_cohort
+
+    students = list(Student.objects.filter(active=True).only("id", "normalized_name", "full_name").order_by("id"))
+    result_values = load_result_values(
+        student_ids=[student.id for student in students],
+        assessment_ids=assessment_ids,
+    )
+    try:
+        matrix = build_cohort_score_matrix(
+            students=students,
+            assessment_ids=assessment_ids,
+            result_values=result_values,
+        )
+    except InexactMatrixInputError as exc:
+        msg = f"Season {formula.season_year} has scores the simulator cannot represent exactly."
+        raise RankingWhatIfError(msg) from exc
+
+    cohort = WhatIfCohort(
+        version=version,
+        matrix=matrix,
+        student_names=[student.full_name for student in students],
+    )
+    cache.set(cache_key, cohort, WHAT_IF_MATRIX_CACHE_SECONDS)
+    return cohort
+
+
+def _cohort_version(*, assessment_ids: list[int]) -> str:
+    result_marker = StudentResult.objects.filter(assessment_id__in=assessment_ids).aggregate(
+        count=Count("id"),
+        last_id=Max("id"),
+        last_updated=Max("updated_at"),
+    )
+    student_marker = Student.objects.aggregate(
+        active=Count("id", filter=Q(active=True)),
+        last_id=Max("id"),
+        last_updated=Max("updated_at"),
+    )
+    key_payload = "|".join(
+        [
+            ",".join(str(assessment_id) for assessment_id in assessment_ids),
+            *(f"{name}={value}" for name, value in sorted(result_marker.items())),
+            *(f"student_{name}={value}" for name, value in sorted(student_marker.items())),
+        ],
+    )
+    return hashlib.sha256(key_payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_items(raw_items: object) -> tuple[WhatIfItem, ...]:
+    if not isinstance(raw_items, list) or not raw_items:
+        msg = "items must be a non-empty list."
+        raise RankingWhatIfError(msg)
+
+    items: list[WhatIfItem] = []
+    seen_assessment_ids: set[int] = set()
+    for raw_item in raw_items:
+        if not isinstance(raw_item, dict):
+            msg = "Each item must be a JSON object."
+            raise RankingWhatIfError(msg)
+        try:
+            assessment_id = int(raw_item.get("assessment_id", ""))
+        except (TypeError, ValueError) as exc:
+            msg = f"Invalid assessment_id: {raw_item.get('assessment_id')!r}."
+            raise RankingWhatIfError(msg) from exc
+        if assessment_id in seen_assessment_ids:
+            msg = f"Assessment {assessment_id} appears more than once."
+            raise RankingWhatIfError(msg)
+        seen_assessment_ids.add(assessment_id)
+
+        normalization_method = canonicalize_choice_token(
+            str(raw_item.get("normalization_method") or RankingFormulaItem.NormalizationMethod.RAW),
+            RANKING_FORMULA_ITEM_NORMALIZATION_METHOD_ALIASES,
+        )
+        if normalization_method not in RankingFormulaItem.NormalizationMethod.values:
+            msg = f"Unknown normalization method: {raw_item.get('normalization_method')}."
+            raise RankingWhatIfError(msg)
+
+        is_required = raw_item.get("is_required", False)
+        if not isinstance(is_required, bool):
+            msg = f"is_required must be true or false, not {is_required!r}."
+            raise RankingWhatIfError(msg)
+
+        items.append(
+            WhatIfItem(
+                assessment_id=assessment_id,
+                weight=_parse_weight(raw_item.get("weight", "1")),
+                normalization_method=normalization_method,
+                is_required=is_required,
+            ),
+        )
+    return tuple(items)
+
+
+def _parse_weight(value: object) -> Decimal:
+    try:
+        weight = Decimal(str(value))
+    except InvalidOperation as exc:
+        msg = f"Invalid weight: {value!r}."
+        raise RankingWhatIfError(msg) from exc
+    if not weight.is_finite() or weight < 0 or weight > WHAT_IF_MAX_WEIGHT:
+        msg = f"Weights must be between 0 and {WHAT_IF_MAX_WEIGHT}."
+        raise RankingWhatIfError(msg)
+    exponent = weight.as_tuple().exponent
+    if isinstance(exponent, int) and exponent < WHAT_IF_WEIGHT_EXPONENT:
+        msg = "Weights can have at most four decimal places."
+        raise RankingWhatIfError(msg)
+    return weight
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import School
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import StudentSelectionStatus
+from inspinia.rankings.services.ranking_dashboard import invalidate_ranking_filter_options
+from inspinia.rankings.services.ranking_dashboard import refresh_dashboard_aggregates
+from inspinia.rankings.services.ranking_read_model import refresh_snapshot_read_model
+
+
+@receiver(post_save, sender=Student)
+def refresh_student_ranking_read_model(sender, instance: Student, *, created: bool, **kwargs) -> None:
+    if not created:
+        refresh_snapshot_read_model(student_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Student)
+def remember_student_formula_ids(sender, instance: Student, **kwargs) -> None:
+    instance._ranking_formula_ids = list(  # noqa: SLF001
+        RankingSnapshot.objects.filter(student=instance).values_list("ranking_formula_id", flat=True),
+    )
+
+
+@receiver(post_delete, sender=Student)
+def refresh_deleted_student_dashboard_aggregates(sender, instance: Student, **kwargs) -> None:
+    formula_ids = getattr(instance, "_ranking_formula_ids", None)
+    if formula_ids:
+        refresh_dashboard_aggregates(formula_ids=formula_ids)
+
+
+@receiver(post_save, sender=School)
+def refresh_school_ranking_read_model(sender, instance: School, *, created: bool, **kwargs) -> None:
+    if not created:
+        refresh_snapshot_read_model(student_ids=instance.students.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=School)
+def remember_school_student_ids(sender, instance: School, **kwargs) -> None:
+    instance._student_ids = list(instance.students.values_list("id", flat=True))  # noqa: SLF001
+
+
+@receiver(post_delete, sender=School)
+def refresh_detached_school_ranking_read_model(sender, instance: School, **kwargs) -> None:
+    student_ids = getattr(instance, "_student_ids", None)
+    if student_ids:
+        refresh_snapshot_read_model(student_ids=student_ids)
+
+
+@receiver(post_save, sender=School)
+@receiver(post_delete, sender=School)
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_ranking_filter_options_on_change(sender, instance, **kwargs) -> None:
+    invalidate_ranking_filter_options()
+
+
+@receiver(post_save, sender=StudentSelectionStatus)
+@receiver(post_delete, sender=StudentSelectionStatus)
+def refresh_selection_status_ranking_read_model(sender, instance: StudentSelectionStatus, **kwargs) -> None:
+    refresh_snapshot_read_model(student_ids=[instance.student_id])
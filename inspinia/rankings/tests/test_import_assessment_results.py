@@ -9,6 +9,7 @@ from inspinia.rankings.imports.assessment_result_import import PREVIEW_STATUS_IN
 from inspinia.rankings.imports.assessment_result_import import PREVIEW_STATUS_MATCHED
 from inspinia.rankings.imports.assessment_result_import import PREVIEW_STATUS_MISSING_STUDENT
 from inspinia.rankings.imports.assessment_result_import import apply_assessment_result_import
+from inspinia.rankings.imports.assessment_result_import import iter_assessment_result_chunks
 from inspinia.rankings.imports.assessment_result_import import preview_assessment_result_import
 from inspinia.rankings.models import Assessment
 from inspinia.rankings.models import ImportBatch
@@ -27,6 +28,7 @@ APPLY_CREATED_ROWS = 1
 APPLY_UPDATED_ROWS = 1
 APPLY_UPSERTED_ROWS = 2
 APPLY_STUDENT_RESULT_COUNT = 2
+CSV_CHUNK_SIZE = 2
 
 
 def _test_password() -> str:
@@ -234,3 +236,63 @@ def test_apply_assessment_result_import_upserts_rows_and_updates_batch_summary()
     assert bob_result.source_file_name == "assessment-results.csv"
     assert bob_result.imported_by == user
     assert bob_result.imported_at is not None
+
+
+def test_preview_assessment_result_import_resolves_students_in_constant_queries(django_assert_max_num_queries):
+    assessment = _assessment()
+    batch = _batch()
+    students = [
+        Student.objects.create(full_name=f"Student {index}", external_code=f"S-{index:03d}") for index in range(40)
+    ]
+    Student.objects.create(full_name="Twin Name")
+    Student.objects.create(full_name="twin name")
+    identifiers = [f"s-{index:03d}" for index in range(40)] + ["TWIN NAME", str(students[0].id), "NOBODY"]
+    dataframe = pd.DataFrame([{"student_identifier": identifier, "raw_score": "10"} for identifier in identifiers])
+
+    with django_assert_max_num_queries(8):
+        result = preview_assessment_result_import(dataframe, batch=batch, assessment=assessment)
+
+    statuses = [row.status for row in result.rows]
+    assert statuses[:40] == [PREVIEW_STATUS_MATCHED] * 40
+    assert [row.student_id for row in result.rows[:40]] == [student.id for student in students]
+    assert statuses[40:] == [PREVIEW_STATUS_INVALID, PREVIEW_STATUS_MATCHED, PREVIEW_STATUS_MISSING_STUDENT]
+    assert result.rows[40].issue_message == "Student identifier 'TWIN NAME' is ambiguous."
+
+
+def test_reapplying_assessment_results_only_writes_changed_rows():
+    assessment = _assessment()
+    Student.objects.create(full_name="Alice Tan", external_code="A-001")
+    Student.objects.create(full_name="Bob Lim", external_code="B-002")
+    dataframe = pd.DataFrame(
+        [
+            {"student_identifier": "A-001", "raw_score": "91.50", "medal": "Gold"},
+            {"student_identifier": "B-002", "raw_score": "74", "medal": "Silver"},
+        ],
+    )
+    apply_assessment_result_import(dataframe, batch=_batch(), assessment=assessment)
+    dataframe.loc[1, "raw_score"] = "80"
+    batch = _batch()
+
+    result = apply_assessment_result_import(dataframe, batch=batch, assessment=assessment)
+
+    assert (result.created_count, result.updated_count, result.unchanged_count) == (0, 1, 1)
+    batch.refresh_from_db()
+    assert batch.summary_json["unchanged_count"] == 1
+    assert StudentResult.objects.get(student__external_code="B-002").raw_score == Decimal("80.00")
+
+
+def test_preview_streams_csv_chunks_and_keeps_identifier_leading_zeros():
+    assessment = _assessment()
+    batch = _batch("results.csv")
+    padded = Student.objects.create(full_name="Padded Code", external_code="00123")
+    payload = b"student_identifier,raw_score\n00123,15\nNOBODY,9\n00123,16\n"
+
+    result = preview_assessment_result_import(
+        iter_assessment_result_chunks(payload, chunk_size=CSV_CHUNK_SIZE),
+        batch=batch,
+        assessment=assessment,
+    )
+
+    assert [row.row_number for row in result.rows] == [2, 3, 4]
+    assert [row.student_id for row in result.rows] == [padded.id, None, padded.id]
+    assert result.rows[2].raw_score == Decimal("16.00")
@@ -21,6 +21,7 @@ from inspinia.users.tests.factories import UserFactory
 pytestmark = pytest.mark.django_db
 
 EXPECTED_TEAM_AND_SQUAD_STATUS_COUNT = 2
+TEAM_MEMBER_COUNT = 3
 
 
 def _make_import_batch(*, created_by: User | None = None) -> ImportBatch:
@@ -107,9 +108,13 @@ def test_apply_legacy_wide_import_routes_team_and_squad_labels_to_selection_stat
     assert batch.summary_json == {
         "created_students": 1,
         "updated_students": 0,
+        "unchanged_students": 0,
         "created_assessments": 1,
         "created_results": 1,
+        "updated_results": 0,
+        "unchanged_results": 0,
         "created_statuses": 2,
+        "unchanged_statuses": 0,
         "issues": 0,
         "rows": 1,
     }
@@ -126,3 +131,62 @@ def test_apply_legacy_wide_import_routes_team_and_squad_labels_to_selection_stat
     assert StudentSelectionStatus.objects.filter(student=student, status="squad").exists()
     assert StudentResult.objects.filter(student=student, assessment=assessment).count() == 1
     assert StudentResult.objects.filter(student=student, assessment=assessment).first().status_text == ""
+
+
+def test_apply_legacy_wide_import_matches_students_created_earlier_in_the_same_sheet():
+    batch = _make_import_batch()
+    Student.objects.create(full_name="Bob Lim", birth_year=2009)
+    dataframe = pd.DataFrame(
+        [
+            {"full_name": "Alice Tan", "birth_year": 2008, "external_code": "AST-001", "R1": "88"},
+            {"full_name": "Alice  Tan", "birth_year": 2008, "external_code": "ast-001", "R2": "70"},
+            {"full_name": "bob lim", "birth_year": 2009, "external_code": "BL-001", "R1": "60"},
+            {"full_name": "Bob Lim", "birth_year": None, "external_code": "BL-001", "R2": "65"},
+        ],
+    )
+
+    preview = preview_legacy_wide_import(dataframe=dataframe, import_batch=batch)
+    result = apply_legacy_wide_import(preview=preview, import_batch=batch, season_year=2026)
+
+    assert result.created_students == 1
+    assert result.updated_students == 2  # noqa: PLR2004
+    assert result.unchanged_students == 1
+    assert Student.objects.count() == 2  # noqa: PLR2004
+    assert StudentResult.objects.filter(student__external_code="BL-001").count() == 2  # noqa: PLR2004
+
+
+def test_reapplying_legacy_wide_import_reports_unchanged_rows_in_bulk(django_assert_max_num_queries):
+    dataframe = pd.DataFrame(
+        [
+            {
+                "full_name": f"Student {index}",
+                "birth_year": 2008,
+                "external_code": f"S-{index:03d}",
+                "school": "SMK A" if index % 2 else "SMK B",
+                "TEAM": "TEAM" if index < TEAM_MEMBER_COUNT else "",
+                "R1": str(50 + index),
+                "R2": str(40 + index),
+            }
+            for index in range(30)
+        ],
+    )
+    first_batch = _make_import_batch()
+    apply_legacy_wide_import(
+        preview=preview_legacy_wide_import(dataframe=dataframe, import_batch=first_batch),
+        import_batch=first_batch,
+        season_year=2026,
+    )
+    dataframe.loc[0, "R1"] = "99"
+    second_batch = _make_import_batch()
+    second_preview = preview_legacy_wide_import(dataframe=dataframe, import_batch=second_batch)
+
+    with django_assert_max_num_queries(20):
+        result = apply_legacy_wide_import(preview=second_preview, import_batch=second_batch, season_year=2026)
+
+    assert (result.created_students, result.updated_students, result.unchanged_students) == (0, 0, 30)
+    assert (result.created_results, result.updated_results, result.unchanged_results) == (0, 1, 59)
+    assert (result.created_statuses, result.unchanged_statuses) == (0, TEAM_MEMBER_COUNT)
+    assert result.created_assessments == 0
+    assert StudentResult.objects.get(student__external_code="S-000", assessment__code="R1").raw_score == Decimal(
+        "99.00",
+    )
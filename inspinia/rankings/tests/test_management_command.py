@@ -13,6 +13,7 @@ from inspinia.rankings.models import RankingFormulaItem
 from inspinia.rankings.models import RankingSnapshot
 from inspinia.rankings.models import Student
 from inspinia.rankings.models import StudentResult
+from inspinia.rankings.services import ranking_recompute
 
 pytestmark = pytest.mark.django_db
 
@@ -161,3 +162,119 @@ def test_recompute_rankings_command_clears_stale_snapshots_for_empty_formula():
     output = stdout.getvalue()
     assert "cleared 1 existing snapshot(s)" in output
     assert "Recomputed 0 formula(s), stored 0 snapshot(s)." in output
+
+
+def test_recompute_rankings_command_refreshes_only_listed_students():
+    formula = _make_formula("Overall")
+    assessment = _make_assessment("R1", sort_order=1)
+    _attach_assessment(formula, assessment)
+    alice = Student.objects.create(full_name="Alice Tan", active=True)
+    bob = Student.objects.create(full_name="Bob Lim", active=True)
+    StudentResult.objects.create(student=alice, assessment=assessment, raw_score=Decimal("80.00"))
+    bob_result = StudentResult.objects.create(student=bob, assessment=assessment, raw_score=Decimal("70.00"))
+    call_command("recompute_rankings", "--formula", str(formula.id), stdout=StringIO())
+    alice_snapshot_id = RankingSnapshot.objects.get(ranking_formula=formula, student=alice).id
+    bob_result.raw_score = Decimal("90.00")
+    bob_result.save()
+
+    stdout = StringIO()
+    call_command("recompute_rankings", "--formula", str(formula.id), "--student", str(bob.id), stdout=stdout)
+
+    snapshots = list(RankingSnapshot.objects.filter(ranking_formula=formula).order_by("rank_overall"))
+    assert [(snapshot.student_id, snapshot.rank_overall) for snapshot in snapshots] == [(bob.id, 1), (alice.id, 2)]
+    assert snapshots[1].id == alice_snapshot_id
+    assert "Refreshed 1 formula(s) for 1 student(s), wrote 2 snapshot change(s)." in stdout.getvalue()
+
+
+def test_recompute_rankings_command_rejects_non_positive_student_id():
+    with pytest.raises(CommandError, match="--student must be a positive integer."):
+        call_command("recompute_rankings", "--student", "0")
+
+
+def test_recompute_rankings_command_reports_per_formula_timing_and_runs_serially_on_sqlite():
+    senior = _make_formula("Senior Overall", division="senior")
+    junior = _make_formula("Junior Overall", division="junior")
+    assessment = _make_assessment("R1", sort_order=1)
+    _attach_assessment(senior, assessment)
+    _attach_assessment(junior, assessment)
+    alice = Student.objects.create(full_name="Alice Tan", active=True)
+    StudentResult.objects.create(student=alice, assessment=assessment, raw_score=Decimal("88.00"))
+
+    stdout = StringIO()
+    call_command("recompute_rankings", "--workers", "4", stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "SQLite serializes writers; recomputing with 1 worker." in output
+    assert f"RankingFormula {senior.id} (Senior Overall): 1 snapshot(s) in " in output
+    assert f"RankingFormula {junior.id} (Junior Overall): 1 snapshot(s) in " in output
+    assert "Recomputed 2 formula(s), stored 2 snapshot(s)." in output
+
+
+def test_recompute_formula_groups_fans_groups_out_to_the_process_pool(monkeypatch):
+    class InlineExecutor:
+        max_workers = None
+
+        def __init__(self, *, max_workers, mp_context, initializer):
+            InlineExecutor.max_workers = max_workers
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def map(self, function, iterable):
+            return [function(item) for item in iterable]
+
+    monkeypatch.setattr(ranking_recompute, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(ranking_recompute.connections, "close_all", lambda: None)
+    senior = _make_formula("Senior Overall", division="senior")
+    senior_v2 = _make_formula("Senior Overall v2", division="senior", version=2)
+    junior = _make_formula("Junior Overall", division="junior")
+    assessment = _make_assessment("R1", sort_order=1)
+    for formula in (senior, senior_v2, junior):
+        _attach_assessment(formula, assessment)
+    alice = Student.objects.create(full_name="Alice Tan", active=True)
+    StudentResult.objects.create(student=alice, assessment=assessment, raw_score=Decimal("88.00"))
+
+    groups = ranking_recompute.group_formula_ids(
+        RankingFormula.objects.order_by("season_year", "division", "id"),
+    )
+    results = ranking_recompute.recompute_formula_groups(groups, workers=8)
+
+    assert groups == [[junior.id], [senior.id, senior_v2.id]]
+    assert InlineExecutor.max_workers == len(groups)
+    assert [result.formula_id for result in results] == [junior.id, senior.id, senior_v2.id]
+    assert RankingSnapshot.objects.count() == len(results)
+
+
+def test_recompute_formula_group_locks_only_formulas_and_loads_results_under_the_lock(monkeypatch):
+    formula = _make_formula("Senior Overall", division="senior")
+    first_round = _make_assessment("R1", sort_order=1)
+    second_round = _make_assessment("R2", sort_order=2)
+    _attach_assessment(formula, first_round, sort_order=1)
+    alice = Student.objects.create(full_name="Alice Tan", active=True)
+    StudentResult.objects.create(student=alice, assessment=first_round, raw_score=Decimal("40.00"))
+    StudentResult.objects.create(student=alice, assessment=second_round, raw_score=Decimal("60.00"))
+    ranking_recompute.recompute_formula_group([formula.id])
+    score_before_edit = RankingSnapshot.objects.get(ranking_formula=formula).total_score
+    locked_ids = []
+    lock_formulas = ranking_recompute.lock_formulas_for_group_refresh
+
+    def edit_then_lock(formula_ids):
+        # An item and a result import commit just before the group takes its lock.
+        _attach_assessment(formula, second_round, sort_order=2)
+        StudentResult.objects.filter(student=alice, assessment=first_round).update(raw_score=Decimal("10.00"))
+        locked_ids.append(list(formula_ids))
+        return lock_formulas(formula_ids)
+
+    monkeypatch.setattr(ranking_recompute, "lock_formulas_for_group_refresh", edit_then_lock)
+    [result] = ranking_recompute.recompute_formula_group([formula.id])
+    score_after_edit = RankingSnapshot.objects.get(ranking_formula=formula).total_score
+    monkeypatch.setattr(ranking_recompute, "lock_formulas_for_group_refresh", lock_formulas)
+    ranking_recompute.recompute_formula_group([formula.id])
+
+    assert locked_ids == [[formula.id]]
+    assert result.snapshot_count == 1
+    assert score_after_edit != score_before_edit
+    assert RankingSnapshot.objects.get(ranking_formula=formula).total_score == score_after_edit
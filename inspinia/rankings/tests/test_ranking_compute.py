@@ -1,3 +1,4 @@
+import random
 from decimal import Decimal
 
 import pytest
@@ -9,6 +10,7 @@ from inspinia.rankings.models import Student
 from inspinia.rankings.models import StudentResult
 from inspinia.rankings.services.ranking_compute import compute_rank_rows
 from inspinia.rankings.services.ranking_compute import compute_rankings
+from inspinia.rankings.services.ranking_compute_batch import compute_rank_rows_batch
 
 pytestmark = pytest.mark.django_db
 
@@ -254,3 +256,115 @@ def test_compute_rankings_avoids_breakdown_key_collision_for_duplicate_assessmen
     assert row["total_score"] == Decimal("80.0000")
     assert "DUP" in row["breakdown"]
     assert any(key.startswith("DUP__") for key in row["breakdown"])
+
+
+def _rows_as_tuples(rows) -> list[tuple]:
+    return [
+        (
+            row.student_id,
+            str(row.total_score),
+            row.normalized_name,
+            {key: {name: str(value) for name, value in item.items()} for key, item in row.breakdown.items()},
+        )
+        for row in rows
+    ]
+
+
+_REQUIRED_ITEM_RATE = 0.3
+_MISSING_RESULT_RATE = 0.2
+_NORMALIZED_SCORE_RATE = 0.5
+
+
+def _make_random_cohort(*, seed: int, missing_score_policy: str, tiebreak_policy: dict) -> RankingFormula:
+    rng = random.Random(seed)  # noqa: S311
+    formula = RankingFormula.objects.create(
+        name=f"Parity {seed}",
+        season_year=2026,
+        division="",
+        purpose=RankingFormula.Purpose.OVERALL,
+        missing_score_policy=missing_score_policy,
+        tiebreak_policy=tiebreak_policy,
+    )
+    methods = list(RankingFormulaItem.NormalizationMethod.values)
+    assessments = []
+    for index in range(5):
+        assessment = _make_assessment(
+            f"P{seed}-{index}",
+            max_score=rng.choice(["7.00", "42.00", "100.00", "0.00", "33.33"]),
+            sort_order=index,
+        )
+        RankingFormulaItem.objects.create(
+            ranking_formula=formula,
+            assessment=assessment,
+            weight=Decimal(rng.randint(1, 30_000)).scaleb(-4),
+            normalization_method=methods[index % len(methods)],
+            is_required=rng.random() < _REQUIRED_ITEM_RATE,
+            sort_order=rng.randint(0, 2),
+        )
+        assessments.append(assessment)
+
+    for student_index in range(40):
+        # Repeated names exercise the alphabetical and student-id tie-breaks.
+        student = Student.objects.create(full_name=f"Student {student_index % 13}")
+        for assessment in assessments:
+            if rng.random() < _MISSING_RESULT_RATE:
+                continue
+            StudentResult.objects.create(
+                student=student,
+                assessment=assessment,
+                # Coarse scores make total-score ties common.
+                raw_score=Decimal(rng.choice([0, 1, 2, 7, 7, 21, 42, 3333, 9999])).scaleb(-rng.choice([0, 2])),
+                normalized_score=(
+                    Decimal(rng.randint(0, 1_000_000)).scaleb(-4) if rng.random() < _NORMALIZED_SCORE_RATE else None
+                ),
+            )
+    return formula
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize(
+    "missing_score_policy",
+    [RankingFormula.MissingScorePolicy.ZERO, RankingFormula.MissingScorePolicy.SKIP_AND_RESCALE],
+)
+def test_compute_rank_rows_batch_matches_reference_engine(seed, missing_score_policy):
+    tiebreak_policy = [
+        {},
+        {"priority_assessment_code": f"P{seed}-3"},
+        {"criteria": [{"type": "alphabetical"}, {"type": "assessment_score", "assessment_code": f"P{seed}-1"}]},
+    ][seed % 3]
+    formula = _make_random_cohort(
+        seed=seed,
+        missing_score_policy=missing_score_policy,
+        tiebreak_policy=tiebreak_policy,
+    )
+
+    reference_rows = compute_rank_rows(formula=formula, students=Student.objects.all())
+    batch_rows = compute_rank_rows_batch(formula=formula, students=Student.objects.all())
+
+    assert _rows_as_tuples(batch_rows) == _rows_as_tuples(reference_rows)
+
+
+def test_compute_rank_rows_batch_falls_back_for_values_outside_the_integer_matrix():
+    formula = _make_formula(missing_score_policy=RankingFormula.MissingScorePolicy.ZERO)
+    round_one = _make_assessment("R1", sort_order=1)
+    RankingFormulaItem.objects.create(ranking_formula=formula, assessment=round_one, weight=Decimal("1.0000"))
+    alice = Student.objects.create(full_name="Alice Tan")
+    bob = Student.objects.create(full_name="Bob Lim")
+    StudentResult.objects.create(student=alice, assessment=round_one, raw_score=Decimal("-0.01"))
+    StudentResult.objects.create(student=bob, assessment=round_one, raw_score=Decimal("5.00"))
+
+    reference_rows = compute_rank_rows(formula=formula, students=Student.objects.all())
+    batch_rows = compute_rank_rows_batch(formula=formula, students=Student.objects.all())
+
+    assert _rows_as_tuples(batch_rows) == _rows_as_tuples(reference_rows)
+    assert [row.student_id for row in batch_rows] == [bob.id, alice.id]
+
+
+def test_compute_rank_rows_batch_handles_formula_without_items_and_empty_cohort():
+    formula = _make_formula(missing_score_policy=RankingFormula.MissingScorePolicy.ZERO)
+    Student.objects.create(full_name="Alice Tan")
+
+    assert compute_rank_rows_batch(formula=formula, students=Student.objects.none()) == []
+    assert _rows_as_tuples(compute_rank_rows_batch(formula=formula, students=Student.objects.all())) == (
+        _rows_as_tuples(compute_rank_rows(formula=formula, students=Student.objects.all()))
+    )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from inspinia.rankings import views as ranking_views
+from inspinia.rankings.models import Assessment
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingFormulaItem
+from inspinia.rankings.models import School
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import StudentResult
+from inspinia.rankings.models import StudentSelectionStatus
+from inspinia.rankings.models import build_ranking_dashboard_aggregates
+from inspinia.rankings.services.ranking_compute_batch import compute_rank_rows_batch
+from inspinia.rankings.services.ranking_snapshot_store import clear_ranking_snapshots
+from inspinia.rankings.services.ranking_snapshot_store import store_ranking_snapshots
+from inspinia.users.models import User
+from inspinia.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+SEASON_YEAR = 2026
+STUDENT_COUNT = 3
+
+
+def _stored_formula() -> tuple[RankingFormula, list[Student]]:
+    assessment = Assessment.objects.create(
+        code="R1",
+        display_name="R1",
+        season_year=SEASON_YEAR,
+        category=Assessment.Category.CONTEST,
+        result_type=Assessment.ResultType.SCORE,
+    )
+    formula = RankingFormula.objects.create(name="Overall", season_year=SEASON_YEAR)
+    RankingFormulaItem.objects.create(ranking_formula=formula, assessment=assessment, weight=Decimal(1))
+    north = School.objects.create(name="North High")
+    south = School.objects.create(name="South High")
+    students = []
+    for name, school, state, score in [
+        ("Ada", north, "Selangor", "40"),
+        ("Ben", north, "Johor", "10"),
+        ("Cy", south, "Selangor", "25"),
+    ]:
+        student = Student.objects.create(full_name=name, school=school, state=state)
+        StudentResult.objects.create(student=student, assessment=assessment, raw_score=Decimal(score))
+        students.append(student)
+    store_ranking_snapshots(
+        formula=formula,
+        rows=compute_rank_rows_batch(formula=formula, students=Student.objects.order_by("id")),
+    )
+    return formula, students
+
+
+def test_dashboard_aggregates_summarize_scores_schools_and_states():
+    aggregates = build_ranking_dashboard_aggregates(
+        [
+            (Decimal("40"), "North High", "Selangor"),
+            (Decimal("10"), "North High", "Johor"),
+            (Decimal("25"), "", "Selangor"),
+        ],
+    )
+
+    assert aggregates["snapshot_count"] == STUDENT_COUNT
+    assert aggregates["school_stats"][0] == {
+        "school_name": "North High",
+        "student_count": 2,
+        "average_total": "25.0000",
+    }
+    assert aggregates["state_stats"][0] == {"student_state": "Selangor", "student_count": 2}
+
+    distribution = aggregates["score_distribution"]
+    assert (distribution["min"], distribution["median"], distribution["max"]) == ("10.0000", "25.0000", "40.0000")
+    assert sum(bucket["count"] for bucket in distribution["buckets"]) == STUDENT_COUNT
+    assert distribution["buckets"][-1]["upper"] == "40.0000"
+    assert build_ranking_dashboard_aggregates([])["score_distribution"]["buckets"] == []
+
+
+def test_snapshot_writes_keep_stored_aggregates_current():
+    formula, (ada, _ben, cy) = _stored_formula()
+
+    formula.refresh_from_db()
+    assert formula.dashboard_aggregates["snapshot_count"] == STUDENT_COUNT
+    assert formula.dashboard_aggregates["school_stats"][0]["school_name"] == "North High"
+
+    ada.school = cy.school
+    ada.save()
+    formula.refresh_from_db()
+    assert formula.dashboard_aggregates["school_stats"][0] == {
+        "school_name": "South High",
+        "student_count": 2,
+        "average_total": "32.5000",
+    }
+
+    clear_ranking_snapshots(formula=formula)
+    formula.refresh_from_db()
+    assert formula.dashboard_aggregates["snapshot_count"] == 0
+
+
+def test_dashboard_reads_stored_aggregates_unless_rows_are_filtered(client):
+    formula, _students = _stored_formula()
+    School.objects.create(name="West High")
+    School.objects.create(name="Closed High", is_active=False)
+    client.force_login(UserFactory(role=User.Role.MODERATOR))
+    url = reverse("rankings:dashboard")
+
+    response = client.get(url, {"formula": formula.id})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["school_stats"] == formula.dashboard_aggregates["school_stats"]
+    assert response.context["score_distribution"]["max"] == "40.0000"
+    assert response.context["school_options"] == ["North High", "South High", "West High"]
+    assert response.context["state_options"] == ["Johor", "Selangor"]
+    assert response.context["season_options"] == [SEASON_YEAR]
+
+    filtered = client.get(url, {"formula": formula.id, "state": "Johor"})
+
+    assert [item["school_name"] for item in filtered.context["school_stats"]] == ["North High"]
+    assert filtered.context["score_distribution"]["max"] == "10.0000"
+
+
+def test_dashboard_status_cards_count_only_the_top_ranked_rows(client, monkeypatch):
+    formula, (ada, ben, cy) = _stored_formula()
+    for student, status in [
+        (ada, StudentSelectionStatus.Status.TEAM),
+        (cy, StudentSelectionStatus.Status.WATCHLIST),
+        (ben, StudentSelectionStatus.Status.TEAM),
+    ]:
+        StudentSelectionStatus.objects.create(student=student, season_year=SEASON_YEAR, status=status)
+    monkeypatch.setattr(ranking_views, "RANKING_DASHBOARD_STATUS_ROW_LIMIT", 2)
+    client.force_login(UserFactory(role=User.Role.MODERATOR))
+
+    response = client.get(reverse("rankings:dashboard"), {"formula": formula.id})
+
+    # Ben ranks third, below the two counted rows.
+    assert (response.context["selected_count"], response.context["watchlist_count"]) == (1, 1)
+
+
+def test_filter_options_are_cached_until_a_school_or_student_changes(client, django_capture_on_commit_callbacks):
+    formula, (ada, _ben, _cy) = _stored_formula()
+    client.force_login(UserFactory(role=User.Role.MODERATOR))
+    url = reverse("rankings:dashboard")
+    client.get(url, {"formula": formula.id})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"formula": formula.id})
+
+    assert response.context["state_options"] == ["Johor", "Selangor"]
+    assert not [query["sql"] for query in queries if '"rankings_school"' in query["sql"]]
+    assert not [query["sql"] for query in queries if 'DISTINCT "rankings_student"."state"' in query["sql"]]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        School.objects.create(name="West High")
+        ada.state = "Penang"
+        ada.save()
+    response = client.get(url, {"formula": formula.id})
+
+    assert response.context["school_options"] == ["North High", "South High", "West High"]
+    assert response.context["state_options"] == ["Johor", "Penang", "Selangor"]
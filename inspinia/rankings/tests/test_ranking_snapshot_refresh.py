@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from inspinia.rankings.imports.assessment_result_import import apply_assessment_result_import
+from inspinia.rankings.models import Assessment
+from inspinia.rankings.models import ImportBatch
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingFormulaItem
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import StudentResult
+from inspinia.rankings.services.ranking_compute import compute_rank_rows
+from inspinia.rankings.services.ranking_snapshot_refresh import refresh_ranking_snapshots_for_students
+from inspinia.rankings.services.ranking_snapshot_store import store_ranking_snapshots
+
+pytestmark = pytest.mark.django_db
+
+COHORT_SIZE = 30
+
+
+def _make_assessment(code: str, *, sort_order: int = 0) -> Assessment:
+    return Assessment.objects.create(
+        code=code,
+        display_name=code,
+        season_year=2026,
+        category=Assessment.Category.CONTEST,
+        division_scope="",
+        result_type=Assessment.ResultType.SCORE,
+        max_score=Decimal("42.00"),
+        sort_order=sort_order,
+    )
+
+
+def _make_formula(assessments: list[Assessment], *, tiebreak_policy: dict | None = None) -> RankingFormula:
+    formula = RankingFormula.objects.create(
+        name="Overall",
+        season_year=2026,
+        division="",
+        purpose=RankingFormula.Purpose.OVERALL,
+        missing_score_policy=RankingFormula.MissingScorePolicy.ZERO,
+        tiebreak_policy=tiebreak_policy or {},
+    )
+    for index, assessment in enumerate(assessments, start=1):
+        RankingFormulaItem.objects.create(
+            ranking_formula=formula,
+            assessment=assessment,
+            weight=Decimal(index),
+            normalization_method=RankingFormulaItem.NormalizationMethod.PERCENT_OF_MAX,
+            sort_order=index,
+        )
+    return formula
+
+
+def _store_full(formula: RankingFormula) -> None:
+    store_ranking_snapshots(formula=formula, rows=compute_rank_rows(formula, Student.objects.filter(active=True)))
+
+
+def _snapshot_state(formula: RankingFormula) -> list[tuple]:
+    return list(
+        RankingSnapshot.objects.filter(ranking_formula=formula)
+        .order_by("rank_overall")
+        .values_list("student_id", "rank_overall", "rank_within_division", "total_score", "score_breakdown_json"),
+    )
+
+
+def test_incremental_refresh_matches_full_recompute_and_only_touches_shifted_ranks():
+    rng = random.Random(7)  # noqa: S311
+    round_one = _make_assessment("R1", sort_order=1)
+    round_two = _make_assessment("R2", sort_order=2)
+    formula = _make_formula([round_one, round_two], tiebreak_policy={"priority_assessment_code": "R2"})
+    students = [Student.objects.create(full_name=f"Student {index % 7}") for index in range(COHORT_SIZE)]
+    for student in students:
+        for assessment in (round_one, round_two):
+            StudentResult.objects.create(
+                student=student,
+                assessment=assessment,
+                raw_score=Decimal(rng.choice([0, 7, 14, 21, 28, 35, 42])),
+            )
+    _store_full(formula)
+    snapshot_ids_before = dict(
+        RankingSnapshot.objects.filter(ranking_formula=formula).values_list("student_id", "id"),
+    )
+
+    # One student climbs, one ties with an existing group, one leaves and one joins.
+    climber, tied, leaver = students[-1], students[3], students[5]
+    StudentResult.objects.filter(student=climber).update(raw_score=Decimal("42.00"))
+    StudentResult.objects.filter(student=tied, assessment=round_two).update(raw_score=Decimal("21.00"))
+    leaver.active = False
+    leaver.save()
+    newcomer = Student.objects.create(full_name="Newcomer")
+    StudentResult.objects.create(student=newcomer, assessment=round_one, raw_score=Decimal("14.00"))
+
+    result = refresh_ranking_snapshots_for_students(
+        formula=formula,
+        student_ids=[climber.id, tied.id, leaver.id, newcomer.id],
+    )
+    incremental_state = _snapshot_state(formula)
+
+    assert not result.full_rebuild
+    assert result.created_count == 1
+    assert result.deleted_count == 1
+    assert 0 < result.rank_shifted_count < COHORT_SIZE - 1
+    assert result.updated_count + result.unchanged_count == 2  # noqa: PLR2004
+    # Every other snapshot row is patched in place, never recreated.
+    snapshot_ids_after = dict(
+        RankingSnapshot.objects.filter(ranking_formula=formula).values_list("student_id", "id"),
+    )
+    del snapshot_ids_after[newcomer.id]
+    del snapshot_ids_before[leaver.id]
+    assert snapshot_ids_after == snapshot_ids_before
+
+    RankingSnapshot.objects.filter(ranking_formula=formula).delete()
+    _store_full(formula)
+    assert incremental_state == _snapshot_state(formula)
+
+
+def test_incremental_refresh_skips_unchanged_students():
+    round_one = _make_assessment("R1")
+    formula = _make_formula([round_one])
+    alice = Student.objects.create(full_name="Alice Tan")
+    bob = Student.objects.create(full_name="Bob Lim")
+    StudentResult.objects.create(student=alice, assessment=round_one, raw_score=Decimal("30.00"))
+    StudentResult.objects.create(student=bob, assessment=round_one, raw_score=Decimal("20.00"))
+    _store_full(formula)
+
+    result = refresh_ranking_snapshots_for_students(formula=formula, student_ids=[alice.id, bob.id])
+
+    assert result.unchanged_count == 2  # noqa: PLR2004
+    assert result.written_count == 0
+
+
+def test_incremental_refresh_rebuilds_snapshots_from_an_older_formula_version():
+    round_one = _make_assessment("R1")
+    formula = _make_formula([round_one])
+    alice = Student.objects.create(full_name="Alice Tan")
+    bob = Student.objects.create(full_name="Bob Lim")
+    StudentResult.objects.create(student=alice, assessment=round_one, raw_score=Decimal("30.00"))
+    StudentResult.objects.create(student=bob, assessment=round_one, raw_score=Decimal("20.00"))
+    _store_full(formula)
+    RankingFormula.objects.filter(pk=formula.pk).update(version=2)
+    formula.refresh_from_db()
+
+    result = refresh_ranking_snapshots_for_students(formula=formula, student_ids=[alice.id])
+
+    assert result.full_rebuild
+    assert set(
+        RankingSnapshot.objects.filter(ranking_formula=formula).values_list("formula_version_label", flat=True),
+    ) == {"v2"}
+
+
+def test_assessment_result_import_refreshes_computed_rankings():
+    round_one = _make_assessment("R1")
+    formula = _make_formula([round_one])
+    alice = Student.objects.create(full_name="Alice Tan", external_code="A-001")
+    bob = Student.objects.create(full_name="Bob Lim", external_code="B-001")
+    StudentResult.objects.create(student=alice, assessment=round_one, raw_score=Decimal("30.00"))
+    StudentResult.objects.create(student=bob, assessment=round_one, raw_score=Decimal("20.00"))
+    _store_full(formula)
+    batch = ImportBatch.objects.create(
+        import_type=ImportBatch.ImportType.ASSESSMENT_RESULTS,
+        uploaded_file=SimpleUploadedFile("results.csv", b"student_identifier,raw_score\n", content_type="text/csv"),
+        original_filename="results.csv",
+    )
+
+    apply_assessment_result_import(
+        pd.DataFrame([{"student_identifier": "B-001", "raw_score": "40.00"}]),
+        batch=batch,
+        assessment=round_one,
+    )
+
+    assert list(
+        RankingSnapshot.objects.filter(ranking_formula=formula)
+        .order_by("rank_overall")
+        .values_list("student_id", "total_score"),
+    ) == [(bob.id, Decimal("95.2381")), (alice.id, Decimal("71.4286"))]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from inspinia.rankings.models import Assessment
+from inspinia.rankings.models import RankingFormula
+from inspinia.rankings.models import RankingFormulaItem
+from inspinia.rankings.models import RankingSnapshot
+from inspinia.rankings.models import Student
+from inspinia.rankings.models import StudentResult
+from inspinia.rankings.services.ranking_compute_batch import compute_rank_rows_batch
+from inspinia.rankings.services.ranking_snapshot_store import store_ranking_snapshots
+from inspinia.rankings.services.ranking_what_if import RankingWhatIfError
+from inspinia.rankings.services.ranking_what_if import parse_what_if_scenario
+from inspinia.rankings.services.ranking_what_if import simulate_formula_ranking
+from inspinia.users.models import User
+from inspinia.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+SEASON_YEAR = 2026
+CACHED_SIMULATION_MAX_QUERIES = 6
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _assessment(code: str) -> Assessment:
+    return Assessment.objects.create(
+        code=code,
+        display_name=code,
+        season_year=SEASON_YEAR,
+        category=Assessment.Category.CONTEST,
+        result_type=Assessment.ResultType.SCORE,
+        max_score=Decimal("50.00"),
+    )
+
+
+def _ranked_formula() -> tuple[RankingFormula, list[Assessment], list[Student]]:
+    round_one = _assessment("R1")
+    round_two = _assessment("R2")
+    formula = RankingFormula.objects.create(name="Overall", season_year=SEASON_YEAR)
+    for sort_order, (assessment, weight) in enumerate([(round_one, "1"), (round_two, "3")], start=1):
+        RankingFormulaItem.objects.create(
+            ranking_formula=formula,
+            assessment=assessment,
+            weight=Decimal(weight),
+            normalization_method=RankingFormulaItem.NormalizationMethod.PERCENT_OF_MAX,
+            sort_order=sort_order,
+        )
+    scores = {"Ada": ("50", "10"), "Ben": ("10", "40"), "Cy": ("30", "30")}
+    students = []
+    for name, (first, second) in scores.items():
+        student = Student.objects.create(full_name=name)
+        StudentResult.objects.create(student=student, assessment=round_one, raw_score=Decimal(first))
+        StudentResult.objects.create(student=student, assessment=round_two, raw_score=Decimal(second))
+        students.append(student)
+    store_ranking_snapshots(
+        formula=formula,
+        rows=compute_rank_rows_batch(formula=formula, students=Student.objects.order_by("id")),
+    )
+    return formula, [round_one, round_two], students
+
+
+def test_simulation_matches_snapshots_and_reports_rank_deltas_without_writing():
+    formula, (round_one, round_two), (ada, ben, cy) = _ranked_formula()
+    stored = list(RankingSnapshot.objects.order_by("rank_overall").values_list("student_id", "total_score"))
+
+    unchanged = simulate_formula_ranking(formula)
+
+    assert [(row.student_id, row.total_score) for row in unchanged.rows] == stored
+    assert unchanged.moved_count == 0
+
+    scenario = parse_what_if_scenario(
+        {
+            "items": [
+                {"assessment_id": round_one.id, "weight": "3", "normalization_method": "percent"},
+                {"assessment_id": round_two.id, "weight": "1", "normalization_method": "percent_of_max"},
+            ],
+        },
+        formula=formula,
+    )
+    swapped = simulate_formula_ranking(formula, scenario)
+
+    assert [row.student_id for row in swapped.rows] == [ada.id, cy.id, ben.id]
+    assert [row.rank_delta for row in swapped.rows] == [2, 0, -2]
+    assert swapped.rows[0].total_score == Decimal("80.0000")
+    assert list(RankingSnapshot.objects.order_by("rank_overall").values_list("student_id", "total_score")) == stored
+
+
+def test_simulation_reuses_cached_matrix_until_results_change(django_assert_max_num_queries):
+    formula, (round_one, _round_two), (ada, _ben, _cy) = _ranked_formula()
+    first = simulate_formula_ranking(formula)
+
+    with django_assert_max_num_queries(CACHED_SIMULATION_MAX_QUERIES):
+        cached = simulate_formula_ranking(formula)
+    assert cached.cohort_version == first.cohort_version
+
+    result = StudentResult.objects.get(student=ada, assessment=round_one)
+    result.raw_score = Decimal("0")
+    result.save()
+
+    refreshed = simulate_formula_ranking(formula)
+    assert refreshed.cohort_version != first.cohort_version
+    assert refreshed.rows[-1].student_id == ada.id
+
+
+def test_scenario_validation_rejects_unknown_methods_and_assessments():
+    formula, (round_one, _round_two), _students = _ranked_formula()
+    other_season = Assessment.objects.create(code="OLD", display_name="Old", season_year=SEASON_YEAR - 1)
+
+    with pytest.raises(RankingWhatIfError, match="normalization method"):
+        parse_what_if_scenario(
+            {"items": [{"assessment_id": round_one.id, "normalization_method": "median"}]},
+            formula=formula,
+        )
+    with pytest.raises(RankingWhatIfError, match="four decimal places"):
+        parse_what_if_scenario({"items": [{"assessment_id": round_one.id, "weight": "0.00001"}]}, formula=formula)
+    with pytest.raises(RankingWhatIfError, match="is_required must be true or false"):
+        parse_what_if_scenario({"items": [{"assessment_id": round_one.id, "is_required": "false"}]}, formula=formula)
+
+    scenario = parse_what_if_scenario({"items": [{"assessment_id": other_season.id}]}, formula=formula)
+    with pytest.raises(RankingWhatIfError, match="not part of season"):
+        simulate_formula_ranking(formula, scenario)
+
+
+def test_what_if_view_returns_json_deltas_for_moderators(client):
+    formula, (round_one, _round_two), _students = _ranked_formula()
+    url = reverse("rankings:formula_what_if", args=[formula.id])
+    client.force_login(UserFactory(role=User.Role.MODERATOR))
+
+    response = client.post(
+        url,
+        data=json.dumps({"items": [{"assessment_id": round_one.id, "weight": "2"}], "missing_score_policy": "skip"}),
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    payload = response.json()
+    assert payload["formula_id"] == formula.id
+    assert [row["rank"] for row in payload["rows"]] == [1, 2, 3]
+    assert payload["rows"][0]["total_score"] == "50.0000"
+
+    invalid = client.post(url, data="{", content_type="application/json")
+    assert invalid.status_code == HTTPStatus.BAD_REQUEST
+    string_flag = client.post(
+        url,
+        data=json.dumps({"items": [{"assessment_id": round_one.id, "is_required": "0"}]}),
+        content_type="application/json",
+    )
+    assert string_flag.status_code == HTTPStatus.BAD_REQUEST
+    assert client.get(url).status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+    client.force_login(UserFactory(role=User.Role.NORMAL))
+    assert client.post(url, data="{}", content_type="application/json").status_code == HTTPStatus.FORBIDDEN
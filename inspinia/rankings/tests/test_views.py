@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from decimal import Decimal
 from http import HTTPStatus
+from io import BytesIO
 
 import pytest
 from django.conf import settings
 from django.test import override_settings
 from django.urls import reverse
+from openpyxl import load_workbook
 
 from inspinia.rankings.models import Assessment
 from inspinia.rankings.models import RankingFormula
@@ -130,6 +132,62 @@ def test_ranking_table_filters_by_school_and_division(client):
     assert rows[0]["school_name"] == "SMK A"
 
 
+def test_ranking_read_model_follows_student_school_and_status_changes(client):
+    client.force_login(UserFactory(role=User.Role.MODERATOR))
+    school = School.objects.create(name="SMK A")
+    formula = _make_formula(name="Senior Formula", season_year=2026, division="senior")
+    assessment = _attach_assessment(formula, code="S1", sort_order=1)
+    student = Student.objects.create(full_name="Alice Tan", school=school, state="Selangor")
+    snapshot = _snapshot(formula=formula, student=student, rank=1, total_score="95.0000", assessment=assessment)
+
+    assert (snapshot.student_name, snapshot.school_name, snapshot.student_state) == ("Alice Tan", "SMK A", "Selangor")
+    assert snapshot.assessment_scores == ["95.0000"]
+
+    student.full_name = "Alice  Tan Mei"
+    student.save()
+    school.name = "SMK Alpha"
+    school.save()
+    StudentSelectionStatus.objects.create(
+        student=student,
+        season_year=2026,
+        division="",
+        status=StudentSelectionStatus.Status.WATCHLIST,
+    )
+    StudentSelectionStatus.objects.create(
+        student=student,
+        season_year=2026,
+        division="senior",
+        status=StudentSelectionStatus.Status.TEAM,
+    )
+
+    snapshot.refresh_from_db()
+    assert snapshot.student_name == "Alice Tan Mei"
+    assert snapshot.student_normalized_name == "alice tan mei"
+    assert snapshot.school_name == "SMK Alpha"
+    assert snapshot.selection_status == StudentSelectionStatus.Status.TEAM
+
+    response = client.get(reverse("rankings:ranking_table"), {"selection_status": "team", "school": "alpha"})
+    rows = response.context["ranking_rows"]
+    assert [(row["student_name"], row["selection_status"]) for row in rows] == [("Alice Tan Mei", "Team")]
+
+
+def test_ranking_table_paginates_on_the_server(client, monkeypatch):
+    monkeypatch.setattr("inspinia.rankings.views.RANKING_TABLE_PAGE_SIZE", 2)
+    client.force_login(UserFactory(role=User.Role.MODERATOR))
+    formula = _make_formula(name="Paged Formula", season_year=2026, division="senior")
+    assessment = _attach_assessment(formula, code="R1", sort_order=1)
+    for rank in range(1, 6):
+        student = Student.objects.create(full_name=f"Paged Student {rank}")
+        _snapshot(formula=formula, student=student, rank=rank, total_score=f"{100 - rank}.0000", assessment=assessment)
+
+    response = client.get(reverse("rankings:ranking_table"), {"formula": formula.id, "page": 2})
+
+    assert [row["rank_overall"] for row in response.context["ranking_rows"]] == [3, 4]
+    assert response.context["page_obj"].paginator.num_pages == 3  # noqa: PLR2004
+    assert response.context["pagination_suffix"] == f"&formula={formula.id}"
+    assert f"?page=3&amp;formula={formula.id}".encode() in response.content
+
+
 @override_settings(DEBUG=False)
 def test_import_center_forbidden_for_non_admin(client):
     user = UserFactory(role=User.Role.NORMAL)
@@ -201,7 +259,7 @@ def test_ranking_export_masks_nric_for_moderator(client):
     response = client.get(reverse("rankings:ranking_export_csv"))
 
     assert response.status_code == HTTPStatus.OK
-    content = response.content.decode()
+    content = b"".join(response.streaming_content).decode()
     assert "900101-01-1234" not in content
     assert "1234" in content
 
@@ -228,10 +286,41 @@ def test_ranking_export_includes_full_nric_for_admin(client):
     response = client.get(reverse("rankings:ranking_export_csv"))
 
     assert response.status_code == HTTPStatus.OK
-    content = response.content.decode()
+    content = b"".join(response.streaming_content).decode()
     assert "900101-01-8888" in content
 
 
+def test_ranking_exports_stream_every_chunk_in_rank_order(client, monkeypatch):
+    monkeypatch.setattr("inspinia.rankings.views.RANKING_EXPORT_CHUNK_SIZE", 2)
+    client.force_login(UserFactory(role=User.Role.ADMIN))
+    formula = _make_formula(name="Chunked Export Formula", season_year=2026, division="senior")
+    assessment = _attach_assessment(formula, code="R1", sort_order=1)
+    for rank in range(1, 6):
+        student = Student.objects.create(full_name=f"Chunk Student {rank}")
+        StudentSelectionStatus.objects.create(
+            student=student,
+            season_year=2026,
+            division="senior",
+            status=StudentSelectionStatus.Status.SQUAD,
+        )
+        _snapshot(formula=formula, student=student, rank=rank, total_score=f"{100 - rank}.0000", assessment=assessment)
+
+    csv_response = client.get(reverse("rankings:ranking_export_csv"), {"formula": formula.id})
+    xlsx_response = client.get(reverse("rankings:ranking_export_xlsx"), {"formula": formula.id})
+
+    assert csv_response.streaming
+    csv_lines = b"".join(csv_response.streaming_content).decode().splitlines()
+    assert csv_lines[0].endswith(",R1")
+    assert [line.split(",")[1] for line in csv_lines[1:]] == [f"Chunk Student {rank}" for rank in range(1, 6)]
+    assert all(",Squad," in line for line in csv_lines[1:])
+
+    worksheet = load_workbook(BytesIO(b"".join(xlsx_response.streaming_content)), read_only=True)["Ranking"]
+    xlsx_rows = list(worksheet.iter_rows(values_only=True))
+    assert xlsx_rows[0][:2] == ("Rank", "Student Name")
+    assert [row[1] for row in xlsx_rows[1:]] == [f"Chunk Student {rank}" for rank in range(1, 6)]
+    assert xlsx_rows[1][8] == 99.0  # noqa: PLR2004
+
+
 @override_settings(DEBUG=False)
 def test_students_assessments_formulas_imports_and_dashboard_routes_render_for_moderator(client):
     user = UserFactory(role=User.Role.MODERATOR)
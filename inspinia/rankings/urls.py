@@ -1,6 +1,7 @@
 from django.urls import path
 
 from inspinia.rankings.views import assessments_list_view
+from inspinia.rankings.views import formula_what_if_view
 from inspinia.rankings.views import formulas_list_view
 from inspinia.rankings.views import import_center_view
 from inspinia.rankings.views import ranking_dashboard_view
@@ -21,5 +22,6 @@ urlpatterns = [
     path("students/<int:student_id>/", student_detail_view, name="student_detail"),
     path("assessments/", assessments_list_view, name="assessments_list"),
     path("formulas/", formulas_list_view, name="formulas_list"),
+    path("formulas/<int:formula_id>/what-if/", formula_what_if_view, name="formula_what_if"),
     path("imports/", import_center_view, name="import_center"),
 ]
@@ -1,31 +1,38 @@
 from __future__ import annotations
 
 import csv
+import json
+import tempfile
 from decimal import Decimal
+from itertools import batched
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
 
-import pandas as pd
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.db.models import Avg
+from django.core.paginator import Paginator
 from django.db.models import Count
 from django.db.models import Max
-from django.db.models import Prefetch
 from django.db.models import Q
+from django.http import FileResponse
 from django.http import Http404
-from django.http import HttpResponse
+from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 from openpyxl import Workbook
 
+from inspinia.pages.tabular_reader import iter_tabular_chunks
 from inspinia.rankings.forms import AssessmentResultImportForm
 from inspinia.rankings.forms import LegacyWideImportForm
 from inspinia.rankings.forms import RankingTableFilterForm
 from inspinia.rankings.forms import StudentMasterImportForm
 from inspinia.rankings.imports.assessment_result_import import apply_assessment_result_import
-from inspinia.rankings.imports.assessment_result_import import assessment_result_dataframe_from_source
+from inspinia.rankings.imports.assessment_result_import import iter_assessment_result_chunks
 from inspinia.rankings.imports.assessment_result_import import preview_assessment_result_import
 from inspinia.rankings.imports.legacy_wide_import import apply_legacy_wide_import
 from inspinia.rankings.imports.legacy_wide_import import preview_legacy_wide_import
@@ -38,64 +45,67 @@ from inspinia.rankings.models import RankingSnapshot
 from inspinia.rankings.models import School
 from inspinia.rankings.models import Student
 from inspinia.rankings.models import StudentSelectionStatus
+from inspinia.rankings.models import breakdown_scores_by_assessment
+from inspinia.rankings.models import build_ranking_dashboard_aggregates
 from inspinia.rankings.services.privacy import mask_nric
 from inspinia.rankings.services.privacy import user_can_view_full_nric
+from inspinia.rankings.services.ranking_dashboard import DASHBOARD_AGGREGATE_FIELDS
+from inspinia.rankings.services.ranking_dashboard import ranking_filter_options
+from inspinia.rankings.services.ranking_what_if import RankingWhatIfError
+from inspinia.rankings.services.ranking_what_if import parse_what_if_scenario
+from inspinia.rankings.services.ranking_what_if import simulate_formula_ranking
 from inspinia.users.models import AuditEvent
 from inspinia.users.monitoring import record_event
 from inspinia.users.roles import user_has_moderator_or_admin_role
 
-RANKING_TABLE_MAX_ROWS = 5000
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+RANKING_TABLE_PAGE_SIZE = 100
+RANKING_EXPORT_CHUNK_SIZE = 500
+RANKING_EXPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+# The selected/watchlist cards count the top of the ranking, not the whole cohort.
+RANKING_DASHBOARD_STATUS_ROW_LIMIT = 200
+_DASHBOARD_ROW_FILTERS = ("school", "state", "selection_status", "active", "q")
+RANKING_EXPORT_CSV_HEADERS = [
+    "rank",
+    "student_name",
+    "birth_year",
+    "age",
+    "school",
+    "state",
+    "selection_status",
+    "nric",
+    "total_score",
+    "last_updated",
+]
+RANKING_EXPORT_XLSX_HEADERS = [
+    "Rank",
+    "Student Name",
+    "Birth Year",
+    "Age",
+    "School",
+    "State",
+    "Selection Status",
+    "NRIC",
+    "Total Score",
+    "Last Updated",
+]
+RANKING_EXPORT_TOTAL_SCORE_COLUMN = RANKING_EXPORT_CSV_HEADERS.index("total_score")
 IMPORT_BATCH_HISTORY_LIMIT = 20
 MAX_DERIVED_AGE = 100
 
 
+def _pagination_suffix(params) -> str:
+    query_string = urlencode({key: value for key, value in params.items() if key != "page" and value})
+    return f"&{query_string}" if query_string else ""
+
+
 def _require_rankings_access(request) -> None:
     if not user_has_moderator_or_admin_role(request.user):
         raise PermissionDenied
 
 
-def _read_tabular_upload(upload) -> pd.DataFrame:
-    if isinstance(upload, str):
-        if upload.lower().endswith(".csv"):
-            return pd.read_csv(upload)
-        return pd.read_excel(upload)
-
-    filename = (getattr(upload, "name", "") or "").lower()
-    if hasattr(upload, "seek"):
-        upload.seek(0)
-    if filename.endswith(".csv"):
-        return pd.read_csv(upload)
-    return pd.read_excel(upload)
-
-
-def _serialize_breakdown_values(snapshot: RankingSnapshot) -> dict[int, str]:
-    raw_breakdown = snapshot.score_breakdown_json
-    if not isinstance(raw_breakdown, dict):
-        return {}
-
-    by_assessment_id: dict[int, str] = {}
-    for item in raw_breakdown.values():
-        if not isinstance(item, dict):
-            continue
-        assessment_id = item.get("assessment_id")
-        if assessment_id is None:
-            continue
-        try:
-            assessment_id_int = int(assessment_id)
-        except (TypeError, ValueError):
-            continue
-
-        value = item.get("normalized_score")
-        if value is None:
-            by_assessment_id[assessment_id_int] = ""
-        elif isinstance(value, str):
-            by_assessment_id[assessment_id_int] = value
-        else:
-            by_assessment_id[assessment_id_int] = str(value)
-
-    return by_assessment_id
-
-
 def _derived_age(birth_year: int | None) -> int | None:
     if birth_year is None:
         return None
@@ -106,24 +116,6 @@ def _derived_age(birth_year: int | None) -> int | None:
     return age
 
 
-def _pick_selection_status(snapshot: RankingSnapshot) -> str:
-    exact_division_match = None
-    season_match = None
-    for status in snapshot.student.selection_statuses.all():
-        if status.season_year != snapshot.season_year:
-            continue
-        if status.division == snapshot.division:
-            exact_division_match = status
-            break
-        if not status.division:
-            season_match = status
-
-    selected = exact_division_match or season_match
-    if selected is None:
-        return ""
-    return selected.get_status_display()
-
-
 def _assessment_columns_for_formula(formula: RankingFormula | None) -> list[dict]:
     if formula is None:
         return []
@@ -162,16 +154,12 @@ def _resolve_formula(filter_data: dict) -> RankingFormula | None:
 
 
 def _build_ranking_queryset(*, filter_data: dict, formula: RankingFormula | None):
-    queryset = RankingSnapshot.objects.select_related(
-        "student",
-        "student__school",
-        "ranking_formula",
-    ).prefetch_related(
-        Prefetch(
-            "student__selection_statuses",
-            queryset=StudentSelectionStatus.objects.order_by("-season_year", "division", "status", "id"),
-        ),
-    )
+    """Filter and order ranking snapshots on their read-model columns.
+
+    Display fields live on the snapshot itself; the student join only supplies
+    the NRIC and birth year columns that are deliberately not copied.
+    """
+    queryset = RankingSnapshot.objects.select_related("student")
 
     if formula is not None:
         queryset = queryset.filter(ranking_formula=formula)
@@ -186,28 +174,25 @@ def _build_ranking_queryset(*, filter_data: dict, formula: RankingFormula | None
 
     school = (filter_data.get("school") or "").strip()
     if school:
-        queryset = queryset.filter(student__school__name__icontains=school)
+        queryset = queryset.filter(school_name__icontains=school)
 
     state = (filter_data.get("state") or "").strip()
     if state:
-        queryset = queryset.filter(student__state__iexact=state)
+        queryset = queryset.filter(student_state__iexact=state)
 
     selection_status = (filter_data.get("selection_status") or "").strip()
     if selection_status:
-        queryset = queryset.filter(student__selection_statuses__status=selection_status).distinct()
+        queryset = queryset.filter(selection_status=selection_status)
 
     active_flag = (filter_data.get("active") or "").strip()
     if active_flag in {"0", "1"}:
-        queryset = queryset.filter(student__active=active_flag == "1")
+        queryset = queryset.filter(student_active=active_flag == "1")
 
     search_text = (filter_data.get("q") or "").strip()
     if search_text:
-        queryset = queryset.filter(
-            Q(student__full_name__icontains=search_text)
-            | Q(student__school__name__icontains=search_text),
-        )
+        queryset = queryset.filter(Q(student_name__icontains=search_text) | Q(school_name__icontains=search_text))
 
-    return queryset.order_by("rank_overall", "student__normalized_name", "student_id")
+    return queryset.order_by("rank_overall", "student_normalized_name", "student_id")
 
 
 def _build_ranking_rows(
@@ -220,24 +205,22 @@ def _build_ranking_rows(
     rows: list[dict] = []
     for snapshot in snapshots:
         student = snapshot.student
-        breakdown_values = _serialize_breakdown_values(snapshot)
         nric_value = student.full_nric if can_view_nric else mask_nric(student.masked_nric or student.full_nric)
+        assessment_score_list = _snapshot_assessment_scores(snapshot, assessment_columns)
         assessment_scores = {
-            column["field"]: breakdown_values.get(column["assessment_id"], "")
-            for column in assessment_columns
+            column["field"]: score for column, score in zip(assessment_columns, assessment_score_list, strict=True)
         }
-        assessment_score_list = [assessment_scores[column["field"]] for column in assessment_columns]
         rows.append(
             {
                 "snapshot": snapshot,
                 "rank_overall": snapshot.rank_overall,
-                "student_id": student.id,
-                "student_name": student.full_name,
+                "student_id": snapshot.student_id,
+                "student_name": snapshot.student_name,
                 "birth_year": student.birth_year,
                 "age": _derived_age(student.birth_year),
-                "school_name": student.school.name if student.school else "",
-                "state": student.state,
-                "selection_status": _pick_selection_status(snapshot),
+                "school_name": snapshot.school_name,
+                "state": snapshot.student_state,
+                "selection_status": snapshot.get_selection_status_display(),
                 "total_score": snapshot.total_score,
                 "nric": nric_value,
                 "assessment_scores": assessment_scores,
@@ -248,24 +231,19 @@ def _build_ranking_rows(
     return rows
 
 
+def _snapshot_assessment_scores(snapshot: RankingSnapshot, assessment_columns: list[dict]) -> list[str]:
+    scores = snapshot.assessment_scores
+    if isinstance(scores, list) and len(scores) == len(assessment_columns):
+        return scores
+    # The stored array only matches when the columns come from the snapshot's own,
+    # unchanged formula; otherwise map scores from the breakdown.
+    by_assessment_id = breakdown_scores_by_assessment(snapshot.score_breakdown_json)
+    return [by_assessment_id.get(column["assessment_id"], "") for column in assessment_columns]
+
+
 def _ranking_filters_context() -> dict:
     return {
-        "season_options": list(
-            RankingSnapshot.objects.order_by("-season_year").values_list("season_year", flat=True).distinct(),
-        ),
-        "division_options": [
-            division
-            for division in RankingSnapshot.objects.order_by("division").values_list("division", flat=True).distinct()
-            if division
-        ],
-        "school_options": list(
-            School.objects.filter(is_active=True).order_by("name").values_list("name", flat=True),
-        ),
-        "state_options": [
-            state
-            for state in Student.objects.order_by("state").values_list("state", flat=True).distinct()
-            if state
-        ],
+        **ranking_filter_options(),
         "formula_options": list(
             RankingFormula.objects.order_by("-season_year", "division", "name", "-version")
             .values("id", "name", "season_year", "division", "version", "is_active"),
@@ -273,15 +251,62 @@ def _ranking_filters_context() -> dict:
     }
 
 
-def _render_ranking_export_rows(*, request, queryset, formula: RankingFormula | None):
-    assessment_columns = _assessment_columns_for_formula(formula)
-    snapshots = list(queryset)
-    rows = _build_ranking_rows(
-        snapshots=snapshots,
-        assessment_columns=assessment_columns,
-        request_user=request.user,
+def _dashboard_aggregates(*, filter_data: dict, formula: RankingFormula | None, queryset) -> dict:
+    """Stored aggregates of ``formula`` when the filters select all of its snapshots.
+
+    Narrower filters summarize the filtered snapshots in one pass instead.
+    """
+    unfiltered = not any((filter_data.get(field_name) or "").strip() for field_name in _DASHBOARD_ROW_FILTERS)
+    season = filter_data.get("season")
+    division = (filter_data.get("division") or "").strip()
+    if (
+        formula is not None
+        and unfiltered
+        and formula.dashboard_aggregates
+        and season in {None, formula.season_year}
+        and division in {"", formula.division}
+    ):
+        return formula.dashboard_aggregates
+    return build_ranking_dashboard_aggregates(
+        queryset.order_by().values_list(*DASHBOARD_AGGREGATE_FIELDS).iterator(chunk_size=RANKING_EXPORT_CHUNK_SIZE),
     )
-    return assessment_columns, rows
+
+
+def _iter_ranking_export_rows(*, request, queryset, assessment_columns: list[dict]) -> Iterator[dict]:
+    """Yield export rows chunk by chunk so memory stays flat for any cohort size.
+
+    ``iterator()`` uses a server-side cursor on Postgres.
+    """
+    snapshots = queryset.iterator(chunk_size=RANKING_EXPORT_CHUNK_SIZE)
+    for snapshot_chunk in batched(snapshots, RANKING_EXPORT_CHUNK_SIZE):
+        yield from _build_ranking_rows(
+            snapshots=list(snapshot_chunk),
+            assessment_columns=assessment_columns,
+            request_user=request.user,
+        )
+
+
+def _ranking_export_values(row: dict, assessment_columns: list[dict]) -> list:
+    return [
+        row["rank_overall"] or "",
+        row["student_name"],
+        row["birth_year"] or "",
+        row["age"] or "",
+        row["school_name"],
+        row["state"],
+        row["selection_status"],
+        row["nric"],
+        row["total_score"],
+        row["last_updated"].strftime("%Y-%m-%d %H:%M"),
+        *[row["assessment_scores"].get(column["field"], "") for column in assessment_columns],
+    ]
+
+
+class _EchoBuffer:
+    """File-like object whose ``write`` returns the CSV line instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
 
 
 @login_required
@@ -292,10 +317,10 @@ def ranking_table_view(request):
     formula = _resolve_formula(filter_data)
 
     queryset = _build_ranking_queryset(filter_data=filter_data, formula=formula)
-    snapshots = list(queryset[:RANKING_TABLE_MAX_ROWS])
+    page_obj = Paginator(queryset, RANKING_TABLE_PAGE_SIZE).get_page(request.GET.get("page"))
     assessment_columns = _assessment_columns_for_formula(formula)
     ranking_rows = _build_ranking_rows(
-        snapshots=snapshots,
+        snapshots=list(page_obj.object_list),
         assessment_columns=assessment_columns,
         request_user=request.user,
     )
@@ -305,7 +330,8 @@ def ranking_table_view(request):
         "formula": formula,
         "assessment_columns": assessment_columns,
         "ranking_rows": ranking_rows,
-        "ranking_row_limit": RANKING_TABLE_MAX_ROWS,
+        "page_obj": page_obj,
+        "pagination_suffix": _pagination_suffix(request.GET),
         **_ranking_filters_context(),
     }
     return render(request, "pages/rankings/ranking-table.html", context)
@@ -318,44 +344,18 @@ def ranking_export_csv_view(request):
     filter_data = filter_form.cleaned_data if filter_form.is_valid() else {}
     formula = _resolve_formula(filter_data)
     queryset = _build_ranking_queryset(filter_data=filter_data, formula=formula)
-    assessment_columns, rows = _render_ranking_export_rows(request=request, queryset=queryset, formula=formula)
+    assessment_columns = _assessment_columns_for_formula(formula)
+    writer = csv.writer(_EchoBuffer())
+
+    def stream_csv_lines() -> Iterator[str]:
+        yield writer.writerow([*RANKING_EXPORT_CSV_HEADERS, *[column["code"] for column in assessment_columns]])
+        rows = _iter_ranking_export_rows(request=request, queryset=queryset, assessment_columns=assessment_columns)
+        for row in rows:
+            yield writer.writerow(_ranking_export_values(row, assessment_columns))
 
     timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
-    response = HttpResponse(content_type="text/csv; charset=utf-8")
+    response = StreamingHttpResponse(stream_csv_lines(), content_type="text/csv; charset=utf-8")
     response["Content-Disposition"] = f'attachment; filename="ranking-export-{timestamp}.csv"'
-
-    writer = csv.writer(response)
-    headers = [
-        "rank",
-        "student_name",
-        "birth_year",
-        "age",
-        "school",
-        "state",
-        "selection_status",
-        "nric",
-        "total_score",
-        "last_updated",
-    ] + [column["code"] for column in assessment_columns]
-    writer.writerow(headers)
-
-    for row in rows:
-        writer.writerow(
-            [
-                row["rank_overall"] or "",
-                row["student_name"],
-                row["birth_year"] or "",
-                row["age"] or "",
-                row["school_name"],
-                row["state"],
-                row["selection_status"],
-                row["nric"],
-                row["total_score"],
-                row["last_updated"].strftime("%Y-%m-%d %H:%M"),
-                *[row["assessment_scores"].get(column["field"], "") for column in assessment_columns],
-            ],
-        )
-
     return response
 
 
@@ -366,51 +366,30 @@ def ranking_export_xlsx_view(request):
     filter_data = filter_form.cleaned_data if filter_form.is_valid() else {}
     formula = _resolve_formula(filter_data)
     queryset = _build_ranking_queryset(filter_data=filter_data, formula=formula)
-    assessment_columns, rows = _render_ranking_export_rows(request=request, queryset=queryset, formula=formula)
-
-    workbook = Workbook()
-    worksheet = workbook.active
-    worksheet.title = "Ranking"
-
-    headers = [
-        "Rank",
-        "Student Name",
-        "Birth Year",
-        "Age",
-        "School",
-        "State",
-        "Selection Status",
-        "NRIC",
-        "Total Score",
-        "Last Updated",
-        *[column["code"] for column in assessment_columns],
-    ]
-    worksheet.append(headers)
-
-    for row in rows:
-        worksheet.append(
-            [
-                row["rank_overall"] or "",
-                row["student_name"],
-                row["birth_year"] or "",
-                row["age"] or "",
-                row["school_name"],
-                row["state"],
-                row["selection_status"],
-                row["nric"],
-                float(row["total_score"]) if isinstance(row["total_score"], Decimal) else row["total_score"],
-                row["last_updated"].strftime("%Y-%m-%d %H:%M"),
-                *[row["assessment_scores"].get(column["field"], "") for column in assessment_columns],
-            ],
+    assessment_columns = _assessment_columns_for_formula(formula)
+
+    # Write-only worksheets flush rows to disk as they are appended; the finished
+    # workbook is spooled to a temp file and streamed back in blocks.
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Ranking")
+    worksheet.append([*RANKING_EXPORT_XLSX_HEADERS, *[column["code"] for column in assessment_columns]])
+    for row in _iter_ranking_export_rows(request=request, queryset=queryset, assessment_columns=assessment_columns):
+        values = _ranking_export_values(row, assessment_columns)
+        values[RANKING_EXPORT_TOTAL_SCORE_COLUMN] = (
+            float(row["total_score"]) if isinstance(row["total_score"], Decimal) else row["total_score"]
         )
+        worksheet.append(values)
 
-    response = HttpResponse(
+    spooled_file = tempfile.SpooledTemporaryFile(max_size=RANKING_EXPORT_SPOOL_MAX_BYTES)  # noqa: SIM115
+    workbook.save(spooled_file)
+    spooled_file.seek(0)
+    timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    return FileResponse(
+        spooled_file,
+        as_attachment=True,
+        filename=f"ranking-export-{timestamp}.xlsx",
         content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
-    timestamp = timezone.now().strftime("%Y%m%d-%H%M%S")
-    response["Content-Disposition"] = f'attachment; filename="ranking-export-{timestamp}.xlsx"'
-    workbook.save(response)
-    return response
 
 
 @login_required
@@ -421,41 +400,26 @@ def ranking_dashboard_view(request):
     formula = _resolve_formula(filter_data)
     queryset = _build_ranking_queryset(filter_data=filter_data, formula=formula)
 
-    snapshots = list(queryset[:200])
-    top_rows = snapshots[:15]
+    top_rows = list(queryset[:15])
+    aggregates = _dashboard_aggregates(filter_data=filter_data, formula=formula, queryset=queryset)
 
     selected_count = 0
     watchlist_count = 0
-    for snapshot in snapshots:
-        status = _pick_selection_status(snapshot).lower()
-        if status == StudentSelectionStatus.Status.TEAM:
+    for selection_status in queryset.values_list("selection_status", flat=True)[:RANKING_DASHBOARD_STATUS_ROW_LIMIT]:
+        if selection_status == StudentSelectionStatus.Status.TEAM:
             selected_count += 1
-        elif status == StudentSelectionStatus.Status.WATCHLIST:
+        elif selection_status == StudentSelectionStatus.Status.WATCHLIST:
             watchlist_count += 1
 
-    school_stats = list(
-        queryset.values("student__school__name")
-        .annotate(
-            student_count=Count("student", distinct=True),
-            average_total=Avg("total_score"),
-        )
-        .order_by("-student_count", "student__school__name")[:10],
-    )
-
-    state_stats = list(
-        queryset.values("student__state")
-        .annotate(student_count=Count("student", distinct=True))
-        .order_by("-student_count", "student__state")[:10],
-    )
-
     context = {
         "filter_form": filter_form,
         "formula": formula,
         "top_rows": top_rows,
         "selected_count": selected_count,
         "watchlist_count": watchlist_count,
-        "school_stats": school_stats,
-        "state_stats": state_stats,
+        "school_stats": aggregates["school_stats"],
+        "state_stats": aggregates["state_stats"],
+        "score_distribution": aggregates["score_distribution"],
         **_ranking_filters_context(),
     }
     return render(request, "pages/rankings/ranking-dashboard.html", context)
@@ -603,6 +567,25 @@ def formulas_list_view(request):
     return render(request, "pages/rankings/formulas-list.html", context)
 
 
+@login_required
+@require_POST
+def formula_what_if_view(request, formula_id: int):
+    """Simulate a formula with candidate weights and policies; nothing is saved."""
+    _require_rankings_access(request)
+    formula = get_object_or_404(RankingFormula, pk=formula_id)
+    try:
+        payload = json.loads(request.body or b"{}")
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+
+    try:
+        scenario = parse_what_if_scenario(payload, formula=formula)
+        result = simulate_formula_ranking(formula, scenario)
+    except RankingWhatIfError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse(result.to_json())
+
+
 def _base_import_center_context() -> dict:
     return {
         "student_master_form": StudentMasterImportForm(),
@@ -729,9 +712,9 @@ def import_center_view(request):  # noqa: C901, PLR0911, PLR0915
                 },
             )
 
-        dataframe = assessment_result_dataframe_from_source(upload)
+        upload.seek(0)
         preview = preview_assessment_result_import(
-            dataframe,
+            iter_assessment_result_chunks(upload),
             batch=batch,
             assessment=assessment,
             column_map=mapping,
@@ -766,9 +749,8 @@ def import_center_view(request):  # noqa: C901, PLR0911, PLR0915
             "remarks": (request.POST.get("remarks") or "").strip(),
             "source_url": (request.POST.get("source_url") or "").strip(),
         }
-        dataframe = assessment_result_dataframe_from_source(batch.uploaded_file.path)
         result = apply_assessment_result_import(
-            dataframe,
+            iter_assessment_result_chunks(batch.uploaded_file.path),
             batch=batch,
             assessment=assessment,
             imported_by=request.user,
@@ -794,8 +776,8 @@ def import_center_view(request):  # noqa: C901, PLR0911, PLR0915
             import_type=ImportBatch.ImportType.LEGACY_WIDE_TABLE,
             upload=upload,
         )
-        dataframe = _read_tabular_upload(upload)
-        preview = preview_legacy_wide_import(dataframe=dataframe, import_batch=batch)
+        upload.seek(0)
+        preview = preview_legacy_wide_import(dataframe=iter_tabular_chunks(upload), import_batch=batch)
         _log_import_preview_event(request=request, batch=batch)
 
         context.update(
@@ -820,8 +802,10 @@ def import_center_view(request):  # noqa: C901, PLR0911, PLR0915
             msg = "Missing season year for legacy apply."
             raise Http404(msg)
 
-        dataframe = _read_tabular_upload(batch.uploaded_file.path)
-        preview = preview_legacy_wide_import(dataframe=dataframe, import_batch=batch)
+        preview = preview_legacy_wide_import(
+            dataframe=iter_tabular_chunks(batch.uploaded_file.path),
+            import_batch=batch,
+        )
         result = apply_legacy_wide_import(
             preview=preview,
             import_batch=batch,
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class SolutionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "inspinia.solutions"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import inspinia.solutions.signals  # noqa: F401
@@ -0,0 +1,180 @@
+"""Storage, variants and manifest for images pasted into solution block bodies.
+
+Uploads are keyed by a SHA-256 of their bytes: pasting the same image again,
+into any solution, reuses the stored file and its variants instead of writing
+another copy. Each new file gets two Pillow variants next to it:
+
+* a web variant (WebP, or PNG when Pillow lacks WebP) no wider than
+  ``SOLUTION_BODY_IMAGE_WEB_MAX_WIDTH``, served to the browser in place of the
+  original;
+* a PDF variant (PNG, or JPEG for opaque photos) no wider than
+  ``SOLUTION_BODY_IMAGE_PDF_MAX_WIDTH``, included by LaTeX in place of the
+  original. pdflatex cannot read GIF or WebP, so those always get one.
+
+A variant is only kept when the original is unsuitable or larger. The
+``SolutionBodyImage`` rows double as the manifest: PDF compiles resolve the
+paths a solution references with one indexed query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.core.files.base import ContentFile
+from PIL import Image
+from PIL import ImageOps
+from PIL import features
+
+from inspinia.solutions.models import SolutionBodyImage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from inspinia.solutions.models import ProblemSolution
+
+logger = logging.getLogger(__name__)
+
+SOLUTION_BODY_IMAGE_WEB_MAX_WIDTH = 1600
+SOLUTION_BODY_IMAGE_PDF_MAX_WIDTH = 2400
+SOLUTION_BODY_IMAGE_WEB_DIR = "solution_body_images/web"
+SOLUTION_BODY_IMAGE_PDF_DIR = "solution_body_images/pdf"
+_WEBP_QUALITY = 82
+_JPEG_QUALITY = 90
+
+
+def body_image_content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def store_solution_body_image(*, solution: ProblemSolution, uploaded_by, data: bytes) -> SolutionBodyImage:
+    """Record ``data`` as a body image of ``solution``, reusing stored bytes when already uploaded."""
+    content_hash = body_image_content_hash(data)
+    existing = SolutionBodyImage.objects.filter(content_hash=content_hash).order_by("id")
+    own_row = existing.filter(solution=solution).first()
+    if own_row is not None:
+        return own_row
+    shared_row = existing.first()
+    if shared_row is not None and shared_row.file.storage.exists(shared_row.file.name):
+        # One row per solution keeps ownership and cascades intact; the files are shared.
+        return SolutionBodyImage.objects.create(
+            solution=solution,
+            uploaded_by=uploaded_by,
+            file=shared_row.file.name,
+            content_hash=content_hash,
+            width=shared_row.width,
+            height=shared_row.height,
+            web_variant=shared_row.web_variant,
+            pdf_variant=shared_row.pdf_variant,
+        )
+
+    row = SolutionBodyImage(solution=solution, uploaded_by=uploaded_by, content_hash=content_hash)
+    # Django 5.1+ FileField.pre_save rejects nameless ContentFile in some paths.
+    row.file.save("paste.png", ContentFile(data, name="paste.png"), save=False)
+    _render_variants(row, data)
+    row.save()
+    return row
+
+
+def solution_body_image_pdf_inputs(
+    image_paths: Iterable[str],
+    *,
+    media_root: Path,
+) -> tuple[dict[str, str], list[str]]:
+    """Map each referenced path to the file LaTeX should include; also return the missing paths.
+
+    Paths come from the manifest; a path unknown to it (a file placed in media by
+    hand, or from before the manifest) falls back to a filesystem check.
+    """
+    paths = list(image_paths)
+    manifest = dict(
+        SolutionBodyImage.objects.filter(file__in=paths).values_list("file", "pdf_variant"),
+    )
+    pdf_inputs: dict[str, str] = {}
+    missing: list[str] = []
+    for path in paths:
+        if path in manifest:
+            pdf_inputs[path] = manifest[path] or path
+        elif (media_root / path).is_file():
+            pdf_inputs[path] = path
+        else:
+            missing.append(path)
+    return pdf_inputs, missing
+
+
+def solution_body_image_web_variants(solutions: Iterable[ProblemSolution]) -> dict[str, str]:
+    """Web variant path of each body image of ``solutions`` that has one, keyed by original path."""
+    solution_ids = [solution.pk for solution in solutions if solution is not None and solution.pk]
+    if not solution_ids:
+        return {}
+    return dict(
+        SolutionBodyImage.objects.filter(solution_id__in=solution_ids)
+        .exclude(web_variant="")
+        .values_list("file", "web_variant"),
+    )
+
+
+def _render_variants(row: SolutionBodyImage, data: bytes) -> None:
+    stem = Path(row.file.name).stem
+    try:
+        with Image.open(BytesIO(data)) as image:
+            source_format = image.format
+            image.seek(0)
+            upright = ImageOps.exif_transpose(image)
+            row.width, row.height = upright.size
+            web_bytes, web_ext = _encode_web_variant(upright)
+            pdf_bytes, pdf_ext = _encode_pdf_variant(upright, source_format=source_format)
+    except (OSError, ValueError):
+        # The original is still served and included as uploaded.
+        logger.warning("solution_body_image_variant_failed path=%s", row.file.name, exc_info=True)
+        return
+
+    original_serves_web = row.width <= SOLUTION_BODY_IMAGE_WEB_MAX_WIDTH and len(data) <= len(web_bytes)
+    if not original_serves_web:
+        row.web_variant = _save_variant(row, f"{SOLUTION_BODY_IMAGE_WEB_DIR}/{stem}.{web_ext}", web_bytes)
+    # Uploads are stored under a .png name, so only real PNGs can go to LaTeX as-is.
+    original_serves_pdf = (
+        source_format == "PNG" and row.width <= SOLUTION_BODY_IMAGE_PDF_MAX_WIDTH and len(data) <= len(pdf_bytes)
+    )
+    if not original_serves_pdf:
+        row.pdf_variant = _save_variant(row, f"{SOLUTION_BODY_IMAGE_PDF_DIR}/{stem}.{pdf_ext}", pdf_bytes)
+
+
+def _encode_web_variant(image: Image.Image) -> tuple[bytes, str]:
+    scaled = _fit_width(image, SOLUTION_BODY_IMAGE_WEB_MAX_WIDTH)
+    buffer = BytesIO()
+    if features.check("webp"):
+        scaled.save(buffer, format="WEBP", quality=_WEBP_QUALITY, method=6)
+        return buffer.getvalue(), "webp"
+    scaled.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue(), "png"
+
+
+def _encode_pdf_variant(image: Image.Image, *, source_format: str | None) -> tuple[bytes, str]:
+    scaled = _fit_width(image, SOLUTION_BODY_IMAGE_PDF_MAX_WIDTH)
+    buffer = BytesIO()
+    if source_format == "JPEG" and scaled.mode == "RGB":
+        # Photos stay JPEG; screenshots and diagrams stay lossless.
+        scaled.save(buffer, format="JPEG", quality=_JPEG_QUALITY, optimize=True)
+        return buffer.getvalue(), "jpg"
+    scaled.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue(), "png"
+
+
+def _fit_width(image: Image.Image, max_width: int) -> Image.Image:
+    converted = image.convert("RGBA" if _has_alpha(image) else "RGB")
+    if converted.width <= max_width:
+        return converted
+    height = max(round(converted.height * max_width / converted.width), 1)
+    return converted.resize((max_width, height), Image.Resampling.LANCZOS)
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in {"RGBA", "LA", "PA"} or (image.mode == "P" and "transparency" in image.info)
+
+
+def _save_variant(row: SolutionBodyImage, name: str, data: bytes) -> str:
+    return row.file.storage.save(name, ContentFile(data))
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import shutil
+import statistics
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from inspinia.solutions.pdf_latex import EVAN_STY_PATH
+from inspinia.solutions.pdf_latex import SolutionPdfError
+from inspinia.solutions.pdf_latex import compile_solution_tex_to_pdf
+from inspinia.solutions.pdf_latex import shared_latex_preamble_lines
+from inspinia.solutions.pdf_latex_format import ensure_latex_format
+from inspinia.solutions.pdf_latex_format import preamble_of
+
+DEFAULT_REPEAT = 5
+DEFAULT_SECTIONS = 4
+
+
+class Command(BaseCommand):
+    help = (
+        "Time per-compile latency of a synthetic solution PDF with a cold compile "
+        "(fresh temp dir, preamble loaded from scratch) and a prewarmed compile "
+        "(precompiled LaTeX format, reused work dir). Requires latexmk and pdflatex; "
+        "the PDF cache is bypassed."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=DEFAULT_REPEAT,
+            help=f"Timed compiles per mode (default {DEFAULT_REPEAT}).",
+        )
+        parser.add_argument(
+            "--sections",
+            type=int,
+            default=DEFAULT_SECTIONS,
+            help=f"Synthetic solution sections in the document (default {DEFAULT_SECTIONS}).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        repeat = options["repeat"]
+        sections = options["sections"]
+        if repeat < 1 or sections < 1:
+            msg = "--repeat and --sections must be positive integers."
+            raise CommandError(msg)
+        latex_binary = settings.SOLUTION_PDF_LATEX_BINARY
+        if shutil.which(latex_binary) is None:
+            msg = f"LaTeX tool not found in PATH: {latex_binary!r}"
+            raise CommandError(msg)
+
+        timeout = settings.SOLUTION_PDF_LATEX_TIMEOUT
+        tex_source = _synthetic_solution_tex(sections)
+        started = time.perf_counter()
+        format_path = ensure_latex_format(
+            preamble_of(tex_source) or "",
+            support_files=[EVAN_STY_PATH],
+            timeout=timeout,
+        )
+        format_seconds = time.perf_counter() - started
+        if format_path is None:
+            self.stdout.write(
+                self.style.WARNING("Precompiled format unavailable; prewarmed runs only reuse work dirs."),
+            )
+        else:
+            self.stdout.write(f"Format ready in {format_seconds * 1000:.1f} ms: {format_path}")
+
+        compile_pdf = partial(compile_solution_tex_to_pdf, tex_source, timeout=timeout, latex_binary=latex_binary)
+        try:
+            cold = _timings(repeat, partial(compile_pdf, prewarmed=False))
+            warm = _timings(repeat, compile_pdf)
+        except SolutionPdfError as exc:
+            raise CommandError(str(exc)) from exc
+
+        for label, seconds in (("cold compile", cold), ("prewarmed compile", warm)):
+            self.stdout.write(
+                f"{label}: mean {statistics.mean(seconds) * 1000:.1f} ms, "
+                f"best {min(seconds) * 1000:.1f} ms ({repeat} run(s))",
+            )
+        self.stdout.write(f"Speedup (mean): {statistics.mean(cold) / statistics.mean(warm):.2f}x")
+        self.stdout.write(self.style.SUCCESS("PDF compile benchmark complete."))
+
+
+def _timings(repeat: int, build) -> list[float]:
+    seconds = []
+    for _run in range(repeat):
+        started = time.perf_counter()
+        build()
+        seconds.append(time.perf_counter() - started)
+    return seconds
+
+
+def _synthetic_solution_tex(sections: int) -> str:
+    lines = [
+        *shared_latex_preamble_lines(),
+        r"\title{Benchmark Problem}",
+        r"\author{Benchmark}",
+        r"\begin{document}",
+        r"\maketitle",
+    ]
+    for index in range(1, sections + 1):
+        lines.extend(
+            [
+                rf"\section*{{Step {index}}}",
+                r"Let $a, b, c > 0$ with $a + b + c = 3$. By AM-GM,",
+                r"\[ \sum_{\mathrm{cyc}} \frac{a^2}{b + c} \ge \frac{(a + b + c)^2}{2(a + b + c)} = \frac{3}{2}. \]",
+                r"\begin{align*} x^2 + y^2 &\ge 2xy \\ (x - y)^2 &\ge 0. \end{align*}",
+            ],
+        )
+    lines.append(r"\end{document}")
+    return "\n".join(lines)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from inspinia.solutions import pdf_latex
+from inspinia.solutions.pdf_cache import cached_pdf_path
+from inspinia.solutions.pdf_latex import SolutionPdfError
+from inspinia.solutions.pdf_latex import SolutionPdfMissingBodyImagesError
+from inspinia.solutions.pdf_prerender import problem_list_pdf_download_request
+from inspinia.solutions.pdf_prerender import public_problem_list_queryset
+from inspinia.solutions.pdf_prerender import published_solution_queryset
+from inspinia.solutions.pdf_prerender import solution_pdf_download_request
+
+SCOPE_ALL = "all"
+SCOPE_SOLUTIONS = "solutions"
+SCOPE_PROBLEM_LISTS = "problem-lists"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the download PDFs of all published solutions and public problem lists "
+        "that are missing from the PDF cache."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.SOLUTION_PDF_COMPILE_WORKERS,
+            help=(
+                "Parallel LaTeX compiles "
+                f"(default SOLUTION_PDF_COMPILE_WORKERS = {settings.SOLUTION_PDF_COMPILE_WORKERS})."
+            ),
+        )
+        parser.add_argument(
+            "--only",
+            choices=[SCOPE_ALL, SCOPE_SOLUTIONS, SCOPE_PROBLEM_LISTS],
+            default=SCOPE_ALL,
+            help="Limit the run to solutions or problem lists (default all).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be compiled.")
+
+    def handle(self, *args, **options) -> None:
+        workers = options["workers"]
+        if workers < 1:
+            msg = "--workers must be a positive integer."
+            raise CommandError(msg)
+
+        compile_requests, cached_total, skipped_total = self._pending_requests(options["only"])
+        self.stdout.write(
+            f"{len(compile_requests)} PDF(s) to compile, {cached_total} already cached, "
+            f"{skipped_total} skipped (missing body images).",
+        )
+        if options["dry_run"] or not compile_requests:
+            self.stdout.write(self.style.SUCCESS("PDF pre-render complete."))
+            return
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-prerender") as executor:
+            futures = {
+                executor.submit(pdf_latex.compile_pdf_request, compile_request): label
+                for label, compile_request in compile_requests.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except SolutionPdfError as exc:
+                    failed.append(futures[future])
+                    self.stderr.write(f"{futures[future]}: {exc}")
+
+        self.stdout.write(f"Compiled {len(compile_requests) - len(failed)} PDF(s), {len(failed)} failed.")
+        if failed:
+            msg = f"{len(failed)} PDF(s) failed to compile."
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS("PDF pre-render complete."))
+
+    def _pending_requests(self, scope: str):
+        """Build compile requests up front so the worker threads never touch the database."""
+        candidates = []
+        skipped_total = 0
+        if scope in {SCOPE_ALL, SCOPE_SOLUTIONS}:
+            for solution in published_solution_queryset().order_by("id").iterator(chunk_size=200):
+                try:
+                    candidates.append((f"solution {solution.pk}", solution_pdf_download_request(solution)))
+                except SolutionPdfMissingBodyImagesError:
+                    skipped_total += 1
+        if scope in {SCOPE_ALL, SCOPE_PROBLEM_LISTS}:
+            candidates.extend(
+                (f"problem list {problem_list.pk}", problem_list_pdf_download_request(problem_list))
+                for problem_list in public_problem_list_queryset().order_by("id")
+            )
+
+        compile_requests = {}
+        cached_total = 0
+        seen_keys = set()
+        for label, compile_request in candidates:
+            if compile_request.cache_key in seen_keys or cached_pdf_path(compile_request.cache_key) is not None:
+                cached_total += 1
+                continue
+            seen_keys.add(compile_request.cache_key)
+            compile_requests[label] = compile_request
+        return compile_requests, cached_total, skipped_total
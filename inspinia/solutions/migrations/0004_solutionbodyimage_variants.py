@@ -0,0 +1,44 @@
+# Generated by Django 5.1.9 on 2026-10-19 16:15
+
+import inspinia.solutions.models
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("solutions", "0003_solution_body_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="solutionbodyimage",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="solutionbodyimage",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="solutionbodyimage",
+            name="pdf_variant",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="solutionbodyimage",
+            name="web_variant",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="solutionbodyimage",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="solutionbodyimage",
+            name="file",
+            field=models.ImageField(db_index=True, upload_to=inspinia.solutions.models._solution_body_image_upload_to),
+        ),
+    ]
@@ -196,7 +196,14 @@ class SolutionBodyImage(models.Model):
         on_delete=models.CASCADE,
         related_name="body_images",
     )
-    file = models.ImageField(upload_to=_solution_body_image_upload_to)
+    # ``file.name`` is the path solution bodies reference; indexed so PDF compiles
+    # check image existence with one query instead of a stat per image.
+    file = models.ImageField(upload_to=_solution_body_image_upload_to, db_index=True)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    web_variant = models.CharField(max_length=255, blank=True)
+    pdf_variant = models.CharField(max_length=255, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -0,0 +1,212 @@
+"""Concatenate many solution PDFs into one bookmarked download.
+
+Every uncached solution is submitted to the shared compile pool as its own job
+under the requesting user, so the pieces compile in parallel on the pool's
+workers while the per-user cap and round-robin keep a large bundle from crowding
+out other users. Pieces that do not fit in the user's share are submitted by a
+later poll of the pending page; the job id of each piece is kept in the Django
+cache so a poll picks up where the last request left off. Once every piece is
+cached (or has failed to compile) the request that notices joins them with
+``pypdf`` (one top-level bookmark per solution) and caches the result under a
+key derived from the piece keys, so an unchanged bundle is served from disk
+without queueing anything.
+
+Bundles are capped at ``PDF_BUNDLE_MAX_SOLUTIONS`` pieces, which bounds the
+page objects pypdf holds during the merge; the merged PDF goes to disk and the
+response streams it from there.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from pypdf import PdfWriter
+
+from inspinia.solutions.pdf_cache import PDF_CACHE_KEY_VERSION
+from inspinia.solutions.pdf_cache import cached_pdf_path
+from inspinia.solutions.pdf_cache import store_cached_pdf_stream
+from inspinia.solutions.pdf_compile_queue import PDF_COMPILE_JOB_TTL_SECONDS
+from inspinia.solutions.pdf_compile_queue import SolutionPdfCompilePendingError
+from inspinia.solutions.pdf_compile_queue import SolutionPdfQueueFullError
+from inspinia.solutions.pdf_compile_queue import get_pdf_compile_pool
+from inspinia.solutions.pdf_compile_queue import load_pdf_compile_job
+from inspinia.solutions.pdf_latex import SolutionPdfCompileError
+from inspinia.solutions.pdf_latex import SolutionPdfError
+from inspinia.solutions.pdf_latex import SolutionPdfMissingBodyImagesError
+from inspinia.solutions.pdf_prerender import solution_pdf_download_request
+from inspinia.solutions.pdf_prerender import solution_pdf_problem_label
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+    from typing import IO
+
+    from inspinia.solutions.models import ProblemSolution
+    from inspinia.solutions.pdf_compile_queue import PdfCompileJob
+    from inspinia.solutions.pdf_compile_queue import PdfCompilePool
+    from inspinia.solutions.pdf_latex import PdfCompileRequest
+
+logger = logging.getLogger(__name__)
+
+PDF_BUNDLE_MAX_SOLUTIONS = 60
+
+_MSG_NOTHING_COMPILED = "None of the selected solutions could be compiled."
+
+
+@dataclass(frozen=True)
+class SolutionPdfBundleRequest:
+    """The titled pieces of a bundle, keyed by every piece's title and source."""
+
+    pieces: tuple[tuple[str, PdfCompileRequest], ...]
+    # Solutions left out up front because their pasted images are missing.
+    missing_image_titles: tuple[str, ...] = ()
+    cache_key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "cache_key", _bundle_cache_key(self.pieces))
+
+    def skipped_titles(self) -> list[str]:
+        """Titles left out of the bundle: missing images, then pieces that did not compile."""
+        failed = [title for title, piece in self.pieces if cached_pdf_path(piece.cache_key) is None]
+        return [*self.missing_image_titles, *failed]
+
+
+def solution_pdf_bundle_title(solution: ProblemSolution) -> str:
+    label = solution_pdf_problem_label(solution.problem)
+    author = (solution.author.name or "").strip()
+    return f"{label} — {author}" if author else label
+
+
+def solution_pdf_bundle_request(solutions: Iterable[ProblemSolution]) -> SolutionPdfBundleRequest:
+    """Build the bundle of ``solutions`` (blocks prefetched) without compiling anything.
+
+    Raises ``SolutionPdfError`` when every solution references missing images.
+    """
+    pieces: list[tuple[str, PdfCompileRequest]] = []
+    missing_image_titles: list[str] = []
+    for solution in solutions:
+        title = solution_pdf_bundle_title(solution)
+        try:
+            pieces.append((title, solution_pdf_download_request(solution)))
+        except SolutionPdfMissingBodyImagesError:
+            missing_image_titles.append(title)
+    if not pieces:
+        raise SolutionPdfError(_MSG_NOTHING_COMPILED)
+    return SolutionPdfBundleRequest(pieces=tuple(pieces), missing_image_titles=tuple(missing_image_titles))
+
+
+def run_solution_pdf_bundle(bundle_request: SolutionPdfBundleRequest, *, user_id: int | None) -> Path:
+    """Return the joined bundle, compiling its uncached pieces as pool jobs of ``user_id``.
+
+    Raises ``SolutionPdfCompilePendingError`` (with one of the unfinished piece
+    jobs) while pieces are still compiling after ``SOLUTION_PDF_COMPILE_INLINE_WAIT``,
+    ``SolutionPdfQueueFullError`` when no outstanding piece could be queued,
+    ``SolutionPdfToolError`` when no LaTeX driver is available and
+    ``SolutionPdfError`` when nothing compiled. Pieces that fail to compile are
+    left out of the bundle.
+    """
+    cached_path = cached_pdf_path(bundle_request.cache_key)
+    if cached_path is not None:
+        return cached_path
+
+    pool = get_pdf_compile_pool()
+    progress_key = _bundle_progress_key(bundle_request.cache_key)
+    piece_job_ids = cache.get(progress_key) or {}
+    deadline = time.monotonic() + settings.SOLUTION_PDF_COMPILE_INLINE_WAIT
+    while True:
+        unfinished, queue_full = _submit_outstanding_pieces(
+            bundle_request,
+            pool=pool,
+            user_id=user_id,
+            piece_job_ids=piece_job_ids,
+        )
+        cache.set(progress_key, piece_job_ids, PDF_COMPILE_JOB_TTL_SECONDS)
+        if not unfinished:
+            if queue_full is not None:
+                raise queue_full
+            break
+        # Without a local event (another process runs the job) ``wait`` returns at once.
+        job = pool.wait(unfinished[0], timeout=deadline - time.monotonic())
+        if not job.is_finished:
+            raise SolutionPdfCompilePendingError(job)
+
+    compiled = []
+    for title, compile_request in bundle_request.pieces:
+        piece_path = cached_pdf_path(compile_request.cache_key)
+        if piece_path is not None:
+            compiled.append((title, piece_path))
+    if not compiled:
+        raise SolutionPdfError(_MSG_NOTHING_COMPILED)
+    bundle_path = store_cached_pdf_stream(bundle_request.cache_key, lambda handle: _write_bundle(compiled, handle))
+    cache.delete(progress_key)
+    return bundle_path
+
+
+def _submit_outstanding_pieces(
+    bundle_request: SolutionPdfBundleRequest,
+    *,
+    pool: PdfCompilePool,
+    user_id: int | None,
+    piece_job_ids: dict[str, str],
+) -> tuple[list[PdfCompileJob], SolutionPdfQueueFullError | None]:
+    """Queue every uncached piece that has no live job; return the unfinished jobs.
+
+    Stops submitting at the first ``SolutionPdfQueueFullError`` and returns it, so
+    the remaining pieces wait for a later poll.
+    """
+    unfinished: list[PdfCompileJob] = []
+    queue_full: SolutionPdfQueueFullError | None = None
+    for title, compile_request in bundle_request.pieces:
+        if cached_pdf_path(compile_request.cache_key) is not None:
+            continue
+        job_id = piece_job_ids.get(compile_request.cache_key)
+        job = load_pdf_compile_job(job_id) if job_id else None
+        if job is not None and job.is_finished:
+            try:
+                job.raise_for_error()
+            except SolutionPdfCompileError:
+                logger.warning("solution_pdf_bundle_piece_failed title=%s", title)
+                continue
+            # Compiled, but the piece has since been evicted from the cache.
+            job = None
+        if job is None:
+            if queue_full is not None:
+                continue
+            try:
+                job = pool.submit(compile_request, user_id=user_id)
+            except SolutionPdfQueueFullError as exc:
+                queue_full = exc
+                continue
+            piece_job_ids[compile_request.cache_key] = job.job_id
+        unfinished.append(job)
+    return unfinished, queue_full
+
+
+def _bundle_cache_key(pieces: Iterable[tuple[str, PdfCompileRequest]]) -> str:
+    # Piece keys cover each solution's source, so the bundle key follows every piece.
+    digest = hashlib.sha256(f"bundle:{PDF_CACHE_KEY_VERSION}".encode())
+    for title, compile_request in pieces:
+        digest.update(b"\0")
+        digest.update(title.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(compile_request.cache_key.encode("ascii"))
+    return digest.hexdigest()
+
+
+def _bundle_progress_key(bundle_cache_key: str) -> str:
+    return f"solution-pdf-bundle:{PDF_CACHE_KEY_VERSION}:{bundle_cache_key}"
+
+
+def _write_bundle(compiled: list[tuple[str, Path]], handle: IO[bytes]) -> None:
+    writer = PdfWriter()
+    for title, path in compiled:
+        writer.append(path, outline_item=title, import_outline=False)
+    writer.write(handle)
+    writer.close()
@@ -0,0 +1,146 @@
+"""Content-addressed on-disk cache of compiled solution and problem list PDFs.
+
+Every PDF download used to run a full ``latexmk`` compile in a fresh temp
+directory. Compiled PDFs are now stored under ``MEDIA_ROOT`` keyed by a hash of
+everything that determines the output: the generated TeX source, the vendored
+``evan.sty``, the LaTeX driver and the contents of the body images the source
+includes. Unchanged content is served straight from the cache; any edit
+produces a new key, so entries never need invalidating.
+
+Cache hits bump the file's mtime, and each store evicts the least recently
+used entries once the cache grows past ``SOLUTION_PDF_CACHE_MAX_BYTES``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from typing import IO
+
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_DIRNAME = "pdf_cache"
+PDF_CACHE_KEY_VERSION = "v1"
+_HASH_CHUNK_BYTES = 1024 * 1024
+_DIGEST_CACHE_SIZE = 4096
+
+
+def pdf_cache_root() -> Path:
+    return Path(settings.MEDIA_ROOT) / PDF_CACHE_DIRNAME
+
+
+def pdf_cache_key(
+    tex_source: str,
+    *,
+    latex_binary: str,
+    input_paths: Iterable[Path] = (),
+) -> str:
+    """Hash of the TeX source, the driver and the contents of ``input_paths``.
+
+    ``input_paths`` are the files the compile reads besides the source, such as
+    ``evan.sty`` and the included body images; a missing file hashes as empty.
+    """
+    digest = hashlib.sha256()
+    for part in (PDF_CACHE_KEY_VERSION, latex_binary, tex_source):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for input_path in sorted(set(input_paths)):
+        digest.update(input_path.as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(file_content_digest(input_path).encode("ascii"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_content_digest(path: Path) -> str:
+    """SHA-256 of ``path``, memoized on its size and mtime."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return ""
+    return _file_digest(path, stat.st_size, stat.st_mtime_ns)
+
+
+def cached_pdf_path(key: str) -> Path | None:
+    """Path of the cached PDF for ``key``, marking it recently used, or ``None``."""
+    path = _entry_path(key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def store_cached_pdf(key: str, pdf_bytes: bytes) -> Path:
+    """Write ``pdf_bytes`` under ``key`` atomically, then evict down to the size limit."""
+    return store_cached_pdf_stream(key, lambda handle: handle.write(pdf_bytes))
+
+
+def store_cached_pdf_stream(key: str, write: Callable[[IO[bytes]], object]) -> Path:
+    """Like ``store_cached_pdf``, but ``write`` streams the PDF into the open cache file."""
+    path = _entry_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{key}.", suffix=".part", delete=False) as handle:
+        try:
+            write(handle)
+        except BaseException:
+            handle.close()
+            Path(handle.name).unlink(missing_ok=True)
+            raise
+    # Concurrent compiles of the same key write identical bytes; the last rename wins.
+    Path(handle.name).replace(path)
+    evict_pdf_cache(max_bytes=settings.SOLUTION_PDF_CACHE_MAX_BYTES, keep=path)
+    return path
+
+
+def evict_pdf_cache(*, max_bytes: int, keep: Path | None = None) -> int:
+    """Delete least recently used PDFs until the cache fits in ``max_bytes``; return the count."""
+    entries = []
+    total_bytes = 0
+    for path in pdf_cache_root().glob("*/*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total_bytes += stat.st_size
+
+    removed = 0
+    for _mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total_bytes <= max_bytes:
+            break
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total_bytes -= size
+        removed += 1
+    if removed:
+        logger.info("pdf_cache_evicted count=%s remaining_bytes=%s", removed, total_bytes)
+    return removed
+
+
+def _entry_path(key: str) -> Path:
+    return pdf_cache_root() / key[:2] / f"{key}.pdf"
+
+
+@lru_cache(maxsize=_DIGEST_CACHE_SIZE)
+def _file_digest(path: Path, _size: int, _mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            while chunk := handle.read(_HASH_CHUNK_BYTES):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return ""
+    return digest.hexdigest()
@@ -0,0 +1,400 @@
+"""Bounded LaTeX compile pool shared by the solution and problem list PDF downloads.
+
+Each PDF download used to run ``latexmk`` inside the request, so a burst of
+downloads started one compile per gunicorn worker and starved page serving.
+Cache misses are now handed to a fixed pool of ``SOLUTION_PDF_COMPILE_WORKERS``
+threads per process:
+
+* the queue holds at most ``SOLUTION_PDF_COMPILE_QUEUE_DEPTH`` jobs and each
+  user at most ``SOLUTION_PDF_COMPILE_MAX_PER_USER``; beyond that submissions
+  are refused with ``SolutionPdfQueueFullError`` instead of piling up;
+* queued jobs are taken round-robin across users, so one user's bulk export
+  cannot delay everybody else;
+* background jobs (pre-renders) wait in a lane of their own, capped at
+  ``SOLUTION_PDF_COMPILE_MAX_PER_USER``, that is served only while no user job
+  is queued, so they never take a turn or a queue slot from a reader;
+* a request for a PDF that is already queued or compiling joins that job, and
+  a reader joining a queued background job moves it into the reader's lane.
+
+The request waits up to ``SOLUTION_PDF_COMPILE_INLINE_WAIT`` seconds and then
+answers with a pending page that polls ``pdf_compile_status_view``. Job state
+lives in the Django cache, so any process can answer the poll; the PDF itself
+lands in the shared ``pdf_cache``. Queue wait and compile times are logged per
+job and summarized by ``PdfCompilePool.metrics``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import statistics
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+
+from inspinia.solutions import pdf_latex
+from inspinia.solutions.pdf_cache import cached_pdf_path
+from inspinia.solutions.pdf_latex import SolutionPdfCompileError
+from inspinia.solutions.pdf_latex import SolutionPdfError
+from inspinia.solutions.pdf_latex import SolutionPdfToolError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from inspinia.solutions.pdf_latex import PdfCompileRequest
+
+logger = logging.getLogger(__name__)
+
+PDF_COMPILE_JOB_CACHE_VERSION = "v1"
+PDF_COMPILE_JOB_TTL_SECONDS = 60 * 60
+PDF_COMPILE_METRICS_WINDOW = 200
+PDF_COMPILE_RETRY_AFTER_SECONDS = 30
+
+_JOB_QUEUED = "queued"
+_JOB_RUNNING = "running"
+_JOB_DONE = "done"
+_JOB_FAILED = "failed"
+
+_ERROR_TOOL = "tool"
+_ERROR_COMPILE = "compile"
+_ERROR_OTHER = "error"
+
+_MSG_QUEUE_FULL = "The PDF compiler is busy. Try again in a minute."
+_MSG_USER_LIMIT = "You already have PDF exports in progress. Wait for them to finish."
+_MSG_CACHE_EVICTED = "The compiled PDF is no longer available. Try again."
+
+
+class SolutionPdfQueueFullError(SolutionPdfError):
+    """The compile queue (or the user's share of it) is full."""
+
+
+class SolutionPdfCompilePendingError(SolutionPdfError):
+    """The compile is queued or running; poll ``job`` for the result."""
+
+    def __init__(self, job: PdfCompileJob) -> None:
+        super().__init__("PDF compile in progress.")
+        self.job = job
+
+
+@dataclass
+class PdfCompileJob:
+    job_id: str
+    user_id: int | None
+    cache_key: str
+    status: str = _JOB_QUEUED
+    submitted_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+    error_kind: str = ""
+    error_message: str = ""
+    log_tail: str = ""
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {_JOB_DONE, _JOB_FAILED}
+
+    @property
+    def queue_wait_ms(self) -> int | None:
+        if self.started_at is None:
+            return None
+        return round((self.started_at - self.submitted_at) * 1000)
+
+    @property
+    def compile_ms(self) -> int | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round((self.finished_at - self.started_at) * 1000)
+
+    def raise_for_error(self) -> None:
+        """Re-raise the failure of a finished job as the original error type."""
+        if self.status != _JOB_FAILED:
+            return
+        if self.error_kind == _ERROR_TOOL:
+            raise SolutionPdfToolError(self.error_message)
+        if self.error_kind == _ERROR_COMPILE:
+            raise SolutionPdfCompileError(self.error_message, log_tail=self.log_tail)
+        raise SolutionPdfError(self.error_message)
+
+    def to_json(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "queue_wait_ms": self.queue_wait_ms,
+            "compile_ms": self.compile_ms,
+        }
+
+
+def load_pdf_compile_job(job_id: str) -> PdfCompileJob | None:
+    state = cache.get(_job_cache_key(job_id))
+    return PdfCompileJob(**state) if state else None
+
+
+class _FairQueue:
+    """FIFO per user, served round-robin across users; background jobs only when no user job waits."""
+
+    def __init__(self) -> None:
+        self._jobs_by_user: dict[int | None, deque[PdfCompileJob]] = {}
+        self._turns: deque[int | None] = deque()
+        self._size = 0
+        self._background: deque[PdfCompileJob] = deque()
+
+    def __len__(self) -> int:
+        return self._size + len(self._background)
+
+    @property
+    def background_count(self) -> int:
+        return len(self._background)
+
+    def queued_for(self, user_id: int | None) -> int:
+        return len(self._jobs_by_user.get(user_id, ()))
+
+    def push(self, job: PdfCompileJob, *, background: bool = False) -> None:
+        if background:
+            self._background.append(job)
+            return
+        jobs = self._jobs_by_user.get(job.user_id)
+        if jobs is None:
+            jobs = self._jobs_by_user[job.user_id] = deque()
+            self._turns.append(job.user_id)
+        jobs.append(job)
+        self._size += 1
+
+    def promote(self, job: PdfCompileJob, *, user_id: int | None) -> None:
+        """Move ``job`` from the background lane to ``user_id``'s lane if it is still waiting there."""
+        if job not in self._background:
+            return
+        self._background.remove(job)
+        job.user_id = user_id
+        self.push(job)
+
+    def pop(self) -> PdfCompileJob:
+        if not self._turns:
+            return self._background.popleft()
+        user_id = self._turns.popleft()
+        jobs = self._jobs_by_user[user_id]
+        job = jobs.popleft()
+        if jobs:
+            self._turns.append(user_id)
+        else:
+            del self._jobs_by_user[user_id]
+        self._size -= 1
+        return job
+
+
+class PdfCompilePool:
+    def __init__(self, *, workers: int, max_queue_depth: int, max_jobs_per_user: int) -> None:
+        self.workers = max(workers, 1)
+        self.max_queue_depth = max_queue_depth
+        self.max_jobs_per_user = max_jobs_per_user
+        self._condition = threading.Condition()
+        self._queue = _FairQueue()
+        self._requests: dict[str, PdfCompileRequest] = {}
+        self._active_by_cache_key: dict[str, PdfCompileJob] = {}
+        self._finished_events: dict[str, threading.Event] = {}
+        self._running = 0
+        self._threads: list[threading.Thread] = []
+        self._counts = {"submitted": 0, "joined": 0, "rejected": 0, "done": 0, "failed": 0}
+        self._queue_wait_ms: deque[int] = deque(maxlen=PDF_COMPILE_METRICS_WINDOW)
+        self._compile_ms: deque[int] = deque(maxlen=PDF_COMPILE_METRICS_WINDOW)
+
+    def submit(
+        self,
+        compile_request: PdfCompileRequest,
+        *,
+        user_id: int | None,
+        background: bool = False,
+    ) -> PdfCompileJob:
+        """Queue a compile for ``user_id``, or in the background lane when ``background`` is set."""
+        with self._condition:
+            active = self._active_by_cache_key.get(compile_request.cache_key)
+            if active is not None:
+                if not background:
+                    self._queue.promote(active, user_id=user_id)
+                self._counts["joined"] += 1
+                return active
+            if background:
+                queue_is_full = (
+                    len(self._queue) >= self.max_queue_depth or self._queue.background_count >= self.max_jobs_per_user
+                )
+            else:
+                queue_is_full = len(self._queue) - self._queue.background_count >= self.max_queue_depth
+            if queue_is_full:
+                self._counts["rejected"] += 1
+                raise SolutionPdfQueueFullError(_MSG_QUEUE_FULL)
+            if not background and self._queue.queued_for(user_id) >= self.max_jobs_per_user:
+                self._counts["rejected"] += 1
+                raise SolutionPdfQueueFullError(_MSG_USER_LIMIT)
+
+            job = PdfCompileJob(
+                job_id=uuid.uuid4().hex,
+                user_id=user_id,
+                cache_key=compile_request.cache_key,
+                submitted_at=time.time(),
+            )
+            self._requests[job.job_id] = compile_request
+            self._active_by_cache_key[job.cache_key] = job
+            self._finished_events[job.job_id] = threading.Event()
+            self._queue.push(job, background=background)
+            self._counts["submitted"] += 1
+            _save_job(job)
+            self._start_workers()
+            self._condition.notify()
+        return job
+
+    def wait(self, job: PdfCompileJob, *, timeout: float) -> PdfCompileJob:
+        """Wait up to ``timeout`` seconds for ``job`` and return its latest state."""
+        event = self._finished_events.get(job.job_id)
+        if event is not None and timeout > 0:
+            event.wait(timeout)
+        return load_pdf_compile_job(job.job_id) or job
+
+    def metrics(self) -> dict:
+        with self._condition:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": len(self._queue),
+                "queued_background": self._queue.background_count,
+                "max_queue_depth": self.max_queue_depth,
+                **self._counts,
+                "queue_wait_ms": _summarize(self._queue_wait_ms),
+                "compile_ms": _summarize(self._compile_ms),
+            }
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"pdf-compile-{len(self._threads) + 1}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                while not len(self._queue):
+                    self._condition.wait()
+                job = self._queue.pop()
+                compile_request = self._requests.pop(job.job_id)
+                self._running += 1
+            job.status = _JOB_RUNNING
+            job.started_at = time.time()
+            _save_job(job)
+            try:
+                self._run(job, compile_request)
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._active_by_cache_key.pop(job.cache_key, None)
+                    self._counts[job.status] += 1
+                    self._queue_wait_ms.append(job.queue_wait_ms or 0)
+                    self._compile_ms.append(job.compile_ms or 0)
+                _save_job(job)
+                self._finished_events.pop(job.job_id).set()
+                logger.info(
+                    "solution_pdf_compile_finished job_id=%s status=%s queue_wait_ms=%s compile_ms=%s",
+                    job.job_id,
+                    job.status,
+                    job.queue_wait_ms,
+                    job.compile_ms,
+                )
+
+    def _run(self, job: PdfCompileJob, compile_request: PdfCompileRequest) -> None:
+        try:
+            pdf_latex.compile_pdf_request(compile_request)
+        except SolutionPdfToolError as exc:
+            _fail(job, _ERROR_TOOL, exc)
+        except SolutionPdfCompileError as exc:
+            _fail(job, _ERROR_COMPILE, exc)
+            job.log_tail = exc.log_tail
+        except Exception as exc:
+            logger.exception("solution_pdf_compile_crashed job_id=%s", job.job_id)
+            _fail(job, _ERROR_OTHER, exc)
+        else:
+            job.status = _JOB_DONE
+            job.finished_at = time.time()
+
+
+_pool: PdfCompilePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_compile_pool() -> PdfCompilePool:
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = PdfCompilePool(
+                workers=settings.SOLUTION_PDF_COMPILE_WORKERS,
+                max_queue_depth=settings.SOLUTION_PDF_COMPILE_QUEUE_DEPTH,
+                max_jobs_per_user=settings.SOLUTION_PDF_COMPILE_MAX_PER_USER,
+            )
+        return _pool
+
+
+def run_pdf_compile(
+    compile_request: PdfCompileRequest,
+    *,
+    user_id: int | None,
+    previous_job_id: str = "",
+) -> Path:
+    """Return the compiled PDF, queueing the compile on a cache miss.
+
+    Raises ``SolutionPdfCompilePendingError`` when the job does not finish within
+    ``SOLUTION_PDF_COMPILE_INLINE_WAIT``. ``previous_job_id`` is the job a pending
+    page polled; if it failed for this same source its error is raised instead of
+    compiling again. Requests for a source that is already compiling share that
+    job, whoever submitted it.
+    """
+    cached_path = cached_pdf_path(compile_request.cache_key)
+    if cached_path is not None:
+        return cached_path
+
+    previous_job = load_pdf_compile_job(previous_job_id) if previous_job_id else None
+    if previous_job is not None and previous_job.cache_key == compile_request.cache_key:
+        previous_job.raise_for_error()
+
+    pool = get_pdf_compile_pool()
+    job = pool.wait(pool.submit(compile_request, user_id=user_id), timeout=settings.SOLUTION_PDF_COMPILE_INLINE_WAIT)
+    if not job.is_finished:
+        raise SolutionPdfCompilePendingError(job)
+    job.raise_for_error()
+    cached_path = cached_pdf_path(compile_request.cache_key)
+    if cached_path is None:
+        raise SolutionPdfError(_MSG_CACHE_EVICTED)
+    return cached_path
+
+
+def _fail(job: PdfCompileJob, error_kind: str, exc: Exception) -> None:
+    job.status = _JOB_FAILED
+    job.finished_at = time.time()
+    job.error_kind = error_kind
+    job.error_message = str(exc)
+
+
+def _save_job(job: PdfCompileJob) -> None:
+    cache.set(_job_cache_key(job.job_id), asdict(job), PDF_COMPILE_JOB_TTL_SECONDS)
+
+
+def _job_cache_key(job_id: str) -> str:
+    return f"solution-pdf-job:{PDF_COMPILE_JOB_CACHE_VERSION}:{job_id}"
+
+
+def _summarize(samples: deque[int]) -> dict:
+    if not samples:
+        return {"count": 0, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": round(statistics.median(ordered)),
+        "p95": ordered[max(math.ceil(len(ordered) * 0.95) - 1, 0)],
+        "max": ordered[-1],
+    }
@@ -1,4 +1,8 @@
-"""Build LaTeX source and compile solution PDFs with vendored ``evan.sty``."""
+"""Build LaTeX source and compile solution PDFs with vendored ``evan.sty``.
+
+Compiled PDFs go through the content-addressed cache in ``pdf_cache``, so the
+``compile_*`` helpers return the path of the cached file.
+"""
 
 from __future__ import annotations
 
@@ -9,14 +13,27 @@ import subprocess
 import tempfile
 import unicodedata
 from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from django.utils import timezone
 
 from inspinia.solutions.body_image_paths import is_allowed_includegraphics_path
+from inspinia.solutions.body_images import solution_body_image_pdf_inputs
+from inspinia.solutions.pdf_cache import cached_pdf_path
+from inspinia.solutions.pdf_cache import pdf_cache_key
+from inspinia.solutions.pdf_cache import store_cached_pdf
+from inspinia.solutions.pdf_latex_format import LATEX_FORMAT_DUMP_MARKER
+from inspinia.solutions.pdf_latex_format import LATEX_FORMAT_ENGINE
+from inspinia.solutions.pdf_latex_format import LATEX_FORMAT_NAME
+from inspinia.solutions.pdf_latex_format import ensure_latex_format
+from inspinia.solutions.pdf_latex_format import latex_work_dir
+from inspinia.solutions.pdf_latex_format import preamble_of
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
     from collections.abc import Sequence
 
     from inspinia.solutions.models import ProblemSolution
@@ -65,6 +82,26 @@ class SolutionPdfCompileParams:
     problem_statement_latex: str = ""
 
 
+@dataclass(frozen=True)
+class PdfCompileRequest:
+    """A generated TeX source ready to compile, keyed by everything that shapes its PDF."""
+
+    tex_source: str
+    timeout: int
+    latex_binary: str
+    # Files the source includes besides ``evan.sty`` (pasted body images).
+    input_paths: tuple[Path, ...] = ()
+    cache_key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        key = pdf_cache_key(
+            self.tex_source,
+            latex_binary=self.latex_binary,
+            input_paths=[EVAN_STY_PATH, *self.input_paths],
+        )
+        object.__setattr__(self, "cache_key", key)
+
+
 # Vertical gap between exported blocks.
 _SOLUTION_PDF_BLOCK_VSPACE = r"\addvspace{\baselineskip}"
 
@@ -207,6 +244,20 @@ def latex_unicode_character_declarations() -> list[str]:
     ]
 
 
+def shared_latex_preamble_lines() -> list[str]:
+    """Preamble shared by solution and problem list PDFs, ending at the format dump marker.
+
+    Everything up to the marker is baked into the precompiled LaTeX format, so
+    per-document settings (title, ``\\graphicspath``, ...) must come after it.
+    """
+    return [
+        r"\documentclass[11pt]{scrartcl}",
+        r"\usepackage[sexy,noasy]{evan}",
+        *latex_unicode_character_declarations(),
+        LATEX_FORMAT_DUMP_MARKER,
+    ]
+
+
 def _block_heading(block: ProblemSolutionBlock) -> str:
     type_label = (block.block_type.label if block.block_type else "").strip() or "Block"
     title = (block.title or "").strip()
@@ -257,24 +308,38 @@ def _extract_includegraphics_paths(value: str) -> list[str]:
     return [match.group(1).strip() for match in _INCLUDEGRAPHICS_RE.finditer(_strip_latex_comments(value))]
 
 
-def _missing_solution_body_image_paths(
-    blocks: Sequence[ProblemSolutionBlock],
-    *,
-    media_root: Path,
-) -> list[str]:
+def _solution_body_image_paths(blocks: Sequence[ProblemSolutionBlock]) -> list[str]:
+    """Canonical media-relative paths of the body images the blocks include, in order."""
     seen: set[str] = set()
-    missing: list[str] = []
+    paths: list[str] = []
     for block in blocks:
         for path in _extract_includegraphics_paths(block.body_source or ""):
             if not is_allowed_includegraphics_path(path):
                 continue
-            canonical_path = unicodedata.normalize("NFKC", path).strip().replace("\\", "/").lstrip("/")
+            canonical_path = _canonical_body_image_path(path)
             if canonical_path in seen:
                 continue
             seen.add(canonical_path)
-            if not (media_root / canonical_path).is_file():
-                missing.append(canonical_path)
-    return missing
+            paths.append(canonical_path)
+    return paths
+
+
+def _canonical_body_image_path(path: str) -> str:
+    return unicodedata.normalize("NFKC", path).strip().replace("\\", "/").lstrip("/")
+
+
+def _swap_body_image_paths(body: str, body_image_paths: Mapping[str, str]) -> str:
+    """Point each ``\\includegraphics`` of an uploaded image at its replacement in ``body_image_paths``."""
+    if not body_image_paths:
+        return body
+
+    def swap(match: re.Match[str]) -> str:
+        replacement = body_image_paths.get(_canonical_body_image_path(match.group(1)))
+        if replacement is None:
+            return match.group(0)
+        return match.string[match.start(0) : match.start(1)] + replacement + match.string[match.end(1) : match.end(0)]
+
+    return _INCLUDEGRAPHICS_RE.sub(swap, body)
 
 
 def _solution_pdf_author_display(user) -> str:
@@ -354,10 +419,11 @@ def _render_bold_leadin(label: str, *, title: str, body: str) -> list[str]:
     return lines
 
 
-def _render_block(block: ProblemSolutionBlock) -> list[str]:
+def _render_block(block: ProblemSolutionBlock, body_image_paths: Mapping[str, str] | None = None) -> list[str]:
     rendered: list[str]
+    body = _swap_body_image_paths(block.body_source or "", body_image_paths or {})
     if _is_plain_block(block):
-        rendered = [block.body_source or "", ""]
+        rendered = [body, ""]
     else:
         slug = _block_slug(block)
         theorem_env = {
@@ -365,11 +431,11 @@ def _render_block(block: ProblemSolutionBlock) -> list[str]:
             "remark": "remark",
         }.get(slug)
         if theorem_env:
-            rendered = _render_theorem_like_block(theorem_env, title=block.title or "", body=block.body_source or "")
+            rendered = _render_theorem_like_block(theorem_env, title=block.title or "", body=body)
         elif slug == "claim":
-            rendered = _render_claim_block(title=block.title or "", body=block.body_source or "")
+            rendered = _render_claim_block(title=block.title or "", body=body)
         elif slug == "proof":
-            rendered = _render_proof_block(title=block.title or "", body=block.body_source or "")
+            rendered = _render_proof_block(title=block.title or "", body=body)
         elif slug in {"section", "part"}:
             command = "section" if slug == "section" else "subsection"
             fallback = block.block_type.label if block.block_type else slug.title()
@@ -377,29 +443,31 @@ def _render_block(block: ProblemSolutionBlock) -> list[str]:
                 command,
                 title=block.title or "",
                 fallback=fallback,
-                body=block.body_source or "",
+                body=body,
             )
         elif slug in {"case", "subcase", "idea", "computation", "conclusion"}:
             rendered = _render_bold_leadin(
                 (block.block_type.label if block.block_type else slug.title()),
                 title=block.title or "",
-                body=block.body_source or "",
+                body=body,
             )
         else:
             heading = latex_escape_plain_text(_block_heading(block))
-            rendered = [rf"\paragraph{{{heading}}}", block.body_source or "", ""]
+            rendered = [rf"\paragraph{{{heading}}}", body, ""]
 
     return rendered
 
 
-def build_solution_tex_source(
+def build_solution_tex_source(  # noqa: PLR0913
     *,
     solution: ProblemSolution,
     blocks: Sequence[ProblemSolutionBlock],
     media_root: Path,
     problem_label: str,
     problem_statement_latex: str = "",
+    body_image_paths: Mapping[str, str] | None = None,
 ) -> str:
+    """TeX source of a solution; ``body_image_paths`` swaps included images for their PDF variants."""
     title = latex_escape_plain_text(problem_label)
     subtitle = latex_escape_plain_text(_solution_pdf_subtitle(solution))
     author = latex_escape_plain_text(_solution_pdf_author_display(solution.author))
@@ -410,18 +478,15 @@ def build_solution_tex_source(
     gp = _graphicspath_tex(media_root)
 
     lines: list[str] = [
-        r"\documentclass[11pt]{scrartcl}",
-        r"\usepackage[sexy,noasy]{evan}",
-        *latex_unicode_character_declarations(),
+        *shared_latex_preamble_lines(),
         rf"\graphicspath{{{gp}}}",
         rf"\title{{{title}}}",
+        *([rf"\subtitle{{{subtitle}}}"] if subtitle else []),
         rf"\author{{{author}}}",
         rf"\date{{{date_str}}}",
         r"\begin{document}",
         r"\maketitle",
     ]
-    if subtitle:
-        lines.insert(4, rf"\subtitle{{{subtitle}}}")
     stmt_body = (problem_statement_latex or "").strip()
     if stmt_body:
         lines.append(r"\begin{mdframed}[style=mdpurplebox,frametitle={Problem Statement}]")
@@ -432,7 +497,7 @@ def build_solution_tex_source(
         if i:
             lines.append(r"\par")
             lines.append(_SOLUTION_PDF_BLOCK_VSPACE)
-        lines.extend(_render_block(block))
+        lines.extend(_render_block(block, body_image_paths))
     lines.append(r"\end{document}")
     return "\n".join(lines)
 
@@ -482,7 +547,15 @@ def compile_solution_tex_to_pdf(
     *,
     timeout: int,
     latex_binary: str,
+    prewarmed: bool = True,
 ) -> bytes:
+    """Compile ``tex_source`` with ``latex_binary`` and return the PDF bytes.
+
+    With ``prewarmed`` (the default) the compile runs in a reused work directory
+    and, for ``latexmk`` sources that start with the shared preamble, loads the
+    precompiled LaTeX format. ``prewarmed=False`` runs the plain cold compile in a
+    fresh temp directory; the benchmark command compares the two.
+    """
     if not EVAN_STY_PATH.is_file():
         msg = f"Missing vendored evan.sty at {EVAN_STY_PATH}"
         raise SolutionPdfError(msg)
@@ -490,55 +563,116 @@ def compile_solution_tex_to_pdf(
         msg = _MSG_TOOL_NOT_FOUND.format(binary=repr(latex_binary))
         raise SolutionPdfToolError(msg)
 
-    with tempfile.TemporaryDirectory(prefix="ap_solution_pdf_") as tmp:
-        tmp_path = Path(tmp)
-        shutil.copy2(EVAN_STY_PATH, tmp_path / "evan.sty")
-        main_tex = tmp_path / "main.tex"
-        main_tex.write_text(normalize_latex_unicode_math(tex_source), encoding="utf-8")
-        cmd = [
-            latex_binary,
-            "-pdf",
-            "-interaction=nonstopmode",
-            "-halt-on-error",
-            str(main_tex.name),
-        ]
-        try:
-            completed = subprocess.run(  # noqa: S603
-                cmd,
-                cwd=tmp_path,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False,
-            )
-        except subprocess.TimeoutExpired as exc:
-            log_raw = _read_log_bytes(tmp_path / "main.log")
-            log_tail = _merge_latex_fail_detail(log_text=log_raw, stderr="", max_chars=LOG_TAIL_MAX_CHARS)
-            raise SolutionPdfCompileError(_MSG_LATEX_TIMEOUT, log_tail=log_tail) from exc
-
-        pdf_path = tmp_path / "main.pdf"
-        if pdf_path.is_file() and completed.returncode == 0:
-            return pdf_path.read_bytes()
-
-        log_raw = _read_log_bytes(tmp_path / "main.log")
-        logger.warning(
-            "solution_pdf_compile_failed returncode=%s",
-            completed.returncode,
+    if not prewarmed:
+        with tempfile.TemporaryDirectory(prefix="ap_solution_pdf_") as tmp:
+            tmp_path = Path(tmp)
+            shutil.copy2(EVAN_STY_PATH, tmp_path / "evan.sty")
+            return _run_latex(tex_source, work_dir=tmp_path, timeout=timeout, latex_binary=latex_binary)
+
+    format_path = _latex_format_for(tex_source, timeout=timeout, latex_binary=latex_binary)
+    support_files = [EVAN_STY_PATH] if format_path is None else [EVAN_STY_PATH, format_path]
+    with latex_work_dir(support_files=support_files) as work_dir:
+        return _run_latex(
+            tex_source,
+            work_dir=work_dir,
+            timeout=timeout,
+            latex_binary=latex_binary,
+            use_format=format_path is not None,
         )
-        combined = _merge_latex_fail_detail(
-            log_text=log_raw,
-            stderr=completed.stderr or "",
-            max_chars=LOG_TAIL_MAX_CHARS,
-        ) or (completed.stderr or "")[-2000:]
-        raise SolutionPdfCompileError(_MSG_LATEX_FAILED, log_tail=combined)
 
 
-def compile_solution_to_pdf(
+def _latex_format_for(tex_source: str, *, timeout: int, latex_binary: str) -> Path | None:
+    if Path(latex_binary).name != "latexmk":
+        return None
+    preamble = preamble_of(tex_source)
+    if preamble is None:
+        return None
+    return ensure_latex_format(preamble, support_files=[EVAN_STY_PATH], timeout=timeout)
+
+
+def _run_latex(
+    tex_source: str,
+    *,
+    work_dir: Path,
+    timeout: int,
+    latex_binary: str,
+    use_format: bool = False,
+) -> bytes:
+    main_tex = work_dir / "main.tex"
+    main_tex.write_text(normalize_latex_unicode_math(tex_source), encoding="utf-8")
+    cmd = [latex_binary, "-pdf"]
+    if use_format:
+        cmd.append(f"-pdflatex={LATEX_FORMAT_ENGINE} -fmt={LATEX_FORMAT_NAME} %O %S")
+    cmd.extend(["-interaction=nonstopmode", "-halt-on-error", str(main_tex.name)])
+    try:
+        completed = subprocess.run(  # noqa: S603
+            cmd,
+            cwd=work_dir,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as exc:
+        log_raw = _read_log_bytes(work_dir / "main.log")
+        log_tail = _merge_latex_fail_detail(log_text=log_raw, stderr="", max_chars=LOG_TAIL_MAX_CHARS)
+        raise SolutionPdfCompileError(_MSG_LATEX_TIMEOUT, log_tail=log_tail) from exc
+
+    pdf_path = work_dir / "main.pdf"
+    if pdf_path.is_file() and completed.returncode == 0:
+        return pdf_path.read_bytes()
+
+    log_raw = _read_log_bytes(work_dir / "main.log")
+    logger.warning(
+        "solution_pdf_compile_failed returncode=%s",
+        completed.returncode,
+    )
+    combined = _merge_latex_fail_detail(
+        log_text=log_raw,
+        stderr=completed.stderr or "",
+        max_chars=LOG_TAIL_MAX_CHARS,
+    ) or (completed.stderr or "")[-2000:]
+    raise SolutionPdfCompileError(_MSG_LATEX_FAILED, log_tail=combined)
+
+
+def compile_pdf_request(compile_request: PdfCompileRequest) -> Path:
+    """Return the cached PDF for ``compile_request``, compiling it only on a cache miss."""
+    cached_path = cached_pdf_path(compile_request.cache_key)
+    if cached_path is not None:
+        return cached_path
+    pdf_bytes = compile_solution_tex_to_pdf(
+        compile_request.tex_source,
+        timeout=compile_request.timeout,
+        latex_binary=compile_request.latex_binary,
+    )
+    return store_cached_pdf(compile_request.cache_key, pdf_bytes)
+
+
+def compile_solution_tex_to_cached_pdf(
+    tex_source: str,
+    *,
+    timeout: int,
+    latex_binary: str,
+    input_paths: Iterable[Path] = (),
+) -> Path:
+    return compile_pdf_request(
+        PdfCompileRequest(
+            tex_source=tex_source,
+            timeout=timeout,
+            latex_binary=latex_binary,
+            input_paths=tuple(input_paths),
+        ),
+    )
+
+
+def solution_pdf_compile_request(
     solution: ProblemSolution,
     blocks: Sequence[ProblemSolutionBlock],
     params: SolutionPdfCompileParams,
-) -> bytes:
-    missing_paths = _missing_solution_body_image_paths(blocks, media_root=params.media_root)
+) -> PdfCompileRequest:
+    """Build the TeX source of a solution, checking its pasted body images exist."""
+    image_paths = _solution_body_image_paths(blocks)
+    pdf_inputs, missing_paths = solution_body_image_pdf_inputs(image_paths, media_root=params.media_root)
     if missing_paths:
         raise SolutionPdfMissingBodyImagesError(missing_paths)
     tex = build_solution_tex_source(
@@ -547,9 +681,19 @@ def compile_solution_to_pdf(
         media_root=params.media_root,
         problem_label=params.problem_label,
         problem_statement_latex=params.problem_statement_latex,
+        body_image_paths={path: pdf_path for path, pdf_path in pdf_inputs.items() if pdf_path != path},
     )
-    return compile_solution_tex_to_pdf(
-        tex,
+    return PdfCompileRequest(
+        tex_source=tex,
         timeout=params.timeout,
         latex_binary=params.latex_binary,
+        input_paths=tuple(params.media_root / pdf_path for pdf_path in pdf_inputs.values()),
     )
+
+
+def compile_solution_to_pdf(
+    solution: ProblemSolution,
+    blocks: Sequence[ProblemSolutionBlock],
+    params: SolutionPdfCompileParams,
+) -> Path:
+    return compile_pdf_request(solution_pdf_compile_request(solution, blocks, params))
@@ -0,0 +1,195 @@
+"""Precompiled LaTeX format and warm work directories for PDF compiles.
+
+Solution and problem list PDFs share one preamble (``scrartcl`` plus the
+vendored ``evan.sty`` and its package stack). Loading that preamble dominates a
+short compile, so it is dumped once into a ``.fmt`` file with
+``mylatexformat``; compiles then start from the format and skip everything up
+to the ``\\endofdump`` marker in their source.
+
+Formats are keyed by a hash of the preamble text, ``evan.sty`` and the engine
+binary, so editing the style or upgrading TeX builds a fresh one. When the
+engine or ``mylatexformat`` is unavailable, or the build fails, compiles fall
+back to loading the preamble normally.
+
+Compiles also reuse a small pool of work directories that already hold
+``evan.sty`` and the format, instead of creating a fresh temp dir each time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from inspinia.solutions.pdf_cache import file_content_digest
+from inspinia.solutions.pdf_cache import pdf_cache_root
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+LATEX_FORMAT_DUMP_MARKER = r"\csname endofdump\endcsname"
+LATEX_FORMAT_NAME = "evan-preamble"
+LATEX_FORMAT_ENGINE = "pdflatex"
+LATEX_FORMAT_KEY_VERSION = "v1"
+LATEX_FORMAT_DIRNAME = "formats"
+WORK_DIR_SOURCE_STEM = "main"
+
+_format_lock = threading.Lock()
+_failed_format_keys: set[str] = set()
+_work_dir_lock = threading.Lock()
+_idle_work_dirs: list[Path] = []
+
+
+def latex_format_root() -> Path:
+    return pdf_cache_root() / LATEX_FORMAT_DIRNAME
+
+
+def latex_format_key(preamble: str, *, support_files: Sequence[Path], engine_path: Path) -> str:
+    """Hash of the preamble text, the files it loads and the engine binary."""
+    digest = hashlib.sha256()
+    for part in (LATEX_FORMAT_KEY_VERSION, preamble):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for path in (*support_files, engine_path):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(file_content_digest(path).encode("ascii"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def preamble_of(tex_source: str) -> str | None:
+    """The part of ``tex_source`` up to and including the dump marker, or ``None``."""
+    head, marker, _body = tex_source.partition(LATEX_FORMAT_DUMP_MARKER)
+    if not marker:
+        return None
+    return head + marker
+
+
+def ensure_latex_format(
+    preamble: str,
+    *,
+    support_files: Sequence[Path],
+    timeout: int,
+) -> Path | None:
+    """Return the ``.fmt`` for ``preamble``, building it on first use, or ``None``.
+
+    ``None`` means compiles should load the preamble normally: the format is
+    disabled, the toolchain cannot build it, or a previous build failed.
+    """
+    if not settings.SOLUTION_PDF_LATEX_FORMAT:
+        return None
+    engine = shutil.which(LATEX_FORMAT_ENGINE)
+    if engine is None:
+        return None
+    key = latex_format_key(preamble, support_files=support_files, engine_path=Path(engine))
+    format_path = latex_format_root() / key / f"{LATEX_FORMAT_NAME}.fmt"
+    if format_path.is_file():
+        return format_path
+    with _format_lock:
+        if not format_path.is_file() and key not in _failed_format_keys:
+            if not _build_latex_format(preamble, support_files, format_path=format_path, timeout=timeout):
+                _failed_format_keys.add(key)
+    return format_path if format_path.is_file() else None
+
+
+def _build_latex_format(
+    preamble: str,
+    support_files: Sequence[Path],
+    *,
+    format_path: Path,
+    timeout: int,
+) -> bool:
+    format_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="ap_latex_format_") as tmp:
+        tmp_path = Path(tmp)
+        for path in support_files:
+            shutil.copy2(path, tmp_path / path.name)
+        (tmp_path / "preamble.tex").write_text(preamble + "\n", encoding="utf-8")
+        cmd = [
+            LATEX_FORMAT_ENGINE,
+            "-ini",
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            f"-jobname={LATEX_FORMAT_NAME}",
+            f"&{LATEX_FORMAT_ENGINE}",
+            "mylatexformat.ltx",
+            "preamble.tex",
+        ]
+        try:
+            completed = subprocess.run(  # noqa: S603
+                cmd,
+                cwd=tmp_path,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning("latex_format_build_timeout format=%s", format_path.parent.name)
+            return False
+        built = tmp_path / f"{LATEX_FORMAT_NAME}.fmt"
+        if completed.returncode != 0 or not built.is_file():
+            logger.warning(
+                "latex_format_build_failed returncode=%s format=%s",
+                completed.returncode,
+                format_path.parent.name,
+            )
+            return False
+        # Build next to the target and rename so other processes never load a partial file.
+        partial = format_path.with_suffix(".fmt.part")
+        shutil.copy2(built, partial)
+        partial.replace(format_path)
+    logger.info("latex_format_built format=%s", format_path.parent.name)
+    return True
+
+
+@contextmanager
+def latex_work_dir(*, support_files: Sequence[Path]) -> Iterator[Path]:
+    """Yield a work directory holding ``support_files``, reused across compiles.
+
+    Outputs of the previous compile (``main.*``) are removed first. A directory
+    whose compile raised is discarded rather than returned to the pool.
+    """
+    with _work_dir_lock:
+        work_dir = _idle_work_dirs.pop() if _idle_work_dirs else None
+    if work_dir is None or not work_dir.is_dir():
+        work_dir = Path(tempfile.mkdtemp(prefix="ap_solution_pdf_warm_"))
+    for stale in work_dir.glob(f"{WORK_DIR_SOURCE_STEM}.*"):
+        stale.unlink(missing_ok=True)
+    _sync_support_files(work_dir, support_files)
+    try:
+        yield work_dir
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+    with _work_dir_lock:
+        _idle_work_dirs.append(work_dir)
+
+
+def _sync_support_files(work_dir: Path, support_files: Sequence[Path]) -> None:
+    for path in support_files:
+        target = work_dir / path.name
+        source_stat = path.stat()
+        try:
+            target_stat = target.stat()
+        except FileNotFoundError:
+            target_stat = None
+        if (
+            target_stat is not None
+            and target_stat.st_size == source_stat.st_size
+            and target_stat.st_mtime_ns == source_stat.st_mtime_ns
+        ):
+            continue
+        shutil.copy2(path, target)
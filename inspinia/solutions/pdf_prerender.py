@@ -0,0 +1,164 @@
+"""Pre-render published solution and public problem list PDFs in the background.
+
+Publishing a solution, editing a published one or changing a public problem
+list queues a compile of its download PDF, so the first reader finds it in
+``pdf_cache`` instead of waiting on LaTeX. Changes are debounced per object for
+``SOLUTION_PDF_PRERENDER_DELAY`` seconds after the transaction commits: a burst
+of saves from one editor session compiles only the final content.
+
+Pre-renders go through the shared compile pool's background lane, which is
+capped like a single user and only served while no reader download is queued,
+so a publish burst never delays readers. A refused or failed pre-render is only
+logged; the download view compiles on demand as before.
+
+The ``prerender_pdfs`` management command compiles everything that is missing
+from the cache in bulk.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.db.models import Prefetch
+
+from inspinia.pages.models import ContestProblemStatement
+from inspinia.problemsets.models import ProblemList
+from inspinia.problemsets.pdf_latex import ProblemListPdfCompileParams
+from inspinia.problemsets.pdf_latex import problem_list_pdf_compile_request
+from inspinia.problemsets.selectors import problem_list_item_rows
+from inspinia.solutions.models import ProblemSolution
+from inspinia.solutions.models import ProblemSolutionBlock
+from inspinia.solutions.pdf_cache import cached_pdf_path
+from inspinia.solutions.pdf_compile_queue import SolutionPdfQueueFullError
+from inspinia.solutions.pdf_compile_queue import get_pdf_compile_pool
+from inspinia.solutions.pdf_latex import SolutionPdfCompileParams
+from inspinia.solutions.pdf_latex import SolutionPdfMissingBodyImagesError
+from inspinia.solutions.pdf_latex import solution_pdf_compile_request
+
+if TYPE_CHECKING:
+    from inspinia.pages.models import ProblemSolveRecord
+    from inspinia.solutions.pdf_latex import PdfCompileRequest
+
+logger = logging.getLogger(__name__)
+
+PDF_PRERENDER_SOLUTION = "solution"
+PDF_PRERENDER_PROBLEM_LIST = "problem_list"
+
+_timers: dict[tuple[str, int], threading.Timer] = {}
+_timers_lock = threading.Lock()
+
+
+def solution_pdf_download_request(solution: ProblemSolution) -> PdfCompileRequest:
+    """Compile request for the solution PDF download; ``blocks`` should be prefetched."""
+    problem = solution.problem
+    statement_row = (
+        ContestProblemStatement.objects.filter(linked_problem_id=problem.pk).only("statement_latex").first()
+    )
+    return solution_pdf_compile_request(
+        solution,
+        list(solution.blocks.all()),
+        SolutionPdfCompileParams(
+            media_root=Path(settings.MEDIA_ROOT),
+            problem_label=solution_pdf_problem_label(problem),
+            timeout=settings.SOLUTION_PDF_LATEX_TIMEOUT,
+            latex_binary=settings.SOLUTION_PDF_LATEX_BINARY,
+            problem_statement_latex=(statement_row.statement_latex if statement_row else "") or "",
+        ),
+    )
+
+
+def solution_pdf_problem_label(problem: ProblemSolveRecord) -> str:
+    return problem.contest_year_problem or f"{problem.contest} {problem.year} {problem.problem}"
+
+
+def problem_list_pdf_download_request(problem_list: ProblemList) -> PdfCompileRequest:
+    return problem_list_pdf_compile_request(
+        problem_list,
+        problem_list_item_rows(problem_list),
+        ProblemListPdfCompileParams(
+            timeout=settings.SOLUTION_PDF_LATEX_TIMEOUT,
+            latex_binary=settings.SOLUTION_PDF_LATEX_BINARY,
+        ),
+    )
+
+
+def published_solution_queryset():
+    return (
+        ProblemSolution.objects.filter(status=ProblemSolution.Status.PUBLISHED)
+        .select_related("author", "problem")
+        .prefetch_related(
+            Prefetch(
+                "blocks",
+                queryset=ProblemSolutionBlock.objects.select_related("block_type").order_by("position", "id"),
+            ),
+        )
+    )
+
+
+def public_problem_list_queryset():
+    return ProblemList.objects.filter(visibility=ProblemList.Visibility.PUBLIC).select_related("author")
+
+
+def pdf_prerender_request(kind: str, object_id: int) -> PdfCompileRequest | None:
+    """Compile request for a published solution or public list, or ``None`` if it is not readable."""
+    if kind == PDF_PRERENDER_SOLUTION:
+        solution = published_solution_queryset().filter(pk=object_id).first()
+        if solution is None:
+            return None
+        try:
+            return solution_pdf_download_request(solution)
+        except SolutionPdfMissingBodyImagesError:
+            return None
+    problem_list = public_problem_list_queryset().filter(pk=object_id).first()
+    return problem_list_pdf_download_request(problem_list) if problem_list is not None else None
+
+
+def queue_pdf_prerender(kind: str, object_id: int | None) -> None:
+    """Pre-render the PDF of ``kind``/``object_id`` once the current transaction commits."""
+    if object_id is None or not settings.SOLUTION_PDF_PRERENDER:
+        return
+    transaction.on_commit(lambda: _schedule(kind, object_id))
+
+
+def prerender_pdf(kind: str, object_id: int) -> bool:
+    """Submit a background compile unless the PDF is cached or unreadable; return whether one was queued."""
+    compile_request = pdf_prerender_request(kind, object_id)
+    if compile_request is None or cached_pdf_path(compile_request.cache_key) is not None:
+        return False
+    try:
+        get_pdf_compile_pool().submit(compile_request, user_id=None, background=True)
+    except SolutionPdfQueueFullError:
+        logger.info("solution_pdf_prerender_skipped kind=%s id=%s reason=queue_full", kind, object_id)
+        return False
+    return True
+
+
+def _schedule(kind: str, object_id: int) -> None:
+    key = (kind, object_id)
+    timer = threading.Timer(settings.SOLUTION_PDF_PRERENDER_DELAY, _run_scheduled, args=key)
+    timer.daemon = True
+    with _timers_lock:
+        previous = _timers.get(key)
+        if previous is not None:
+            previous.cancel()
+        _timers[key] = timer
+    timer.start()
+
+
+def _run_scheduled(kind: str, object_id: int) -> None:
+    with _timers_lock:
+        if _timers.get((kind, object_id)) is threading.current_thread():
+            del _timers[(kind, object_id)]
+    try:
+        prerender_pdf(kind, object_id)
+    except Exception:
+        logger.exception("solution_pdf_prerender_failed kind=%s id=%s", kind, object_id)
+    finally:
+        # Timer threads open their own connection; do not leave it dangling.
+        connection.close()
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from inspinia.solutions.models import ProblemSolution
+from inspinia.solutions.models import ProblemSolutionBlock
+from inspinia.solutions.pdf_prerender import PDF_PRERENDER_SOLUTION
+from inspinia.solutions.pdf_prerender import queue_pdf_prerender
+
+
+@receiver(post_save, sender=ProblemSolution)
+def prerender_published_solution_pdf(sender, instance: ProblemSolution, **kwargs) -> None:
+    if instance.status == ProblemSolution.Status.PUBLISHED:
+        queue_pdf_prerender(PDF_PRERENDER_SOLUTION, instance.pk)
+
+
+@receiver(post_save, sender=ProblemSolutionBlock)
+@receiver(post_delete, sender=ProblemSolutionBlock)
+def prerender_solution_pdf_after_block_change(sender, instance: ProblemSolutionBlock, **kwargs) -> None:
+    # Drafts are skipped when the debounced pre-render runs.
+    queue_pdf_prerender(PDF_PRERENDER_SOLUTION, instance.solution_id)
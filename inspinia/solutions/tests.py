@@ -1,18 +1,25 @@
+import os
+import subprocess
+import threading
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from http import HTTPStatus
 from io import BytesIO
+from io import StringIO
 from pathlib import Path
 
 import pytest
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.db import IntegrityError
 from django.urls import reverse
 from django.utils import timezone
 from PIL import Image
+from pypdf import PdfReader
+from pypdf import PdfWriter
 
 from inspinia.pages.models import ContestProblemStatement
 from inspinia.pages.models import ProblemSolveRecord
@@ -22,11 +29,23 @@ from inspinia.pages.models import UserProblemCompletion
 from inspinia.pages.models import UserProblemDifficultyRating
 from inspinia.problemsets.models import ProblemList
 from inspinia.solutions.body_image_paths import is_allowed_includegraphics_path
+from inspinia.solutions.body_images import SOLUTION_BODY_IMAGE_PDF_MAX_WIDTH
+from inspinia.solutions.body_images import SOLUTION_BODY_IMAGE_WEB_MAX_WIDTH
+from inspinia.solutions.body_images import store_solution_body_image
 from inspinia.solutions.models import ProblemSolution
 from inspinia.solutions.models import ProblemSolutionBlock
 from inspinia.solutions.models import SolutionBlockType
 from inspinia.solutions.models import SolutionBodyImage
 from inspinia.solutions.models import SolutionSourceArtifact
+from inspinia.solutions.pdf_cache import cached_pdf_path
+from inspinia.solutions.pdf_cache import pdf_cache_root
+from inspinia.solutions.pdf_cache import store_cached_pdf
+from inspinia.solutions.pdf_compile_queue import PdfCompileJob
+from inspinia.solutions.pdf_compile_queue import PdfCompilePool
+from inspinia.solutions.pdf_compile_queue import SolutionPdfQueueFullError
+from inspinia.solutions.pdf_compile_queue import _FairQueue
+from inspinia.solutions.pdf_compile_queue import get_pdf_compile_pool
+from inspinia.solutions.pdf_latex import PdfCompileRequest
 from inspinia.solutions.pdf_latex import SolutionPdfCompileError
 from inspinia.solutions.pdf_latex import SolutionPdfCompileParams
 from inspinia.solutions.pdf_latex import SolutionPdfMissingBodyImagesError
@@ -36,7 +55,15 @@ from inspinia.solutions.pdf_latex import _graphicspath_tex
 from inspinia.solutions.pdf_latex import _latex_log_user_excerpt
 from inspinia.solutions.pdf_latex import _merge_latex_fail_detail
 from inspinia.solutions.pdf_latex import build_solution_tex_source
+from inspinia.solutions.pdf_latex import compile_solution_tex_to_pdf
 from inspinia.solutions.pdf_latex import compile_solution_to_pdf
+from inspinia.solutions.pdf_latex import shared_latex_preamble_lines
+from inspinia.solutions.pdf_latex import solution_pdf_compile_request
+from inspinia.solutions.pdf_latex_format import latex_format_key
+from inspinia.solutions.pdf_latex_format import preamble_of
+from inspinia.solutions.pdf_prerender import PDF_PRERENDER_SOLUTION
+from inspinia.solutions.pdf_prerender import prerender_pdf
+from inspinia.solutions.pdf_prerender import solution_pdf_download_request
 from inspinia.solutions.views import STATEMENT_BACKED_PROBLEM_LIST_LIMIT
 from inspinia.users.models import User
 from inspinia.users.tests.factories import UserFactory
@@ -62,7 +89,13 @@ EXPECTED_STATEMENT_BACKED_PROBLEM_TOTAL = 2
 EXPECTED_DIFFICULTY_RATING_COUNT = 2
 EXPECTED_USER_DIFFICULTY_RATING = 37
 OTHER_USER_DIFFICULTY_RATING = 17
+EXPECTED_QUEUED_FOR_BULK_USER = 3
+EXPECTED_PRERENDERED_PDF_TOTAL = 2
+EXPECTED_BUNDLE_PAGE_TOTAL = 2
+EXPECTED_BUNDLE_PIECE_TOTAL = 3
 EXPECTED_AVERAGE_DIFFICULTY_DISPLAY = "27.0"
+EXPECTED_LARGE_BODY_IMAGE_WIDTH = 3000
+EXPECTED_SHARED_BODY_IMAGE_ROWS = 2
 
 
 def _problem(*, year: int = 2026, contest: str = "IMO", problem: str = "P1") -> ProblemSolveRecord:
@@ -873,6 +906,82 @@ def test_solution_body_image_upload_rejects_oversized(client):
     assert response.status_code == HTTPStatus.BAD_REQUEST
 
 
+def test_solution_body_image_upload_deduplicates_identical_pastes(client):
+    user = UserFactory()
+    other_user = UserFactory()
+    problem = _problem()
+    url = reverse("solutions:solution_body_image_upload", args=[problem.problem_uuid])
+
+    client.force_login(user)
+    first = client.post(url, {"image": _png_upload()}).json()
+    again = client.post(url, {"image": _png_upload()}).json()
+    client.force_login(other_user)
+    shared = client.post(url, {"image": _png_upload()}).json()
+
+    assert first["path"] == again["path"] == shared["path"]
+    rows = SolutionBodyImage.objects.filter(file=first["path"])
+    assert rows.count() == EXPECTED_SHARED_BODY_IMAGE_ROWS
+    assert len({row.content_hash for row in rows}) == 1
+    stored = [path for path in (Path(settings.MEDIA_ROOT) / "solution_body_images").iterdir() if path.is_file()]
+    assert len(stored) == 1
+
+
+def test_solution_body_image_upload_stores_downscaled_variants(client):
+    user = UserFactory()
+    client.force_login(user)
+    problem = _problem()
+    buf = BytesIO()
+    Image.new("RGB", (EXPECTED_LARGE_BODY_IMAGE_WIDTH, 40), color=(200, 30, 30)).save(buf, format="PNG")
+    upload = SimpleUploadedFile("wide.png", buf.getvalue(), content_type="image/png")
+
+    url = reverse("solutions:solution_body_image_upload", args=[problem.problem_uuid])
+    payload = client.post(url, {"image": upload}).json()
+
+    row = SolutionBodyImage.objects.get(file=payload["path"])
+    assert row.width == EXPECTED_LARGE_BODY_IMAGE_WIDTH
+    assert payload["web_path"] == row.web_variant
+    media_root = Path(settings.MEDIA_ROOT)
+    with Image.open(media_root / row.web_variant) as web_image:
+        assert web_image.width == SOLUTION_BODY_IMAGE_WEB_MAX_WIDTH
+    with Image.open(media_root / row.pdf_variant) as pdf_image:
+        assert pdf_image.width == SOLUTION_BODY_IMAGE_PDF_MAX_WIDTH
+
+    response = client.get(reverse("solutions:problem_solution_edit", args=[problem.problem_uuid]))
+    assert row.web_variant in response.content.decode()
+
+
+def test_solution_pdf_compile_request_includes_pdf_variant_from_manifest():
+    user = UserFactory()
+    problem = _problem()
+    solution = _solution_with_blocks(problem=problem, author=user, blocks=[])
+    buf = BytesIO()
+    Image.new("RGB", (4, 4), color=(10, 20, 30)).save(buf, format="GIF")
+    row = store_solution_body_image(solution=solution, uploaded_by=user, data=buf.getvalue())
+    ProblemSolutionBlock.objects.create(
+        solution=solution,
+        block_type=SolutionBlockType.objects.get(slug="proof"),
+        body_source=rf"\includegraphics[width=3cm]{{{row.file.name}}}",
+        position=1,
+    )
+    media_root = Path(settings.MEDIA_ROOT)
+
+    compile_request = solution_pdf_compile_request(
+        solution,
+        list(solution.blocks.all()),
+        SolutionPdfCompileParams(
+            media_root=media_root,
+            problem_label="IMO 2026 P1",
+            timeout=5,
+            latex_binary="latexmk",
+        ),
+    )
+
+    # pdflatex cannot read GIF data, so the PNG variant is included instead.
+    assert row.pdf_variant.endswith(".png")
+    assert rf"\includegraphics[width=3cm]{{{row.pdf_variant}}}" in compile_request.tex_source
+    assert compile_request.input_paths == (media_root / row.pdf_variant,)
+
+
 def test_build_solution_tex_wrapper_uses_11pt_sexy_and_problem_title():
     user = UserFactory(name="Test User")
     problem = _problem()
@@ -1113,10 +1222,201 @@ def test_compile_solution_to_pdf_ignores_commented_out_body_image_references(
 
     monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _stub)
 
-    assert compile_solution_to_pdf(solution, blocks, params) == b"ok"
+    assert compile_solution_to_pdf(solution, blocks, params).read_bytes() == b"ok"
     assert called["count"] == 1
 
 
+def test_compile_solution_to_pdf_serves_unchanged_content_from_pdf_cache(monkeypatch, tmp_path):
+    user = UserFactory()
+    solution = _solution_with_blocks(
+        problem=_problem(),
+        author=user,
+        blocks=[
+            (
+                "Figure",
+                r"\includegraphics{solution_body_images/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.png}",
+                "proof",
+            ),
+        ],
+    )
+    blocks = list(solution.blocks.order_by("position"))
+    image_path = tmp_path / "solution_body_images" / "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.png"
+    image_path.parent.mkdir()
+    image_path.write_bytes(b"first image")
+    params = SolutionPdfCompileParams(
+        media_root=tmp_path,
+        problem_label="IMO 2026 P1",
+        timeout=5,
+        latex_binary="latexmk",
+    )
+    compiles = []
+
+    def _stub(tex_source, **_kwargs):
+        compiles.append(tex_source)
+        return f"%PDF-{len(compiles)}".encode()
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _stub)
+
+    first = compile_solution_to_pdf(solution, blocks, params)
+    repeat = compile_solution_to_pdf(solution, blocks, params)
+    assert repeat == first
+    assert first.is_relative_to(pdf_cache_root())
+    assert len(compiles) == 1
+
+    image_path.write_bytes(b"replaced image with new content")
+    changed = compile_solution_to_pdf(solution, blocks, params)
+    assert changed != first
+    assert changed.read_bytes() == b"%PDF-2"
+
+
+def test_pdf_cache_evicts_least_recently_used_entries_past_size_limit(settings):
+    settings.SOLUTION_PDF_CACHE_MAX_BYTES = 10
+    oldest = store_cached_pdf("a" * 64, b"12345")
+    newest = store_cached_pdf("b" * 64, b"12345")
+    os.utime(oldest, (0, 0))
+    os.utime(newest, (1, 1))
+
+    assert cached_pdf_path("a" * 64) == oldest
+    store_cached_pdf("c" * 64, b"12345")
+
+    assert cached_pdf_path("a" * 64) == oldest
+    assert cached_pdf_path("b" * 64) is None
+
+
+def test_published_solution_edits_debounce_into_one_background_prerender(
+    settings,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    solution = _solution_with_blocks(problem=_problem(), author=UserFactory(), blocks=[("A", "Body.", "proof")])
+    settings.SOLUTION_PDF_PRERENDER = True
+    settings.SOLUTION_PDF_PRERENDER_DELAY = 0.5
+    prerendered = []
+    finished = threading.Event()
+
+    def _record(kind, object_id):
+        prerendered.append((kind, object_id))
+        finished.set()
+
+    monkeypatch.setattr("inspinia.solutions.pdf_prerender.prerender_pdf", _record)
+    with django_capture_on_commit_callbacks(execute=True):
+        solution.status = ProblemSolution.Status.PUBLISHED
+        solution.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        block = solution.blocks.get()
+        block.body_source = "Edited body."
+        block.save()
+
+    assert finished.wait(timeout=5)
+    assert prerendered == [(PDF_PRERENDER_SOLUTION, solution.pk)]
+
+
+def test_prerender_pdf_queues_published_solutions_that_are_not_cached(monkeypatch):
+    published = _solution_with_blocks(
+        problem=_problem(),
+        author=UserFactory(),
+        status=ProblemSolution.Status.PUBLISHED,
+        blocks=[("A", "Body.", "proof")],
+    )
+    draft = _solution_with_blocks(problem=_problem(problem="P2"), author=UserFactory(), blocks=[])
+    pool = PdfCompilePool(workers=1, max_queue_depth=4, max_jobs_per_user=2)
+    monkeypatch.setattr(pool, "_start_workers", lambda: None)
+    monkeypatch.setattr("inspinia.solutions.pdf_prerender.get_pdf_compile_pool", lambda: pool)
+
+    assert prerender_pdf(PDF_PRERENDER_SOLUTION, draft.pk) is False
+    assert prerender_pdf(PDF_PRERENDER_SOLUTION, published.pk) is True
+    assert pool.metrics()["queued_background"] == 1
+
+    store_cached_pdf(solution_pdf_download_request(published).cache_key, b"%PDF-cached")
+    assert prerender_pdf(PDF_PRERENDER_SOLUTION, published.pk) is False
+
+
+def test_prerender_pdfs_command_compiles_missing_published_pdfs(monkeypatch):
+    author = UserFactory()
+    _solution_with_blocks(
+        problem=_problem(),
+        author=author,
+        status=ProblemSolution.Status.PUBLISHED,
+        blocks=[("A", "Body.", "proof")],
+    )
+    _solution_with_blocks(problem=_problem(problem="P2"), author=author, blocks=[])
+    ProblemList.objects.create(author=author, title="Shortlist", visibility=ProblemList.Visibility.PUBLIC)
+    compiles = []
+
+    def _stub(tex_source, **_kwargs):
+        compiles.append(tex_source)
+        return b"%PDF-prerendered"
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _stub)
+    stdout = StringIO()
+    call_command("prerender_pdfs", "--workers", "2", stdout=stdout)
+
+    assert len(compiles) == EXPECTED_PRERENDERED_PDF_TOTAL
+    assert "Compiled 2 PDF(s), 0 failed." in stdout.getvalue()
+
+    stdout = StringIO()
+    call_command("prerender_pdfs", stdout=stdout)
+    assert "0 PDF(s) to compile, 2 already cached" in stdout.getvalue()
+
+
+def test_build_solution_tex_puts_per_document_settings_after_the_format_dump_marker():
+    solution = _solution_with_blocks(problem=_problem(), author=UserFactory(), title="My Title", blocks=[])
+    tex = build_solution_tex_source(
+        solution=solution,
+        blocks=[],
+        media_root=Path(settings.MEDIA_ROOT),
+        problem_label="USAMO 2026 P4",
+    )
+
+    preamble = preamble_of(tex)
+    assert preamble == "\n".join(shared_latex_preamble_lines())
+    body = tex.removeprefix(preamble)
+    assert r"\graphicspath{" in body
+    assert r"\subtitle{My Title}" in body
+
+
+def test_latex_format_key_tracks_preamble_and_evan_sty(tmp_path):
+    evan_sty = tmp_path / "evan.sty"
+    evan_sty.write_text("% first", encoding="utf-8")
+    engine = tmp_path / "pdflatex"
+    engine.write_text("engine", encoding="utf-8")
+    key = latex_format_key("preamble", support_files=[evan_sty], engine_path=engine)
+
+    assert latex_format_key("preamble", support_files=[evan_sty], engine_path=engine) == key
+    assert latex_format_key("other preamble", support_files=[evan_sty], engine_path=engine) != key
+    evan_sty.write_text("% edited style", encoding="utf-8")
+    assert latex_format_key("preamble", support_files=[evan_sty], engine_path=engine) != key
+
+
+def test_compile_tex_reuses_warm_work_dir_and_loads_format_when_available(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "inspinia.solutions.pdf_latex.shutil.which",
+        lambda name: "/usr/bin/latexmk" if name == "latexmk" else None,
+    )
+    runs = []
+
+    def _fake_run(cmd, *, cwd, **_kwargs):
+        runs.append((cmd, cwd, sorted(path.name for path in cwd.iterdir())))
+        (cwd / "main.pdf").write_bytes(b"%PDF-fake")
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.subprocess.run", _fake_run)
+    tex_source = "\n".join([*shared_latex_preamble_lines(), r"\begin{document}x\end{document}"])
+
+    assert compile_solution_tex_to_pdf(tex_source, timeout=5, latex_binary="latexmk") == b"%PDF-fake"
+    format_path = tmp_path / "evan-preamble.fmt"
+    format_path.write_bytes(b"format")
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.ensure_latex_format", lambda *_args, **_kwargs: format_path)
+    compile_solution_tex_to_pdf(tex_source, timeout=5, latex_binary="latexmk")
+
+    (plain_cmd, first_dir, first_files), (format_cmd, second_dir, second_files) = runs
+    assert second_dir == first_dir
+    assert first_files == ["evan.sty", "main.tex"]
+    assert second_files == ["evan-preamble.fmt", "evan.sty", "main.tex"]
+    assert not any(arg.startswith("-pdflatex=") for arg in plain_cmd)
+    assert "-pdflatex=pdflatex -fmt=evan-preamble %O %S" in format_cmd
+
+
 def test_build_solution_tex_splits_claim_title_from_claim_body():
     user = UserFactory(name="Author Display")
     problem = _problem()
@@ -1419,7 +1719,7 @@ def test_problem_solution_pdf_returns_attachment_when_compile_succeeds(monkeypat
     )
 
     monkeypatch.setattr(
-        "inspinia.solutions.views.compile_solution_to_pdf",
+        "inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf",
         lambda *args, **kwargs: b"%PDF-1.4\n",
     )
     url = reverse("solutions:problem_solution_pdf", args=[problem.problem_uuid])
@@ -1440,7 +1740,7 @@ def test_problem_solution_pdf_compile_error_renders_log_tail(monkeypatch, client
         tail = "! LaTeX Error: intentional"
         raise SolutionPdfCompileError(msg, log_tail=tail)
 
-    monkeypatch.setattr("inspinia.solutions.views.compile_solution_to_pdf", _boom)
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _boom)
     url = reverse("solutions:problem_solution_pdf", args=[problem.problem_uuid])
     response = client.get(url)
     assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
@@ -1457,7 +1757,7 @@ def test_problem_solution_pdf_tool_missing_returns_503(monkeypatch, client):
         msg = "latexmk not found"
         raise SolutionPdfToolError(msg)
 
-    monkeypatch.setattr("inspinia.solutions.views.compile_solution_to_pdf", _boom)
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _boom)
     url = reverse("solutions:problem_solution_pdf", args=[problem.problem_uuid])
     response = client.get(url)
     assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
@@ -1467,14 +1767,16 @@ def test_problem_solution_pdf_missing_body_images_renders_unavailable_detail(mon
     user = UserFactory()
     client.force_login(user)
     problem = _problem()
-    _solution_with_blocks(problem=problem, author=user, blocks=[("X", "y", "idea")])
+    _solution_with_blocks(
+        problem=problem,
+        author=user,
+        blocks=[("X", r"\includegraphics{solution_body_images/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.png}", "idea")],
+    )
 
     def _boom(*args, **kwargs):
-        raise SolutionPdfMissingBodyImagesError(
-            ["solution_body_images/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.png"],
-        )
+        pytest.fail("compile_solution_tex_to_pdf should not be called")
 
-    monkeypatch.setattr("inspinia.solutions.views.compile_solution_to_pdf", _boom)
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _boom)
     url = reverse("solutions:problem_solution_pdf", args=[problem.problem_uuid])
     response = client.get(url)
     assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
@@ -1482,6 +1784,226 @@ def test_problem_solution_pdf_missing_body_images_renders_unavailable_detail(mon
     assert b"solution_body_images/aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.png" in response.content
 
 
+def test_pdf_compile_fair_queue_alternates_between_users():
+    queue = _FairQueue()
+    for job_id, user_id in [("a1", 1), ("a2", 1), ("a3", 1), ("b1", 2), ("c1", 3)]:
+        queue.push(PdfCompileJob(job_id=job_id, user_id=user_id, cache_key=job_id))
+
+    assert queue.queued_for(1) == EXPECTED_QUEUED_FOR_BULK_USER
+    assert [queue.pop().job_id for _ in range(len(queue))] == ["a1", "b1", "c1", "a2", "a3"]
+
+
+def test_pdf_compile_pool_rejects_past_queue_and_user_limits_and_joins_duplicates(monkeypatch):
+    monkeypatch.setattr(PdfCompilePool, "_start_workers", lambda self: None)
+    pool = PdfCompilePool(workers=1, max_queue_depth=3, max_jobs_per_user=2)
+
+    def _request(tex_source: str) -> PdfCompileRequest:
+        return PdfCompileRequest(tex_source=tex_source, timeout=5, latex_binary="latexmk")
+
+    first = pool.submit(_request("first"), user_id=1)
+    assert pool.submit(_request("first"), user_id=2) is first
+    pool.submit(_request("second"), user_id=1)
+    with pytest.raises(SolutionPdfQueueFullError, match="in progress"):
+        pool.submit(_request("third"), user_id=1)
+    pool.submit(_request("third"), user_id=2)
+    with pytest.raises(SolutionPdfQueueFullError, match="busy"):
+        pool.submit(_request("fourth"), user_id=3)
+
+    metrics = pool.metrics()
+    assert (metrics["queued"], metrics["joined"], metrics["rejected"]) == (3, 1, 2)
+
+
+def test_pdf_compile_pool_serves_background_jobs_only_when_no_reader_job_waits(monkeypatch):
+    monkeypatch.setattr(PdfCompilePool, "_start_workers", lambda self: None)
+    pool = PdfCompilePool(workers=1, max_queue_depth=2, max_jobs_per_user=2)
+
+    def _request(tex_source: str) -> PdfCompileRequest:
+        return PdfCompileRequest(tex_source=tex_source, timeout=5, latex_binary="latexmk")
+
+    prerender = pool.submit(_request("prerender"), user_id=None, background=True)
+    promoted = pool.submit(_request("promoted"), user_id=None, background=True)
+    with pytest.raises(SolutionPdfQueueFullError, match="busy"):
+        pool.submit(_request("third prerender"), user_id=None, background=True)
+    reader = pool.submit(_request("reader"), user_id=1)
+    assert pool.submit(_request("promoted"), user_id=2) is promoted
+    assert pool.metrics()["queued_background"] == 1
+
+    queue = pool._queue  # noqa: SLF001
+    assert [queue.pop().job_id for _ in range(len(queue))] == [reader.job_id, promoted.job_id, prerender.job_id]
+
+
+def test_problem_solution_pdf_slow_compile_renders_pending_page_then_downloads(monkeypatch, client, settings):
+    settings.SOLUTION_PDF_COMPILE_INLINE_WAIT = 0
+    user = UserFactory()
+    client.force_login(user)
+    problem = _problem()
+    _solution_with_blocks(problem=problem, author=user, blocks=[("Block", "body", "idea")])
+    release = threading.Event()
+
+    def _slow_compile(*args, **kwargs):
+        release.wait(5)
+        return b"%PDF-1.4\n"
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _slow_compile)
+    url = reverse("solutions:problem_solution_pdf", args=[problem.problem_uuid])
+
+    pending = client.get(url)
+    assert pending.status_code == HTTPStatus.ACCEPTED
+    job = pending.context["job"]
+    status_url = reverse("solutions:pdf_compile_status", args=[job.job_id])
+    assert client.get(status_url).json()["status"] in {"queued", "running"}
+
+    release.set()
+    get_pdf_compile_pool().wait(job, timeout=5)
+    status = client.get(status_url).json()
+    assert status["status"] == "done"
+    assert status["compile_ms"] is not None
+
+    response = client.get(url, {"job": job.job_id})
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/pdf"
+
+
+def _one_page_pdf() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(width=72, height=72)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_solution_pdf_bundle_joins_my_solutions_with_bookmarks_and_reuses_pieces(monkeypatch, client):
+    user = UserFactory(name="Camp Student")
+    client.force_login(user)
+    _solution_with_blocks(problem=_problem(problem="P1"), author=user, blocks=[("A", "First.", "proof")])
+    _solution_with_blocks(
+        problem=_problem(problem="P2"),
+        author=user,
+        status=ProblemSolution.Status.PUBLISHED,
+        blocks=[("B", "Second.", "proof")],
+    )
+    _solution_with_blocks(problem=_problem(problem="P3"), author=UserFactory(), blocks=[("C", "Other.", "proof")])
+    compiles = []
+
+    def _stub(tex_source, **_kwargs):
+        compiles.append(tex_source)
+        return _one_page_pdf()
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _stub)
+    url = reverse("solutions:solution_pdf_bundle")
+    response = client.get(url)
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'filename="my-solutions.pdf"' in response["Content-Disposition"]
+    reader = PdfReader(BytesIO(b"".join(response.streaming_content)))
+    assert len(reader.pages) == EXPECTED_BUNDLE_PAGE_TOTAL
+    assert [getattr(item, "title", None) for item in reader.outline] == [
+        "IMO 2026 P1 — Camp Student",
+        "IMO 2026 P2 — Camp Student",
+    ]
+    assert len(compiles) == EXPECTED_BUNDLE_PAGE_TOTAL
+
+    assert client.get(url).status_code == HTTPStatus.OK
+    assert len(compiles) == EXPECTED_BUNDLE_PAGE_TOTAL
+
+
+def test_solution_pdf_bundle_for_contest_skips_drafts_and_failed_pieces(monkeypatch, client):
+    client.force_login(UserFactory())
+    author = UserFactory()
+    _solution_with_blocks(
+        problem=_problem(problem="P1"),
+        author=author,
+        status=ProblemSolution.Status.PUBLISHED,
+        blocks=[("A", "Fine.", "proof")],
+    )
+    _solution_with_blocks(
+        problem=_problem(problem="P2"),
+        author=author,
+        status=ProblemSolution.Status.PUBLISHED,
+        blocks=[("B", "BROKEN", "proof")],
+    )
+    _solution_with_blocks(problem=_problem(problem="P3"), author=author, blocks=[("C", "Draft.", "proof")])
+    _solution_with_blocks(
+        problem=_problem(contest="USAMO", problem="P1"),
+        author=author,
+        status=ProblemSolution.Status.PUBLISHED,
+        blocks=[("D", "Elsewhere.", "proof")],
+    )
+
+    def _stub(tex_source, **_kwargs):
+        if "BROKEN" in tex_source:
+            msg = "failed"
+            raise SolutionPdfCompileError(msg)
+        return _one_page_pdf()
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _stub)
+    response = client.get(reverse("solutions:solution_pdf_bundle"), {"contest": "IMO", "year": "2026"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert 'filename="imo-2026-solutions.pdf"' in response["Content-Disposition"]
+    assert response["X-Solution-Pdf-Bundle-Skipped"] == "1"
+    reader = PdfReader(BytesIO(b"".join(response.streaming_content)))
+    assert len(reader.pages) == 1
+
+
+def test_solution_pdf_bundle_compiles_pieces_as_parallel_pool_jobs_behind_the_pending_page(
+    monkeypatch,
+    client,
+    settings,
+):
+    settings.SOLUTION_PDF_COMPILE_INLINE_WAIT = 0
+    user = UserFactory()
+    client.force_login(user)
+    author = UserFactory()
+    for problem_label in ("P1", "P2", "P3"):
+        _solution_with_blocks(
+            problem=_problem(problem=problem_label),
+            author=author,
+            status=ProblemSolution.Status.PUBLISHED,
+            blocks=[("A", f"Body {problem_label}.", "proof")],
+        )
+    release = threading.Event()
+    compile_threads = set()
+
+    def _slow_compile(*args, **kwargs):
+        compile_threads.add(threading.current_thread().name)
+        release.wait(5)
+        return _one_page_pdf()
+
+    monkeypatch.setattr("inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf", _slow_compile)
+    pool = get_pdf_compile_pool()
+    submitted_before = pool.metrics()["submitted"]
+    url = reverse("solutions:solution_pdf_bundle")
+
+    pending = client.get(url, {"contest": "IMO", "year": "2026"})
+
+    assert pending.status_code == HTTPStatus.ACCEPTED
+    job = pending.context["job"]
+    assert job.user_id == user.pk
+    assert pending.context["download_url"] == f"{url}?contest=IMO&year=2026"
+    assert f"{url}?contest=IMO&amp;year=2026&amp;job={job.job_id}".encode() in pending.content
+    assert pool.metrics()["submitted"] == submitted_before + EXPECTED_BUNDLE_PIECE_TOTAL
+
+    release.set()
+    settings.SOLUTION_PDF_COMPILE_INLINE_WAIT = 5
+    response = client.get(url, {"contest": "IMO", "year": "2026", "job": job.job_id})
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(PdfReader(BytesIO(b"".join(response.streaming_content))).pages) == EXPECTED_BUNDLE_PIECE_TOTAL
+    assert pool.metrics()["submitted"] == submitted_before + EXPECTED_BUNDLE_PIECE_TOTAL
+    assert len(compile_threads) > 1
+    assert all(name.startswith("pdf-compile-") for name in compile_threads)
+
+
+def test_solution_pdf_bundle_without_solutions_renders_unavailable(client):
+    client.force_login(UserFactory())
+
+    response = client.get(reverse("solutions:solution_pdf_bundle"))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert b"There are no solutions to export yet." in response.content
+
+
 def test_admin_problem_solution_pdf_requires_login(client):
     sol = _solution_with_blocks(problem=_problem(), author=UserFactory(), blocks=[("X", "y", "idea")])
     url = reverse("solutions:admin_problem_solution_pdf", args=[sol.pk])
@@ -1505,7 +2027,7 @@ def test_admin_problem_solution_pdf_returns_attachment_for_admin(monkeypatch, cl
     sol = _solution_with_blocks(problem=problem, author=author, blocks=[("Block", "body", "idea")])
 
     monkeypatch.setattr(
-        "inspinia.solutions.views.compile_solution_to_pdf",
+        "inspinia.solutions.pdf_latex.compile_solution_tex_to_pdf",
         lambda *args, **kwargs: b"%PDF-1.4\n",
     )
     client.force_login(admin)
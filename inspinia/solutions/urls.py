@@ -1,18 +1,22 @@
 from django.urls import path
 
+from inspinia.solutions.views import admin_pdf_compile_metrics_view
 from inspinia.solutions.views import admin_problem_solution_pdf_view
 from inspinia.solutions.views import my_solution_list_view
+from inspinia.solutions.views import pdf_compile_status_view
 from inspinia.solutions.views import problem_solution_create_view
 from inspinia.solutions.views import problem_solution_edit_view
 from inspinia.solutions.views import problem_solution_list_view
 from inspinia.solutions.views import problem_solution_pdf_view
 from inspinia.solutions.views import solution_body_image_upload_view
+from inspinia.solutions.views import solution_pdf_bundle_view
 
 app_name = "solutions"
 
 urlpatterns = [
     path("", my_solution_list_view, name="my_solution_list"),
     path("new/", problem_solution_create_view, name="problem_solution_create"),
+    path("pdf-bundle/", solution_pdf_bundle_view, name="solution_pdf_bundle"),
     path("problems/<uuid:problem_uuid>/", problem_solution_list_view, name="problem_solution_list"),
     path(
         "problems/<uuid:problem_uuid>/body-images/",
@@ -30,4 +34,6 @@ urlpatterns = [
         admin_problem_solution_pdf_view,
         name="admin_problem_solution_pdf",
     ),
+    path("pdf-jobs/<str:job_id>/", pdf_compile_status_view, name="pdf_compile_status"),
+    path("admin/pdf-compile-metrics/", admin_pdf_compile_metrics_view, name="admin_pdf_compile_metrics"),
 ]
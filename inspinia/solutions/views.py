@@ -1,8 +1,6 @@
 import logging
-import re
 from collections import Counter
 from io import BytesIO
-from pathlib import Path
 from urllib.parse import urlencode
 
 from django.conf import settings
@@ -10,7 +8,6 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import FieldError
 from django.core.exceptions import PermissionDenied
-from django.core.files.base import ContentFile
 from django.db import DatabaseError
 from django.db import transaction
 from django.db.models import Avg
@@ -18,6 +15,7 @@ from django.db.models import Count
 from django.db.models import Max
 from django.db.models import Prefetch
 from django.http import FileResponse
+from django.http import Http404
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
@@ -29,7 +27,6 @@ from django.views.decorators.http import require_POST
 from PIL import Image
 from PIL import UnidentifiedImageError
 
-from inspinia.pages.asymptote_render import build_statement_render_segments
 from inspinia.pages.contest_links import contest_dashboard_listing_url
 from inspinia.pages.models import DIFFICULTY_RATING_MAX
 from inspinia.pages.models import DIFFICULTY_RATING_MIN
@@ -42,20 +39,32 @@ from inspinia.pages.models import UserProblemCompletion
 from inspinia.pages.models import UserProblemDifficultyRating
 from inspinia.pages.page_views import PageViewPayload
 from inspinia.pages.page_views import record_page_view
+from inspinia.pages.statement_render import statement_preview_texts
+from inspinia.pages.statement_render import statement_render_payload
 from inspinia.pages.topic_labels import display_topic_label
 from inspinia.problemsets.selectors import problem_list_add_target_rows
+from inspinia.solutions.body_images import solution_body_image_web_variants
+from inspinia.solutions.body_images import store_solution_body_image
 from inspinia.solutions.forms import ProblemSolutionBlockFormSet
 from inspinia.solutions.forms import ProblemSolutionForm
 from inspinia.solutions.models import ProblemSolution
 from inspinia.solutions.models import ProblemSolutionBlock
 from inspinia.solutions.models import SolutionBlockType
-from inspinia.solutions.models import SolutionBodyImage
+from inspinia.solutions.pdf_bundle import PDF_BUNDLE_MAX_SOLUTIONS
+from inspinia.solutions.pdf_bundle import run_solution_pdf_bundle
+from inspinia.solutions.pdf_bundle import solution_pdf_bundle_request
+from inspinia.solutions.pdf_compile_queue import PDF_COMPILE_RETRY_AFTER_SECONDS
+from inspinia.solutions.pdf_compile_queue import SolutionPdfCompilePendingError
+from inspinia.solutions.pdf_compile_queue import SolutionPdfQueueFullError
+from inspinia.solutions.pdf_compile_queue import get_pdf_compile_pool
+from inspinia.solutions.pdf_compile_queue import load_pdf_compile_job
+from inspinia.solutions.pdf_compile_queue import run_pdf_compile
 from inspinia.solutions.pdf_latex import SolutionPdfCompileError
-from inspinia.solutions.pdf_latex import SolutionPdfCompileParams
 from inspinia.solutions.pdf_latex import SolutionPdfError
 from inspinia.solutions.pdf_latex import SolutionPdfMissingBodyImagesError
 from inspinia.solutions.pdf_latex import SolutionPdfToolError
-from inspinia.solutions.pdf_latex import compile_solution_to_pdf
+from inspinia.solutions.pdf_prerender import solution_pdf_download_request
+from inspinia.solutions.pdf_prerender import solution_pdf_problem_label
 from inspinia.users.roles import user_has_admin_role
 
 logger = logging.getLogger(__name__)
@@ -153,31 +162,40 @@ def _require_admin_tools_access(request) -> None:
         raise PermissionDenied
 
 
-def _solution_pdf_http_response(request, solution: ProblemSolution):
+def _solution_pdf_http_response(request, solution: ProblemSolution):  # noqa: PLR0911
     """Return PDF file response or render an error/unavailable template (blocks should be prefetched)."""
-    problem = solution.problem
-    problem_data = _problem_context(problem)
-    problem_label = problem.contest_year_problem or f"{problem.contest} {problem.year} {problem.problem}"
-    blocks = list(solution.blocks.all())
-    statement_row = (
-        ContestProblemStatement.objects.filter(linked_problem_id=problem.pk)
-        .only("statement_latex")
-        .first()
-    )
-    problem_statement_latex = (statement_row.statement_latex if statement_row else "") or ""
+    problem_data = _problem_context(solution.problem)
 
     try:
-        pdf_bytes = compile_solution_to_pdf(
-            solution,
-            blocks,
-            SolutionPdfCompileParams(
-                media_root=Path(settings.MEDIA_ROOT),
-                problem_label=problem_label,
-                timeout=settings.SOLUTION_PDF_LATEX_TIMEOUT,
-                latex_binary=settings.SOLUTION_PDF_LATEX_BINARY,
-                problem_statement_latex=problem_statement_latex,
-            ),
+        pdf_path = run_pdf_compile(
+            solution_pdf_download_request(solution),
+            user_id=request.user.pk,
+            previous_job_id=request.GET.get("job", ""),
+        )
+    except SolutionPdfCompilePendingError as exc:
+        return render(
+            request,
+            "solutions/solution_pdf_pending.html",
+            {
+                "problem_data": problem_data,
+                "download_url": request.path,
+                "job": exc.job,
+                "status_url": reverse("solutions:pdf_compile_status", args=[exc.job.job_id]),
+            },
+            status=202,
         )
+    except SolutionPdfQueueFullError as exc:
+        response = render(
+            request,
+            "solutions/solution_pdf_unavailable.html",
+            {
+                "problem_data": problem_data,
+                "reason": str(exc),
+            },
+            status=503,
+        )
+        response["Retry-After"] = str(PDF_COMPILE_RETRY_AFTER_SECONDS)
+        return response
     except SolutionPdfToolError as exc:
         return render(
             request,
@@ -226,11 +244,11 @@ def _solution_pdf_http_response(request, solution: ProblemSolution):
             status=500,
         )
 
-    base = slugify(problem_label) or "solution"
+    base = slugify(solution_pdf_problem_label(solution.problem)) or "solution"
     slug = slugify(solution.title or "solution") or "solution"
     filename = f"{base}-{slug}.pdf"[:200]
     return FileResponse(
-        BytesIO(pdf_bytes),
+        pdf_path.open("rb"),
         as_attachment=True,
         filename=filename,
         content_type="application/pdf",
@@ -252,6 +270,8 @@ def _problem_context(problem: ProblemSolveRecord) -> dict:
     if contest_slug is not None:
         contest_url = contest_dashboard_listing_url(problem.contest)
 
+    contest_bundle_query = urlencode({"contest": problem.contest, "year": problem.year})
+
     statement_entry = (
         ContestProblemStatement.objects.filter(linked_problem=problem)
         .order_by("-updated_at", "-id")
@@ -259,6 +279,7 @@ def _problem_context(problem: ProblemSolveRecord) -> dict:
     )
     return {
         "contest_archive_url": contest_url,
+        "contest_solutions_pdf_url": f"{reverse('solutions:solution_pdf_bundle')}?{contest_bundle_query}",
         "editor_url": reverse("solutions:problem_solution_edit", args=[problem.problem_uuid]),
         "problem": problem,
         "problem_anchor": _problem_anchor(problem_label, f"{problem.year}-{problem.problem}"),
@@ -266,7 +287,9 @@ def _problem_context(problem: ProblemSolveRecord) -> dict:
         "solutions_url": reverse("solutions:problem_solution_list", args=[problem.problem_uuid]),
         "statement_entry": statement_entry,
         "statement_render_segments": (
-            build_statement_render_segments(statement_entry.statement_latex) if statement_entry else []
+            statement_render_payload(statement_entry.statement_latex)["statement_render_segments"]
+            if statement_entry
+            else []
         ),
         "topic_tag_rows": _problem_context_topic_tag_rows(problem=problem, statement_entry=statement_entry),
     }
@@ -531,6 +554,7 @@ def _solution_list_context(  # noqa: PLR0913
         "problem_list_next_url": request.get_full_path(),
         "selected_solution_id": selected_solution_id,
         "show_inline_draft_editor": show_inline_draft_editor,
+        "solution_body_image_web_variants": solution_body_image_web_variants([my_solution, *visible_solutions]),
         "solution_media_base_url": _solution_media_base_url(request),
         "visible_solution_empty_message": visible_solution_empty_message,
         "visible_solution_rows": visible_solution_rows,
@@ -584,11 +608,10 @@ def _solution_list_response(  # noqa: PLR0913
     return render(request, "solutions/problem-solution-list.html", context)
 
 
-def _statement_preview_text(statement_latex: str, *, max_length: int = 220) -> str:
-    collapsed = re.sub(r"\s+", " ", (statement_latex or "").strip())
-    if len(collapsed) <= max_length:
-        return collapsed
-    return f"{collapsed[: max_length - 1].rstrip()}…"
+def _statement_preview_text(preview_text: str, *, max_length: int = 220) -> str:
+    if len(preview_text) <= max_length:
+        return preview_text
+    return f"{preview_text[: max_length - 1].rstrip()}…"
 
 
 def _statement_backed_problem_rows(user) -> tuple[list[dict], dict[str, bool | int]]:
@@ -627,6 +650,7 @@ def _statement_backed_problem_rows(user) -> tuple[list[dict], dict[str, bool | i
         [statement.linked_problem.contest for statement in statements if statement.linked_problem is not None],
     )
 
+    preview_by_latex = statement_preview_texts(statement.statement_latex for statement in statements)
     rows: list[dict] = []
     for statement in sorted(
         statements,
@@ -675,7 +699,7 @@ def _statement_backed_problem_rows(user) -> tuple[list[dict], dict[str, bool | i
                     if statement.day_label
                     else statement.problem_code
                 ),
-                "statement_preview": _statement_preview_text(statement.statement_latex),
+                "statement_preview": _statement_preview_text(preview_by_latex[statement.statement_latex]),
                 "statement_updated_at_label": timezone.localtime(statement.updated_at).strftime("%Y-%m-%d"),
             },
         )
@@ -858,6 +882,7 @@ def problem_solution_edit_view(request, problem_uuid):
             "solutions:solution_body_image_upload",
             args=[problem.problem_uuid],
         ),
+        "solution_body_image_web_variants": solution_body_image_web_variants([solution]),
         "solution_media_base_url": _solution_media_base_url(request),
         "solution_status_badge_class": _solution_status_badge(current_status),
         "solution_status_label": ProblemSolution.Status(current_status).label,
@@ -888,6 +913,80 @@ def problem_solution_pdf_view(request, problem_uuid):
     return _solution_pdf_http_response(request, solution)
 
 
+@login_required
+def solution_pdf_bundle_view(request):  # noqa: PLR0911
+    """All of the user's solutions, or all published ones for ``?contest=`` (and ``year``), as one PDF.
+
+    Each uncached solution compiles as its own job on the shared compile pool; while
+    pieces are outstanding the view answers with the same pending page as single
+    solution downloads, and the poll that finds every piece finished joins them.
+    """
+    contest = (request.GET.get("contest") or "").strip()
+    year = (request.GET.get("year") or "").strip()
+    solution_queryset = ProblemSolution.objects.select_related("author", "problem").prefetch_related(
+        _problem_solution_prefetch(),
+    )
+    if contest:
+        solution_queryset = solution_queryset.filter(status=ProblemSolution.Status.PUBLISHED, problem__contest=contest)
+        if year.isdigit():
+            solution_queryset = solution_queryset.filter(problem__year=int(year))
+        filename = slugify(f"{contest} {year if year.isdigit() else ''} solutions") or "solutions"
+    else:
+        solution_queryset = solution_queryset.filter(author=request.user)
+        filename = "my-solutions"
+    solutions = list(
+        solution_queryset.order_by("problem__year", "problem__contest", "problem__problem", "id")[
+            : PDF_BUNDLE_MAX_SOLUTIONS + 1
+        ],
+    )
+
+    if not solutions:
+        return _solution_pdf_bundle_unavailable(request, "There are no solutions to export yet.", status=404)
+    if len(solutions) > PDF_BUNDLE_MAX_SOLUTIONS:
+        reason = f"Bundles are limited to {PDF_BUNDLE_MAX_SOLUTIONS} solutions. Export one contest at a time."
+        return _solution_pdf_bundle_unavailable(request, reason, status=400)
+
+    try:
+        bundle_request = solution_pdf_bundle_request(solutions)
+        bundle_path = run_solution_pdf_bundle(bundle_request, user_id=request.user.pk)
+    except SolutionPdfCompilePendingError as exc:
+        query = request.GET.copy()
+        query.pop("job", None)
+        return render(
+            request,
+            "solutions/solution_pdf_bundle_pending.html",
+            {
+                "download_url": f"{request.path}?{query.urlencode()}" if query else request.path,
+                "job": exc.job,
+                "status_url": reverse("solutions:pdf_compile_status", args=[exc.job.job_id]),
+            },
+            status=202,
+        )
+    except SolutionPdfQueueFullError as exc:
+        response = _solution_pdf_bundle_unavailable(request, str(exc), status=503)
+        response["Retry-After"] = str(PDF_COMPILE_RETRY_AFTER_SECONDS)
+        return response
+    except SolutionPdfToolError as exc:
+        return _solution_pdf_bundle_unavailable(request, str(exc), status=503)
+    except SolutionPdfError as exc:
+        return _solution_pdf_bundle_unavailable(request, str(exc), status=500)
+
+    response = FileResponse(
+        bundle_path.open("rb"),
+        as_attachment=True,
+        filename=f"{filename[:190]}.pdf",
+        content_type="application/pdf",
+    )
+    skipped = bundle_request.skipped_titles()
+    if skipped:
+        response["X-Solution-Pdf-Bundle-Skipped"] = str(len(skipped))
+    return response
+
+
+def _solution_pdf_bundle_unavailable(request, reason: str, *, status: int):
+    return render(request, "solutions/solution_pdf_bundle_unavailable.html", {"reason": reason}, status=status)
+
+
 @login_required
 def admin_problem_solution_pdf_view(request, solution_pk: int):
     """Admin inventory: download any user's solution as Evan-format PDF (same pipeline as author PDF)."""
@@ -899,6 +998,22 @@ def admin_problem_solution_pdf_view(request, solution_pk: int):
     return _solution_pdf_http_response(request, solution)
 
 
+@login_required
+def pdf_compile_status_view(request, job_id: str):
+    """Poll target of the PDF pending pages; job ids are random and only expose timings."""
+    job = load_pdf_compile_job(job_id)
+    if job is None:
+        raise Http404
+    return JsonResponse(job.to_json())
+
+
+@login_required
+def admin_pdf_compile_metrics_view(request):
+    """Queue depth, throughput and wait/compile time percentiles of this process's compile pool."""
+    _require_admin_tools_access(request)
+    return JsonResponse(get_pdf_compile_pool().metrics())
+
+
 @login_required
 @require_POST
 def solution_body_image_upload_view(request, problem_uuid):  # noqa: C901, PLR0911
@@ -924,8 +1039,6 @@ def solution_body_image_upload_view(request, problem_uuid):  # noqa: C901, PLR09
     except (OSError, ValueError, UnidentifiedImageError):
         return JsonResponse({"error": "Invalid image file."}, status=400)
 
-    # Django 5.1+ FileField.pre_save rejects nameless ContentFile in some paths.
-    image_file = ContentFile(data, name="paste.png")
     try:
         with transaction.atomic():
             solution, _created = ProblemSolution.objects.get_or_create(
@@ -933,11 +1046,7 @@ def solution_body_image_upload_view(request, problem_uuid):  # noqa: C901, PLR09
                 author=request.user,
                 defaults={"status": ProblemSolution.Status.DRAFT},
             )
-            row = SolutionBodyImage(
-                solution=solution,
-                uploaded_by=request.user,
-            )
-            row.file.save("paste.png", image_file, save=True)
+            row = store_solution_body_image(solution=solution, uploaded_by=request.user, data=data)
     except FieldError as exc:
         logger.exception("solution_body_image_field_error")
         payload = {"error": "Could not store the image."}
@@ -963,9 +1072,10 @@ def solution_body_image_upload_view(request, problem_uuid):  # noqa: C901, PLR09
         return JsonResponse(payload, status=500)
 
     canonical_path = row.file.name.replace("\\", "/")
-    return JsonResponse(
-        {
-            "path": canonical_path,
-            "url": _absolute_media_file_url(request, row.file.url),
-        },
-    )
+    payload = {
+        "path": canonical_path,
+        "url": _absolute_media_file_url(request, row.file.url),
+    }
+    if row.web_variant:
+        payload["web_path"] = row.web_variant
+    return JsonResponse(payload)
@@ -51,6 +51,13 @@
     }
   }
 
+  function webVariantPath(path) {
+    var p = normalizePath(path);
+    var cfg = typeof window !== "undefined" ? window.ASTERPROOF_SOLUTION_MEDIA : null;
+    var variants = cfg && cfg.webVariants ? cfg.webVariants : null;
+    return (variants && variants[p]) || p;
+  }
+
   function parseIncludeGraphics(text) {
     var src = text == null ? "" : String(text);
     var parts = [];
@@ -95,7 +102,7 @@
         img.className = "solution-body-image img-fluid d-block my-2";
         img.alt = "";
         img.loading = "eager";
-        img.src = joinMediaUrl(baseUrl, p.path);
+        img.src = joinMediaUrl(baseUrl, webVariantPath(p.path));
         frag.appendChild(img);
         return;
       }
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db.models import Q
+
+from inspinia.training.models import MATERIAL_MARKDOWN_FIELDS
+from inspinia.training.models import PROBLEM_MARKDOWN_FIELDS
+from inspinia.training.models import SUBMISSION_COMMENT_MARKDOWN_FIELDS
+from inspinia.training.models import SUBMISSION_MARKDOWN_FIELDS
+from inspinia.training.models import Material
+from inspinia.training.models import Problem
+from inspinia.training.models import Submission
+from inspinia.training.models import SubmissionComment
+from inspinia.training.rendering import render_training_markdown
+
+DEFAULT_BATCH_SIZE = 200
+MARKDOWN_MODELS = (
+    (Material, MATERIAL_MARKDOWN_FIELDS),
+    (Problem, PROBLEM_MARKDOWN_FIELDS),
+    (Submission, SUBMISSION_MARKDOWN_FIELDS),
+    (SubmissionComment, SUBMISSION_COMMENT_MARKDOWN_FIELDS),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the stored HTML of training materials, problems, submissions and comments "
+        "whose Markdown has not been rendered yet."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows rendered per bulk update (default {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-render every row, e.g. after changing the Markdown renderer or sanitizer.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            msg = "--batch-size must be a positive integer."
+            raise CommandError(msg)
+
+        for model, fields in MARKDOWN_MODELS:
+            rendered_total = self._backfill(model, fields, batch_size=batch_size, force=options["force"])
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {rendered_total} rendered.")  # noqa: SLF001
+        self.stdout.write(self.style.SUCCESS("Training Markdown backfill complete."))
+
+    def _backfill(self, model, fields: dict[str, str], *, batch_size: int, force: bool) -> int:
+        queryset = model.objects.order_by("pk")
+        if not force:
+            queryset = queryset.filter(
+                reduce(
+                    or_,
+                    (Q(**{html_field: ""}) & ~Q(**{source_field: ""}) for source_field, html_field in fields.items()),
+                ),
+            )
+        queryset = queryset.only("pk", *fields, *fields.values())
+
+        rendered_total = 0
+        batch = []
+        # bulk_update leaves updated_at alone: rendering is not an edit.
+        for row in queryset.iterator(chunk_size=batch_size):
+            for source_field, html_field in fields.items():
+                setattr(row, html_field, render_training_markdown(getattr(row, source_field)))
+            batch.append(row)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, list(fields.values()))
+                rendered_total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, list(fields.values()))
+            rendered_total += len(batch)
+        return rendered_total
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.9 on 2026-10-19 16:11
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("training", "0005_subtopic_imo_syllabus_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="material",
+            name="content_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="problem",
+            name="official_solution_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="problem",
+            name="statement_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="solution_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="submissioncomment",
+            name="body_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
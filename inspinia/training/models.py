@@ -7,12 +7,41 @@ from django.db import models
 from django.db.models import Q
 from django.utils.text import slugify
 
+from inspinia.training.rendering import render_training_markdown
+
 
 def _submission_attachment_upload_to(instance, filename: str) -> str:
     extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else "upload"
     return f"training-submissions/{instance.submission_id}/{instance.id or 'new'}.{extension}"
 
 
+# Markdown source field -> sanitized HTML field rendered from it on save.
+MATERIAL_MARKDOWN_FIELDS = {"content_markdown": "content_html"}
+PROBLEM_MARKDOWN_FIELDS = {
+    "statement_markdown": "statement_html",
+    "official_solution_markdown": "official_solution_html",
+}
+SUBMISSION_MARKDOWN_FIELDS = {"solution_markdown": "solution_html"}
+SUBMISSION_COMMENT_MARKDOWN_FIELDS = {"body_markdown": "body_html"}
+
+
+def _render_markdown_fields(instance, fields: dict[str, str], update_fields) -> list[str] | None:
+    """Re-render the stored HTML of each Markdown source field being saved.
+
+    ``fields`` maps source field to HTML field. Returns ``update_fields`` widened
+    with the re-rendered HTML fields, so partial saves keep them in step.
+    """
+    rendered = []
+    for source_field, html_field in fields.items():
+        if update_fields is not None and source_field not in update_fields:
+            continue
+        setattr(instance, html_field, render_training_markdown(getattr(instance, source_field)))
+        rendered.append(html_field)
+    if update_fields is None:
+        return None
+    return [*update_fields, *rendered]
+
+
 class Topic(models.Model):
     title = models.CharField(max_length=120)
     slug = models.SlugField(unique=True)
@@ -77,6 +106,7 @@ class Material(models.Model):
     title = models.CharField(max_length=180)
     slug = models.SlugField(unique=True)
     content_markdown = models.TextField()
+    content_html = models.TextField(blank=True, default="", editable=False)
     estimated_minutes = models.PositiveIntegerField(default=10)
     completion_points = models.PositiveIntegerField(default=10)
     order = models.PositiveIntegerField(default=0)
@@ -105,6 +135,11 @@ class Material(models.Model):
             self.slug = slugify(self.title)
         self.title = (self.title or "").strip()
         self.content_markdown = (self.content_markdown or "").strip()
+        kwargs["update_fields"] = _render_markdown_fields(
+            self,
+            MATERIAL_MARKDOWN_FIELDS,
+            kwargs.get("update_fields"),
+        )
         super().save(*args, **kwargs)
 
 
@@ -119,6 +154,7 @@ class Problem(models.Model):
     title = models.CharField(max_length=180)
     slug = models.SlugField(unique=True)
     statement_markdown = models.TextField()
+    statement_html = models.TextField(blank=True, default="", editable=False)
     difficulty = models.CharField(max_length=24, choices=Difficulty.choices, default=Difficulty.INTRODUCTORY)
     mohs_rating = models.PositiveSmallIntegerField(null=True, blank=True)
     source = models.CharField(max_length=180, blank=True)
@@ -126,6 +162,7 @@ class Problem(models.Model):
     expected_method = models.CharField(max_length=180, blank=True)
     max_points = models.PositiveIntegerField(default=40)
     official_solution_markdown = models.TextField(blank=True)
+    official_solution_html = models.TextField(blank=True, default="", editable=False)
     order = models.PositiveIntegerField(default=0)
     is_published = models.BooleanField(default=True, db_index=True)
     created_by = models.ForeignKey(
@@ -166,6 +203,11 @@ class Problem(models.Model):
         self.expected_method = (self.expected_method or "").strip()
         self.official_solution_markdown = (self.official_solution_markdown or "").strip()
         self.tags = [str(tag).strip().upper() for tag in self.tags or [] if str(tag).strip()]
+        kwargs["update_fields"] = _render_markdown_fields(
+            self,
+            PROBLEM_MARKDOWN_FIELDS,
+            kwargs.get("update_fields"),
+        )
         super().save(*args, **kwargs)
 
 
@@ -203,6 +245,7 @@ class Submission(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="training_submissions")
     problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name="submissions")
     solution_markdown = models.TextField()
+    solution_html = models.TextField(blank=True, default="", editable=False)
     status = models.CharField(max_length=24, choices=Status.choices, default=Status.SUBMITTED, db_index=True)
     awarded_points = models.PositiveIntegerField(default=0)
     reviewed_by = models.ForeignKey(
@@ -226,6 +269,14 @@ class Submission(models.Model):
     def __str__(self) -> str:
         return f"{self.user_id} - {self.problem.title}"
 
+    def save(self, *args, **kwargs) -> None:
+        kwargs["update_fields"] = _render_markdown_fields(
+            self,
+            SUBMISSION_MARKDOWN_FIELDS,
+            kwargs.get("update_fields"),
+        )
+        super().save(*args, **kwargs)
+
     @property
     def is_accepted_for_progress(self) -> bool:
         return self.status in {self.Status.ACCEPTED, self.Status.PARTIALLY_ACCEPTED}
@@ -259,6 +310,7 @@ class SubmissionComment(models.Model):
     submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name="comments")
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="training_comments")
     body_markdown = models.TextField()
+    body_html = models.TextField(blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -268,6 +320,14 @@ class SubmissionComment(models.Model):
     def __str__(self) -> str:
         return f"Comment {self.id} on submission {self.submission_id}"
 
+    def save(self, *args, **kwargs) -> None:
+        kwargs["update_fields"] = _render_markdown_fields(
+            self,
+            SUBMISSION_COMMENT_MARKDOWN_FIELDS,
+            kwargs.get("update_fields"),
+        )
+        super().save(*args, **kwargs)
+
 
 class PointLedger(models.Model):
     class SourceType(models.TextChoices):
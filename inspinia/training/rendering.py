@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
 from inspinia.training.markdown import render_markdown
 
 
 def render_training_markdown(source: str) -> str:
     return str(render_markdown(source))
+
+
+def stored_training_markdown(html: str, source: str) -> SafeString:
+    """HTML rendered on save, or a fresh render for rows the backfill has not reached yet."""
+    if html or not source:
+        return mark_safe(html)  # noqa: S308
+    return render_markdown(source)
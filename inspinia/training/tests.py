@@ -1,6 +1,8 @@
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 
 from inspinia.training.markdown import render_markdown
@@ -255,6 +257,47 @@ def test_markdown_renderer_sanitizes_html_and_preserves_math():
     assert '<a href="https://example.com"' in html
 
 
+def test_training_markdown_is_rendered_on_save_and_served_from_the_stored_html(client):
+    student = UserFactory()
+    _topic, _subtopic, material, problem = _topic_tree()
+    submission = Submission.objects.create(user=student, problem=problem, solution_markdown="**Attempt** $x$.")
+
+    assert material.content_html == str(render_markdown("Use $a^2-b^2=(a-b)(a+b)$."))
+    assert "<strong>Attempt</strong>" in submission.solution_html
+
+    submission.solution_markdown = "Edited without a render."
+    submission.status = Submission.Status.UNDER_REVIEW
+    submission.save(update_fields=["status", "updated_at"])
+    submission.refresh_from_db()
+    assert "<strong>Attempt</strong>" in submission.solution_html
+
+    Material.objects.filter(pk=material.pk).update(content_html="<p>Stored render.</p>")
+    client.force_login(student)
+    response = client.get(reverse("training:material_detail", args=[material.slug]))
+
+    assert "<p>Stored render.</p>" in response.content.decode()
+
+
+def test_backfill_training_markdown_renders_rows_missing_stored_html():
+    _topic, _subtopic, material, problem = _topic_tree()
+    Material.objects.filter(pk=material.pk).update(content_html="")
+    Problem.objects.filter(pk=problem.pk).update(statement_html="<p>Stale.</p>")
+    stdout = StringIO()
+
+    call_command("backfill_training_markdown", stdout=stdout)
+    material.refresh_from_db()
+    problem.refresh_from_db()
+
+    assert material.content_html == str(render_markdown(material.content_markdown))
+    assert problem.statement_html == "<p>Stale.</p>"
+    assert "materials: 1 rendered." in stdout.getvalue()
+
+    call_command("backfill_training_markdown", "--force", stdout=StringIO())
+    problem.refresh_from_db()
+
+    assert problem.statement_html == str(render_markdown(problem.statement_markdown))
+
+
 def test_level_is_calculated_from_point_ledger():
     _thresholds()
     user = UserFactory()
@@ -33,6 +33,7 @@ from inspinia.training.models import SubmissionAttachment
 from inspinia.training.models import SubmissionComment
 from inspinia.training.models import Subtopic
 from inspinia.training.models import Topic
+from inspinia.training.rendering import stored_training_markdown
 from inspinia.training.services import complete_material
 from inspinia.training.services import get_next_level
 from inspinia.training.services import get_subtopic_progress
@@ -289,7 +290,7 @@ def material_detail_view(request, material_slug: str):
         {
             "completed": completed,
             "material": material,
-            "rendered_content": render_markdown(material.content_markdown),
+            "rendered_content": stored_training_markdown(material.content_html, material.content_markdown),
         },
     )
 
@@ -340,8 +341,11 @@ def problem_detail_view(request, problem_slug: str):
             "difficulty_badge_class": _difficulty_badge_class(problem.difficulty),
             "form": form,
             "problem": problem,
-            "rendered_official_solution": render_markdown(problem.official_solution_markdown),
-            "rendered_statement": render_markdown(problem.statement_markdown),
+            "rendered_official_solution": stored_training_markdown(
+                problem.official_solution_html,
+                problem.official_solution_markdown,
+            ),
+            "rendered_statement": stored_training_markdown(problem.statement_html, problem.statement_markdown),
             "status_badge_class": _status_badge_class,
             "submissions": submissions,
         },
@@ -382,7 +386,7 @@ def submission_detail_view(request, submission_id: int):
     comments = [
         {
             "comment": comment,
-            "rendered_body": render_markdown(comment.body_markdown),
+            "rendered_body": stored_training_markdown(comment.body_html, comment.body_markdown),
         }
         for comment in submission.comments.select_related("author")
     ]
@@ -392,7 +396,7 @@ def submission_detail_view(request, submission_id: int):
         {
             "comments": comments,
             "form": form,
-            "rendered_solution": render_markdown(submission.solution_markdown),
+            "rendered_solution": stored_training_markdown(submission.solution_html, submission.solution_markdown),
             "reviewer_view": reviewer_view,
             "status_badge_class": _status_badge_class(submission.status),
             "submission": submission,
@@ -652,7 +656,11 @@ def trainer_materials_view(request):
         {
             "checkpoint_form": checkpoint_form,
             "form": form,
-            "rendered_material_preview": render_markdown(instance.content_markdown) if instance is not None else "",
+            "rendered_material_preview": (
+                stored_training_markdown(instance.content_html, instance.content_markdown)
+                if instance is not None
+                else ""
+            ),
             "selected_material": instance,
             "selected_subtopic": selected_subtopic,
             **_trainer_materials_workspace_context(request, selected_subtopic),
@@ -684,9 +692,15 @@ def trainer_problems_view(request):
             "form": form,
             "problems": Problem.objects.select_related("subtopic", "subtopic__topic"),
             "rendered_official_solution_preview": (
-                render_markdown(instance.official_solution_markdown) if instance is not None else ""
+                stored_training_markdown(instance.official_solution_html, instance.official_solution_markdown)
+                if instance is not None
+                else ""
+            ),
+            "rendered_statement_preview": (
+                stored_training_markdown(instance.statement_html, instance.statement_markdown)
+                if instance is not None
+                else ""
             ),
-            "rendered_statement_preview": render_markdown(instance.statement_markdown) if instance is not None else "",
             "selected_problem": instance,
         },
     )